@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from . import auth, users, wallet, issues, repositories, rewards
+from . import auth, users, wallet, issues, repositories, rewards, webhooks, metrics, health, export, stats, events
 
 
 router = APIRouter()
@@ -11,3 +11,9 @@ router.include_router(wallet.router, prefix="/wallet")
 router.include_router(issues.router, prefix="/issues")
 router.include_router(repositories.router, prefix="/repositories")
 router.include_router(rewards.router, prefix="/rewards")
+router.include_router(webhooks.router, prefix="/webhooks")
+router.include_router(metrics.router, prefix="/metrics")
+router.include_router(health.router, prefix="/health")
+router.include_router(export.router, prefix="/export")
+router.include_router(stats.router, prefix="/stats")
+router.include_router(events.router, prefix="/events")
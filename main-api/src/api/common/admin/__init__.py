@@ -0,0 +1,6 @@
+from .service import AdminService
+
+
+__all__ = [
+    "AdminService"
+]
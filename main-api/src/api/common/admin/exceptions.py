@@ -0,0 +1,9 @@
+from api.exceptions.base import APIException
+
+
+class AdminAPIException(APIException):
+    """Base class for admin access exceptions."""
+
+
+class AdminAccessRequired(AdminAPIException):
+    pass
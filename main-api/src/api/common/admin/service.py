@@ -0,0 +1,18 @@
+from domain.users.schemas import UserSchema
+
+from ...config import AdminSettings
+
+
+class AdminService:
+    """
+    Admins are the users whose GitHub IDs are listed in the settings.
+    """
+    _github_ids: frozenset[int] = frozenset()
+
+    @classmethod
+    def setup(cls, settings: AdminSettings) -> None:
+        cls._github_ids = frozenset(settings.github_ids)
+
+    @classmethod
+    def is_admin(cls, user: UserSchema) -> bool:
+        return user.github_id in cls._github_ids
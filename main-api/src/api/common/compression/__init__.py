@@ -0,0 +1,6 @@
+from .middleware import CompressionMiddleware
+
+
+__all__ = [
+    "CompressionMiddleware"
+]
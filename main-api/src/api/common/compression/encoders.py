@@ -0,0 +1,94 @@
+import zlib
+from typing import Protocol
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+
+GZIP = "gzip"
+BROTLI = "br"
+
+
+class StreamEncoder(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """
+        :return: Compressed data, flushed so the client can decode it right away
+        """
+        ...
+
+    def finish(self) -> bytes:
+        ...
+
+
+class GzipStreamEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliStreamEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def get_supported_encodings() -> tuple[str, ...]:
+    """
+    :return: Supported encodings, most efficient first
+    """
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Picks the encoding with the highest weight in an **Accept-Encoding** header, brotli first on ties.
+    :return: The encoding, None if the response should not be compressed
+    """
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in get_supported_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """
+    :param level: Gzip level or brotli quality
+    """
+    if encoding == BROTLI:
+        return brotli.compress(data, quality=level)
+    return zlib.compress(data, level, wbits=16 + zlib.MAX_WBITS)
+
+
+def get_stream_encoder(encoding: str, level: int) -> StreamEncoder:
+    if encoding == BROTLI:
+        return BrotliStreamEncoder(level)
+    return GzipStreamEncoder(level)
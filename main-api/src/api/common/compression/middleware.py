@@ -0,0 +1,187 @@
+import asyncio
+import hashlib
+import logging
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.cache import Cache, CacheException
+from infrastructure.metrics import MetricsRegistry
+
+from ...config import CompressionSettings
+from .encoders import BROTLI, StreamEncoder, compress, get_stream_encoder, negotiate_encoding
+
+
+_RESPONSES = MetricsRegistry.counter(
+    "http_compressed_responses_total",
+    "Number of compressed responses by encoding and source of the compressed body.",
+    ("encoding", "source")
+)
+_SAVED_BYTES = MetricsRegistry.counter(
+    "http_compression_saved_bytes_total",
+    "Number of response bytes saved by the compression of buffered responses.",
+    ("encoding",)
+)
+
+# Compressed in a worker thread above this size, not to block the event loop
+THREAD_COMPRESSION_SIZE = 256 * 1024
+
+# Server-sent events must reach the client unbuffered
+INCOMPRESSIBLE_CONTENT_TYPES = ("text/event-stream",)
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.split(";", 1)[0].strip().lower()
+    if content_type in INCOMPRESSIBLE_CONTENT_TYPES:
+        return False
+    return (
+        content_type.startswith("text/")
+        or content_type in ("application/json", "application/x-ndjson", "application/javascript")
+        or content_type.endswith("+json")
+    )
+
+
+class CompressionMiddleware:
+    """
+    Compresses the responses with gzip or brotli, as negotiated with the **Accept-Encoding** header.
+
+    Responses below the minimum size are sent as is. Streamed responses are compressed chunk by chunk.
+    The compressed bodies of large public responses are cached by content,
+    so the same list served again is not compressed again.
+    """
+
+    def __init__(self, app: ASGIApp, settings: CompressionSettings):
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.settings.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(
+            self,
+            send,
+            encoding,
+            is_public="authorization" not in request_headers and "cookie" not in request_headers
+        )
+        await self.app(scope, receive, responder.send)
+
+    def get_level(self, encoding: str) -> int:
+        return self.settings.brotli_quality if encoding == BROTLI else self.settings.gzip_level
+
+    async def get_compressed(self, body: bytes, encoding: str, cacheable: bool) -> bytes:
+        level = self.get_level(encoding)
+        cache_key = None
+        if cacheable and self.settings.cache_ttl > 0 and len(body) >= self.settings.cache_minimum_size:
+            digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+            cache_key = f"compressed-response:{encoding}:{level}:{digest}"
+            try:
+                compressed = await Cache.get(cache_key)
+            except CacheException as e:
+                logging.warning("Could not read a compressed response from the cache: %r", e)
+                cache_key = None
+            else:
+                if compressed is not None:
+                    _RESPONSES.inc(encoding=encoding, source="cache")
+                    return compressed
+
+        if len(body) >= THREAD_COMPRESSION_SIZE:
+            compressed = await asyncio.to_thread(compress, body, encoding, level)
+        else:
+            compressed = compress(body, encoding, level)
+        _RESPONSES.inc(encoding=encoding, source="compressed")
+
+        if cache_key is not None:
+            try:
+                await Cache.set(cache_key, compressed, ttl=self.settings.cache_ttl)
+            except CacheException as e:
+                logging.warning("Could not cache a compressed response: %r", e)
+        return compressed
+
+
+class _CompressionResponder:
+    """
+    Holds the response start until the first body chunk tells if and how the response is compressed.
+    """
+
+    def __init__(self, middleware: CompressionMiddleware, send: Send, encoding: str, is_public: bool):
+        self._middleware = middleware
+        self._send = send
+        self._encoding = encoding
+        self._is_public = is_public
+
+        self._start_message: Message | None = None
+        self._passthrough = False
+        self._stream_encoder: StreamEncoder | None = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start_message = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self._passthrough:
+            await self._send(message)
+        elif self._stream_encoder is not None:
+            await self._send_stream_chunk(message)
+        else:
+            await self._send_first_chunk(message)
+
+    async def _send_first_chunk(self, message: Message) -> None:
+        start_message = self._start_message
+        headers = MutableHeaders(raw=start_message.setdefault("headers", []))
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if (
+            "content-encoding" in headers
+            or start_message["status"] in (204, 304)
+            or not is_compressible(headers.get("content-type", ""))
+        ):
+            self._passthrough = True
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if not more_body and len(body) < self._middleware.settings.minimum_size:
+            self._passthrough = True
+            await self._send(start_message)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self._encoding
+        if more_body:
+            # Streamed, the length is unknown
+            del headers["Content-Length"]
+            self._stream_encoder = get_stream_encoder(self._encoding, self._middleware.get_level(self._encoding))
+            _RESPONSES.inc(encoding=self._encoding, source="stream")
+            await self._send(start_message)
+            await self._send_stream_chunk(message)
+            return
+
+        compressed = await self._middleware.get_compressed(
+            body,
+            self._encoding,
+            cacheable=self._is_public and "set-cookie" not in headers
+        )
+        _SAVED_BYTES.inc(max(len(body) - len(compressed), 0), encoding=self._encoding)
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(start_message)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_stream_chunk(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        chunk = self._stream_encoder.compress(message.get("body", b""))
+        if not more_body:
+            chunk += self._stream_encoder.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
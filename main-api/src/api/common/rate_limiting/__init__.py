@@ -0,0 +1,6 @@
+from .service import RateLimitService
+
+
+__all__ = [
+    "RateLimitService"
+]
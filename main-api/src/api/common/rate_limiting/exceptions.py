@@ -0,0 +1,9 @@
+from api.exceptions.base import APIException
+
+
+class RateLimitAPIException(APIException):
+    """Base class for rate limiting exceptions."""
+
+
+class RateLimitExceeded(RateLimitAPIException):
+    pass
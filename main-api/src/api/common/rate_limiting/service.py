@@ -0,0 +1,85 @@
+import logging
+from uuid import UUID
+
+from infrastructure.metrics import MetricsRegistry
+from infrastructure.rate_limiting import (
+    RateLimitBackendABC,
+    InMemoryRateLimitBackend,
+    DatabaseRateLimitBackend,
+    RateLimitRule,
+    RateLimitDecision
+)
+
+from ...config import RateLimitSettings, RateLimitBackend
+
+
+_REQUESTS = MetricsRegistry.counter(
+    "rate_limit_requests_total",
+    "Number of rate limited requests by route scope and result.",
+    ("scope", "result")
+)
+_CAPACITY = MetricsRegistry.gauge(
+    "rate_limit_capacity",
+    "Max number of requests in a burst by route scope and bucket.",
+    ("scope", "bucket")
+)
+_PERIOD = MetricsRegistry.gauge(
+    "rate_limit_period_seconds",
+    "Number of seconds to refill the whole capacity by route scope and bucket.",
+    ("scope", "bucket")
+)
+
+
+class RateLimitService:
+    """
+    Applies token bucket limits per user and per route to the requests of a route scope.
+    """
+    _enabled: bool = False
+    _backend: RateLimitBackendABC = InMemoryRateLimitBackend()
+    _rules: dict[str, tuple[RateLimitRule, RateLimitRule]] = {}
+
+    @classmethod
+    def setup(cls, settings: RateLimitSettings) -> None:
+        cls._enabled = settings.enabled
+        cls._backend = (
+            DatabaseRateLimitBackend() if settings.backend == RateLimitBackend.DATABASE
+            else InMemoryRateLimitBackend()
+        )
+        cls._rules = {}
+        for scope, route_settings in settings.routes.items():
+            cls._rules[scope] = (
+                RateLimitRule.model_validate(route_settings.per_user.model_dump()),
+                RateLimitRule.model_validate(route_settings.per_route.model_dump())
+            )
+            for bucket, rule_settings in (("user", route_settings.per_user), ("route", route_settings.per_route)):
+                _CAPACITY.set(rule_settings.capacity, scope=scope, bucket=bucket)
+                _PERIOD.set(rule_settings.period_seconds, scope=scope, bucket=bucket)
+
+    @classmethod
+    async def check(cls, scope: str, user_id: UUID) -> RateLimitDecision:
+        """
+        Takes a token from the user's bucket and then from the route's one.
+        The user's token is given back if the route rejects the request,
+        so a user isn't charged for the requests rejected by the route limit.
+        If the limiter backend fails, the request is allowed.
+        :param scope: Route scope
+        :param user_id: Internal ID of the user making the request
+        :return: RateLimitDecision
+        """
+        if not cls._enabled or scope not in cls._rules:
+            return RateLimitDecision(allowed=True)
+
+        user_rule, route_rule = cls._rules[scope]
+        user_key = f"{scope}:user:{user_id}"
+        try:
+            decision = await cls._backend.consume(user_key, user_rule)
+            if decision.allowed:
+                decision = await cls._backend.consume(f"{scope}:route", route_rule)
+                if not decision.allowed:
+                    await cls._backend.refund(user_key, user_rule)
+        except Exception as e:
+            logging.warning("Rate limiter failed, letting the request through: %r", e)
+            return RateLimitDecision(allowed=True)
+
+        _REQUESTS.inc(scope=scope, result="allowed" if decision.allowed else "rejected")
+        return decision
@@ -0,0 +1,7 @@
+from .middleware import TracingMiddleware, TRACE_ID_HEADER
+
+
+__all__ = [
+    "TracingMiddleware",
+    "TRACE_ID_HEADER"
+]
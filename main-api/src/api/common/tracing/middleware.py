@@ -0,0 +1,68 @@
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.tracing import Tracer, SpanContext, SpanKind
+
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+
+def get_route_path(scope: Scope) -> str | None:
+    """
+    :return: Path template of the matched route, e.g. /api/rewards/{reward_id}
+    """
+    app = scope.get("app")
+    if app is None:
+        return None
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", None)
+    return None
+
+
+class TracingMiddleware:
+    """
+    Wraps every HTTP request into a server span, continuing the trace of the caller's **traceparent** header.
+    The trace ID is returned in the **X-Trace-Id** header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not Tracer.is_enabled():
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                parent = SpanContext.from_traceparent(value.decode("latin-1"))
+                break
+
+        method = scope["method"]
+        with Tracer.start_span(
+            f"{method} {scope['path']}",
+            kind=SpanKind.SERVER,
+            attributes={"http.method": method, "http.target": scope["path"]},
+            parent=parent
+        ) as span:
+            async def send_with_trace_id(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (TRACE_ID_HEADER.lower().encode("latin-1"), span.context.trace_id.encode("latin-1"))
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                if span.is_recording:
+                    # Named after the route template to group the requests by endpoint
+                    route_path = get_route_path(scope)
+                    if route_path is not None:
+                        span.name = f"{method} {route_path}"
+                        span.set_attribute("http.route", route_path)
@@ -1,4 +1,7 @@
-from pydantic import BaseModel
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel, Field, field_validator
 
 
 class CORSSettings(BaseModel):
@@ -17,11 +20,98 @@ class IssueTrackerSettings(BaseModel):
     secret: str
 
 
+class GithubWebhookSettings(BaseModel):
+    secret: str | None = None
+
+
+class LNBitsWebhookSettings(BaseModel):
+    secret: str | None = None
+
+
+class AdminSettings(BaseModel):
+    github_ids: list[int] = Field(default_factory=list)
+
+
+class RateLimitBackend(StrEnum):
+    MEMORY = "memory"  # Per API instance
+    DATABASE = "database"  # Shared by all API instances
+
+
+class RateLimitRuleSettings(BaseModel):
+    """
+    Up to **capacity** requests in a burst, refilled completely every **period_seconds**.
+    """
+    capacity: int = Field(..., gt=0)
+    period_seconds: float = Field(..., gt=0)
+
+
+class RouteRateLimitSettings(BaseModel):
+    per_user: RateLimitRuleSettings
+    per_route: RateLimitRuleSettings
+
+
+DEFAULT_ROUTE_RATE_LIMITS = {
+    "wallet_deposit": RouteRateLimitSettings(
+        per_user=RateLimitRuleSettings(capacity=10, period_seconds=60),
+        per_route=RateLimitRuleSettings(capacity=300, period_seconds=60)
+    ),
+    "wallet_withdraw": RouteRateLimitSettings(
+        per_user=RateLimitRuleSettings(capacity=5, period_seconds=60),
+        per_route=RateLimitRuleSettings(capacity=120, period_seconds=60)
+    ),
+    "rewards_create": RouteRateLimitSettings(
+        per_user=RateLimitRuleSettings(capacity=10, period_seconds=60),
+        per_route=RateLimitRuleSettings(capacity=300, period_seconds=60)
+    ),
+    "rewards_create_bulk": RouteRateLimitSettings(
+        per_user=RateLimitRuleSettings(capacity=3, period_seconds=60),
+        per_route=RateLimitRuleSettings(capacity=60, period_seconds=60)
+    ),
+    "rewards_check_pull": RouteRateLimitSettings(
+        per_user=RateLimitRuleSettings(capacity=10, period_seconds=60),
+        per_route=RateLimitRuleSettings(capacity=300, period_seconds=60)
+    ),
+}
+
+
+class RateLimitSettings(BaseModel):
+    """
+    **routes**: Limits by route scope, the ones passed override the defaults
+    """
+    enabled: bool = True
+    backend: RateLimitBackend = RateLimitBackend.MEMORY
+    routes: dict[str, RouteRateLimitSettings] = Field(default_factory=lambda: dict(DEFAULT_ROUTE_RATE_LIMITS))
+
+    @field_validator("routes", mode="before")
+    @classmethod
+    def merge_with_defaults(cls, routes: dict[str, Any]) -> dict[str, Any]:
+        return {**DEFAULT_ROUTE_RATE_LIMITS, **routes}
+
+
+class CompressionSettings(BaseModel):
+    """
+    Responses of at least **minimum_size** bytes are compressed.
+    The compressed bodies of public responses of at least **cache_minimum_size** bytes
+    are cached for **cache_ttl** seconds, 0 to disable the cache.
+    """
+    enabled: bool = True
+    minimum_size: int = Field(1024, ge=0)
+    gzip_level: int = Field(6, ge=1, le=9)
+    brotli_quality: int = Field(4, ge=0, le=11)
+    cache_minimum_size: int = Field(16 * 1024, ge=0)
+    cache_ttl: float = Field(300, ge=0)
+
+
 class APIConfig(BaseModel):
     title: str = "Lightning Bounties API"
     version: str | None = None
     enable_docs: bool = False
 
     cors_settings: CORSSettings = CORSSettings()
+    compression_settings: CompressionSettings = CompressionSettings()
     jwt_settings: JWTSettings
     issue_tracker_settings: IssueTrackerSettings
+    github_webhook_settings: GithubWebhookSettings = GithubWebhookSettings()
+    lnbits_webhook_settings: LNBitsWebhookSettings = LNBitsWebhookSettings()
+    rate_limit_settings: RateLimitSettings = RateLimitSettings()
+    admin_settings: AdminSettings = AdminSettings()
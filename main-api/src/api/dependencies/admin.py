@@ -0,0 +1,20 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from domain.users.schemas import UserSchema
+from ..common.admin import AdminService
+from ..common.admin.exceptions import AdminAccessRequired
+from ..exceptions.http import ForbiddenException
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+from .jwt import get_authenticated_user
+
+
+async def get_admin_user(
+    user: Annotated[UserSchema, Depends(get_authenticated_user)]
+) -> UserSchema:
+    if not AdminService.is_admin(user):
+        raise ForbiddenException(
+            detail=HTTPExceptionDetailSchema.from_standard_exception(AdminAccessRequired())
+        )
+    return user
@@ -0,0 +1,12 @@
+from fastapi import FastAPI
+
+from domain.escrow import EscrowServiceABC
+from impl.escrow import EscrowService
+
+
+def get_service() -> EscrowServiceABC:
+    return EscrowService()
+
+
+def di_escrow(app: FastAPI) -> None:
+    app.dependency_overrides[EscrowServiceABC] = get_service
@@ -0,0 +1,12 @@
+from fastapi import FastAPI
+
+from domain.idempotency import IdempotencyServiceABC
+from impl.idempotency import IdempotencyService
+
+
+def get_service() -> IdempotencyServiceABC:
+    return IdempotencyService()
+
+
+def di_idempotency(app: FastAPI) -> None:
+    app.dependency_overrides[IdempotencyServiceABC] = get_service
@@ -1,10 +1,14 @@
 from fastapi import FastAPI
 
+from .escrow import di_escrow
+from .idempotency import di_idempotency
 from .issue import di_issue
 from .repository import di_repository
 from .reward import di_reward
+from .stats import di_stats
 from .user import di_user
 from .wallet import di_wallet
+from .webhook import di_webhook
 
 
 def setup_dependencies(app: FastAPI) -> None:
@@ -13,3 +17,7 @@ def setup_dependencies(app: FastAPI) -> None:
     di_issue(app)
     di_repository(app)
     di_reward(app)
+    di_webhook(app)
+    di_idempotency(app)
+    di_escrow(app)
+    di_stats(app)
@@ -0,0 +1,12 @@
+from fastapi import FastAPI
+
+from domain.stats import StatsServiceABC
+from impl.stats import StatsService
+
+
+def get_service() -> StatsServiceABC:
+    return StatsService()
+
+
+def di_stats(app: FastAPI) -> None:
+    app.dependency_overrides[StatsServiceABC] = get_service
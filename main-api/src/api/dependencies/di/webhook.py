@@ -0,0 +1,12 @@
+from fastapi import FastAPI
+
+from domain.webhooks import WebhookServiceABC
+from impl.webhooks import WebhookService
+
+
+def get_service() -> WebhookServiceABC:
+    return WebhookService()
+
+
+def di_webhook(app: FastAPI) -> None:
+    app.dependency_overrides[WebhookServiceABC] = get_service
@@ -0,0 +1,49 @@
+from typing import Callable, Sequence
+
+from fastapi import Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from ..exceptions.http import BadRequestException
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+
+
+def read_fields(schema: type[BaseModel]) -> Callable[[str | None], set[str] | None]:
+    """
+    Builds a dependency reading the sparse fieldset of a list endpoint, e.g. ?fields=id,title,state.
+    The ID is always returned.
+    :param schema: Schema of the listed items
+    :return: The dependency, it resolves to None when all the fields are requested
+    """
+    def dependency(
+        fields: str | None = Query(
+            None,
+            description=f"Comma-separated fields to return, among: {', '.join(schema.model_fields)}"
+        )
+    ) -> set[str] | None:
+        if fields is None:
+            return None
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(schema.model_fields)
+        if unknown:
+            raise BadRequestException(
+                HTTPExceptionDetailSchema(
+                    error_code=1,
+                    message=f"Unknown fields: {', '.join(sorted(unknown))}."
+                )
+            )
+        return requested | {"id"}
+
+    return dependency
+
+
+def sparse_response(items: Sequence[BaseModel], fields: set[str] | None) -> Sequence[BaseModel] | JSONResponse:
+    """
+    Items built with only the requested fields can't go through the response model, they are serialized here.
+    :param items: Items of the response
+    :param fields: Requested fields, None if all of them are
+    :return: The items as they are if all the fields are requested, the serialized response otherwise
+    """
+    if fields is None:
+        return items
+    return JSONResponse(content=[item.model_dump(mode="json", include=fields) for item in items])
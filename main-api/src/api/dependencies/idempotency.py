@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import logging
+from typing import Annotated, Any, Awaitable, Callable
+from uuid import UUID
+
+from fastapi import Depends, Header, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from domain.idempotency import IdempotencyServiceABC
+from domain.idempotency.exceptions import IdempotencyKeyReused, RequestInProgress
+from domain.idempotency.schemas import IdempotentRequestSchema, IdempotentResponseSchema
+from infrastructure.resilience import RetryPolicy
+from infrastructure.tasks import TaskSupervisor
+from ..exceptions.http import BadRequestException
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+
+
+COMPLETE_REQUEST_TASK = TaskSupervisor.register(
+    "idempotency_complete_request",
+    RetryPolicy(max_attempts=8, base_delay=1, max_delay=30)
+)
+
+
+class IdempotentRequest:
+    """
+    Executes a request handler at most once per **Idempotency-Key** header.
+
+    Retries get the stored final response. Concurrent duplicates handled by this process
+    wait for the in-flight execution, the ones handled by other processes poll the stored key.
+    Failures without a final response (5xx, unexpected errors) free the key for retries.
+    A final response that can't be stored keeps the key locked, the request is never executed twice.
+    """
+    WAIT_TIMEOUT = 30
+    WAIT_POLL_INTERVAL = 0.5
+    COMPLETE_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=0.2, max_delay=1)
+
+    # (user ID, key) -> (fingerprint, final response or None if the request failed)
+    _in_flight: dict[tuple[UUID, str], tuple[str, asyncio.Future]] = {}
+
+    def __init__(self, idempotency_service: IdempotencyServiceABC, key: str | None, endpoint: str):
+        self._idempotency_service = idempotency_service
+        self._key = key
+        self._endpoint = endpoint
+
+    def _get_fingerprint(self, payload: BaseModel | None) -> str:
+        raw = self._endpoint + (payload.model_dump_json() if payload is not None else "")
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @staticmethod
+    def _replay(response: IdempotentResponseSchema) -> JSONResponse:
+        return JSONResponse(
+            status_code=response.status_code,
+            content=response.body,
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    @staticmethod
+    def _raise_from_domain_exception(exc: IdempotencyKeyReused | RequestInProgress) -> None:
+        raise BadRequestException(
+            status_code=(
+                status.HTTP_422_UNPROCESSABLE_ENTITY if isinstance(exc, IdempotencyKeyReused)
+                else status.HTTP_409_CONFLICT
+            ),
+            detail=HTTPExceptionDetailSchema.from_standard_exception(exc)
+        )
+
+    async def _begin(self, request: IdempotentRequestSchema) -> IdempotentResponseSchema | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.WAIT_TIMEOUT
+        while True:
+            try:
+                return await self._idempotency_service.begin_request(request)
+            except IdempotencyKeyReused as key_reused:
+                self._raise_from_domain_exception(key_reused)
+            except RequestInProgress as request_in_progress:
+                if loop.time() >= deadline:
+                    self._raise_from_domain_exception(request_in_progress)
+            await asyncio.sleep(self.WAIT_POLL_INTERVAL)
+
+    async def _complete(self, user_id: UUID, response: IdempotentResponseSchema) -> None:
+        """
+        Stores the final response of the executed request.
+        If it still fails after the retries, the key is held, so it can't be taken over once its lock times out,
+        and the response is stored in the background.
+        """
+        for attempt in range(self.COMPLETE_RETRY_POLICY.max_attempts):
+            if attempt > 0:
+                await asyncio.sleep(self.COMPLETE_RETRY_POLICY.get_delay(attempt - 1))
+            try:
+                await self._idempotency_service.complete_request(user_id, self._key, response)
+                return
+            except Exception as e:
+                logging.warning("Could not store the response of idempotency key %s: %r", self._key, e)
+
+        key = self._key
+        try:
+            await self._idempotency_service.hold_request(user_id, key)
+        except Exception as e:
+            logging.error("Could not hold idempotency key %s, it may be executed again: %r", key, e)
+        TaskSupervisor.submit(
+            COMPLETE_REQUEST_TASK,
+            lambda: self._idempotency_service.complete_request(user_id, key, response)
+        )
+
+    async def execute(
+        self,
+        user_id: UUID,
+        payload: BaseModel | None,
+        handler: Callable[[], Awaitable[Any]],
+        status_code: int = status.HTTP_200_OK
+    ) -> Any:
+        """
+        :param user_id: Internal ID of the user making the request
+        :param payload: Request parameters the key is bound to
+        :param handler: Executes the request
+        :param status_code: Status code of a successful response
+        :return: The handler result or the stored response
+        """
+        if self._key is None:
+            return await handler()
+
+        fingerprint = self._get_fingerprint(payload)
+        in_flight_key = (user_id, self._key)
+        in_flight = self._in_flight.get(in_flight_key)
+        if in_flight is not None:
+            in_flight_fingerprint, in_flight_response = in_flight
+            if in_flight_fingerprint != fingerprint:
+                self._raise_from_domain_exception(IdempotencyKeyReused())
+            response = await asyncio.shield(in_flight_response)
+            if response is not None:
+                return self._replay(response)
+
+        request = IdempotentRequestSchema(
+            user_id=user_id,
+            key=self._key,
+            endpoint=self._endpoint,
+            fingerprint=fingerprint
+        )
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[in_flight_key] = (fingerprint, future)
+        response = None
+        try:
+            stored_response = await self._begin(request)
+            if stored_response is not None:
+                response = stored_response
+                return self._replay(stored_response)
+
+            try:
+                result = await handler()
+            except HTTPException as e:
+                if e.status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+                    await self._idempotency_service.release_request(user_id, self._key)
+                    raise
+                error_response = IdempotentResponseSchema(
+                    status_code=e.status_code,
+                    body={"detail": jsonable_encoder(e.detail)}
+                )
+                response = error_response
+                await self._complete(user_id, error_response)
+                raise
+            except Exception:
+                await self._idempotency_service.release_request(user_id, self._key)
+                raise
+
+            success_response = IdempotentResponseSchema(status_code=status_code, body=jsonable_encoder(result))
+            response = success_response
+            await self._complete(user_id, success_response)
+            return result
+        finally:
+            # Waiters replay the final response, or retry on their own if there is none
+            future.set_result(response)
+            if self._in_flight.get(in_flight_key, (None, None))[1] is future:
+                self._in_flight.pop(in_flight_key)
+
+
+def get_idempotent_request(
+    request: Request,
+    idempotency_service: Annotated[IdempotencyServiceABC, Depends()],
+    idempotency_key: Annotated[str | None, Header(max_length=255)] = None
+) -> IdempotentRequest:
+    return IdempotentRequest(
+        idempotency_service=idempotency_service,
+        key=idempotency_key,
+        endpoint=f"{request.method} {request.url.path}"
+    )
@@ -0,0 +1,30 @@
+import math
+from typing import Annotated, Callable, Awaitable
+from uuid import UUID
+
+from fastapi import Depends, status
+
+from ..common.jwt import AccessTokenPayloadSchema
+from ..common.rate_limiting import RateLimitService
+from ..common.rate_limiting.exceptions import RateLimitExceeded
+from ..exceptions.http import BadRequestException
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+from .jwt import get_jwt_payload
+
+
+def rate_limit(scope: str) -> Callable[[AccessTokenPayloadSchema], Awaitable[None]]:
+    """
+    Builds a dependency rejecting requests of the authorized user over the limits of the route scope with **429**.
+    """
+    async def check_rate_limit(
+        jwt_payload: Annotated[AccessTokenPayloadSchema, Depends(get_jwt_payload)]
+    ) -> None:
+        decision = await RateLimitService.check(scope, UUID(jwt_payload.user_id))
+        if not decision.allowed:
+            raise BadRequestException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=HTTPExceptionDetailSchema.from_standard_exception(RateLimitExceeded()),
+                headers={"Retry-After": str(max(1, math.ceil(decision.retry_after)))}
+            )
+
+    return check_rate_limit
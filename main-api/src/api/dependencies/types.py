@@ -1,25 +1,41 @@
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import Depends
+from fastapi import Depends, Query
 
 from domain.common.schemas import PaginationSchema
+from domain.idempotency import IdempotencyServiceABC
 from domain.issues import IssueServiceABC
 from domain.repositories.service import RepositoryServiceABC
 from domain.rewards import RewardServiceABC
+from domain.stats import StatsServiceABC
 from domain.users import UserServiceABC
 from domain.users.schemas import UserSchema
 from domain.wallet import WalletServiceABC
+from domain.webhooks import WebhookServiceABC
 from infrastructure.github import GithubAPIClient
 
+from .admin import get_admin_user
+from .idempotency import IdempotentRequest, get_idempotent_request
 from .jwt import get_authenticated_user, get_github_api_service
 from .pagination import read_pagination
 
 
 PaginationDep = Annotated[PaginationSchema, Depends(read_pagination)]
 
+# Multi-value query parameters of the batch lookups, e.g. ?ids=...&ids=...
+MAX_BATCH_SIZE = 100
+BatchIdsQuery = Annotated[list[UUID], Query(max_length=MAX_BATCH_SIZE)]
+BatchGithubIdsQuery = Annotated[list[int], Query(max_length=MAX_BATCH_SIZE)]
+BatchUsernamesQuery = Annotated[list[str], Query(max_length=MAX_BATCH_SIZE)]
+
+IdempotentRequestDep = Annotated[IdempotentRequest, Depends(get_idempotent_request)]
+
 GithubAPIServiceDep = Annotated[GithubAPIClient, Depends(get_github_api_service)]
 GetAuthenticatedUserDep = Annotated[UserSchema, Depends(get_authenticated_user)]
 
+GetAdminUserDep = Annotated[UserSchema, Depends(get_admin_user)]
+
 UserServiceDep = Annotated[UserServiceABC, Depends()]
 
 WalletServiceDep = Annotated[WalletServiceABC, Depends()]
@@ -29,3 +45,9 @@ IssueServiceDep = Annotated[IssueServiceABC, Depends()]
 RepositoryServiceDep = Annotated[RepositoryServiceABC, Depends()]
 
 RewardServiceDep = Annotated[RewardServiceABC, Depends()]
+
+StatsServiceDep = Annotated[StatsServiceABC, Depends()]
+
+WebhookServiceDep = Annotated[WebhookServiceABC, Depends()]
+
+IdempotencyServiceDep = Annotated[IdempotencyServiceABC, Depends()]
@@ -0,0 +1,120 @@
+import asyncio
+from typing import AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from domain.rewards.schemas import RewardEventSchema
+from infrastructure.events import EventHub, Subscription
+
+from ..dependencies.types import BatchIdsQuery
+
+
+router = APIRouter(tags=["Events"])
+
+# Sent over idle streams, so the proxies don't close them
+HEARTBEAT_INTERVAL = 15
+# Tells the browsers to reconnect shortly after the stream ends, e.g. on a deploy
+RECONNECT_DELAY_MS = 3000
+
+LAGGED_EVENT = "lagged"
+
+
+def _format_server_sent_events(events: list[RewardEventSchema], lagged: bool) -> str:
+    messages = [f"event: {LAGGED_EVENT}\ndata: {{}}\n\n"] if lagged else []
+    messages.extend(
+        f"event: {event.type.value}\ndata: {event.model_dump_json()}\n\n"
+        for event in events
+    )
+    return "".join(messages)
+
+
+async def _stream_server_sent_events(repository_ids: list[UUID], issue_ids: list[UUID]) -> AsyncIterator[str]:
+    with EventHub.subscribe(repository_ids, issue_ids) as subscription:
+        yield f"retry: {RECONNECT_DELAY_MS}\n\n"
+        while True:
+            try:
+                received = await asyncio.wait_for(subscription.get(), HEARTBEAT_INTERVAL)
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if received is None:
+                return
+            # The events published while the previous chunk was being sent go out in a single chunk
+            yield _format_server_sent_events(*received)
+
+
+@router.get(
+    "/stream",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"text/event-stream": {}}}
+    }
+)
+async def stream_events(
+    repository_ids: BatchIdsQuery = [],
+    issue_ids: BatchIdsQuery = []
+):
+    """
+    Streams the reward events as server-sent events, named after the event type:
+    **reward_created**, **reward_added** and **issue_claimed**.
+
+    Only the events of the passed repositories and issues are sent, all of them if none is passed.
+    The events are sent once committed, there is no replay of the events missed while disconnected.
+
+    A client that doesn't keep up loses the oldest events and gets a **lagged** event instead,
+    it should reload what it shows from the other endpoints.
+    """
+    return StreamingResponse(
+        _stream_server_sent_events(repository_ids, issue_ids),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Disables the response buffering of nginx
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+async def _receive_until_disconnect(websocket: WebSocket) -> None:
+    # The client has nothing to send, its messages are read only to notice the disconnect
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+async def _send_websocket_events(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        received = await subscription.get()
+        if received is None:
+            await websocket.close(code=status.WS_1001_GOING_AWAY)
+            return
+        events, lagged = received
+        if lagged:
+            await websocket.send_json({"type": LAGGED_EVENT})
+        for event in events:
+            await websocket.send_text(event.model_dump_json())
+
+
+@router.websocket("/ws")
+async def stream_events_websocket(
+    websocket: WebSocket,
+    repository_ids: BatchIdsQuery = [],
+    issue_ids: BatchIdsQuery = []
+):
+    """
+    Same events as **/stream**, one JSON message per event with its **type**.
+    """
+    await websocket.accept()
+    with EventHub.subscribe(repository_ids, issue_ids) as subscription:
+        receiver = asyncio.create_task(_receive_until_disconnect(websocket))
+        sender = asyncio.create_task(_send_websocket_events(websocket, subscription))
+        try:
+            await asyncio.wait((receiver, sender), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            receiver.cancel()
+            sender.cancel()
+            results = await asyncio.gather(receiver, sender, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception) and not isinstance(result, WebSocketDisconnect):
+                raise result
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 
 from domain.common.exceptions import DomainException
+from domain.idempotency.exceptions import IdempotencyException, IdempotencyKeyReused, RequestInProgress
 from domain.issues.exceptions import IssueException, IssueNotFound
 from domain.repositories.exceptions import RepositoryException, RepositoryNotFound
 from domain.rewards.exceptions import (
@@ -18,6 +19,7 @@ from domain.wallet.exceptions import (
     CouldNotCreateInvoice,
     CouldNotPayInvoice,
     InsufficientFunds,
+    DepositNotFound,
 )
 from impl.common.exceptions import ImplException
 from infrastructure.common.exceptions import InfrastructureException
@@ -27,18 +29,31 @@ from infrastructure.github.exceptions import (
     CouldNotFetchGithubUser,
     GithubIssueIsAlreadyClosed,
     GithubPullRequestNotFound,
-    CouldNotFetchPullRequest
+    CouldNotFetchPullRequest,
+    GithubUnavailable,
+    GithubRateLimited,
+    GithubRepositoryNotFound,
+    CouldNotFetchRepository,
+    GithubIssueNotFound,
+    CouldNotFetchIssue
 )
+from infrastructure.locks import LockException, LockNotAcquired
 from infrastructure.lnbits.exceptions import (
     WalletAPIException,
     WalletCreationFailure,
     WalletFetchFailure,
     CreateInvoiceFailure,
     PayInvoiceFailure,
-    InvoiceIsAlreadyPaid, NotEnoughSats
+    InvoiceIsAlreadyPaid, NotEnoughSats,
+    PaymentFetchFailure,
+    PaymentHistoryFetchFailure,
+    LNBitsUnavailable,
+    LNBitsOverloaded
 )
 
 from .base import APIException
+from ..common.admin.exceptions import AdminAPIException, AdminAccessRequired
+from ..common.rate_limiting.exceptions import RateLimitAPIException, RateLimitExceeded
 from ..common.jwt.exceptions import (
     JWTAPIException,
     TokenIsNotPresented,
@@ -68,6 +83,7 @@ DOMAIN_EXCEPTION_MAPPING = {
     CouldNotCreateInvoice: ExceptionDescription(code=12003, description="Couldn't create invoice."),
     CouldNotPayInvoice: ExceptionDescription(code=12004, description="Couldn't pay invoice."),
     InsufficientFunds: ExceptionDescription(code=12005, description="Insufficient funds."),
+    DepositNotFound: ExceptionDescription(code=12006, description="Deposit not found."),
 
     RewardException: ExceptionDescription(code=13000, description="Reward exception."),
     RewardNotFound: ExceptionDescription(code=13001, description="Reward not found."),
@@ -80,6 +96,16 @@ DOMAIN_EXCEPTION_MAPPING = {
 
     RepositoryException: ExceptionDescription(code=15000, description="Repository exception."),
     RepositoryNotFound: ExceptionDescription(code=15001, description="Repository not found."),
+
+    IdempotencyException: ExceptionDescription(code=16000, description="Idempotency exception."),
+    IdempotencyKeyReused: ExceptionDescription(
+        code=16001,
+        description="Idempotency key was already used for a different request."
+    ),
+    RequestInProgress: ExceptionDescription(
+        code=16002,
+        description="A request with the same idempotency key is still in progress. Please retry later."
+    ),
 }
 
 IMPL_EXCEPTION_MAPPING = {
@@ -99,6 +125,15 @@ INFRASTRUCTURE_EXCEPTION_MAPPING = {
     GithubIssueIsAlreadyClosed: ExceptionDescription(code=41003, description="GitHub issue is already closed."),
     GithubPullRequestNotFound: ExceptionDescription(code=41004, description="Github pull request not found."),
     CouldNotFetchPullRequest: ExceptionDescription(code=41005, description="Couldn't fetch pull request."),
+    GithubUnavailable: ExceptionDescription(code=41006, description="Github is unavailable. Please try again later."),
+    GithubRateLimited: ExceptionDescription(
+        code=41007,
+        description="GitHub rate limit exceeded. Please retry after the number of seconds in the Retry-After header."
+    ),
+    GithubRepositoryNotFound: ExceptionDescription(code=41008, description="Github repository not found."),
+    CouldNotFetchRepository: ExceptionDescription(code=41009, description="Couldn't fetch repository."),
+    GithubIssueNotFound: ExceptionDescription(code=41010, description="Github issue not found."),
+    CouldNotFetchIssue: ExceptionDescription(code=41011, description="Couldn't fetch issue."),
 
     WalletAPIException: ExceptionDescription(code=42000, description="Wallet API exception."),
     WalletCreationFailure: ExceptionDescription(
@@ -125,6 +160,28 @@ INFRASTRUCTURE_EXCEPTION_MAPPING = {
     NotEnoughSats: ExceptionDescription(
         code=42006,
         description="Not enough sats to perform the operation."
+    ),
+    PaymentFetchFailure: ExceptionDescription(
+        code=42007,
+        description="Could not fetch payment status. Please try again later."
+    ),
+    PaymentHistoryFetchFailure: ExceptionDescription(
+        code=42008,
+        description="Could not fetch payment history. Please try again later."
+    ),
+    LNBitsOverloaded: ExceptionDescription(
+        code=42009,
+        description="Wallet API is overloaded. Please try again later."
+    ),
+    LNBitsUnavailable: ExceptionDescription(
+        code=42010,
+        description="Wallet API is unavailable. Please try again later."
+    ),
+
+    LockException: ExceptionDescription(code=43000, description="Lock exception."),
+    LockNotAcquired: ExceptionDescription(
+        code=43001,
+        description="The resource is being modified by another request. Please try again later."
     )
 }
 
@@ -149,5 +206,14 @@ API_EXCEPTION_MAPPING = {
     TokenIsInvalid: ExceptionDescription(
         code=31004,
         description="Token is invalid. Please re-login and try again."
-    )
+    ),
+
+    RateLimitAPIException: ExceptionDescription(code=32000, description="Rate limit exception."),
+    RateLimitExceeded: ExceptionDescription(
+        code=32001,
+        description="Too many requests. Please retry after the number of seconds in the Retry-After header."
+    ),
+
+    AdminAPIException: ExceptionDescription(code=33000, description="Admin access exception."),
+    AdminAccessRequired: ExceptionDescription(code=33001, description="Only admins can access this resource.")
 }
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Query, status
+
+from domain.issues.schemas import IssueExpandedSchema
+from domain.rewards.schemas import RewardExpandedSchema
+
+from .schemas import ExportFormat
+from .utils import build_export_response, to_naive_utc
+from ..dependencies.types import GetAdminUserDep, IssueServiceDep, RewardServiceDep
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+
+
+router = APIRouter(tags=["Export"])
+
+
+@router.get(
+    "/rewards",
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_403_FORBIDDEN: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def export_rewards(
+    _: GetAdminUserDep,
+    reward_service: RewardServiceDep,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    since: datetime | None = Query(None)
+):
+    """
+    Streams all the rewards in a single response, the oldest modified first.
+
+    Pass the latest **modified_at** of the previous export as **since** to get only the new and changed rows.
+    Rows modified exactly at **since** are exported again.
+
+    Throws
+    - **401** if the user is not authorized.
+    - **403** if the user is not an admin.
+    """
+    return build_export_response(
+        reward_service.export_rewards_expanded(since=to_naive_utc(since)),
+        model=RewardExpandedSchema,
+        export_format=export_format,
+        filename="rewards"
+    )
+
+
+@router.get(
+    "/issues",
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_403_FORBIDDEN: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def export_issues(
+    _: GetAdminUserDep,
+    issue_service: IssueServiceDep,
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    since: datetime | None = Query(None)
+):
+    """
+    Streams all the issues in a single response, the oldest modified first.
+
+    Pass the latest **modified_at** of the previous export as **since** to get only the new and changed rows.
+    Rows modified exactly at **since** are exported again.
+
+    Throws
+    - **401** if the user is not authorized.
+    - **403** if the user is not an admin.
+    """
+    return build_export_response(
+        issue_service.export_issues_expanded(since=to_naive_utc(since)),
+        model=IssueExpandedSchema,
+        export_format=export_format,
+        filename="issues"
+    )
@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+import types
+import typing
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from .schemas import ExportFormat
+
+
+# Number of rows sent to the client in a single chunk
+CHUNK_SIZE = 500
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def to_naive_utc(value: datetime | None) -> datetime | None:
+    """
+    Timestamps are stored without a timezone, in UTC.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _get_nested_model(annotation: Any) -> type[BaseModel] | None:
+    """
+    Returns the model of a **Model** or **Model | None** annotation.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        models = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(models) == 1:
+            return _get_nested_model(models[0])
+    return None
+
+
+def get_csv_columns(model: type[BaseModel], prefix: str = "") -> list[str]:
+    """
+    Lists the fields of the model, the fields of nested models are flattened to **parent.child**.
+    """
+    columns = []
+    for name, field in model.model_fields.items():
+        nested_model = _get_nested_model(field.annotation)
+        if nested_model is not None:
+            columns.extend(get_csv_columns(nested_model, prefix=f"{prefix}{name}."))
+        else:
+            columns.append(f"{prefix}{name}")
+    return columns
+
+
+def _flatten(data: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, prefix=f"{prefix}{key}."))
+        elif isinstance(value, list):
+            flat[f"{prefix}{key}"] = json.dumps(value)
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+async def _iter_ndjson(rows: AsyncIterator[BaseModel]) -> AsyncIterator[str]:
+    chunk = []
+    async for row in rows:
+        chunk.append(row.model_dump_json())
+        if len(chunk) >= CHUNK_SIZE:
+            yield "\n".join(chunk) + "\n"
+            chunk.clear()
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+async def _iter_csv(rows: AsyncIterator[BaseModel], model: type[BaseModel]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    # Nested models that are None leave their columns empty
+    writer = csv.DictWriter(buffer, fieldnames=get_csv_columns(model), extrasaction="ignore")
+    writer.writeheader()
+
+    count = 0
+    async for row in rows:
+        writer.writerow(_flatten(row.model_dump(mode="json")))
+        count += 1
+        if count % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def build_export_response(
+    rows: AsyncIterator[BaseModel],
+    model: type[BaseModel],
+    export_format: ExportFormat,
+    filename: str
+) -> StreamingResponse:
+    content = _iter_csv(rows, model) if export_format == ExportFormat.CSV else _iter_ndjson(rows)
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
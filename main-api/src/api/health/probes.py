@@ -0,0 +1,82 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+from infrastructure.database import probe_db
+from infrastructure.github import GithubAPIClient
+from infrastructure.lnbits import LNBitsClient
+from .schemas import DependencyProbeSchema, ProbeStatus
+
+
+PROBE_TIMEOUT = 2
+PROBE_CACHE_SECONDS = 5
+
+PROBES: dict[str, Callable[[], Awaitable[float]]] = {
+    "database": probe_db,
+    "lnbits": LNBitsClient.probe,
+    "github_api": GithubAPIClient.probe
+}
+# LNBits and GitHub outages are handled per request by the circuit breakers,
+# taking every instance out of rotation because of them would only turn a partial outage into a full one
+REQUIRED_DEPENDENCIES = frozenset({"database"})
+
+
+class ReadinessProbe:
+    """
+    Tracks whether the instance should receive traffic: it has to be warmed up, not shutting down,
+    and its required dependencies have to respond.
+    Probe results are cached for a few seconds, so frequent readiness checks don't load the dependencies.
+    """
+
+    _ready: bool = False
+    _results: dict[str, DependencyProbeSchema] = {}
+    _checked_at: float | None = None
+    _lock: asyncio.Lock | None = None
+
+    @classmethod
+    def set_ready(cls, ready: bool) -> None:
+        cls._ready = ready
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        return cls._ready and all(
+            cls._results.get(name) is not None and cls._results[name].status == ProbeStatus.UP
+            for name in REQUIRED_DEPENDENCIES
+        )
+
+    @staticmethod
+    async def _probe(probe: Callable[[], Awaitable[float]]) -> DependencyProbeSchema:
+        try:
+            latency = await asyncio.wait_for(probe(), PROBE_TIMEOUT)
+        except Exception as e:
+            return DependencyProbeSchema(status=ProbeStatus.DOWN, error=repr(e))
+        return DependencyProbeSchema(status=ProbeStatus.UP, latency_ms=round(latency * 1000, 3))
+
+    @classmethod
+    async def check_dependencies(cls) -> dict[str, DependencyProbeSchema]:
+        """
+        Probes all the dependencies concurrently, unless they were probed recently.
+        :return: Probe result by dependency name
+        """
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+        async with cls._lock:
+            if cls._checked_at is None or time.monotonic() - cls._checked_at >= PROBE_CACHE_SECONDS:
+                results = await asyncio.gather(*(cls._probe(probe) for probe in PROBES.values()))
+                cls._results = dict(zip(PROBES, results))
+                cls._checked_at = time.monotonic()
+        return cls._results
+
+    @classmethod
+    async def warmup(cls) -> None:
+        """
+        Probes every dependency, which opens the HTTP connections and completes the TLS handshakes
+        before the first requests need them.
+        """
+        cls._checked_at = None
+        for name, result in (await cls.check_dependencies()).items():
+            if result.status == ProbeStatus.UP:
+                logging.info("%s is up, %sms", name, result.latency_ms)
+            else:
+                logging.warning("%s is down: %s", name, result.error)
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Response, status
+
+from infrastructure.resilience import ResilientHTTPClient, CircuitState
+from .probes import ReadinessProbe
+from .schemas import HealthSchema, HealthStatus, LivenessSchema, ReadinessSchema, ReadinessStatus
+
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/", response_model=HealthSchema)
+async def get_health():
+    """
+    Reports the circuit breaker state of every outbound dependency.
+
+    The status is **degraded** while any breaker isn't closed.
+    """
+    dependencies = ResilientHTTPClient.get_breaker_states()
+    degraded = any(state != CircuitState.CLOSED for state in dependencies.values())
+    return HealthSchema(
+        status=HealthStatus.DEGRADED if degraded else HealthStatus.OK,
+        dependencies=dependencies
+    )
+
+
+@router.get("/live", response_model=LivenessSchema)
+async def get_liveness():
+    """
+    Reports that the process is up and serving requests.
+    """
+    return LivenessSchema(status=HealthStatus.OK)
+
+
+@router.get(
+    "/ready",
+    response_model=ReadinessSchema,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessSchema}}
+)
+async def get_readiness(response: Response):
+    """
+    Probes the dependencies and reports their response times.
+
+    The instance is **ready** once it's warmed up and the database responds.
+    LNBits and GitHub are reported, but don't affect the readiness.
+
+    Throws
+    - **503** if the instance is not ready or is shutting down.
+    """
+    dependencies = await ReadinessProbe.check_dependencies()
+    ready = ReadinessProbe.is_ready()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessSchema(
+        status=ReadinessStatus.READY if ready else ReadinessStatus.NOT_READY,
+        dependencies=dependencies
+    )
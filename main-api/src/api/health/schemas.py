@@ -0,0 +1,45 @@
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+from infrastructure.resilience import CircuitState
+
+
+class HealthStatus(StrEnum):
+    OK = "ok"
+    DEGRADED = "degraded"
+
+
+class ReadinessStatus(StrEnum):
+    READY = "ready"
+    NOT_READY = "not_ready"
+
+
+class ProbeStatus(StrEnum):
+    UP = "up"
+    DOWN = "down"
+
+
+class HealthSchema(BaseModel):
+    status: HealthStatus
+    dependencies: dict[str, CircuitState]
+
+
+class LivenessSchema(BaseModel):
+    status: HealthStatus
+
+
+class DependencyProbeSchema(BaseModel):
+    """
+    **latency_ms**: Response time of the probe, None if it failed
+
+    **error**: Why the probe failed
+    """
+    status: ProbeStatus
+    latency_ms: float | None = None
+    error: str | None = None
+
+
+class ReadinessSchema(BaseModel):
+    status: ReadinessStatus
+    dependencies: dict[str, DependencyProbeSchema]
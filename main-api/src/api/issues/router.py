@@ -4,8 +4,9 @@ from uuid import UUID
 from fastapi import APIRouter, status, Depends
 
 from api.common.schemas import CountResponse
-from api.dependencies.types import IssueServiceDep, PaginationDep
-from api.exceptions.http import NotFoundException
+from api.dependencies.fields import read_fields, sparse_response
+from api.dependencies.types import IssueServiceDep, PaginationDep, BatchIdsQuery, BatchGithubIdsQuery
+from api.exceptions.http import NotFoundException, BadRequestException
 from api.exceptions.schemas import HTTPExceptionDetailSchema
 from domain.issues.exceptions import IssueNotFound
 from domain.issues.schemas import IssueFiltersSchema, IssueExpandedSchema
@@ -18,16 +19,27 @@ router = APIRouter(tags=["Issues"])
 
 @router.get(
     "/",
-    response_model=list[IssueExpandedSchema]
+    response_model=list[IssueExpandedSchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
+    }
 )
 async def list_issues(
     issue_service: IssueServiceDep,
     pagination: PaginationDep,
-    filters: Annotated[IssueFiltersSchema, Depends(get_issue_filters)]
+    filters: Annotated[IssueFiltersSchema, Depends(get_issue_filters)],
+    fields: Annotated[set[str] | None, Depends(read_fields(IssueExpandedSchema))]
 ):
-    return await issue_service.list_issues_expanded(
-        pagination=pagination,
-        filters=filters
+    """
+    Pass **fields** to only get some of the fields, the issue body and the joined users are then only loaded if requested.
+    """
+    return sparse_response(
+        await issue_service.list_issues_expanded(
+            pagination=pagination,
+            filters=filters,
+            fields=fields
+        ),
+        fields
     )
 
 
@@ -46,6 +58,39 @@ async def count_issues(
     return CountResponse(count=issue_count)
 
 
+@router.get(
+    "/batch",
+    response_model=list[IssueExpandedSchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def get_issues_batch(
+    issue_service: IssueServiceDep,
+    ids: BatchIdsQuery = [],
+    github_ids: BatchGithubIdsQuery = []
+):
+    """
+    Fetches several issues at once by their IDs or GitHub IDs.
+
+    Issues are returned in the order of the passed values, unknown ones are skipped.
+
+    Throws
+    - **400** if not exactly one of the parameters was provided.
+    """
+    if bool(ids) == bool(github_ids):
+        raise BadRequestException(
+            detail=HTTPExceptionDetailSchema(
+                error_code=1,
+                message="Exactly one of ids or github_ids should be provided."
+            )
+        )
+
+    if ids:
+        return await issue_service.get_issues_by_ids_expanded(ids)
+    return await issue_service.get_issues_by_github_ids_expanded(github_ids)
+
+
 @router.get(
     "/{issue_id}",
     response_model=IssueExpandedSchema,
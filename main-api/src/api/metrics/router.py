@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from infrastructure.metrics import MetricsRegistry
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get(
+    "/",
+    include_in_schema=False,  # Scraped by Prometheus
+    response_class=PlainTextResponse
+)
+async def get_metrics():
+    """
+    Exposes the metrics of this process in the Prometheus text format.
+    """
+    return PlainTextResponse(
+        MetricsRegistry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
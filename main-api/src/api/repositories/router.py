@@ -1,14 +1,16 @@
+from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, status, Depends
 
 from domain.repositories.exceptions import RepositoryNotFound
 from domain.repositories.schemas import RepositorySchema
 
-from api.dependencies.types import RepositoryServiceDep, PaginationDep
+from api.dependencies.fields import read_fields, sparse_response
+from api.dependencies.types import RepositoryServiceDep, PaginationDep, BatchIdsQuery, BatchGithubIdsQuery
 from api.exceptions.schemas import HTTPExceptionDetailSchema
 from api.common.schemas import CountResponse
-from api.exceptions.http import NotFoundException
+from api.exceptions.http import NotFoundException, BadRequestException
 
 
 router = APIRouter(tags=["Repositories"])
@@ -16,13 +18,23 @@ router = APIRouter(tags=["Repositories"])
 
 @router.get(
     "/",
-    response_model=list[RepositorySchema]
+    response_model=list[RepositorySchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
+    }
 )
 async def list_repositories(
     pagination: PaginationDep,
-    repository_service: RepositoryServiceDep
+    repository_service: RepositoryServiceDep,
+    fields: Annotated[set[str] | None, Depends(read_fields(RepositorySchema))]
 ):
-    return await repository_service.list_repositories(pagination)
+    """
+    Pass **fields** to only get some of the fields.
+    """
+    return sparse_response(
+        await repository_service.list_repositories(pagination, fields=fields),
+        fields
+    )
 
 
 @router.get(
@@ -37,6 +49,39 @@ async def count_repositories(
     )
 
 
+@router.get(
+    "/batch",
+    response_model=list[RepositorySchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def get_repositories_batch(
+    repository_service: RepositoryServiceDep,
+    ids: BatchIdsQuery = [],
+    github_ids: BatchGithubIdsQuery = []
+):
+    """
+    Fetches several repositories at once by their IDs or GitHub IDs.
+
+    Repositories are returned in the order of the passed values, unknown ones are skipped.
+
+    Throws
+    - **400** if not exactly one of the parameters was provided.
+    """
+    if bool(ids) == bool(github_ids):
+        raise BadRequestException(
+            detail=HTTPExceptionDetailSchema(
+                error_code=1,
+                message="Exactly one of ids or github_ids should be provided."
+            )
+        )
+
+    if ids:
+        return await repository_service.get_repositories_by_ids(ids)
+    return await repository_service.get_repositories_by_github_ids(github_ids)
+
+
 @router.get(
     "/{repository_id}",
     response_model=RepositorySchema,
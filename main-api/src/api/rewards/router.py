@@ -1,9 +1,11 @@
 import asyncio
+import logging
 from typing import Annotated
 from uuid import UUID
 
 from fastapi import APIRouter, status, Depends
 
+from domain.rewards import RewardServiceABC
 from domain.rewards.exceptions import (
     RewardNotFound, 
     IssueDoesNotExist, 
@@ -11,6 +13,7 @@ from domain.rewards.exceptions import (
 )
 from domain.rewards.schemas import (
     CreateRewardSchema,
+    AddRewardSchema,
     RewardSchema,
     RewardFiltersSchema,
     RewardExpandedSchema,
@@ -18,8 +21,15 @@ from domain.rewards.schemas import (
     IssueIdentifierSchema,
     RewardCompletionSchema
 )
+from domain.users.schemas import UserSchema
+from infrastructure.github import GithubAPIClient
 from infrastructure.github.exceptions import (
+    GithubException,
     GithubIssueIsAlreadyClosed,
+    GithubRepositoryNotFound,
+    CouldNotFetchRepository,
+    GithubIssueNotFound,
+    CouldNotFetchIssue,
     GithubPullRequestNotFound,
     CouldNotFetchPullRequest
 )
@@ -29,6 +39,8 @@ from infrastructure.lnbits.exceptions import NotEnoughSats
 from .dependencies import get_reward_filters, validate_issue_tracker_secret_wrapper
 from .schemas import (
     CreateRewardRequest,
+    CreateRewardsBulkRequest,
+    BulkRewardResult,
     CheckPullRequest,
     RewardForTrackedIssueRequest
 )
@@ -42,8 +54,11 @@ from ..dependencies.types import (
     GetAuthenticatedUserDep,
     GithubAPIServiceDep,
     RewardServiceDep,
-    PaginationDep
+    PaginationDep,
+    IdempotentRequestDep
 )
+from ..dependencies.fields import read_fields, sparse_response
+from ..dependencies.rate_limit import rate_limit
 from ..exceptions.http import (
     NotFoundException,
     BadRequestException,
@@ -54,21 +69,15 @@ from ..exceptions.schemas import HTTPExceptionDetailSchema
 
 router = APIRouter(tags=["Rewards"])
 
+GITHUB_FETCH_CONCURRENCY = 8
 
-@router.post(
-    "/",
-    response_model=RewardSchema,
-    responses={
-        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
-        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
-    }
-)
-async def post_reward(
-    user: GetAuthenticatedUserDep,
-    reward_service: RewardServiceDep,
-    github_api_service: GithubAPIServiceDep,
+
+async def _create_reward(
+    user: UserSchema,
+    reward_service: RewardServiceABC,
+    github_api_service: GithubAPIClient,
     body: CreateRewardRequest
-):
+) -> RewardSchema:
     if body.issue_lb_id is not None:
         try:
             return await reward_service.add_reward(user.id, body.issue_lb_id, amount_sats=body.reward_sats)
@@ -77,10 +86,18 @@ async def post_reward(
 
     issue_identifier = github_api_service.parse_issue_html_url(body.issue_html_url)
 
-    gh_repo, gh_issue = await asyncio.gather(
-        github_api_service.fetch_repository(repo_full_name=issue_identifier.repo_full_name),
-        github_api_service.fetch_issue(issue_identifier)
-    )
+    try:
+        gh_repo, gh_issue = await asyncio.gather(
+            github_api_service.fetch_repository(repo_full_name=issue_identifier.repo_full_name),
+            github_api_service.fetch_issue(issue_identifier)
+        )
+    except (GithubRepositoryNotFound, GithubIssueNotFound) as not_found:
+        raise BadRequestException(detail=HTTPExceptionDetailSchema.from_standard_exception(not_found))
+    except (CouldNotFetchRepository, CouldNotFetchIssue) as could_not_fetch:
+        raise ServerErrorException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=HTTPExceptionDetailSchema.from_standard_exception(could_not_fetch)
+        )
 
     if gh_issue.state == "closed":
         raise BadRequestException(
@@ -113,18 +130,205 @@ async def post_reward(
     return reward
 
 
+@router.post(
+    "/",
+    dependencies=[Depends(rate_limit("rewards_create"))],
+    response_model=RewardSchema,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_409_CONFLICT: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def post_reward(
+    user: GetAuthenticatedUserDep,
+    reward_service: RewardServiceDep,
+    github_api_service: GithubAPIServiceDep,
+    idempotent_request: IdempotentRequestDep,
+    body: CreateRewardRequest
+):
+    """
+    Reserves sats from the authorized user's wallet as a reward for the issue.
+
+    If the **Idempotency-Key** header is passed, retries with the same key get the stored response
+    and the reward is created only once.
+
+    Throws
+    - **400** if the issue is closed, not found on GitHub or there's not enough funds.
+    - **401** if the user is not authorized.
+    - **409** if a request with the same idempotency key is still in progress.
+    - **422** if the idempotency key was used for a different request.
+    - **429** if the user or all users together create too many rewards, or the GitHub rate limit is exhausted.
+    - **503** if the wallet API is overloaded or GitHub is unavailable.
+    """
+    return await idempotent_request.execute(
+        user_id=user.id,
+        payload=body,
+        handler=lambda: _create_reward(user, reward_service, github_api_service, body)
+    )
+
+
+async def _resolve_bulk_rewards(
+    github_api_service: GithubAPIClient,
+    rewards: list[CreateRewardRequest]
+) -> list[CreateRewardSchema | AddRewardSchema | Exception]:
+    """
+    Fetches GitHub data of the issues passed by URL, a few at a time.
+    Each repository is fetched only once.
+    The requests are deferrable, so a large batch doesn't use up the user's GitHub budget.
+    """
+    github_api_service = github_api_service.deferrable()
+    semaphore = asyncio.Semaphore(GITHUB_FETCH_CONCURRENCY)
+    repositories: dict[str, asyncio.Future] = {}
+
+    async def fetch_repository(repo_full_name: str):
+        async with semaphore:
+            return await github_api_service.fetch_repository(repo_full_name=repo_full_name)
+
+    async def resolve(body: CreateRewardRequest) -> CreateRewardSchema | AddRewardSchema:
+        if body.issue_lb_id is not None:
+            return AddRewardSchema(issue_id=body.issue_lb_id, reward_sats=body.reward_sats)
+
+        issue_identifier = github_api_service.parse_issue_html_url(body.issue_html_url)
+        if issue_identifier.repo_full_name not in repositories:
+            repositories[issue_identifier.repo_full_name] = asyncio.ensure_future(
+                fetch_repository(issue_identifier.repo_full_name)
+            )
+
+        gh_repo = await repositories[issue_identifier.repo_full_name]
+        async with semaphore:
+            gh_issue = await github_api_service.fetch_issue(issue_identifier)
+
+        if gh_issue.state == "closed":
+            raise GithubIssueIsAlreadyClosed
+
+        return CreateRewardSchema(
+            repo_github_id=gh_repo.id,
+            repo_full_name=gh_repo.full_name,
+            repo_owner_github_id=gh_repo.owner_id,
+            repo_html_url=gh_repo.html_url,
+            issue_github_id=gh_issue.id,
+            issue_number=gh_issue.number,
+            issue_title=gh_issue.title,
+            issue_body=gh_issue.body,
+            issue_html_url=gh_issue.html_url,
+            reward_sats=body.reward_sats
+        )
+
+    return await asyncio.gather(*[resolve(body) for body in rewards], return_exceptions=True)
+
+
+def _bulk_resolution_error(exc: Exception) -> HTTPExceptionDetailSchema:
+    if isinstance(exc, GithubException):
+        return HTTPExceptionDetailSchema.from_standard_exception(exc)
+    if isinstance(exc, ValueError):
+        return HTTPExceptionDetailSchema(error_code=1, message="Invalid issue URL.")
+
+    logging.warning("Could not fetch the issue for a bulk reward: %r", exc)
+    return HTTPExceptionDetailSchema(error_code=2, message="Could not fetch the issue from GitHub.")
+
+
+async def _create_rewards_bulk(
+    user: UserSchema,
+    reward_service: RewardServiceABC,
+    github_api_service: GithubAPIClient,
+    body: CreateRewardsBulkRequest
+) -> list[BulkRewardResult]:
+    resolved = await _resolve_bulk_rewards(github_api_service, body.rewards)
+    valid = [schema for schema in resolved if not isinstance(schema, Exception)]
+
+    try:
+        created = iter(await reward_service.create_rewards(user.id, valid) if valid else [])
+    except NotEnoughSats as not_enough_sats:
+        raise BadRequestException(
+            detail=HTTPExceptionDetailSchema.from_standard_exception(not_enough_sats)
+        )
+
+    results = []
+    for schema in resolved:
+        if isinstance(schema, Exception):
+            results.append(BulkRewardResult(error=_bulk_resolution_error(schema)))
+            continue
+
+        result = next(created)
+        results.append(
+            BulkRewardResult(reward=result.reward) if result.error is None
+            else BulkRewardResult(error=HTTPExceptionDetailSchema.from_standard_exception(result.error))
+        )
+    return results
+
+
+@router.post(
+    "/bulk",
+    dependencies=[Depends(rate_limit("rewards_create_bulk"))],
+    response_model=list[BulkRewardResult],
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_409_CONFLICT: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def post_rewards_bulk(
+    user: GetAuthenticatedUserDep,
+    reward_service: RewardServiceDep,
+    github_api_service: GithubAPIServiceDep,
+    idempotent_request: IdempotentRequestDep,
+    body: CreateRewardsBulkRequest
+):
+    """
+    Reserves sats from the authorized user's wallet as rewards for several issues at once.
+
+    Returns a result for each passed reward, in the same order.
+    Rewards for issues that are closed, unknown or couldn't be fetched from GitHub get an **error**
+    and are skipped, the sats for all the others are reserved together or not at all.
+
+    If the **Idempotency-Key** header is passed, retries with the same key get the stored response
+    and the rewards are created only once.
+
+    Throws
+    - **400** if there's not enough funds for all the rewards.
+    - **401** if the user is not authorized.
+    - **409** if a request with the same idempotency key is still in progress.
+    - **422** if the idempotency key was used for a different request.
+    - **429** if the user or all users together create too many rewards.
+    - **503** if the wallet API is unavailable.
+    """
+    return await idempotent_request.execute(
+        user_id=user.id,
+        payload=body,
+        handler=lambda: _create_rewards_bulk(user, reward_service, github_api_service, body)
+    )
+
+
 @router.get(
     "/",
-    response_model=list[RewardExpandedSchema]
+    response_model=list[RewardExpandedSchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
+    }
 )
 async def list_rewards(
     reward_service: RewardServiceDep,
     pagination: PaginationDep,
-    filters: Annotated[RewardFiltersSchema, Depends(get_reward_filters)]
+    filters: Annotated[RewardFiltersSchema, Depends(get_reward_filters)],
+    fields: Annotated[set[str] | None, Depends(read_fields(RewardExpandedSchema))]
 ):
-    return await reward_service.list_rewards_expanded(
-        pagination=pagination,
-        filters=filters
+    """
+    Pass **fields** to only get some of the fields, the rewarder and the issue are then only joined if requested.
+    """
+    return sparse_response(
+        await reward_service.list_rewards_expanded(
+            pagination=pagination,
+            filters=filters,
+            fields=fields
+        ),
+        fields
     )
 
 
@@ -157,14 +361,17 @@ async def reward_for_tracked_issue(
         invalid_secret_err_code=2
     ))
 ):
-    return await reward_service.reward_contributor(
-        contributor=ContributorSchema(
-            github_id=body.winner.github_id,
-            github_username=body.winner.login,
-            avatar_url=body.winner.avatar_url
-        ),
-        issue_id=body.issue_id
-    )
+    try:
+        return await reward_service.reward_contributor(
+            contributor=ContributorSchema(
+                github_id=body.winner.github_id,
+                github_username=body.winner.login,
+                avatar_url=body.winner.avatar_url
+            ),
+            issue_id=body.issue_id
+        )
+    except IssueIsClosed as closed:
+        raise BadRequestException(HTTPExceptionDetailSchema.from_standard_exception(closed))
 
 
 
@@ -195,9 +402,12 @@ async def get_reward(
 
 @router.post(
     "/check-pull",
+    dependencies=[Depends(rate_limit("rewards_check_pull"))],
     response_model=list[RewardCompletionSchema],
     responses={
-        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema}
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HTTPExceptionDetailSchema}
     }
 )
 async def check_pull(
@@ -2,6 +2,9 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, model_validator
 
+from domain.rewards.schemas import RewardSchema
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+
 
 class CreateRewardRequest(BaseModel):
     issue_html_url: str | None = None
@@ -15,6 +18,18 @@ class CreateRewardRequest(BaseModel):
         return self
 
 
+class CreateRewardsBulkRequest(BaseModel):
+    rewards: list[CreateRewardRequest] = Field(..., min_length=1, max_length=100)
+
+
+class BulkRewardResult(BaseModel):
+    """
+    Either **reward** or **error** is set.
+    """
+    reward: RewardSchema | None = None
+    error: HTTPExceptionDetailSchema | None = None
+
+
 class CheckPullRequest(BaseModel):
     repo_full_name: str
     pull_request_number: int
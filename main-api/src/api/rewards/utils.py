@@ -1,3 +1,4 @@
+import logging
 import re
 
 from domain.rewards import RewardServiceABC
@@ -54,4 +55,10 @@ async def reward_for_issue(
             issue_identifier=issue_identifier
         )
     except Exception as e:
-        print(e)
+        logging.exception(
+            "Could not reward issue %s#%s: %r",
+            issue_identifier.repo_full_name,
+            issue_identifier.issue_number,
+            e
+        )
+        return None
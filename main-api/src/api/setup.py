@@ -1,30 +1,108 @@
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from types import FrameType
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from infrastructure.cache import Cache, CacheInvalidationListener
+from infrastructure.database import warmup_db, dispose_db
+from infrastructure.events import EventHub, LiveEventListener
+from infrastructure.github.exceptions import GithubUnavailable, GithubRateLimited
+from infrastructure.lnbits.exceptions import LNBitsUnavailable
+from infrastructure.locks import LockNotAcquired
+from infrastructure.resilience import ResilientHTTPClient
+from infrastructure.tasks import TaskSupervisor
+from .common.admin import AdminService
 from .common.jwt import JWTService
+from .common.compression import CompressionMiddleware
+from .common.tracing import TracingMiddleware, TRACE_ID_HEADER
+from .common.rate_limiting import RateLimitService
 from .config import (
     APIConfig,
     CORSSettings,
+    CompressionSettings,
     JWTSettings,
-    IssueTrackerSettings
+    IssueTrackerSettings,
+    GithubWebhookSettings,
+    LNBitsWebhookSettings,
+    RateLimitSettings,
+    AdminSettings
 )
 from . import api
+from .health.probes import ReadinessProbe
 from .dependencies import setup_dependencies
+from .dependencies.di import escrow, idempotency, issue, reward, wallet, webhook
+from .exceptions.schemas import HTTPExceptionDetailSchema
+from impl.escrow.reconciliation import EscrowReconciliationJob
+from impl.idempotency.cleanup import IdempotencyKeyCleanupJob
+from impl.rewards.reserved_sats import ReservedSatsVerificationJob
+from impl.wallet.history import WalletHistorySyncJob
+from impl.wallet.settlement import DepositSettlementListener
 from .rewards.issue_tracker import IssueTrackerService
+from .wallet.lnbits_webhook import LNBitsWebhookService
+from .webhooks.processor import GithubWebhookProcessor
+from .webhooks.signature import GithubWebhookSignatureService
 
 
-def setup_middlewares(app: FastAPI, cors_settings: CORSSettings) -> None:
+def setup_middlewares(app: FastAPI, cors_settings: CORSSettings, compression_settings: CompressionSettings) -> None:
     app.add_middleware(
         CORSMiddleware,
         allow_origins=cors_settings.allow_origins,
         allow_credentials=cors_settings.allow_credentials,
         allow_methods=cors_settings.allow_methods,
-        allow_headers=cors_settings.allow_headers
+        allow_headers=cors_settings.allow_headers,
+        expose_headers=["X-Next-Cursor", TRACE_ID_HEADER]
     )
+    app.add_middleware(CompressionMiddleware, settings=compression_settings)
+    # Added last to be the outermost one and cover the whole request
+    app.add_middleware(TracingMiddleware)
+
+
+def setup_exception_handlers(app: FastAPI) -> None:
+
+    @app.exception_handler(LNBitsUnavailable)
+    @app.exception_handler(GithubUnavailable)
+    async def handle_dependency_unavailable(
+        request: Request,
+        exc: LNBitsUnavailable | GithubUnavailable
+    ) -> JSONResponse:
+        # Raised deep inside the services, so it's handled for all the routes at once
+        retry_after = getattr(exc.__cause__, "retry_after", None) or 1
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": HTTPExceptionDetailSchema.from_standard_exception(exc).model_dump()},
+            headers={"Retry-After": str(int(retry_after))}
+        )
+
+    @app.exception_handler(GithubRateLimited)
+    async def handle_github_rate_limited(request: Request, exc: GithubRateLimited) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            content={"detail": HTTPExceptionDetailSchema.from_standard_exception(exc).model_dump()},
+            headers={"Retry-After": str(math.ceil(exc.retry_after))}
+        )
 
+    @app.exception_handler(LockNotAcquired)
+    async def handle_lock_not_acquired(request: Request, exc: LockNotAcquired) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"detail": HTTPExceptionDetailSchema.from_standard_exception(exc).model_dump()},
+            headers={"Retry-After": "1"}
+        )
 
-def setup_services(jwt_settings: JWTSettings, issue_tracker_settings: IssueTrackerSettings) -> None:
+
+def setup_services(
+    jwt_settings: JWTSettings,
+    issue_tracker_settings: IssueTrackerSettings,
+    github_webhook_settings: GithubWebhookSettings,
+    lnbits_webhook_settings: LNBitsWebhookSettings,
+    rate_limit_settings: RateLimitSettings,
+    admin_settings: AdminSettings
+) -> None:
     JWTService.setup(
         algorithm=jwt_settings.algorithm,
         access_token_secret=jwt_settings.access_token_secret,
@@ -32,6 +110,81 @@ def setup_services(jwt_settings: JWTSettings, issue_tracker_settings: IssueTrack
     IssueTrackerService.setup(
         secret=issue_tracker_settings.secret
     )
+    GithubWebhookSignatureService.setup(
+        secret=github_webhook_settings.secret
+    )
+    LNBitsWebhookService.setup(
+        secret=lnbits_webhook_settings.secret
+    )
+    RateLimitService.setup(rate_limit_settings)
+    AdminService.setup(admin_settings)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Uvicorn starts accepting connections once the startup is complete
+    await warmup_db()
+    await ReadinessProbe.warmup()
+
+    TaskSupervisor.setup()
+    await TaskSupervisor.start()
+
+    GithubWebhookProcessor.setup(
+        webhook_service=webhook.get_service(),
+        reward_service=reward.get_service(),
+        issue_service=issue.get_service()
+    )
+    await GithubWebhookProcessor.start()
+
+    DepositSettlementListener.setup(
+        wallet_service=wallet.get_service()
+    )
+    await DepositSettlementListener.start()
+
+    WalletHistorySyncJob.setup(
+        wallet_service=wallet.get_service()
+    )
+    await WalletHistorySyncJob.start()
+
+    IdempotencyKeyCleanupJob.setup(
+        idempotency_service=idempotency.get_service()
+    )
+    await IdempotencyKeyCleanupJob.start()
+
+    EscrowReconciliationJob.setup(
+        escrow_service=escrow.get_service()
+    )
+    await EscrowReconciliationJob.start()
+
+    ReservedSatsVerificationJob.setup(
+        reward_service=reward.get_service()
+    )
+    await ReservedSatsVerificationJob.start()
+
+    await CacheInvalidationListener.start()
+    await LiveEventListener.start()
+
+    ReadinessProbe.set_ready(True)
+
+    yield
+
+    # Lets the load balancer take the instance out of rotation while it's shutting down
+    ReadinessProbe.set_ready(False)
+
+    await LiveEventListener.stop()
+    await CacheInvalidationListener.stop()
+    await ReservedSatsVerificationJob.stop()
+    await EscrowReconciliationJob.stop()
+    await IdempotencyKeyCleanupJob.stop()
+    await WalletHistorySyncJob.stop()
+    await DepositSettlementListener.stop()
+    await GithubWebhookProcessor.stop()
+    # The jobs may still submit tasks until they are stopped
+    await TaskSupervisor.stop()
+
+    await ResilientHTTPClient.close_all()
+    await Cache.close()
+    await dispose_db()
 
 
 def get_fastapi_app(config: APIConfig) -> FastAPI:
@@ -40,11 +193,21 @@ def get_fastapi_app(config: APIConfig) -> FastAPI:
         version=config.version if config.version else "0.0.0",
 
         docs_url="/api/docs" if config.enable_docs else None,
-        openapi_url="/api/openapi.json" if config.enable_docs else None
+        openapi_url="/api/openapi.json" if config.enable_docs else None,
+
+        lifespan=lifespan
     )
 
-    setup_middlewares(app, config.cors_settings)
-    setup_services(config.jwt_settings, config.issue_tracker_settings)
+    setup_middlewares(app, config.cors_settings, config.compression_settings)
+    setup_exception_handlers(app)
+    setup_services(
+        config.jwt_settings,
+        config.issue_tracker_settings,
+        config.github_webhook_settings,
+        config.lnbits_webhook_settings,
+        config.rate_limit_settings,
+        config.admin_settings
+    )
     setup_dependencies(app)
 
     app.include_router(api.router, prefix="/api")
@@ -53,33 +216,38 @@ def get_fastapi_app(config: APIConfig) -> FastAPI:
 
 
 def get_uvicorn_log_config():
+    # Uvicorn records go to the root logger and share its queue and format
     log_config = {
         "version": 1,
         "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "()": "uvicorn.logging.DefaultFormatter",
-                "fmt": "%(asctime)s %(levelprefix)s %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-        },
-        "handlers": {
-            "default": {
-                "formatter": "default",
-                "class": "logging.StreamHandler",
-                "stream": "ext://sys.stdout",
-            },
-        },
         "loggers": {
-            "uvicorn": {"handlers": ["default"], "level": "INFO"},
-            "uvicorn.error": {"handlers": ["default"], "level": "INFO"},
-            "uvicorn.access": {"handlers": ["default"], "level": "INFO", "propagate": False},
+            "uvicorn": {"handlers": [], "propagate": True},
+            "uvicorn.error": {"handlers": [], "propagate": True},
+            "uvicorn.access": {"handlers": [], "propagate": True},
         },
     }
 
     return log_config
 
 
+class APIServer(uvicorn.Server):
+    """
+    Ends the live event streams once asked to exit,
+    uvicorn waits for the open responses to complete before shutting down.
+    """
+
+    _loop: asyncio.AbstractEventLoop | None = None
+
+    async def serve(self, sockets=None) -> None:
+        self._loop = asyncio.get_running_loop()
+        await super().serve(sockets)
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:
+        super().handle_exit(sig, frame)
+        # Runs in a signal handler, the streams are closed from the event loop
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(EventHub.close)
+
 
 async def run_api(
     host: str,
@@ -92,5 +260,5 @@ async def run_api(
         port=port,
         log_config=get_uvicorn_log_config()
     )
-    uvicorn_server = uvicorn.Server(uvicorn_config)
+    uvicorn_server = APIServer(uvicorn_config)
     await uvicorn_server.serve()
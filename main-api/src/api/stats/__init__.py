@@ -0,0 +1,4 @@
+from .router import router
+
+
+__all__ = ["router"]
@@ -0,0 +1,101 @@
+from datetime import date, datetime, timezone
+from uuid import UUID
+
+from fastapi import APIRouter, Query, status
+
+from domain.repositories.exceptions import RepositoryNotFound
+from domain.stats.schemas import RollupPeriod, TimeseriesPointSchema
+
+from ..dependencies.types import RepositoryServiceDep, StatsServiceDep
+from ..exceptions.http import BadRequestException, NotFoundException
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+
+
+router = APIRouter(tags=["Stats"])
+
+MAX_TIMESERIES_POINTS = 400
+
+
+def _validate_range(period: RollupPeriod, start: date, end: date | None) -> date:
+    """
+    :return: The end of the range, today if not passed
+    """
+    end = end if end is not None else datetime.now(timezone.utc).date()
+    if end < start:
+        raise BadRequestException(
+            detail=HTTPExceptionDetailSchema(
+                error_code=1,
+                message="end should not be before start."
+            )
+        )
+    if period.count_buckets(start, end) > MAX_TIMESERIES_POINTS:
+        raise BadRequestException(
+            detail=HTTPExceptionDetailSchema(
+                error_code=2,
+                message=f"The range should span at most {MAX_TIMESERIES_POINTS} {period.value}s."
+            )
+        )
+    return end
+
+
+@router.get(
+    "/timeseries",
+    response_model=list[TimeseriesPointSchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def get_timeseries(
+    stats_service: StatsServiceDep,
+    start: date,
+    end: date | None = None,
+    period: RollupPeriod = Query(RollupPeriod.DAY)
+):
+    """
+    Reward activity of all the repositories, one point per **period** from **start** to **end** (UTC dates).
+    **end** defaults to today. Periods without activity are zeros.
+
+    Throws
+    - **400** if the range is reversed or too long.
+    """
+    end = _validate_range(period, start, end)
+    return await stats_service.get_timeseries(period=period, start=start, end=end)
+
+
+@router.get(
+    "/timeseries/repositories/{repository_id}",
+    response_model=list[TimeseriesPointSchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def get_repository_timeseries(
+    repository_id: UUID,
+    stats_service: StatsServiceDep,
+    repository_service: RepositoryServiceDep,
+    start: date,
+    end: date | None = None,
+    period: RollupPeriod = Query(RollupPeriod.DAY)
+):
+    """
+    Reward activity of a repository, one point per **period** from **start** to **end** (UTC dates).
+    **end** defaults to today. Periods without activity are zeros.
+
+    Throws
+    - **400** if the range is reversed or too long.
+    - **404** if the repository is not found.
+    """
+    end = _validate_range(period, start, end)
+    try:
+        await repository_service.get_repository_by_id(repository_id)
+    except RepositoryNotFound as repo_not_found:
+        raise NotFoundException(
+            detail=HTTPExceptionDetailSchema.from_standard_exception(repo_not_found)
+        )
+    return await stats_service.get_timeseries(
+        period=period,
+        start=start,
+        end=end,
+        repository_id=repository_id
+    )
@@ -5,7 +5,13 @@ from fastapi import APIRouter, status, Query
 from domain.users.exceptions import UserNotFound
 from domain.users.schemas import UserSchema
 
-from ..dependencies.types import GetAuthenticatedUserDep, UserServiceDep
+from ..dependencies.types import (
+    GetAuthenticatedUserDep,
+    UserServiceDep,
+    BatchIdsQuery,
+    BatchGithubIdsQuery,
+    BatchUsernamesQuery
+)
 from ..exceptions.http import NotFoundException, BadRequestException
 from ..exceptions.schemas import HTTPExceptionDetailSchema
 
@@ -62,3 +68,39 @@ async def get_user(
         raise NotFoundException(
             detail=HTTPExceptionDetailSchema.from_standard_exception(user_not_found)
         )
+
+
+@router.get(
+    "/batch",
+    response_model=list[UserSchema],
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def get_users_batch(
+    user_service: UserServiceDep,
+    ids: BatchIdsQuery = [],
+    github_ids: BatchGithubIdsQuery = [],
+    usernames: BatchUsernamesQuery = []
+):
+    """
+    Fetches several users at once by their IDs, GitHub IDs or GitHub usernames.
+
+    Users are returned in the order of the passed values, unknown ones are skipped.
+
+    Throws
+    - **400** if not exactly one of the parameters was provided.
+    """
+    if sum(1 for values in (ids, github_ids, usernames) if values) != 1:
+        raise BadRequestException(
+            detail=HTTPExceptionDetailSchema(
+                error_code=1,
+                message="Exactly one of ids, github_ids or usernames should be provided."
+            )
+        )
+
+    if ids:
+        return await user_service.get_users_by_ids(ids)
+    if github_ids:
+        return await user_service.get_users_by_github_ids(github_ids)
+    return await user_service.get_users_by_usernames(usernames)
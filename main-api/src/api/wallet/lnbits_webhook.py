@@ -0,0 +1,21 @@
+import hmac
+
+
+class LNBitsWebhookService:
+    _secret: str | None = None
+
+    @classmethod
+    def setup(
+        cls,
+        secret: str | None
+    ) -> None:
+        cls._secret = secret
+
+    @classmethod
+    def validate(
+        cls,
+        secret: str
+    ) -> bool:
+        if cls._secret is None:
+            return False
+        return hmac.compare_digest(cls._secret, secret)
@@ -1,18 +1,28 @@
 import asyncio
+from datetime import datetime
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, status, Query, Response, Depends
 
-from domain.rewards.schemas import RewardFiltersSchema
+from domain.users.schemas import UserSchema
+from domain.wallet import WalletServiceABC
 from domain.wallet.exceptions import (
     WalletNotFound,
     CouldNotCreateInvoice,
     CouldNotPayInvoice,
-    InsufficientFunds
+    InsufficientFunds,
+    DepositNotFound
+)
+from domain.wallet.schemas import (
+    LightningTransactionSchema,
+    DepositSchema,
+    DepositStatus,
+    TransactionType,
+    WalletHistoryFiltersSchema
 )
-from domain.wallet.schemas import LightningTransactionSchema
 from infrastructure.lnbits.exceptions import (
     WalletCreationFailure,
-    InvoiceIsAlreadyPaid
+    InvoiceIsAlreadyPaid,
+    WalletAPIException
 )
 
 from .schemas import (
@@ -20,17 +30,24 @@ from .schemas import (
     DepositRequestSchema,
     WithdrawResponseSchema,
     WithdrawRequestSchema,
-    WalletDetailResponse
+    WalletDetailResponse,
+    LNBitsPaymentWebhookSchema,
+    LNBitsPaymentWebhookResponse
 )
+from .lnbits_webhook import LNBitsWebhookService
+from .utils import encode_history_cursor, decode_history_cursor
 from ..dependencies.types import (
     GetAuthenticatedUserDep,
     WalletServiceDep,
-    PaginationDep, RewardServiceDep
+    PaginationDep, RewardServiceDep,
+    IdempotentRequestDep
 )
+from ..dependencies.rate_limit import rate_limit
 from ..exceptions.http import (
     ServerErrorException,
     NotFoundException,
-    BadRequestException
+    BadRequestException,
+    UnauthorizedException
 )
 from ..exceptions.schemas import HTTPExceptionDetailSchema
 
@@ -62,12 +79,7 @@ async def get_my_wallet(
     try:
         wallet_details, reserved_sats = await asyncio.gather(
             wallet_service.get_or_create_wallet(user_id=user.id),
-            reward_service.get_total_reward(
-                RewardFiltersSchema(
-                    rewarder_id=user.id,
-                    is_closed=False
-                )
-            )
+            reward_service.get_reserved_sats(user.id)
         )
 
         return WalletDetailResponse(
@@ -89,28 +101,11 @@ async def get_my_wallet(
         )
 
 
-@router.post(
-    "/deposit",
-    response_model=DepositResponseSchema,
-    responses={
-        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
-        status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionDetailSchema},
-        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": HTTPExceptionDetailSchema}
-    }
-)
-async def deposit_sats(
-    body: DepositRequestSchema,
-    user: GetAuthenticatedUserDep,
-    wallet_service: WalletServiceDep
-):
-    """
-    Creates an incoming invoice to the wallet of the user authorized.
-
-    Throws
-    - **401** if the user is not authorized.
-    - **404** if the user's wallet not found.
-    - **500** if there was en error making the invoice.
-    """
+async def _deposit_sats(
+    user: UserSchema,
+    wallet_service: WalletServiceABC,
+    body: DepositRequestSchema
+) -> DepositResponseSchema:
     try:
         data = await wallet_service.create_incoming_invoice(
                 wallet_owner_id=user.id,
@@ -131,29 +126,51 @@ async def deposit_sats(
 
 
 @router.post(
-    "/withdraw",
-    response_model=WithdrawResponseSchema,
+    "/deposit",
+    dependencies=[Depends(rate_limit("wallet_deposit"))],
+    response_model=DepositResponseSchema,
     responses={
         status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
         status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionDetailSchema},
-        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema},
-        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": HTTPExceptionDetailSchema}
+        status.HTTP_409_CONFLICT: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HTTPExceptionDetailSchema}
     }
 )
-async def withdraw_sats(
-    body: WithdrawRequestSchema,
+async def deposit_sats(
+    body: DepositRequestSchema,
     user: GetAuthenticatedUserDep,
-    wallet_service: WalletServiceDep
+    wallet_service: WalletServiceDep,
+    idempotent_request: IdempotentRequestDep
 ):
     """
-    Pays the invoice passed from the authorized user's wallet.
+    Creates an incoming invoice to the wallet of the user authorized.
+
+    If the **Idempotency-Key** header is passed, retries with the same key get the same invoice.
 
     Throws
-    - **400** if there's not enough funds to pay the invoice or the invoice has been already paid.
     - **401** if the user is not authorized.
     - **404** if the user's wallet not found.
-    - **500** if there was en error paying the invoice.
+    - **409** if a request with the same idempotency key is still in progress.
+    - **422** if the idempotency key was used for a different request.
+    - **429** if the user or all users together make too many deposits.
+    - **500** if there was en error making the invoice.
+    - **503** if the wallet API is overloaded.
     """
+    return await idempotent_request.execute(
+        user_id=user.id,
+        payload=body,
+        handler=lambda: _deposit_sats(user, wallet_service, body)
+    )
+
+
+async def _withdraw_sats(
+    user: UserSchema,
+    wallet_service: WalletServiceABC,
+    body: WithdrawRequestSchema
+) -> WithdrawResponseSchema:
     try:
         await wallet_service.pay_invoice(
             payer_id=user.id,
@@ -181,23 +198,166 @@ async def withdraw_sats(
     )
 
 
+@router.post(
+    "/withdraw",
+    dependencies=[Depends(rate_limit("wallet_withdraw"))],
+    response_model=WithdrawResponseSchema,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_409_CONFLICT: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_429_TOO_MANY_REQUESTS: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_500_INTERNAL_SERVER_ERROR: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def withdraw_sats(
+    body: WithdrawRequestSchema,
+    user: GetAuthenticatedUserDep,
+    wallet_service: WalletServiceDep,
+    idempotent_request: IdempotentRequestDep
+):
+    """
+    Pays the invoice passed from the authorized user's wallet.
+
+    If the **Idempotency-Key** header is passed, retries with the same key get the stored response
+    and the invoice is paid only once.
+
+    Throws
+    - **400** if there's not enough funds to pay the invoice or the invoice has been already paid.
+    - **401** if the user is not authorized.
+    - **404** if the user's wallet not found.
+    - **409** if a request with the same idempotency key is still in progress.
+    - **422** if the idempotency key was used for a different request.
+    - **429** if the user or all users together make too many withdrawals.
+    - **500** if there was en error paying the invoice.
+    - **503** if the wallet API is overloaded.
+    """
+    return await idempotent_request.execute(
+        user_id=user.id,
+        payload=body,
+        handler=lambda: _withdraw_sats(user, wallet_service, body)
+    )
+
+
 @router.get(
     "/history",
     response_model=list[LightningTransactionSchema],
     responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema},
         status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
         status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionDetailSchema}
     }
 )
 async def get_wallet_history(
+    response: Response,
     user: GetAuthenticatedUserDep,
     wallet_service: WalletServiceDep,
-    pagination: PaginationDep
+    pagination: PaginationDep,
+    cursor: str | None = Query(None),
+    type: TransactionType | None = Query(None),
+    since: datetime | None = Query(None),
+    until: datetime | None = Query(None)
 ):
+    """
+    Lists the wallet transactions of the user authorized, newest first.
+    The transactions are served from the local mirror of the wallet history.
+
+    If the page is full, the **X-Next-Cursor** header holds the cursor to fetch the next page with.
+    **skip** is ignored if **cursor** is passed.
+
+    Throws
+    - **400** if the cursor is malformed.
+    - **401** if the user is not authorized.
+    - **404** if the user's wallet not found.
+    """
+    history_cursor = None
+    if cursor is not None:
+        history_cursor = decode_history_cursor(cursor)
+        if history_cursor is None:
+            raise BadRequestException(detail=HTTPExceptionDetailSchema(
+                error_code=1,
+                message="Invalid cursor."
+            ))
+
     try:
-        return await wallet_service.get_wallet_history(
+        transactions = await wallet_service.get_wallet_history(
             user_id=user.id,
-            pagination=pagination
+            pagination=pagination,
+            filters=WalletHistoryFiltersSchema(type=type, since=since, until=until),
+            cursor=history_cursor
         )
     except WalletNotFound as wallet_not_found:
         raise NotFoundException(detail=HTTPExceptionDetailSchema.from_standard_exception(wallet_not_found))
+
+    if transactions and len(transactions) == pagination.limit:
+        response.headers["X-Next-Cursor"] = encode_history_cursor(transactions[-1])
+    return transactions
+
+
+@router.get(
+    "/deposits/{checking_id}",
+    response_model=DepositSchema,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_404_NOT_FOUND: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def get_deposit(
+    checking_id: str,
+    user: GetAuthenticatedUserDep,
+    wallet_service: WalletServiceDep,
+    wait: int = Query(0, ge=0, le=30)
+):
+    """
+    Fetches the status of a deposit made by the authorized user.
+    The status is served from the database, the wallet API is not queried.
+
+    If **wait** is passed and the deposit is pending, the request is held
+    for up to **wait** seconds until the deposit is settled.
+
+    Throws
+    - **401** if the user is not authorized.
+    - **404** if the deposit not found.
+    """
+    try:
+        if wait:
+            return await wallet_service.wait_for_deposit(user.id, checking_id, timeout=wait)
+        return await wallet_service.get_deposit(user.id, checking_id)
+    except DepositNotFound as deposit_not_found:
+        raise NotFoundException(detail=HTTPExceptionDetailSchema.from_standard_exception(deposit_not_found))
+
+
+@router.post(
+    "/deposits/lnbits-webhook",
+    include_in_schema=False,  # Called by LNBits only
+    response_model=LNBitsPaymentWebhookResponse,
+    responses={
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HTTPExceptionDetailSchema}
+    }
+)
+async def lnbits_payment_webhook(
+    body: LNBitsPaymentWebhookSchema,
+    wallet_service: WalletServiceDep,
+    secret: str = Query()
+):
+    if not LNBitsWebhookService.validate(secret):
+        raise UnauthorizedException(detail=HTTPExceptionDetailSchema(
+            error_code=1,
+            message="Invalid webhook secret."
+        ))
+
+    try:
+        deposit = await wallet_service.settle_deposit(body.checking_id)
+    except WalletAPIException as wallet_api_exception:
+        raise ServerErrorException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=HTTPExceptionDetailSchema.from_standard_exception(wallet_api_exception)
+        )
+
+    return LNBitsPaymentWebhookResponse(
+        settled=deposit is not None and deposit.status == DepositStatus.PAID
+    )
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict, AliasChoices
 
 
 class DepositRequestSchema(BaseModel):
@@ -24,3 +24,17 @@ class WalletDetailResponse(BaseModel):
     user_id: UUID
     free_sats: int
     in_rewards: int
+
+
+class LNBitsPaymentWebhookSchema(BaseModel):
+    """
+    Payment data LNBits sends to the invoice webhook. Only the checking ID is used,
+    the payment status is always re-checked with LNBits.
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    checking_id: str = Field(..., validation_alias=AliasChoices("checking_id", "payment_hash"))
+
+
+class LNBitsPaymentWebhookResponse(BaseModel):
+    settled: bool
@@ -0,0 +1,24 @@
+import base64
+import binascii
+
+from domain.wallet.schemas import LightningTransactionSchema, WalletHistoryCursorSchema
+
+
+def encode_history_cursor(transaction: LightningTransactionSchema) -> str:
+    """
+    Builds an opaque cursor pointing right after the transaction passed.
+    """
+    raw = f"{transaction.time}:{transaction.checking_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_history_cursor(cursor: str) -> WalletHistoryCursorSchema | None:
+    """
+    :return: None if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        time, checking_id = raw.split(":", 1)
+        return WalletHistoryCursorSchema(time=int(time), checking_id=checking_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
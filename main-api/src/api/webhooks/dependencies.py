@@ -0,0 +1,31 @@
+from typing import Annotated
+
+from fastapi import Header, Request
+
+from api.exceptions.http import UnauthorizedException
+from api.exceptions.schemas import HTTPExceptionDetailSchema
+
+from .signature import GithubWebhookSignatureService
+
+
+async def validate_github_signature(
+    request: Request,
+    x_hub_signature_256: Annotated[str | None, Header()] = None
+) -> None:
+    if not GithubWebhookSignatureService.is_configured():
+        raise UnauthorizedException(detail=HTTPExceptionDetailSchema(
+            error_code=1,
+            message="GitHub webhooks are not configured."
+        ))
+
+    if x_hub_signature_256 is None:
+        raise UnauthorizedException(detail=HTTPExceptionDetailSchema(
+            error_code=2,
+            message="No signature provided."
+        ))
+
+    if not GithubWebhookSignatureService.validate(await request.body(), x_hub_signature_256):
+        raise UnauthorizedException(detail=HTTPExceptionDetailSchema(
+            error_code=3,
+            message="Invalid signature."
+        ))
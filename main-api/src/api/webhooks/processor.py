@@ -0,0 +1,191 @@
+import asyncio
+import logging
+from typing import Any
+
+from domain.issues import IssueServiceABC
+from domain.issues.exceptions import IssueNotFound
+from domain.issues.schemas import UpdateIssueDetailsSchema
+from domain.rewards import RewardServiceABC
+from domain.rewards.exceptions import NothingToRewardFor, IssueIsClosed
+from domain.rewards.schemas import ContributorSchema, IssueIdentifierSchema
+from domain.webhooks import WebhookServiceABC
+from domain.webhooks.schemas import WebhookDeliverySchema
+from infrastructure.github.schemas import GithubPullRequestSchema
+from infrastructure.tracing import Tracer, SpanContext
+
+from ..rewards.utils import pull_request_is_valid_for_reward, extract_issue_numbers_from_pull_request
+
+
+RELEVANT_EVENTS: dict[str, set[str]] = {
+    "pull_request": {"closed"},
+    "issues": {"edited", "closed"}
+}
+
+
+def is_relevant_event(event: str, payload: dict[str, Any]) -> bool:
+    """
+    Checks if the delivery has to be processed.
+    Only merged pull requests and edited or closed issues are relevant.
+    """
+    if payload.get("action") not in RELEVANT_EVENTS.get(event, set()):
+        return False
+
+    if event == "pull_request":
+        return bool(payload.get("pull_request", {}).get("merged"))
+
+    return True
+
+
+class GithubWebhookProcessor:
+    """
+    Processes stored GitHub webhook deliveries in the background.
+
+    Deliveries are persisted before they are enqueued, so the in-memory queue is only a fast path:
+    anything that doesn't fit into the queue or is lost on restart is picked up by the periodic sweep.
+    """
+
+    _webhook_service: WebhookServiceABC
+    _reward_service: RewardServiceABC
+    _issue_service: IssueServiceABC
+
+    # Delivery IDs with the context of the request that received them
+    _queue: asyncio.Queue[tuple[str, SpanContext | None]] | None = None
+    _tasks: list[asyncio.Task] = []
+
+    _sweep_interval: float = 60
+    _sweep_batch_size: int = 50
+
+    @classmethod
+    def setup(
+        cls,
+        webhook_service: WebhookServiceABC,
+        reward_service: RewardServiceABC,
+        issue_service: IssueServiceABC,
+        queue_size: int = 1000,
+        sweep_interval: float = 60,
+        sweep_batch_size: int = 50
+    ) -> None:
+        cls._webhook_service = webhook_service
+        cls._reward_service = reward_service
+        cls._issue_service = issue_service
+        cls._queue = asyncio.Queue(maxsize=queue_size)
+        cls._sweep_interval = sweep_interval
+        cls._sweep_batch_size = sweep_batch_size
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._tasks = [
+            asyncio.create_task(cls._consume_queue()),
+            asyncio.create_task(cls._sweep_periodically())
+        ]
+
+    @classmethod
+    async def stop(cls) -> None:
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+
+    @classmethod
+    def enqueue(cls, delivery_id: str) -> bool:
+        """
+        Schedules a stored delivery for processing.
+        :param delivery_id: GitHub delivery ID
+        :return: False if the queue is full and the delivery is left for the sweep
+        """
+        if cls._queue is None:
+            return False
+        try:
+            cls._queue.put_nowait((delivery_id, Tracer.get_current_context()))
+            return True
+        except asyncio.QueueFull:
+            logging.warning("Webhook queue is full, delivery %s is left for the sweep", delivery_id)
+            return False
+
+    @classmethod
+    async def _consume_queue(cls) -> None:
+        while True:
+            delivery_id, request_context = await cls._queue.get()
+            try:
+                # Continues the trace of the webhook request
+                with Tracer.start_span("webhook delivery", attributes={"delivery_id": delivery_id}, parent=request_context):
+                    delivery = await cls._webhook_service.claim_delivery(delivery_id)
+                    if delivery is not None:
+                        await cls._process(delivery)
+            except Exception as e:
+                logging.exception("Could not process webhook delivery %s: %r", delivery_id, e)
+            finally:
+                cls._queue.task_done()
+
+    @classmethod
+    async def _sweep_periodically(cls) -> None:
+        while True:
+            try:
+                for delivery in await cls._webhook_service.claim_pending_deliveries(cls._sweep_batch_size):
+                    await cls._process(delivery)
+            except Exception as e:
+                logging.exception("Webhook sweep failed: %r", e)
+            await asyncio.sleep(cls._sweep_interval)
+
+    @classmethod
+    async def _process(cls, delivery: WebhookDeliverySchema) -> None:
+        try:
+            if delivery.event == "pull_request":
+                await cls._process_merged_pull_request(delivery.payload)
+            elif delivery.event == "issues":
+                await cls._process_issue_change(delivery.payload)
+        except Exception as e:
+            logging.exception("Webhook delivery %s failed: %r", delivery.delivery_id, e)
+            await cls._webhook_service.fail_delivery(delivery, repr(e))
+            return
+
+        await cls._webhook_service.complete_delivery(delivery.delivery_id)
+
+    @classmethod
+    async def _process_merged_pull_request(cls, payload: dict[str, Any]) -> None:
+        pull_request = GithubPullRequestSchema.from_api(payload["pull_request"])
+        if not pull_request_is_valid_for_reward(pull_request):
+            return
+
+        # Commits are not part of the payload, so only the pull request body is scanned for linked issues.
+        # Issues linked in commit messages only can still be claimed through /rewards/check-pull.
+        issue_numbers = extract_issue_numbers_from_pull_request(pull_request, commits=[])
+        contributor = ContributorSchema(
+            github_id=pull_request.user.id,
+            github_username=pull_request.user.login,
+            avatar_url=pull_request.user.avatar_url
+        )
+
+        results = await asyncio.gather(
+            *[
+                cls._reward_service.reward_contributor(
+                    contributor=contributor,
+                    issue_identifier=IssueIdentifierSchema(
+                        repo_full_name=pull_request.base.repo.full_name,
+                        issue_number=issue_number
+                    )
+                ) for issue_number in issue_numbers
+            ],
+            return_exceptions=True
+        )
+        # Issues without rewards are skipped. Any other failure fails the delivery so it's retried,
+        # the issues already claimed are not paid out again.
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, (NothingToRewardFor, IssueIsClosed)):
+                raise result
+
+    @classmethod
+    async def _process_issue_change(cls, payload: dict[str, Any]) -> None:
+        issue = payload["issue"]
+        try:
+            await cls._issue_service.update_issue_details(
+                github_id=issue["id"],
+                schema=UpdateIssueDetailsSchema(
+                    title=issue["title"],
+                    body=issue.get("body"),
+                    html_url=issue.get("html_url")
+                )
+            )
+        except IssueNotFound:
+            # The issue has no rewards, nothing to keep in sync
+            pass
@@ -0,0 +1,70 @@
+import json
+
+from fastapi import APIRouter, status, Depends, Header, Request
+
+from domain.webhooks.schemas import CreateWebhookDeliverySchema
+
+from .dependencies import validate_github_signature
+from .processor import GithubWebhookProcessor, is_relevant_event
+from .schemas import WebhookReceivedResponse
+from ..dependencies.types import WebhookServiceDep
+from ..exceptions.http import BadRequestException
+from ..exceptions.schemas import HTTPExceptionDetailSchema
+
+
+router = APIRouter(tags=["Webhooks"])
+
+
+@router.post(
+    "/github",
+    include_in_schema=False,
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=WebhookReceivedResponse,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"model": HTTPExceptionDetailSchema},
+        status.HTTP_401_UNAUTHORIZED: {"model": HTTPExceptionDetailSchema}
+    },
+    dependencies=[Depends(validate_github_signature)]
+)
+async def receive_github_webhook(
+    request: Request,
+    webhook_service: WebhookServiceDep,
+    x_github_event: str = Header(),
+    x_github_delivery: str = Header()
+):
+    """
+    Receives GitHub webhook deliveries.
+    Merged pull requests and edited or closed issues are stored and processed asynchronously,
+    other events are acknowledged and dropped. Redelivered events are deduplicated by the delivery ID.
+    The webhook has to be configured with the *application/json* content type.
+
+    Throws
+    - **400** if the payload is not valid JSON.
+    - **401** if the signature is missing or invalid.
+    """
+    try:
+        payload = json.loads(await request.body())
+    except ValueError:
+        payload = None
+
+    if not isinstance(payload, dict):
+        raise BadRequestException(detail=HTTPExceptionDetailSchema(
+            error_code=1,
+            message="Invalid payload."
+        ))
+
+    if not is_relevant_event(x_github_event, payload):
+        return WebhookReceivedResponse(delivery_id=x_github_delivery, queued=False, duplicate=False)
+
+    is_new = await webhook_service.register_delivery(
+        CreateWebhookDeliverySchema(
+            delivery_id=x_github_delivery,
+            event=x_github_event,
+            action=payload.get("action"),
+            payload=payload
+        )
+    )
+    if is_new:
+        GithubWebhookProcessor.enqueue(x_github_delivery)
+
+    return WebhookReceivedResponse(delivery_id=x_github_delivery, queued=is_new, duplicate=not is_new)
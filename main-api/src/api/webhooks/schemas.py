@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class WebhookReceivedResponse(BaseModel):
+    delivery_id: str
+    queued: bool
+    duplicate: bool
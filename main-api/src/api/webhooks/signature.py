@@ -0,0 +1,35 @@
+import hashlib
+import hmac
+
+
+class GithubWebhookSignatureService:
+    _secret: bytes | None = None
+
+    @classmethod
+    def setup(
+        cls,
+        secret: str | None
+    ) -> None:
+        cls._secret = secret.encode() if secret else None
+
+    @classmethod
+    def is_configured(cls) -> bool:
+        return cls._secret is not None
+
+    @classmethod
+    def validate(
+        cls,
+        body: bytes,
+        signature: str
+    ) -> bool:
+        """
+        Validates the **X-Hub-Signature-256** header against the raw request body.
+        :param body: Raw request body
+        :param signature: Header value in the 'sha256={hex digest}' format
+        :return: True if the signature is valid
+        """
+        if cls._secret is None:
+            return False
+
+        expected = "sha256=" + hmac.new(cls._secret, body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
@@ -1,23 +1,30 @@
-import logging
+import json
 import os
 import uuid
 
 import dotenv
 
-
-dotenv.load_dotenv()
+from infrastructure.logs import setup_logging
 
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s %(levelname)s: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+dotenv.load_dotenv()
 
 # TODO: Check required values
 
 DEBUG: bool = bool(int(os.getenv("DEBUG", False)))
 
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
+LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json or text
+LOG_LEVELS: dict = json.loads(os.getenv("LOG_LEVELS", "{}"))  # Overrides the level by logger name
+LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1"))  # Share of the debug records kept
+
+setup_logging(
+    level=LOG_LEVEL,
+    log_format=LOG_FORMAT,
+    levels=LOG_LEVELS,
+    debug_sample_rate=LOG_DEBUG_SAMPLE_RATE
+)
+
 APP_HOST: str = os.getenv("APP_HOST", "127.0.0.1")
 APP_PORT: int = int(os.getenv("APP_PORT", "8000"))
 
@@ -26,14 +33,53 @@ DB_PORT: int = int(os.getenv("DB_PORT", "5432"))
 DB_USER: str = os.getenv("DB_USER", "postgres")
 DB_PASSWORD: str = os.getenv("DB_PASSWORD", "postgres")
 DB_DATABASE: str = os.getenv("DB_DATABASE", "postgres")
+DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))  # Connections opened at startup
 
 GITHUB_CLIENT_ID: str = os.getenv("GITHUB_CLIENT_ID")
 GITHUB_CLIENT_SECRET: str = os.getenv("GITHUB_CLIENT_SECRET")
+GITHUB_TIMEOUT: float = float(os.getenv("GITHUB_TIMEOUT", "10"))
+GITHUB_APP_TOKENS: list[str] = [  # Comma-separated tokens used for public reads when a user's rate limit runs out
+    token.strip() for token in os.getenv("GITHUB_APP_TOKENS", "").split(",") if token.strip()
+]
+GITHUB_RATE_LIMIT_RESERVE: int = int(os.getenv("GITHUB_RATE_LIMIT_RESERVE", "100"))  # Kept for interactive requests
+GITHUB_MAX_DEFER: float = float(os.getenv("GITHUB_MAX_DEFER", "5"))
 
 JWT_ACCESS_TOKEN_SECRET = os.getenv("JWT_ACCESS_TOKEN_SECRET", uuid.uuid4().hex)  # Random if not specified
 ISSUE_TRACKER_SECRET = os.getenv("ISSUE_TRACKER_SECRET")
+GITHUB_WEBHOOK_SECRET = os.getenv("GITHUB_WEBHOOK_SECRET")
 
 LIGHTNING_BASE_URL: str = os.getenv("LIGHTNING_BASE_URL")
+LNBITS_WEBHOOK_SECRET = os.getenv("LNBITS_WEBHOOK_SECRET")
+LNBITS_MAX_CONCURRENCY: int = int(os.getenv("LNBITS_MAX_CONCURRENCY", "10"))
+LNBITS_ADMISSION_TIMEOUT: float = float(os.getenv("LNBITS_ADMISSION_TIMEOUT", "1"))
+LNBITS_TIMEOUT: float = float(os.getenv("LNBITS_TIMEOUT", "10"))
+LNBITS_PAYMENT_TIMEOUT: float = float(os.getenv("LNBITS_PAYMENT_TIMEOUT", "60"))  # Outgoing payments may take a while
+
+RATE_LIMIT_ENABLED: bool = bool(int(os.getenv("RATE_LIMIT_ENABLED", True)))
+RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMITS: dict = json.loads(os.getenv("RATE_LIMITS", "{}"))  # Overrides the default limits by route scope
+
+ADMIN_GITHUB_IDS: list[int] = [  # Comma-separated GitHub IDs of the users with admin access
+    int(github_id) for github_id in os.getenv("ADMIN_GITHUB_IDS", "").split(",") if github_id.strip()
+]
+
+API_PUBLIC_URL = os.getenv("API_PUBLIC_URL")  # Used to build webhook URLs for external services
 
 BRANTA_API_KEY: str = os.getenv("BRANTA_API_KEY", "")
 BRANTA_BASE_URL: str = os.getenv("BRANTA_BASE_URL", "")
+BRANTA_TIMEOUT: float = float(os.getenv("BRANTA_TIMEOUT", "5"))
+
+TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")  # none, file or otlp
+TRACING_FILE_PATH: str = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+TRACING_OTLP_ENDPOINT: str = os.getenv("TRACING_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces")
+TRACING_SAMPLE_RATE: float = float(os.getenv("TRACING_SAMPLE_RATE", "1"))  # Share of the new traces recorded
+
+CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")  # memory (per instance) or redis (shared)
+CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0")
+CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))  # Used by the memory backend
+
+COMPRESSION_ENABLED: bool = bool(int(os.getenv("COMPRESSION_ENABLED", True)))
+COMPRESSION_MINIMUM_SIZE: int = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))  # Smaller responses are sent as is
+COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_CACHE_TTL: float = float(os.getenv("COMPRESSION_CACHE_TTL", "300"))  # 0 disables the compressed bodies cache
@@ -0,0 +1,6 @@
+from .service import EscrowServiceABC
+
+
+__all__ = [
+    "EscrowServiceABC"
+]
@@ -0,0 +1,32 @@
+from enum import StrEnum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class EscrowDiscrepancyKind(StrEnum):
+    BALANCE_MISMATCH = "balance_mismatch"
+    UNDRAINED_CLOSED_ISSUE = "undrained_closed_issue"
+    BALANCE_FETCH_FAILED = "balance_fetch_failed"
+
+
+class EscrowDiscrepancySchema(BaseModel):
+    """
+    **expected_sats**: Sum of the issue rewards if it's open, 0 if it's closed
+
+    **actual_sats**: Wallet balance in LNBits, None if it couldn't be fetched
+    """
+    issue_id: UUID
+    wallet_id: str
+    kind: EscrowDiscrepancyKind
+    expected_sats: int
+    actual_sats: int | None = None
+
+
+class EscrowReconciliationReportSchema(BaseModel):
+    """
+    **checked_wallets**: Number of issue wallets compared against the database
+    """
+    run_id: UUID
+    checked_wallets: int
+    discrepancies: list[EscrowDiscrepancySchema]
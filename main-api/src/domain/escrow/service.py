@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+from .schemas import EscrowReconciliationReportSchema
+
+
+class EscrowServiceABC(ABC):
+
+    @abstractmethod
+    async def reconcile_escrow(self, chunk_size: int, concurrency: int) -> EscrowReconciliationReportSchema:
+        """
+        Compares the balance of every issue wallet with the rewards stored for the issue
+        and records the discrepancies found.
+        A wallet is reported only if it's still inconsistent when checked again,
+        so rewards created or claimed during the check aren't reported as mismatches.
+        :param chunk_size: Number of wallets loaded from the database at a time
+        :param concurrency: Max number of concurrent LNBits balance requests
+        :return: Report of the reconciliation run
+        """
+        raise NotImplementedError
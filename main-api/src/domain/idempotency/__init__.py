@@ -0,0 +1,6 @@
+from .service import IdempotencyServiceABC
+
+
+__all__ = [
+    "IdempotencyServiceABC"
+]
@@ -0,0 +1,16 @@
+from domain.common.exceptions import DomainException
+
+
+class IdempotencyException(DomainException):
+    """Base class for idempotency exceptions"""
+    pass
+
+
+class IdempotencyKeyReused(IdempotencyException):
+    """The key was already used for a request with different parameters"""
+    pass
+
+
+class RequestInProgress(IdempotencyException):
+    """A request with the same key is still being executed"""
+    pass
@@ -0,0 +1,29 @@
+from enum import StrEnum
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class IdempotencyKeyStatus(StrEnum):
+    IN_PROGRESS = "in_progress"
+    # Executed, but the final response couldn't be stored yet
+    HELD = "held"
+    COMPLETED = "completed"
+
+
+class IdempotentRequestSchema(BaseModel):
+    """
+    **endpoint**: Method and path of the request
+
+    **fingerprint**: Hash of the request parameters
+    """
+    user_id: UUID
+    key: str = Field(..., max_length=255)
+    endpoint: str = Field(..., max_length=255)
+    fingerprint: str = Field(..., max_length=64)
+
+
+class IdempotentResponseSchema(BaseModel):
+    status_code: int
+    body: Any
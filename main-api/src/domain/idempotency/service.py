@@ -0,0 +1,59 @@
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from .schemas import IdempotentRequestSchema, IdempotentResponseSchema
+
+
+class IdempotencyServiceABC(ABC):
+
+    @abstractmethod
+    async def begin_request(self, request: IdempotentRequestSchema) -> IdempotentResponseSchema | None:
+        """
+        Reserves the idempotency key for the request.
+
+        If the key was used for a different request, raises **IdempotencyKeyReused**.
+        If a request with the same key is being executed, raises **RequestInProgress**.
+        :param request: Request identification
+        :return: The stored response if the request was completed before,
+        None if the request has to be executed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete_request(self, user_id: UUID, key: str, response: IdempotentResponseSchema) -> None:
+        """
+        Stores the final response of the request, so the retries get it without executing the request again.
+        :param user_id: Internal ID of the user who made the request
+        :param key: Idempotency key
+        :param response: Final response
+        :return:
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def hold_request(self, user_id: UUID, key: str) -> None:
+        """
+        Keeps the key of an executed request whose response couldn't be stored locked until it expires,
+        so it's never taken over and executed again. Storing the response later replaces the hold.
+        :param user_id: Internal ID of the user who made the request
+        :param key: Idempotency key
+        :return:
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release_request(self, user_id: UUID, key: str) -> None:
+        """
+        Frees the key of a request that failed without a final response, so it can be retried.
+        :param user_id: Internal ID of the user who made the request
+        :param key: Idempotency key
+        :return:
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_expired_keys(self) -> int:
+        """
+        :return: Number of keys deleted
+        """
+        raise NotImplementedError
@@ -3,7 +3,13 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
-from domain.common.schemas import IdentifiableSchema, TimestampedSchema, RepositoryData, UserData
+from domain.common.schemas import (
+    IdentifiableSchema,
+    TimestampedSchema,
+    RepositoryData,
+    UserData,
+    UpdateSchema
+)
 
 
 class IssueFiltersSchema(BaseModel):
@@ -40,3 +46,12 @@ class IssueExpandedSchema(IssueSchema):
 
     total_rewards: int
     total_reward_sats: int
+
+
+class UpdateIssueDetailsSchema(UpdateSchema):
+    """
+    Issue details mirrored from GitHub.
+    """
+    title: str | None = None
+    body: str | None = None
+    html_url: str | None = None
@@ -1,9 +1,16 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator
 from uuid import UUID
 
 from domain.common.schemas import PaginationSchema
 
-from .schemas import IssueSchema, IssueFiltersSchema, IssueExpandedSchema
+from .schemas import (
+    IssueSchema,
+    IssueFiltersSchema,
+    IssueExpandedSchema,
+    UpdateIssueDetailsSchema
+)
 
 
 class IssueServiceABC(ABC):
@@ -20,8 +27,24 @@ class IssueServiceABC(ABC):
     async def list_issues_expanded(
         self,
         pagination: PaginationSchema,
-        filters: IssueFiltersSchema | None = None
+        filters: IssueFiltersSchema | None = None,
+        fields: set[str] | None = None
     ) -> list[IssueExpandedSchema]:
+        """
+        :param pagination:
+        :param filters:
+        :param fields: Fields to load, all of them if not passed. The others are left unset.
+        :return: List of the issues
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_issues_expanded(self, since: datetime | None = None) -> AsyncIterator[IssueExpandedSchema]:
+        """
+        Streams all the issues modified since the passed time, the oldest first.
+        :param since: Exports everything if not passed
+        :return: Async iterator of the issues
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -48,3 +71,26 @@ class IssueServiceABC(ABC):
         :return: IssueSchema
         """
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_issues_by_ids_expanded(self, issue_ids: list[UUID]) -> list[IssueExpandedSchema]:
+        """
+        Fetches several issues at once, in the order of the passed IDs. Unknown IDs are skipped.
+        :param issue_ids:
+        :return: list[IssueExpandedSchema]
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_issues_by_github_ids_expanded(self, github_ids: list[int]) -> list[IssueExpandedSchema]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update_issue_details(self, github_id: int, schema: UpdateIssueDetailsSchema) -> IssueSchema:
+        """
+        Updates the details of a tracked issue by its GitHub ID. Throws **IssueNotFound** if the issue is not tracked.
+        :param github_id: GitHub ID of the issue
+        :param schema: New issue details
+        :return: IssueSchema
+        """
+        raise NotImplementedError
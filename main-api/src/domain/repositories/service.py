@@ -15,11 +15,28 @@ class RepositoryServiceABC(ABC):
     ) -> RepositorySchema:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_repositories_by_ids(self, repository_ids: list[UUID]) -> list[RepositorySchema]:
+        """
+        Fetches several repositories at once, in the order of the passed IDs. Unknown IDs are skipped.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_repositories_by_github_ids(self, github_ids: list[int]) -> list[RepositorySchema]:
+        raise NotImplementedError
+
     @abstractmethod
     async def list_repositories(
         self,
-        pagination: PaginationSchema
+        pagination: PaginationSchema,
+        fields: set[str] | None = None
     ) -> list[RepositorySchema]:
+        """
+        :param pagination:
+        :param fields: Fields to load, all of them if not passed. The others are left unset.
+        :return: List of the repositories
+        """
         raise NotImplementedError
     
     @abstractmethod
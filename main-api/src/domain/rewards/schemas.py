@@ -1,6 +1,8 @@
+from datetime import datetime
+from enum import StrEnum
 from uuid import UUID
 
-from pydantic import Field, BaseModel
+from pydantic import Field, BaseModel, ConfigDict
 
 from domain.common.schemas import (
     IdentifiableSchema,
@@ -8,6 +10,7 @@ from domain.common.schemas import (
     UserData,
     IssueData
 )
+from .exceptions import RewardException
 
 
 class RewardFiltersSchema(BaseModel):
@@ -43,6 +46,21 @@ class CreateRewardSchema(BaseModel):
     reward_sats: int = Field(..., gt=0)
 
 
+class AddRewardSchema(BaseModel):
+    issue_id: UUID
+    reward_sats: int = Field(..., gt=0)
+
+
+class BulkRewardResultSchema(BaseModel):
+    """
+    Either the created reward or the reason it wasn't created.
+    """
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    reward: RewardSchema | None = None
+    error: RewardException | None = None
+
+
 class ContributorSchema(BaseModel):
     github_id: int
     github_username: str = Field(..., max_length=50)
@@ -58,3 +76,27 @@ class RewardCompletionSchema(BaseModel):
     issue_id: UUID
     winner_id: UUID
     total_sats: float
+
+
+
+class RewardEventType(StrEnum):
+    REWARD_CREATED = "reward_created"
+    REWARD_ADDED = "reward_added"
+    ISSUE_CLAIMED = "issue_claimed"
+
+
+class RewardEventSchema(BaseModel):
+    """
+    **reward_id**: The new reward, None for the claims
+
+    **user_id**: Rewarder of the new reward, or the winner of the claimed issue
+
+    **sats**: Sats of the new reward, or all the sats paid out for the claimed issue
+    """
+    type: RewardEventType
+    repository_id: UUID
+    issue_id: UUID
+    reward_id: UUID | None = None
+    user_id: UUID
+    sats: int
+    at: datetime
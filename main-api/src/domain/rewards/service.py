@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator
 from uuid import UUID
 
 from .schemas import (
     RewardSchema,
     CreateRewardSchema,
+    AddRewardSchema,
+    BulkRewardResultSchema,
     RewardFiltersSchema,
     RewardExpandedSchema,
     ContributorSchema,
@@ -36,6 +40,23 @@ class RewardServiceABC(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    async def create_rewards(
+        self,
+        author_id: UUID,
+        rewards: list[CreateRewardSchema | AddRewardSchema]
+    ) -> list[BulkRewardResultSchema]:
+        """
+        Adds rewards to several issues in a single transaction.
+
+        Rewards for unknown or closed issues are skipped and reported in the results.
+        The sats for all the other rewards are reserved together or not at all.
+        :param author_id: Rewarder user id.
+        :param rewards: Rewards for new issues or the already existing ones.
+        :return: Result for each passed reward, in the same order
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def list_rewards(
         self,
@@ -48,8 +69,24 @@ class RewardServiceABC(ABC):
     async def list_rewards_expanded(
             self,
             pagination: PaginationSchema | None = None,
-            filters: RewardFiltersSchema | None = None
+            filters: RewardFiltersSchema | None = None,
+            fields: set[str] | None = None
     ) -> list[RewardExpandedSchema]:
+        """
+        :param pagination:
+        :param filters:
+        :param fields: Fields to load, all of them if not passed. The others are left unset.
+        :return: List of the rewards
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def export_rewards_expanded(self, since: datetime | None = None) -> AsyncIterator[RewardExpandedSchema]:
+        """
+        Streams all the rewards modified since the passed time, the oldest first.
+        :param since: Exports everything if not passed
+        :return: Async iterator of the rewards
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -83,3 +120,19 @@ class RewardServiceABC(ABC):
         filters: RewardFiltersSchema | None = None
     ) -> int:
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_reserved_sats(self, user_id: UUID) -> int:
+        """
+        :param user_id:
+        :return: Sats reserved by the rewards of the user on the open issues
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def verify_reserved_sats(self) -> int:
+        """
+        Compares the reserved sats of all the users with their rewards and corrects the ones that drifted.
+        :return: Number of corrected users
+        """
+        raise NotImplementedError
@@ -0,0 +1,6 @@
+from .service import StatsServiceABC
+
+
+__all__ = [
+    "StatsServiceABC"
+]
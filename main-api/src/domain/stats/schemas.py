@@ -0,0 +1,57 @@
+from datetime import date, timedelta
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+class RollupPeriod(StrEnum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+    def get_bucket_start(self, day: date) -> date:
+        """
+        :return: First day of the bucket containing **day**, weeks start on Monday
+        """
+        if self == RollupPeriod.DAY:
+            return day
+        if self == RollupPeriod.WEEK:
+            return day - timedelta(days=day.weekday())
+        return day.replace(day=1)
+
+    def count_buckets(self, start: date, end: date) -> int:
+        """
+        :return: Number of buckets from the one containing **start** to the one containing **end**
+        """
+        first, last = self.get_bucket_start(start), self.get_bucket_start(end)
+        if self == RollupPeriod.DAY:
+            return (last - first).days + 1
+        if self == RollupPeriod.WEEK:
+            return (last - first).days // 7 + 1
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+
+    def get_next_bucket_start(self, bucket_start: date) -> date:
+        if self == RollupPeriod.DAY:
+            return bucket_start + timedelta(days=1)
+        if self == RollupPeriod.WEEK:
+            return bucket_start + timedelta(weeks=1)
+        if bucket_start.month == 12:
+            return bucket_start.replace(year=bucket_start.year + 1, month=1)
+        return bucket_start.replace(month=bucket_start.month + 1)
+
+
+class TimeseriesPointSchema(BaseModel):
+    """
+    **sats_pledged**: Sats of the rewards created in the bucket
+
+    **sats_paid_out**: Sats of the rewards of the issues claimed in the bucket
+
+    **issues_funded**: Number of issues that got their first reward in the bucket
+
+    **active_funders**: Number of distinct users who created rewards in the bucket
+    """
+    bucket_start: date
+    sats_pledged: int = 0
+    sats_paid_out: int = 0
+    issues_funded: int = 0
+    active_funders: int = 0
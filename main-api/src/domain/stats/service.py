@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from datetime import date
+from uuid import UUID
+
+from .schemas import RollupPeriod, TimeseriesPointSchema
+
+
+class StatsServiceABC(ABC):
+
+    @abstractmethod
+    async def get_timeseries(
+        self,
+        period: RollupPeriod,
+        start: date,
+        end: date,
+        repository_id: UUID | None = None
+    ) -> list[TimeseriesPointSchema]:
+        """
+        :param period: Size of the buckets
+        :param start: Day in the first bucket
+        :param end: Day in the last bucket
+        :param repository_id: Repository the rewards are counted for, all of them if not passed
+        :return: One point per bucket, the oldest first. Buckets without activity are zeros
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def rebuild_rollups(self) -> None:
+        """
+        Recomputes all the rollups from the rewards and the claimed issues.
+        The rewards and claims made meanwhile wait for the rebuild to complete.
+        """
+        raise NotImplementedError
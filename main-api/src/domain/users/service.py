@@ -33,6 +33,23 @@ class UserServiceABC(ABC):
     async def get_user_by_username(self, username: str) -> UserSchema:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_users_by_ids(self, user_ids: list[UUID]) -> list[UserSchema]:
+        """
+        Fetches several users at once, in the order of the passed IDs. Unknown IDs are skipped.
+        :param user_ids:
+        :return: list[UserSchema]
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_users_by_github_ids(self, github_ids: list[int]) -> list[UserSchema]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_users_by_usernames(self, usernames: list[str]) -> list[UserSchema]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_github_id_or_create(self, github_id: int, schema: CreateUserSchema) -> UserSchema:
         raise NotImplementedError
@@ -25,4 +25,8 @@ class InsufficientFunds(WalletException):
     pass
 
 
+class DepositNotFound(WalletException):
+    pass
+
+
 # No need to add InvoiceIsAlready paid since it's not specific to the domain but only to Lightning
@@ -1,6 +1,8 @@
+from datetime import datetime
+from enum import StrEnum
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class WalletDetailSchema(BaseModel):
@@ -15,6 +17,46 @@ class LightningTransactionSchema(BaseModel):
     memo: str | None = None
     time: int
 
+
+class TransactionType(StrEnum):
+    INCOMING = "incoming"
+    OUTGOING = "outgoing"
+
+
+class WalletHistoryFiltersSchema(BaseModel):
+    """
+    **since** is inclusive, **until** is exclusive.
+    """
+    type: TransactionType | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+class WalletHistoryCursorSchema(BaseModel):
+    """
+    Position of the last transaction of the previous page.
+    """
+    time: int
+    checking_id: str
+
+
 class InvoiceCreationSchema(BaseModel):
     invoice: str
-    checking_id: str
\ No newline at end of file
+    checking_id: str
+
+
+class DepositStatus(StrEnum):
+    PENDING = "pending"
+    PAID = "paid"
+    EXPIRED = "expired"
+
+
+class DepositSchema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    checking_id: str
+    amount_sats: int
+    status: DepositStatus
+    created_at: datetime
+    expires_at: datetime
+    paid_at: datetime | None = None
@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 
-from .schemas import WalletDetailSchema, LightningTransactionSchema, InvoiceCreationSchema
+from .schemas import (
+    WalletDetailSchema,
+    LightningTransactionSchema,
+    InvoiceCreationSchema,
+    DepositSchema,
+    WalletHistoryFiltersSchema,
+    WalletHistoryCursorSchema
+)
 from ..common.schemas import PaginationSchema
 
 
@@ -34,7 +41,7 @@ class WalletServiceABC(ABC):
     @abstractmethod
     async def create_incoming_invoice(self, wallet_owner_id: UUID, amount_sats: int) -> InvoiceCreationSchema:
         """
-        Creates an incoming invoice for the wallet.
+        Creates an incoming invoice for the wallet and starts tracking its settlement.
         :param wallet_owner_id: The user ID associated with the wallet to send funds to.
         :param amount_sats: Amount of satoshis to be deposited
         :return:
@@ -55,6 +62,69 @@ class WalletServiceABC(ABC):
     async def get_wallet_history(
         self,
         user_id: UUID,
-        pagination: PaginationSchema
+        pagination: PaginationSchema,
+        filters: WalletHistoryFiltersSchema | None = None,
+        cursor: WalletHistoryCursorSchema | None = None
     ) -> list[LightningTransactionSchema]:
+        """
+        Lists the wallet transactions of the user, newest first.
+        The transactions are served from the local mirror, the wallet API is queried
+        only if the wallet history has never been synchronized.
+        If no wallet found, raises **WalletNotFound**.
+        :param user_id: Internal ID of the wallet owner
+        :param pagination: **skip** is ignored if the cursor is passed
+        :param filters: Transaction type and time range filters
+        :param cursor: Position of the last transaction of the previous page
+        :return:
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def sync_wallet_histories(self, limit: int) -> int:
+        """
+        Synchronizes the local mirror of a batch of wallet histories with the wallet API.
+        Wallets flagged as changed and never synchronized ones go first.
+        :param limit: Max number of wallets to synchronize
+        :return: Number of wallets synchronized
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_deposit(self, user_id: UUID, checking_id: str) -> DepositSchema:
+        """
+        Returns the locally recorded state of a deposit.
+        If the deposit doesn't exist or belongs to another user, raises **DepositNotFound**.
+        :param user_id: Internal ID of the deposit owner
+        :param checking_id: Checking ID of the deposit invoice
+        :return: DepositSchema
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def wait_for_deposit(self, user_id: UUID, checking_id: str, timeout: float) -> DepositSchema:
+        """
+        Works the same as **get_deposit** but waits up to **timeout** seconds for a pending deposit to be settled.
+        :param user_id: Internal ID of the deposit owner
+        :param checking_id: Checking ID of the deposit invoice
+        :param timeout: Max number of seconds to wait
+        :return: DepositSchema
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def settle_deposit(self, checking_id: str) -> DepositSchema | None:
+        """
+        Checks the deposit invoice with the wallet API and records it as paid if it's settled.
+        :param checking_id: Checking ID of the deposit invoice
+        :return: The deposit or None if it's not tracked
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def check_pending_deposits(self, limit: int) -> int:
+        """
+        Checks a batch of pending deposits with the wallet API and expires the outdated ones.
+        :param limit: Max number of deposits to check
+        :return: Number of deposits settled
+        """
         raise NotImplementedError
@@ -0,0 +1,6 @@
+from .service import WebhookServiceABC
+
+
+__all__ = [
+    "WebhookServiceABC"
+]
@@ -0,0 +1,6 @@
+from domain.common.exceptions import DomainException
+
+
+class WebhookException(DomainException):
+    """Base class for webhook exceptions"""
+    pass
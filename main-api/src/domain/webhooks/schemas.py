@@ -0,0 +1,34 @@
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from domain.common.schemas import IdentifiableSchema, TimestampedSchema
+
+
+class WebhookDeliveryStatus(StrEnum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    FAILED = "failed"
+
+
+class CreateWebhookDeliverySchema(BaseModel):
+    delivery_id: str = Field(..., max_length=64)
+    event: str = Field(..., max_length=64)
+    action: str | None = Field(None, max_length=64)
+    payload: dict[str, Any]
+
+
+class WebhookDeliverySchema(IdentifiableSchema, TimestampedSchema):
+    delivery_id: str
+    event: str
+    action: str | None = None
+    payload: dict[str, Any]
+
+    status: WebhookDeliveryStatus
+    attempts: int
+    last_error: str | None = None
+    processing_started_at: datetime | None = None
+    processed_at: datetime | None = None
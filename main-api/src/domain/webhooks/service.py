@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+
+from .schemas import CreateWebhookDeliverySchema, WebhookDeliverySchema
+
+
+class WebhookServiceABC(ABC):
+
+    @abstractmethod
+    async def register_delivery(self, schema: CreateWebhookDeliverySchema) -> bool:
+        """
+        Stores a webhook delivery for asynchronous processing.
+        :param schema: Delivery data
+        :return: True if the delivery is new, False if it was already received
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim_delivery(self, delivery_id: str) -> WebhookDeliverySchema | None:
+        """
+        Marks a pending delivery as being processed.
+        :param delivery_id: GitHub delivery ID
+        :return: The delivery or None if it's already claimed or processed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim_pending_deliveries(self, limit: int) -> list[WebhookDeliverySchema]:
+        """
+        Claims deliveries that are pending or abandoned by a crashed worker.
+        :param limit: Max number of deliveries to claim
+        :return: Claimed deliveries
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def complete_delivery(self, delivery_id: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def fail_delivery(self, delivery: WebhookDeliverySchema, error: str) -> None:
+        """
+        Records a processing failure. The delivery is retried until the attempts are exhausted.
+        :param delivery: The delivery that failed
+        :param error: Error description
+        """
+        raise NotImplementedError
@@ -0,0 +1,17 @@
+from uuid import UUID
+
+"""
+Cache tags of the entities, shared by the code caching them and the code changing them.
+"""
+
+
+def user_tag(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+def issue_tag(issue_id: UUID) -> str:
+    return f"issue:{issue_id}"
+
+
+def wallet_tag(user_id: UUID) -> str:
+    return f"wallet:{user_id}"
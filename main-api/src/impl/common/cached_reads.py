@@ -0,0 +1,44 @@
+import logging
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+from pydantic import TypeAdapter
+
+from infrastructure.cache import Cache, CacheException
+
+
+T = TypeVar("T")
+
+
+async def get_or_load(
+    key: str,
+    adapter: TypeAdapter[T],
+    load: Callable[[], Awaitable[T]],
+    get_tags: Callable[[T], Iterable[str]],
+    ttl: float
+) -> T:
+    """
+    Reads a value from the cache, or loads it and caches it under the tags of the entities it was read from.
+    The writers invalidate these tags after their commit, on all the instances.
+    A load racing with a write can still cache the value read before it, the TTL bounds how long it's served.
+    The cache is an optimization, its failures are only logged.
+    :param key: Cache key of the value
+    :param adapter: Serializes the value
+    :param load: Reads the value from the database, its exceptions are not cached
+    :param get_tags: Tags of the loaded value
+    :param ttl: Time to live in seconds
+    :return: The value
+    """
+    try:
+        cached = await Cache.get(key)
+    except CacheException as e:
+        logging.warning("Could not read %s from the cache: %r", key, e)
+        return await load()
+    if cached is not None:
+        return adapter.validate_json(cached)
+
+    value = await load()
+    try:
+        await Cache.set(key, adapter.dump_json(value), ttl=ttl, tags=get_tags(value))
+    except CacheException as e:
+        logging.warning("Could not cache %s: %r", key, e)
+    return value
@@ -1,3 +1,5 @@
+import asyncio
+import logging
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,12 +8,16 @@ from domain.wallet.exceptions import WalletNotFound
 from infrastructure.database.issue_wallets import IssueLightningWalletDbModel, IssueLightningWalletRepo
 from infrastructure.database.issue_wallets.dtos import IssueLightningWalletDTO
 from infrastructure.database.lightning_wallet import LightningWalletDbModel, LightningWalletRepo
+from infrastructure.database.wallet_transactions import WalletTransactionRepo
 from infrastructure.lnbits import LNBitsClient
+from infrastructure.lnbits.exceptions import NotEnoughSats
+from infrastructure.tracing import traced
 
 from .exceptions import IssueWalletNotFound
 
 
 class IssueBank:
+    MAX_CONCURRENT_TRANSFERS = 5
 
     def __init__(
         self,
@@ -48,12 +54,43 @@ class IssueBank:
             wallet = await self._create_new_issue_wallet(issue_id)
         return wallet
 
+    async def _get_or_create_issue_wallets(self, issue_ids: list[UUID]) -> dict[UUID, IssueLightningWalletDbModel]:
+        wallet_repo = IssueLightningWalletRepo(self._session)
+        wallets = {
+            wallet.issue_id: wallet
+            for wallet in await wallet_repo.get_wallets_by_issue_ids(issue_ids)
+        }
+
+        missing_issue_ids = [issue_id for issue_id in issue_ids if issue_id not in wallets]
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_TRANSFERS)
+
+        async def create_lnbits_wallet(issue_id: UUID):
+            async with semaphore:
+                return await LNBitsClient().create_headless_wallet(name=issue_id.hex)
+
+        # Only the LNBits calls run concurrently, the session is used sequentially
+        lnbits_wallets = await asyncio.gather(*[
+            create_lnbits_wallet(issue_id)
+            for issue_id in missing_issue_ids
+        ])
+        for issue_id, lnbits_wallet in zip(missing_issue_ids, lnbits_wallets):
+            wallets[issue_id] = await wallet_repo.create_wallet(
+                IssueLightningWalletDTO(
+                    issue_id=issue_id,
+                    wallet_id=lnbits_wallet.id,
+                    adminkey=lnbits_wallet.adminkey,
+                    inkey=lnbits_wallet.inkey
+                )
+            )
+        return wallets
+
     async def _get_user_wallet(self, user_id: UUID) -> LightningWalletDbModel:
         wallet = await LightningWalletRepo(self._session).get_wallet_by_user_id(user_id)
         if wallet is None:
             raise WalletNotFound
         return wallet
 
+    @traced("issue_bank.reserve_sats")
     async def reserve_sats(
         self,
         from_user_id: UUID,
@@ -68,7 +105,73 @@ class IssueBank:
             to_wallet_inkey=issue_wallet.inkey,
             amount=amount
         )
+        await WalletTransactionRepo(self._session).mark_needs_sync([user_wallet.id])
+
+    @traced("issue_bank.reserve_sats_bulk")
+    async def reserve_sats_bulk(
+        self,
+        from_user_id: UUID,
+        amounts: dict[UUID, int]
+    ) -> None:
+        """
+        Moves sats to several issue wallets at once.
+
+        Nothing is moved if the user's balance doesn't cover the total (**NotEnoughSats**).
+        If any transfer fails, the completed ones are moved back and the error is re-raised.
+        :param from_user_id:
+        :param amounts: Issue ID -> amount of sats to reserve
+        :return: None
+        """
+        user_wallet = await self._get_user_wallet(from_user_id)
+
+        lnbits_client = LNBitsClient()
+        wallet_details = await lnbits_client.get_wallet(user_wallet.inkey)
+        if wallet_details.balance // 1000 < sum(amounts.values()):
+            raise NotEnoughSats
+
+        issue_wallets = await self._get_or_create_issue_wallets(list(amounts))
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_TRANSFERS)
+
+        async def move_sats(from_adminkey: str, to_inkey: str, amount: int) -> None:
+            async with semaphore:
+                await lnbits_client.move_sats(
+                    from_wallet_adminkey=from_adminkey,
+                    to_wallet_inkey=to_inkey,
+                    amount=amount
+                )
+
+        results = await asyncio.gather(
+            *[
+                move_sats(user_wallet.adminkey, issue_wallets[issue_id].inkey, amount)
+                for issue_id, amount in amounts.items()
+            ],
+            return_exceptions=True
+        )
+        await WalletTransactionRepo(self._session).mark_needs_sync([user_wallet.id])
+
+        failures = [result for result in results if isinstance(result, BaseException)]
+        if not failures:
+            return
+
+        moved = [
+            (issue_id, amount)
+            for (issue_id, amount), result in zip(amounts.items(), results)
+            if not isinstance(result, BaseException)
+        ]
+        refunds = await asyncio.gather(
+            *[
+                move_sats(issue_wallets[issue_id].adminkey, user_wallet.inkey, amount)
+                for issue_id, amount in moved
+            ],
+            return_exceptions=True
+        )
+        for (issue_id, amount), refund in zip(moved, refunds):
+            if isinstance(refund, BaseException):
+                logging.error("Could not move %s sats of issue %s back to user %s: %r", amount, issue_id, from_user_id, refund)
+
+        raise failures[0]
 
+    @traced("issue_bank.reward_user")
     async def reward_user(
         self,
         user_id: UUID,
@@ -91,5 +194,6 @@ class IssueBank:
             to_wallet_inkey=user_wallet.inkey,
             amount=reserved_balance
         )
+        await WalletTransactionRepo(self._session).mark_needs_sync([user_wallet.id])
 
         return reserved_balance
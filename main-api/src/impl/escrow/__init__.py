@@ -0,0 +1,4 @@
+from .service import EscrowService
+
+
+__all__ = ["EscrowService"]
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+
+from domain.escrow import EscrowServiceABC
+from infrastructure.locks import AdvisoryLockService
+
+
+RECONCILIATION_LOCK = "escrow_reconciliation"
+
+
+class EscrowReconciliationJob:
+    """
+    Periodically compares the issue wallet balances with the rewards stored in the database.
+    The balance requests are capped below the LNBits admission limit to leave room for the API traffic.
+    Only one of the API instances runs it at a time, the others skip the run.
+    """
+
+    _escrow_service: EscrowServiceABC
+    _interval: float = 6 * 60 * 60
+    _chunk_size: int = 200
+    _concurrency: int = 4
+
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def setup(
+        cls,
+        escrow_service: EscrowServiceABC,
+        interval: float = 6 * 60 * 60,
+        chunk_size: int = 200,
+        concurrency: int = 4
+    ) -> None:
+        cls._escrow_service = escrow_service
+        cls._interval = interval
+        cls._chunk_size = chunk_size
+        cls._concurrency = concurrency
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._task = asyncio.create_task(cls._reconcile_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    def _get_delay(cls) -> float:
+        # Aligned to the wall clock, so all the instances wake up together and the lock lets one of them run
+        return cls._interval - time.time() % cls._interval
+
+    @classmethod
+    async def _reconcile_periodically(cls) -> None:
+        while True:
+            # Not run at startup, so a rolling deploy doesn't start a sweep on every instance
+            await asyncio.sleep(cls._get_delay())
+            try:
+                async with AdvisoryLockService.try_hold(RECONCILIATION_LOCK, "job") as acquired:
+                    if not acquired:
+                        logging.debug("Escrow reconciliation is run by another instance")
+                        continue
+                    report = await cls._escrow_service.reconcile_escrow(cls._chunk_size, cls._concurrency)
+                if report.discrepancies:
+                    logging.warning(
+                        "Escrow reconciliation %s found %s discrepancies in %s issue wallets",
+                        report.run_id,
+                        len(report.discrepancies),
+                        report.checked_wallets
+                    )
+                else:
+                    logging.debug("Escrow reconciliation checked %s issue wallets", report.checked_wallets)
+            except Exception as e:
+                logging.exception("Escrow reconciliation failed: %r", e)
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+from uuid import UUID, uuid4
+
+from domain.escrow import EscrowServiceABC
+from domain.escrow.schemas import (
+    EscrowDiscrepancyKind,
+    EscrowDiscrepancySchema,
+    EscrowReconciliationReportSchema
+)
+from infrastructure.database import SessionScope
+from infrastructure.database.escrow_discrepancies import EscrowDiscrepancyRepo
+from infrastructure.database.escrow_discrepancies.dtos import CreateEscrowDiscrepancyDto
+from infrastructure.database.issue_wallets import IssueLightningWalletDbModel, IssueLightningWalletRepo
+from infrastructure.database.rewards import RewardRepo
+from infrastructure.lnbits import LNBitsClient
+from infrastructure.metrics import MetricsRegistry
+
+
+_DISCREPANCIES = MetricsRegistry.gauge(
+    "escrow_discrepancies",
+    "Number of issue wallets found inconsistent by the last escrow reconciliation.",
+    labels=("kind",)
+)
+
+
+class EscrowService(EscrowServiceABC):
+
+    async def _get_balance_sats(self, wallet: IssueLightningWalletDbModel, semaphore: asyncio.Semaphore) -> int | None:
+        async with semaphore:
+            try:
+                lightning_wallet = await LNBitsClient().get_wallet(wallet.inkey)
+            except Exception as e:
+                logging.warning("Could not fetch the balance of issue wallet %s: %r", wallet.wallet_id, e)
+                return None
+        return int(lightning_wallet.balance) // 1000
+
+    @staticmethod
+    def _find_discrepancy(
+        wallet: IssueLightningWalletDbModel,
+        is_closed: bool,
+        reserved_sats: int,
+        balance_sats: int | None
+    ) -> EscrowDiscrepancySchema | None:
+        expected_sats = 0 if is_closed else reserved_sats
+        if balance_sats is None:
+            kind = EscrowDiscrepancyKind.BALANCE_FETCH_FAILED
+        elif balance_sats == expected_sats:
+            return None
+        elif is_closed:
+            kind = EscrowDiscrepancyKind.UNDRAINED_CLOSED_ISSUE
+        else:
+            kind = EscrowDiscrepancyKind.BALANCE_MISMATCH
+
+        return EscrowDiscrepancySchema(
+            issue_id=wallet.issue_id,
+            wallet_id=wallet.wallet_id,
+            kind=kind,
+            expected_sats=expected_sats,
+            actual_sats=balance_sats
+        )
+
+    async def _check_wallets(
+        self,
+        semaphore: asyncio.Semaphore,
+        limit: int,
+        after_issue_id: UUID | None = None,
+        issue_ids: list[UUID] | None = None
+    ) -> tuple[list[IssueLightningWalletDbModel], list[EscrowDiscrepancySchema]]:
+        # No session is held while waiting for LNBits
+        async with SessionScope.get_session() as session:
+            wallets = await IssueLightningWalletRepo(session).list_wallets_with_issue_state(
+                after_issue_id,
+                limit=limit,
+                issue_ids=issue_ids
+            )
+            reserved_sats = await RewardRepo(session).sum_rewards_by_issue_ids(
+                [wallet.issue_id for wallet, _ in wallets]
+            )
+
+        balances = await asyncio.gather(
+            *(self._get_balance_sats(wallet, semaphore) for wallet, _ in wallets)
+        )
+        discrepancies = [
+            discrepancy
+            for (wallet, is_closed), balance_sats in zip(wallets, balances)
+            if (discrepancy := self._find_discrepancy(
+                wallet,
+                is_closed,
+                reserved_sats.get(wallet.issue_id, 0),
+                balance_sats
+            )) is not None
+        ]
+        return [wallet for wallet, _ in wallets], discrepancies
+
+    async def reconcile_escrow(self, chunk_size: int, concurrency: int) -> EscrowReconciliationReportSchema:
+        run_id = uuid4()
+        semaphore = asyncio.Semaphore(concurrency)
+        checked_wallets = 0
+        discrepancies: list[EscrowDiscrepancySchema] = []
+
+        after_issue_id = None
+        while True:
+            wallets, chunk_discrepancies = await self._check_wallets(
+                semaphore,
+                chunk_size,
+                after_issue_id=after_issue_id
+            )
+            if not wallets:
+                break
+            after_issue_id = wallets[-1].issue_id
+
+            # The rewards are read before the balances, so a reward created or claimed in between looks like
+            # a mismatch. Only the wallets still inconsistent on a second check are reported.
+            mismatched_issue_ids = [
+                discrepancy.issue_id
+                for discrepancy in chunk_discrepancies
+                if discrepancy.kind != EscrowDiscrepancyKind.BALANCE_FETCH_FAILED
+            ]
+            if mismatched_issue_ids:
+                _, rechecked_discrepancies = await self._check_wallets(
+                    semaphore,
+                    len(mismatched_issue_ids),
+                    issue_ids=mismatched_issue_ids
+                )
+                chunk_discrepancies = [
+                    discrepancy
+                    for discrepancy in chunk_discrepancies
+                    if discrepancy.kind == EscrowDiscrepancyKind.BALANCE_FETCH_FAILED
+                ] + rechecked_discrepancies
+
+            if chunk_discrepancies:
+                async with SessionScope.get_session() as session:
+                    await EscrowDiscrepancyRepo(session).create_discrepancies([
+                        CreateEscrowDiscrepancyDto(run_id=run_id, **discrepancy.model_dump())
+                        for discrepancy in chunk_discrepancies
+                    ])
+                    await session.commit()
+
+            checked_wallets += len(wallets)
+            discrepancies.extend(chunk_discrepancies)
+
+        for kind in EscrowDiscrepancyKind:
+            _DISCREPANCIES.set(sum(1 for discrepancy in discrepancies if discrepancy.kind == kind), kind=kind)
+
+        return EscrowReconciliationReportSchema(
+            run_id=run_id,
+            checked_wallets=checked_wallets,
+            discrepancies=discrepancies
+        )
@@ -0,0 +1,4 @@
+from .service import IdempotencyService
+
+
+__all__ = ["IdempotencyService"]
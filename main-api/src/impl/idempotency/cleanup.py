@@ -0,0 +1,43 @@
+import asyncio
+import logging
+
+from domain.idempotency import IdempotencyServiceABC
+
+
+class IdempotencyKeyCleanupJob:
+    """
+    Periodically deletes the idempotency keys past their TTL.
+    """
+
+    _idempotency_service: IdempotencyServiceABC
+    _interval: float = 3600
+
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def setup(cls, idempotency_service: IdempotencyServiceABC, interval: float = 3600) -> None:
+        cls._idempotency_service = idempotency_service
+        cls._interval = interval
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._task = asyncio.create_task(cls._cleanup_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    async def _cleanup_periodically(cls) -> None:
+        while True:
+            try:
+                deleted = await cls._idempotency_service.delete_expired_keys()
+                if deleted:
+                    logging.info("%s expired idempotency keys deleted", deleted)
+            except Exception as e:
+                logging.exception("Idempotency key cleanup failed: %r", e)
+            await asyncio.sleep(cls._interval)
@@ -0,0 +1,69 @@
+import datetime
+from uuid import UUID
+
+from domain.idempotency import IdempotencyServiceABC
+from domain.idempotency.exceptions import IdempotencyKeyReused, RequestInProgress
+from domain.idempotency.schemas import IdempotencyKeyStatus, IdempotentRequestSchema, IdempotentResponseSchema
+from infrastructure.database import SessionScope
+from infrastructure.database.idempotency_keys import IdempotencyKeyRepo
+from infrastructure.database.idempotency_keys.dtos import CreateIdempotencyKeyDto, IdempotentResponseDto
+
+
+class IdempotencyService(IdempotencyServiceABC):
+    KEY_TTL = datetime.timedelta(hours=24)
+    LOCK_TIMEOUT = datetime.timedelta(minutes=5)
+
+    async def begin_request(self, request: IdempotentRequestSchema) -> IdempotentResponseSchema | None:
+        async with SessionScope.get_session() as session:
+            key_repo = IdempotencyKeyRepo(session)
+            acquired_key = await key_repo.acquire_key(
+                CreateIdempotencyKeyDto(**request.model_dump()),
+                ttl=self.KEY_TTL,
+                lock_timeout=self.LOCK_TIMEOUT
+            )
+            await session.commit()
+            if acquired_key is not None:
+                return None
+
+            stored_key = await key_repo.get_key(request.user_id, request.key)
+            if stored_key is None:
+                # Deleted in between, e.g. released by the failed request
+                raise RequestInProgress
+
+            if stored_key.endpoint != request.endpoint or stored_key.fingerprint != request.fingerprint:
+                raise IdempotencyKeyReused
+            if stored_key.status != IdempotencyKeyStatus.COMPLETED:
+                raise RequestInProgress
+
+            return IdempotentResponseSchema(
+                status_code=stored_key.response_status,
+                body=stored_key.response_body
+            )
+
+    async def complete_request(self, user_id: UUID, key: str, response: IdempotentResponseSchema) -> None:
+        async with SessionScope.get_session() as session:
+            await IdempotencyKeyRepo(session).complete_key(
+                user_id,
+                key,
+                IdempotentResponseDto(
+                    response_status=response.status_code,
+                    response_body=response.body
+                )
+            )
+            await session.commit()
+
+    async def hold_request(self, user_id: UUID, key: str) -> None:
+        async with SessionScope.get_session() as session:
+            await IdempotencyKeyRepo(session).hold_key(user_id, key)
+            await session.commit()
+
+    async def release_request(self, user_id: UUID, key: str) -> None:
+        async with SessionScope.get_session() as session:
+            await IdempotencyKeyRepo(session).delete_key(user_id, key)
+            await session.commit()
+
+    async def delete_expired_keys(self) -> int:
+        async with SessionScope.get_session() as session:
+            deleted = await IdempotencyKeyRepo(session).delete_expired_keys()
+            await session.commit()
+            return deleted
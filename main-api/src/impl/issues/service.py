@@ -1,13 +1,57 @@
+from datetime import datetime
+from typing import AsyncIterator
 from uuid import UUID
 
+from pydantic import TypeAdapter
+
 from domain.common.schemas import PaginationSchema, RepositoryData, UserData
 from domain.issues import IssueServiceABC
 from domain.issues.exceptions import IssueNotFound
-from domain.issues.schemas import IssueSchema, IssueFiltersSchema, IssueExpandedSchema
+from domain.issues.schemas import (
+    IssueSchema,
+    IssueFiltersSchema,
+    IssueExpandedSchema,
+    UpdateIssueDetailsSchema
+)
+from impl.common.cache_tags import issue_tag, user_tag
+from impl.common.cached_reads import get_or_load
+from infrastructure.cache import notify_invalidation, invalidate_committed
 from infrastructure.database import SessionScope
 from infrastructure.database._abstract.dtos import Pagination
 from infrastructure.database.issues import IssueRepo
-from infrastructure.database.issues.dtos import IssueFiltersDto, ExtendedIssueDto
+from infrastructure.database.issues.dtos import (
+    IssueFiltersDto,
+    ExtendedIssueDto,
+    ExpandedIssueProjectionDto,
+    UpdateIssueDto
+)
+
+
+# Expanded issue fields coming from the joined tables, by the part of the projection loading them
+JOINED_FIELDS = {
+    "repository_data": "repository",
+    "winner_data": "winner",
+    "last_rewarder_data": "last_rewarder",
+    "second_last_rewarder_data": "second_last_rewarder",
+    "third_last_rewarder_data": "third_last_rewarder",
+    "total_rewards": "rewards_count",
+    "total_reward_sats": "rewards_sat_sum"
+}
+
+# The repository data isn't tagged, a renamed repository shows up once the entry expires
+ISSUE_CACHE_TTL = 60
+
+_issue_expanded_adapter = TypeAdapter(IssueExpandedSchema)
+
+
+def _get_issue_expanded_tags(issue: IssueExpandedSchema) -> list[str]:
+    users = [
+        issue.winner_data,
+        issue.last_rewarder_data,
+        issue.second_last_rewarder_data,
+        issue.third_last_rewarder_data
+    ]
+    return [issue_tag(issue.id), *(user_tag(user.id) for user in users if user is not None)]
 
 
 class IssueService(IssueServiceABC):
@@ -27,29 +71,45 @@ class IssueService(IssueServiceABC):
             winner_id=domain_filters.winner_id
         )
 
+    def _get_projection(self, fields: set[str] | None) -> ExpandedIssueProjectionDto | None:
+        if fields is None:
+            return None
+        return ExpandedIssueProjectionDto(
+            issue_columns=(fields & set(IssueSchema.model_fields)) - {"id"},
+            **{part: field in fields for field, part in JOINED_FIELDS.items()}
+        )
+
     def _expanded_issue_db_row_to_schema(
         self,
-        row: ExtendedIssueDto
+        row: ExtendedIssueDto,
+        fields: set[str] | None = None
     ) -> IssueExpandedSchema:
-        return IssueExpandedSchema(
+        values = {
             **row.issue.__dict__,
-            repository_data=RepositoryData(
+            "repository_data": RepositoryData(
                 **row.repository.__dict__
-            ),
-            winner_data=UserData(
+            ) if row.repository is not None else None,
+            "winner_data": UserData(
                 **row.winner.__dict__
             ) if row.winner is not None else None,
-            last_rewarder_data=UserData(
+            "last_rewarder_data": UserData(
                 **row.last_rewarder.__dict__
             ) if row.last_rewarder is not None else None,
-            second_last_rewarder_data=UserData(
+            "second_last_rewarder_data": UserData(
                 **row.second_last_rewarder.__dict__
             ) if row.second_last_rewarder is not None else None,
-            third_last_rewarder_data=UserData(
+            "third_last_rewarder_data": UserData(
                 **row.third_last_rewarder.__dict__
             ) if row.third_last_rewarder is not None else None,
-            total_rewards=row.rewards_count,
-            total_reward_sats=row.rewards_sat_sum
+            "total_rewards": row.rewards_count,
+            "total_reward_sats": row.rewards_sat_sum
+        }
+        if fields is None:
+            return IssueExpandedSchema(**values)
+        # Only the requested fields were loaded, the others are left unset instead of failing validation
+        return IssueExpandedSchema.model_construct(
+            _fields_set=fields,
+            **{field: values[field] for field in fields}
         )
 
     async def list_issues(
@@ -72,17 +132,24 @@ class IssueService(IssueServiceABC):
     async def list_issues_expanded(
         self,
         pagination: PaginationSchema,
-        filters: IssueFiltersSchema | None = None
+        filters: IssueFiltersSchema | None = None,
+        fields: set[str] | None = None
     ) -> list[IssueExpandedSchema]:
         async with SessionScope.get_session() as session:
             return [
-                self._expanded_issue_db_row_to_schema(record)
+                self._expanded_issue_db_row_to_schema(record, fields)
                 for record in await IssueRepo(session).list_issues_extended(
                     pagination=Pagination(skip=pagination.skip, limit=pagination.limit),
-                    filters=self._translate_filters(filters)
+                    filters=self._translate_filters(filters),
+                    projection=self._get_projection(fields)
                 )
             ]
 
+    async def export_issues_expanded(self, since: datetime | None = None) -> AsyncIterator[IssueExpandedSchema]:
+        async with SessionScope.get_session() as session:
+            async for record in IssueRepo(session).stream_issues_expanded(since=since):
+                yield self._expanded_issue_db_row_to_schema(record)
+
     async def count_issues(
         self,
         filters: IssueFiltersSchema | None = None
@@ -99,11 +166,47 @@ class IssueService(IssueServiceABC):
                 raise IssueNotFound
             return IssueSchema.model_validate(fetched_issue)
 
-    async def get_issue_by_id_expanded(self, issue_id: UUID) -> IssueExpandedSchema:
+    async def _load_issue_by_id_expanded(self, issue_id: UUID) -> IssueExpandedSchema:
         async with SessionScope.get_session() as session:
             fetched_record = await IssueRepo(session).get_issue_by_id_expanded(issue_id)
             if fetched_record is None:
                 raise IssueNotFound
             return self._expanded_issue_db_row_to_schema(
                 await IssueRepo(session).get_issue_by_id_expanded(issue_id)
-            )
\ No newline at end of file
+            )
+
+    async def get_issue_by_id_expanded(self, issue_id: UUID) -> IssueExpandedSchema:
+        return await get_or_load(
+            f"issue-expanded:{issue_id}",
+            _issue_expanded_adapter,
+            lambda: self._load_issue_by_id_expanded(issue_id),
+            _get_issue_expanded_tags,
+            ttl=ISSUE_CACHE_TTL
+        )
+
+    async def get_issues_by_ids_expanded(self, issue_ids: list[UUID]) -> list[IssueExpandedSchema]:
+        async with SessionScope.get_session() as session:
+            return [
+                self._expanded_issue_db_row_to_schema(record)
+                for record in await IssueRepo(session).get_issues_by_ids_expanded(issue_ids)
+            ]
+
+    async def get_issues_by_github_ids_expanded(self, github_ids: list[int]) -> list[IssueExpandedSchema]:
+        async with SessionScope.get_session() as session:
+            return [
+                self._expanded_issue_db_row_to_schema(record)
+                for record in await IssueRepo(session).get_issues_by_github_ids_expanded(github_ids)
+            ]
+
+    async def update_issue_details(self, github_id: int, schema: UpdateIssueDetailsSchema) -> IssueSchema:
+        async with SessionScope.get_session() as session:
+            updated_issue = await IssueRepo(session).update_issue_by_github_id(
+                issue_github_id=github_id,
+                update_fields=UpdateIssueDto(**schema.model_dump(exclude_unset=True))
+            )
+            if updated_issue is None:
+                raise IssueNotFound
+            await notify_invalidation(session, [issue_tag(updated_issue.id)])
+            await session.commit()
+            await invalidate_committed([issue_tag(updated_issue.id)])
+            return IssueSchema.model_validate(updated_issue)
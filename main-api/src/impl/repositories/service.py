@@ -19,16 +19,42 @@ class RepositoryService(RepositoryServiceABC):
                 raise RepositoryNotFound
             return RepositorySchema.model_validate(found)
         
-    async def list_repositories(self, pagination: PaginationSchema) -> list[RepositorySchema]:
+    async def get_repositories_by_ids(self, repository_ids: list[UUID]) -> list[RepositorySchema]:
         async with SessionScope.get_session() as session:
             return [
                 RepositorySchema.model_validate(repo)
-                for repo in await RepositoryRepo(session).list_repositories(
-                    pagination=Pagination(
-                        skip=pagination.skip,
-                        limit=pagination.limit
-                    )
+                for repo in await RepositoryRepo(session).get_repositories_by_ids(repository_ids)
+            ]
+
+    async def get_repositories_by_github_ids(self, github_ids: list[int]) -> list[RepositorySchema]:
+        async with SessionScope.get_session() as session:
+            return [
+                RepositorySchema.model_validate(repo)
+                for repo in await RepositoryRepo(session).get_repositories_by_github_ids(github_ids)
+            ]
+
+    async def list_repositories(
+        self,
+        pagination: PaginationSchema,
+        fields: set[str] | None = None
+    ) -> list[RepositorySchema]:
+        async with SessionScope.get_session() as session:
+            repositories = await RepositoryRepo(session).list_repositories(
+                pagination=Pagination(
+                    skip=pagination.skip,
+                    limit=pagination.limit
+                ),
+                columns=fields - {"id"} if fields is not None else None
+            )
+            if fields is None:
+                return [RepositorySchema.model_validate(repo) for repo in repositories]
+            # Only the requested fields were loaded, the others are left unset instead of failing validation
+            return [
+                RepositorySchema.model_construct(
+                    _fields_set=fields,
+                    **{field: getattr(repo, field) for field in fields}
                 )
+                for repo in repositories
             ]
         
     async def count_repositories(self) -> int:
@@ -0,0 +1,44 @@
+import asyncio
+import logging
+
+from domain.rewards import RewardServiceABC
+
+
+class ReservedSatsVerificationJob:
+    """
+    Periodically checks the reserved sats kept per user against the rewards and corrects the ones that drifted.
+    The first run also initializes the reserved sats of the users who rewarded before they were kept.
+    """
+
+    _reward_service: RewardServiceABC
+    _interval: float = 60 * 60
+
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def setup(cls, reward_service: RewardServiceABC, interval: float = 60 * 60) -> None:
+        cls._reward_service = reward_service
+        cls._interval = interval
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._task = asyncio.create_task(cls._verify_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    async def _verify_periodically(cls) -> None:
+        while True:
+            try:
+                corrected = await cls._reward_service.verify_reserved_sats()
+                if corrected:
+                    logging.warning("Reserved sats verification corrected %s users", corrected)
+            except Exception as e:
+                logging.exception("Reserved sats verification failed: %r", e)
+            await asyncio.sleep(cls._interval)
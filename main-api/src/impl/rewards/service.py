@@ -1,6 +1,9 @@
 import datetime
+import logging
+from typing import AsyncIterator
 from uuid import UUID
 
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from domain.common.schemas import PaginationSchema, UserData, IssueData
@@ -13,14 +16,21 @@ from domain.rewards.exceptions import (
 )
 from domain.rewards.schemas import (
     CreateRewardSchema,
+    AddRewardSchema,
+    BulkRewardResultSchema,
     RewardSchema,
     RewardFiltersSchema,
     RewardExpandedSchema,
     ContributorSchema,
     RewardCompletionSchema,
-    IssueIdentifierSchema
+    IssueIdentifierSchema,
+    RewardEventType,
+    RewardEventSchema
 )
+from impl.common.cache_tags import issue_tag, user_tag, wallet_tag
+from impl.common.cached_reads import get_or_load
 from impl.common.issue_bank import IssueBank
+from infrastructure.cache import notify_invalidation, invalidate_committed
 from infrastructure.database import SessionScope
 from infrastructure.database._abstract.dtos import Pagination
 from infrastructure.database.issues import IssueRepo, IssueDbModel
@@ -29,15 +39,32 @@ from infrastructure.database.lightning_wallet import LightningWalletDbModel, Lig
 from infrastructure.database.lightning_wallet.dtos import LightningWalletDTO
 from infrastructure.database.repositories import RepositoryRepo
 from infrastructure.database.repositories.dto import CreateRepositoryDto
+from infrastructure.database.reserved_balances import ReservedBalanceRepo
+from infrastructure.database.reward_rollups import RewardRollupRepo
+from infrastructure.database.reward_rollups.dtos import PledgeDto
 from infrastructure.database.rewards import RewardRepo, RewardDbModel
 from infrastructure.database.rewards.dtos import (
     CreateRewardDto,
     RewardFiltersDto,
-    ExpandedRewardDto
+    ExpandedRewardDto,
+    ExpandedRewardProjectionDto
 )
 from infrastructure.database.users import UserRepo, UserDbModel
 from infrastructure.database.users.dtos import CreateUserDTO
+from infrastructure.events import notify_events
 from infrastructure.lnbits import LNBitsClient
+from infrastructure.locks import AdvisoryLockService
+
+
+# Serializes the changes of an issue's escrow: new rewards and the claim.
+# Keyed by the GitHub issue ID, which is known before the issue row is created or written,
+# so the lock is always taken before the row lock and the two can't be waited for in opposite orders.
+ISSUE_LOCK = "issue"
+
+# Invalidated by the rewards and the claims changing it
+RESERVED_SATS_CACHE_TTL = 300
+
+_reserved_sats_adapter = TypeAdapter(int)
 
 
 class ContributorRegisterer:
@@ -108,31 +135,98 @@ class RewardService(RewardServiceABC):
             rewarder_id=domain_filters.rewarder_id
         )
 
-    def _db_row_to_schema(self, row: ExpandedRewardDto) -> RewardExpandedSchema:
-        return RewardExpandedSchema(
+    def _get_projection(self, fields: set[str] | None) -> ExpandedRewardProjectionDto | None:
+        if fields is None:
+            return None
+        return ExpandedRewardProjectionDto(
+            reward_columns=(fields & set(RewardSchema.model_fields)) - {"id"},
+            rewarder="rewarder_data" in fields,
+            issue="issue_data" in fields
+        )
+
+    def _db_row_to_schema(self, row: ExpandedRewardDto, fields: set[str] | None = None) -> RewardExpandedSchema:
+        values = {
             **row.reward.__dict__,
-            rewarder_data=UserData(
+            "rewarder_data": UserData(
                 **row.rewarder.__dict__
-            ),
-            issue_data=IssueData(
+            ) if row.rewarder is not None else None,
+            "issue_data": IssueData(
                 **row.issue.__dict__
-            )
+            ) if row.issue is not None else None
+        }
+        if fields is None:
+            return RewardExpandedSchema(**values)
+        # Only the requested fields were loaded, the others are left unset instead of failing validation
+        return RewardExpandedSchema.model_construct(
+            _fields_set=fields,
+            **{field: values[field] for field in fields}
+        )
+
+    @staticmethod
+    async def _record_pledges(
+        session: AsyncSession,
+        rewards: list[RewardDbModel],
+        repository_ids: dict[UUID, UUID]
+    ) -> None:
+        """
+        Counts the new rewards in the rollups. Call it after the LNBits transfers, right before the commit:
+        the global rollups are updated by every reward and stay locked until the end of the transaction.
+        :param repository_ids: Repository ID by issue ID of the rewards
+        """
+        # Assigns the reward IDs
+        await session.flush()
+        await RewardRollupRepo(session).record_pledges(
+            [
+                PledgeDto(
+                    reward_id=reward.id,
+                    issue_id=reward.issue_id,
+                    repository_id=repository_ids[reward.issue_id],
+                    rewarder_id=reward.rewarder_id,
+                    reward_sats=reward.reward_sats
+                )
+                for reward in rewards
+            ],
+            at=datetime.datetime.utcnow()
         )
 
+    @staticmethod
+    def _get_reward_events(
+        rewards: list[tuple[RewardEventType, RewardDbModel]],
+        repository_ids: dict[UUID, UUID]
+    ) -> list[RewardEventSchema]:
+        """
+        :param rewards: New rewards with the type of their events
+        :param repository_ids: Repository ID by issue ID of the rewards
+        """
+        return [
+            RewardEventSchema(
+                type=event_type,
+                repository_id=repository_ids[reward.issue_id],
+                issue_id=reward.issue_id,
+                reward_id=reward.id,
+                user_id=reward.rewarder_id,
+                sats=reward.reward_sats,
+                at=reward.created_at
+            )
+            for event_type, reward in rewards
+        ]
+
     async def _create_reward_object(
         self,
         session: AsyncSession,
         author_id: UUID,
         schema: CreateRewardSchema
-    ) -> RewardDbModel:
+    ) -> tuple[RewardDbModel, IssueDbModel]:
         """
         Creates the reward ORM object along with all the corresponding objects - Repository and Issue.
         Updates Repository and Issue if there are differences found
         :param session: ORM session
         :param author_id: Author of the reward
         :param schema: Fields used to create the reward
-        :return: RewardDbModel
+        :return: RewardDbModel and its IssueDbModel
         """
+        await AdvisoryLockService(session).lock(ISSUE_LOCK, schema.issue_github_id)
+
         gh_repo, _, _ = await RepositoryRepo(session).get_update_or_create_repository(
             repository_dto=CreateRepositoryDto(
                 github_id=schema.repo_github_id,
@@ -141,7 +235,6 @@ class RewardService(RewardServiceABC):
                 html_url=schema.repo_html_url
             )
         )
-        await session.flush()
 
         issue_repo = IssueRepo(session)
         gh_issue, _, _ = await issue_repo.get_update_or_create_issue(
@@ -159,17 +252,18 @@ class RewardService(RewardServiceABC):
 
         await session.flush()
 
-        return await RewardRepo(session).create_reward(
+        reward = await RewardRepo(session).create_reward(
             reward_dto=CreateRewardDto(
                 issue_id=gh_issue.id,
                 rewarder_id=author_id,
                 reward_sats=schema.reward_sats
             )
         )
+        return reward, gh_issue
 
     async def create_reward(self, author_id: UUID, schema: CreateRewardSchema) -> RewardSchema:
         async with SessionScope.get_session() as session:
-            reward = await self._create_reward_object(
+            reward, issue = await self._create_reward_object(
                 session=session,
                 author_id=author_id,
                 schema=schema
@@ -180,18 +274,31 @@ class RewardService(RewardServiceABC):
                 to_issue_id=reward.issue_id,
                 amount=schema.reward_sats
             )
+            await ReservedBalanceRepo(session).reserve(author_id, schema.reward_sats)
 
+            await self._record_pledges(session, [reward], {issue.id: issue.repository_id})
+            await notify_events(session, self._get_reward_events(
+                [(RewardEventType.REWARD_CREATED, reward)],
+                {issue.id: issue.repository_id}
+            ))
+
+            invalidated_tags = [issue_tag(reward.issue_id), wallet_tag(author_id)]
+            await notify_invalidation(session, invalidated_tags)
             await session.commit()
+            await invalidate_committed(invalidated_tags)
 
             return RewardSchema.model_validate(reward)
 
     async def add_reward(self, author_id: UUID, issue_id: UUID, amount_sats: int) -> RewardSchema:
         async with SessionScope.get_session() as session:
             issue_repo = IssueRepo(session)
-            issue = await issue_repo.get_issue_by_id(issue_id, lock=True)
+            issue = await issue_repo.get_issue_by_id(issue_id)
             if issue is None:
                 raise IssueDoesNotExist
 
+            await AdvisoryLockService(session).lock(ISSUE_LOCK, issue.github_id)
+            # Re-read, the issue could have changed before the lock was taken
+            await session.refresh(issue)
             if issue.is_closed:
                 raise IssueIsClosed
 
@@ -208,13 +315,139 @@ class RewardService(RewardServiceABC):
                 to_issue_id=reward.issue_id,
                 amount=amount_sats
             )
+            await ReservedBalanceRepo(session).reserve(author_id, amount_sats)
 
             issue_repo.update_top_rewarders(issue, author_id)
-
+            await self._record_pledges(session, [reward], {issue.id: issue.repository_id})
+            await notify_events(session, self._get_reward_events(
+                [(RewardEventType.REWARD_ADDED, reward)],
+                {issue.id: issue.repository_id}
+            ))
+
+            invalidated_tags = [issue_tag(issue.id), wallet_tag(author_id)]
+            await notify_invalidation(session, invalidated_tags)
             await session.commit()
+            await invalidate_committed(invalidated_tags)
 
             return RewardSchema.model_validate(reward)
 
+    async def create_rewards(
+        self,
+        author_id: UUID,
+        rewards: list[CreateRewardSchema | AddRewardSchema]
+    ) -> list[BulkRewardResultSchema]:
+        new_issue_rewards = [reward for reward in rewards if isinstance(reward, CreateRewardSchema)]
+
+        async with SessionScope.get_session() as session:
+            issue_repo = IssueRepo(session)
+            existing_issue_ids = [reward.issue_id for reward in rewards if isinstance(reward, AddRewardSchema)]
+            existing_issue_github_ids = [
+                issue.github_id
+                for issue in await issue_repo.get_issues_by_ids(existing_issue_ids)
+            ]
+            await AdvisoryLockService(session).lock_many(
+                ISSUE_LOCK,
+                [schema.issue_github_id for schema in new_issue_rewards] + existing_issue_github_ids
+            )
+            # Re-read, the issues could have changed before the locks were taken
+            existing_issues = {
+                issue.id: issue
+                for issue in await issue_repo.get_issues_by_ids(existing_issue_ids, refresh=True)
+            }
+
+            repositories = await RepositoryRepo(session).upsert_repositories([
+                CreateRepositoryDto(
+                    github_id=schema.repo_github_id,
+                    full_name=schema.repo_full_name,
+                    owner_github_id=schema.repo_owner_github_id,
+                    html_url=schema.repo_html_url
+                )
+                for schema in {schema.repo_github_id: schema for schema in new_issue_rewards}.values()
+            ])
+            repository_ids = {repository.github_id: repository.id for repository in repositories}
+
+            new_issues = await issue_repo.upsert_issues([
+                CreateIssueDto(
+                    github_id=schema.issue_github_id,
+                    repository_id=repository_ids[schema.repo_github_id],
+                    issue_number=schema.issue_number,
+                    title=schema.issue_title,
+                    body=schema.issue_body,
+                    html_url=schema.issue_html_url,
+                    is_closed=False
+                )
+                for schema in {schema.issue_github_id: schema for schema in new_issue_rewards}.values()
+            ])
+            issues_by_github_id = {issue.github_id: issue for issue in new_issues}
+
+            results: list[BulkRewardResultSchema | None] = []
+            reward_dtos: list[CreateRewardDto] = []
+            amounts: dict[UUID, int] = {}
+            event_types: list[RewardEventType] = []
+            for reward in rewards:
+                if isinstance(reward, CreateRewardSchema):
+                    issue = issues_by_github_id[reward.issue_github_id]
+                else:
+                    issue = existing_issues.get(reward.issue_id)
+                    if issue is None:
+                        results.append(BulkRewardResultSchema(error=IssueDoesNotExist()))
+                        continue
+                    if issue.is_closed:
+                        results.append(BulkRewardResultSchema(error=IssueIsClosed()))
+                        continue
+
+                issue_repo.update_top_rewarders(issue, author_id)
+                reward_dtos.append(
+                    CreateRewardDto(
+                        issue_id=issue.id,
+                        rewarder_id=author_id,
+                        reward_sats=reward.reward_sats
+                    )
+                )
+                amounts[issue.id] = amounts.get(issue.id, 0) + reward.reward_sats
+                event_types.append(
+                    RewardEventType.REWARD_CREATED if isinstance(reward, CreateRewardSchema)
+                    else RewardEventType.REWARD_ADDED
+                )
+                results.append(None)  # Filled in once the reward is created
+
+            new_rewards = await RewardRepo(session).create_rewards(reward_dtos)
+
+            if amounts:
+                await IssueBank(session).reserve_sats_bulk(
+                    from_user_id=author_id,
+                    amounts=amounts
+                )
+                await ReservedBalanceRepo(session).reserve(author_id, sum(amounts.values()))
+
+            issue_repository_ids = {
+                issue.id: issue.repository_id
+                for issue in [*new_issues, *existing_issues.values()]
+            }
+            await self._record_pledges(session, new_rewards, issue_repository_ids)
+            await notify_events(session, self._get_reward_events(
+                list(zip(event_types, new_rewards)),
+                issue_repository_ids
+            ))
+
+            # The upserted issues may have changed even if none of their rewards were created
+            invalidated_issue_ids = {*amounts, *(issue.id for issue in new_issues)}
+            invalidated_tags = [
+                *map(issue_tag, invalidated_issue_ids),
+                *([wallet_tag(author_id)] if amounts else [])
+            ]
+            await notify_invalidation(session, invalidated_tags)
+            await session.commit()
+            await invalidate_committed(invalidated_tags)
+
+            created_rewards = iter(new_rewards)
+            return [
+                result if result is not None else BulkRewardResultSchema(
+                    reward=RewardSchema.model_validate(next(created_rewards))
+                )
+                for result in results
+            ]
+
     async def list_rewards(
         self,
         pagination: PaginationSchema | None = None,
@@ -232,17 +465,27 @@ class RewardService(RewardServiceABC):
     async def list_rewards_expanded(
             self,
             pagination: PaginationSchema | None = None,
-            filters: RewardFiltersSchema | None = None
+            filters: RewardFiltersSchema | None = None,
+            fields: set[str] | None = None
     ) -> list[RewardExpandedSchema]:
         async with SessionScope.get_session() as session:
             return [
-                self._db_row_to_schema(row)
+                self._db_row_to_schema(row, fields)
                 for row in await RewardRepo(session).list_rewards_expanded(
                     pagination=Pagination(skip=pagination.skip, limit=pagination.limit),
-                    filters=self._translate_filters(filters)
+                    filters=self._translate_filters(filters),
+                    projection=self._get_projection(fields)
                 )
             ]
 
+    async def export_rewards_expanded(
+        self,
+        since: datetime.datetime | None = None
+    ) -> AsyncIterator[RewardExpandedSchema]:
+        async with SessionScope.get_session() as session:
+            async for row in RewardRepo(session).stream_rewards_expanded(since=since):
+                yield self._db_row_to_schema(row)
+
     async def count_rewards(
         self,
         pagination: PaginationSchema | None = None,
@@ -289,17 +532,26 @@ class RewardService(RewardServiceABC):
 
             issue: IssueDbModel | None = None
             if issue_id is not None:
-                issue = await issue_repo.get_issue_by_id(issue_id, lock=True)
+                issue = await issue_repo.get_issue_by_id(issue_id)
             else:  # issue_identifier is not None
                 issue = await issue_repo.get_issue_by_repo_fullname(
                     fullname=issue_identifier.repo_full_name,
-                    issue_number=issue_identifier.issue_number,
-                    lock=True
+                    issue_number=issue_identifier.issue_number
                 )
 
             if issue is None:
                 raise NothingToRewardFor
 
+            await AdvisoryLockService(session).lock(ISSUE_LOCK, issue.github_id)
+            # Re-read, the issue could have been claimed before the lock was taken
+            await session.refresh(issue)
+            # Claiming an issue again would overwrite its winner and pay out its rewards twice
+            if issue.is_closed:
+                raise IssueIsClosed
+
+            claimed_at = datetime.datetime.utcnow()
+            released_user_ids = await ReservedBalanceRepo(session).release_issue(issue.id)
+
             total_sats_job = IssueBank(session).reward_user(
                 user_id=contributor_wallet.user_id,
                 for_issue_id=issue.id
@@ -309,14 +561,36 @@ class RewardService(RewardServiceABC):
                 update_fields=UpdateIssueDto(
                     is_closed=True,
                     winner_id=contributor_wallet.user_id,
-                    claimed_at=datetime.datetime.utcnow()
+                    claimed_at=claimed_at
                 )
             )
 
             total_sats = await total_sats_job
             _updated_issue = await update_issue_job
 
+            # After the transfer, like the pledges
+            await RewardRollupRepo(session).record_payout(issue.id, issue.repository_id, at=claimed_at)
+
+            await notify_events(session, [
+                RewardEventSchema(
+                    type=RewardEventType.ISSUE_CLAIMED,
+                    repository_id=issue.repository_id,
+                    issue_id=issue.id,
+                    user_id=contributor_wallet.user_id,
+                    sats=total_sats,
+                    at=claimed_at
+                )
+            ])
+
+            invalidated_tags = [
+                issue_tag(issue.id),
+                user_tag(contributor_wallet.user_id),
+                wallet_tag(contributor_wallet.user_id),
+                *map(wallet_tag, released_user_ids)
+            ]
+            await notify_invalidation(session, invalidated_tags)
             await session.commit()
+            await invalidate_committed(invalidated_tags)
 
             return RewardCompletionSchema(
                 issue_id=issue.id,
@@ -332,3 +606,38 @@ class RewardService(RewardServiceABC):
             return await RewardRepo(session).calculate_total_reward(
                 filters=self._translate_filters(filters)
             )
+
+    async def get_reserved_sats(self, user_id: UUID) -> int:
+        return await get_or_load(
+            f"reserved-sats:{user_id}",
+            _reserved_sats_adapter,
+            lambda: self._load_reserved_sats(user_id),
+            lambda _reserved_sats: [wallet_tag(user_id)],
+            ttl=RESERVED_SATS_CACHE_TTL
+        )
+
+    async def _load_reserved_sats(self, user_id: UUID) -> int:
+        async with SessionScope.get_session() as session:
+            reserved_balance_repo = ReservedBalanceRepo(session)
+            reserved_sats = await reserved_balance_repo.get_reserved_sats(user_id)
+            if reserved_sats is None:
+                reserved_sats = await reserved_balance_repo.initialize(user_id)
+                await session.commit()
+            return reserved_sats
+
+    async def verify_reserved_sats(self) -> int:
+        async with SessionScope.get_session() as session:
+            mismatched_user_ids = await ReservedBalanceRepo(session).list_mismatched_user_ids()
+
+        corrected = 0
+        for user_id in mismatched_user_ids:
+            # One transaction per user, the balance stays locked while it's recomputed
+            async with SessionScope.get_session() as session:
+                previous, expected = await ReservedBalanceRepo(session).correct(user_id)
+                await notify_invalidation(session, [wallet_tag(user_id)])
+                await session.commit()
+            await invalidate_committed([wallet_tag(user_id)])
+            if previous is not None and previous != expected:
+                logging.warning("Reserved sats of user %s corrected from %s to %s", user_id, previous, expected)
+                corrected += 1
+        return corrected
@@ -0,0 +1,4 @@
+from .service import StatsService
+
+
+__all__ = ["StatsService"]
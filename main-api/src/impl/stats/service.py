@@ -0,0 +1,51 @@
+from datetime import date
+from uuid import UUID
+
+from domain.stats import StatsServiceABC
+from domain.stats.schemas import RollupPeriod, TimeseriesPointSchema
+from infrastructure.database import SessionScope
+from infrastructure.database.reward_rollups import RewardRollupRepo, GLOBAL_SCOPE
+
+
+class StatsService(StatsServiceABC):
+
+    async def get_timeseries(
+        self,
+        period: RollupPeriod,
+        start: date,
+        end: date,
+        repository_id: UUID | None = None
+    ) -> list[TimeseriesPointSchema]:
+        first_bucket_start = period.get_bucket_start(start)
+        last_bucket_start = period.get_bucket_start(end)
+        async with SessionScope.get_session() as session:
+            rollups = {
+                rollup.bucket_start: rollup
+                for rollup in await RewardRollupRepo(session).list_rollups(
+                    period=period,
+                    repository_id=repository_id if repository_id is not None else GLOBAL_SCOPE,
+                    first_bucket_start=first_bucket_start,
+                    last_bucket_start=last_bucket_start
+                )
+            }
+
+        points = []
+        bucket_start = first_bucket_start
+        while bucket_start <= last_bucket_start:
+            rollup = rollups.get(bucket_start)
+            points.append(
+                TimeseriesPointSchema(
+                    bucket_start=bucket_start,
+                    sats_pledged=rollup.sats_pledged,
+                    sats_paid_out=rollup.sats_paid_out,
+                    issues_funded=rollup.issues_funded,
+                    active_funders=rollup.active_funders
+                ) if rollup is not None else TimeseriesPointSchema(bucket_start=bucket_start)
+            )
+            bucket_start = period.get_next_bucket_start(bucket_start)
+        return points
+
+    async def rebuild_rollups(self) -> None:
+        async with SessionScope.get_session() as session:
+            await RewardRollupRepo(session).rebuild()
+            await session.commit()
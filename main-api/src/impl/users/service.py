@@ -1,5 +1,7 @@
 from uuid import UUID
 
+from pydantic import TypeAdapter
+
 from domain.users import UserServiceABC
 from domain.users.exceptions import UserNotFound
 from domain.users.schemas import (
@@ -7,11 +9,20 @@ from domain.users.schemas import (
     CreateUserSchema,
     UpdateUserSchema
 )
+from impl.common.cache_tags import user_tag
+from impl.common.cached_reads import get_or_load
+from infrastructure.cache import notify_invalidation, invalidate_committed
 from infrastructure.database import SessionScope
 from infrastructure.database.users import UserRepo, UserDbModel
 from infrastructure.database.users.dtos import CreateUserDTO, UpdateUserDTO
 
 
+# Read on every authenticated request
+USER_CACHE_TTL = 300
+
+_user_adapter = TypeAdapter(UserSchema)
+
+
 class UserService(UserServiceABC):
     """
     User service implements user operations done under a single transaction.
@@ -28,11 +39,20 @@ class UserService(UserServiceABC):
             await session.commit()
             return UserSchema.model_validate(new_user)
 
-    async def get_user_by_id(self, user_id: UUID) -> UserSchema:
+    async def _load_user_by_id(self, user_id: UUID) -> UserSchema:
         async with SessionScope.get_session() as session:
             fetched_user = await UserRepo(session).get_user_by_id(user_id)
             return self._validate_user(fetched_user)
 
+    async def get_user_by_id(self, user_id: UUID) -> UserSchema:
+        return await get_or_load(
+            f"user:{user_id}",
+            _user_adapter,
+            lambda: self._load_user_by_id(user_id),
+            lambda user: [user_tag(user.id)],
+            ttl=USER_CACHE_TTL
+        )
+
     async def get_user_by_github_id(self, github_id: int) -> UserSchema:
         async with SessionScope.get_session() as session:
             fetched_user = await UserRepo(session).get_user_by_github_id(github_id)
@@ -43,6 +63,27 @@ class UserService(UserServiceABC):
             fetched_user = await UserRepo(session).get_user_by_username(username)
             return self._validate_user(fetched_user)
 
+    async def get_users_by_ids(self, user_ids: list[UUID]) -> list[UserSchema]:
+        async with SessionScope.get_session() as session:
+            return [
+                UserSchema.model_validate(user)
+                for user in await UserRepo(session).get_users_by_ids(user_ids)
+            ]
+
+    async def get_users_by_github_ids(self, github_ids: list[int]) -> list[UserSchema]:
+        async with SessionScope.get_session() as session:
+            return [
+                UserSchema.model_validate(user)
+                for user in await UserRepo(session).get_users_by_github_ids(github_ids)
+            ]
+
+    async def get_users_by_usernames(self, usernames: list[str]) -> list[UserSchema]:
+        async with SessionScope.get_session() as session:
+            return [
+                UserSchema.model_validate(user)
+                for user in await UserRepo(session).get_users_by_usernames(usernames)
+            ]
+
     async def get_by_github_id_or_create(self, github_id: int, schema: CreateUserSchema) -> UserSchema:
         try:
             return await self.get_user_by_github_id(github_id)
@@ -52,7 +93,9 @@ class UserService(UserServiceABC):
     async def update_user(self, user_id: UUID, schema: UpdateUserSchema) -> UserSchema:
         async with SessionScope.get_session() as session:
             updated_user = await UserRepo(session).update_user(user_id, UpdateUserDTO(**schema.model_dump()))
+            await notify_invalidation(session, [user_tag(user_id)])
             await session.commit()
+            await invalidate_committed([user_tag(user_id)])
             return self._validate_user(updated_user)
 
     # UsersService._validate_user is specific only to this implementation
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.wallet import WalletServiceABC
+from infrastructure.database.lightning_wallet import LightningWalletDbModel
+from infrastructure.database.wallet_transactions import WalletTransactionRepo
+from infrastructure.database.wallet_transactions.dtos import WalletTransactionDto, WalletHistorySyncStateDto
+from infrastructure.lnbits import LNBitsClient
+from infrastructure.lnbits.schemas import LightningPaymentSchema
+
+
+class WalletHistorySynchronizer:
+    """
+    Mirrors the LNBits payment history of a wallet into the database.
+
+    LNBits lists payments newest first, so the new entries are read from the head of the history
+    down to the high-water mark of the mirrored ones. The first synchronization walks the whole
+    history, a bounded number of pages per run, keeping its offset in the sync state.
+    """
+    PAGE_SIZE = 100
+    MAX_PAGES = 20
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+        self._repo = WalletTransactionRepo(session)
+
+    async def _fetch_page(self, wallet: LightningWalletDbModel, offset: int) -> list[LightningPaymentSchema]:
+        page = await LNBitsClient().get_payments(wallet.inkey, offset=offset, limit=self.PAGE_SIZE)
+        await self._repo.upsert_transactions(
+            wallet.id,
+            [
+                WalletTransactionDto(
+                    checking_id=payment.checking_id,
+                    pending=payment.pending,
+                    amount_msat=payment.amount,
+                    memo=payment.memo,
+                    time=payment.time
+                )
+                for payment in page
+            ]
+        )
+        return page
+
+    async def sync(self, wallet: LightningWalletDbModel) -> None:
+        """
+        Throws **WalletAPIException** if the history couldn't be fetched.
+        :param wallet: The wallet to synchronize
+        :return: None
+        """
+        state = await self._repo.get_sync_state(wallet.id)
+        backfilled = state is not None and state.backfilled
+        backfill_offset = state.backfill_offset if state is not None else 0
+        pages_left = self.MAX_PAGES
+
+        high_water_mark = await self._repo.get_high_water_mark(wallet.id)
+        if high_water_mark is not None:
+            offset = 0
+            while pages_left:
+                page = await self._fetch_page(wallet, offset)
+                pages_left -= 1
+                offset += len(page)
+                if len(page) < self.PAGE_SIZE or page[-1].time < high_water_mark:
+                    break
+            else:
+                # Too many new entries to reach the mirrored ones, the rest is left for the backfill.
+                # Offsets only grow as new payments arrive, so the smaller one is safe to resume from.
+                backfill_offset = offset if backfilled else min(offset, backfill_offset)
+                backfilled = False
+
+        while not backfilled and pages_left:
+            page = await self._fetch_page(wallet, backfill_offset)
+            pages_left -= 1
+            backfill_offset += len(page)
+            backfilled = len(page) < self.PAGE_SIZE
+
+        await self._repo.save_sync_state(
+            WalletHistorySyncStateDto(
+                wallet_id=wallet.id,
+                backfilled=backfilled,
+                backfill_offset=backfill_offset
+            )
+        )
+
+
+class WalletHistorySyncJob:
+    """
+    Keeps the wallet history mirrors up to date.
+    Every round synchronizes a bounded batch of wallets, the ones flagged as changed go first.
+    """
+
+    _wallet_service: WalletServiceABC
+    _interval: float = 60
+    _batch_size: int = 20
+
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def setup(
+        cls,
+        wallet_service: WalletServiceABC,
+        interval: float = 60,
+        batch_size: int = 20
+    ) -> None:
+        cls._wallet_service = wallet_service
+        cls._interval = interval
+        cls._batch_size = batch_size
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._task = asyncio.create_task(cls._sync_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    async def _sync_periodically(cls) -> None:
+        while True:
+            try:
+                synced = await cls._wallet_service.sync_wallet_histories(cls._batch_size)
+                if synced:
+                    logging.debug("%s wallet histories synchronized", synced)
+            except Exception as e:
+                logging.exception("Wallet history synchronization failed: %r", e)
+            await asyncio.sleep(cls._interval)
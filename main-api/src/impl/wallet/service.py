@@ -1,6 +1,7 @@
-from uuid import UUID
-
 import asyncio
+import datetime
+import logging
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,25 +12,64 @@ from domain.wallet.exceptions import (
     WalletNotFound,
     CouldNotCreateInvoice,
     InsufficientFunds,
-    CouldNotPayInvoice
+    CouldNotPayInvoice,
+    DepositNotFound
+)
+from domain.wallet.schemas import (
+    WalletDetailSchema,
+    LightningTransactionSchema,
+    InvoiceCreationSchema,
+    DepositSchema,
+    DepositStatus,
+    TransactionType,
+    WalletHistoryFiltersSchema,
+    WalletHistoryCursorSchema
 )
-from domain.wallet.schemas import WalletDetailSchema, LightningTransactionSchema, InvoiceCreationSchema
 from infrastructure.database import SessionScope
+from infrastructure.database._abstract.dtos import Pagination
+from infrastructure.database.lightning_invoices import LightningInvoiceRepo
+from infrastructure.database.lightning_invoices.dtos import CreateLightningInvoiceDto
 from infrastructure.database.lightning_wallet import LightningWalletRepo, LightningWalletDbModel
 from infrastructure.database.lightning_wallet.dtos import LightningWalletDTO
+from infrastructure.database.wallet_transactions import WalletTransactionRepo
+from infrastructure.database.wallet_transactions.dtos import WalletTransactionFiltersDto, WalletTransactionCursorDto
 from infrastructure.lnbits import LNBitsClient
 from infrastructure.branta import BrantaClient
+from infrastructure.resilience import RetryPolicy
+from infrastructure.tasks import TaskSupervisor
 
 from infrastructure.lnbits.exceptions import (
     WalletCreationFailure,
     WalletFetchFailure,
     WalletAPIException,
     NotEnoughSats,
-    PayInvoiceFailure
+    PayInvoiceFailure,
+    LNBitsUnavailable
+)
+
+from .history import WalletHistorySynchronizer
+from .settlement import DepositSettlementNotifier
+
+
+VERIFY_DEPOSIT_INVOICE_TASK = TaskSupervisor.register(
+    "branta_verify_invoice",
+    RetryPolicy(max_attempts=3, base_delay=1, max_delay=10)
 )
 
 
+def _to_unix_time(value: datetime.datetime) -> int:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return int(value.timestamp())
+
+
 class WalletService(WalletServiceABC):
+    DEPOSIT_EXPIRY_SECONDS = 3600
+    DEPOSIT_EXPIRY_GRACE = datetime.timedelta(minutes=10)
+    DEPOSIT_CHECK_CONCURRENCY = 5
+    DEPOSIT_WAIT_RECHECK_SECONDS = 5
+    HISTORY_SYNC_STALE_AFTER = datetime.timedelta(minutes=10)
+    HISTORY_SYNC_CONCURRENCY = 5
 
     async def _create_wallet(
             self,
@@ -92,6 +132,20 @@ class WalletService(WalletServiceABC):
             total_sats=wallet_api_details.balance / 1000,
         )
 
+    async def _sync_wallet_history(self, wallet: LightningWalletDbModel) -> bool:
+        """
+        Synchronizes the wallet history mirror in its own transaction.
+        :return: False if the wallet API failed
+        """
+        async with SessionScope.get_session() as session:
+            try:
+                await WalletHistorySynchronizer(session).sync(wallet)
+            except WalletAPIException as e:
+                logging.warning("Could not synchronize history of wallet %s: %r", wallet.id, e)
+                return False
+            await session.commit()
+            return True
+
     async def _get_requested_amount(self, invoice: str) -> float:
         return (await LNBitsClient().decode_invoice(invoice)).amount_msat / 1000
 
@@ -119,15 +173,34 @@ class WalletService(WalletServiceABC):
             wallet = await self._get_wallet(session, wallet_owner_id)
 
             try:
-                invoice = await LNBitsClient().create_invoice(
+                invoice = await LNBitsClient().create_deposit_invoice(
                     inkey=wallet.inkey,
-                    amount_sats=amount_sats
+                    amount_sats=amount_sats,
+                    expiry=self.DEPOSIT_EXPIRY_SECONDS
                 )
+            except LNBitsUnavailable:
+                raise
             except WalletAPIException:
                 raise CouldNotCreateInvoice
-            
-            asyncio.create_task(BrantaClient().verify_invoice(invoice.invoice))
-            
+
+            await LightningInvoiceRepo(session).create_invoice(
+                CreateLightningInvoiceDto(
+                    user_id=wallet_owner_id,
+                    checking_id=invoice.checking_id,
+                    payment_request=invoice.invoice,
+                    amount_sats=amount_sats,
+                    expires_at=datetime.datetime.utcnow() + datetime.timedelta(seconds=self.DEPOSIT_EXPIRY_SECONDS)
+                )
+            )
+            await WalletTransactionRepo(session).mark_needs_sync([wallet.id])
+            await session.commit()
+
+            if BrantaClient.is_enabled():
+                TaskSupervisor.submit(
+                    VERIFY_DEPOSIT_INVOICE_TASK,
+                    lambda: BrantaClient.verify_invoice(invoice.invoice)
+                )
+
             return invoice
 
     async def pay_invoice(self, payer_id: UUID, invoice: str) -> None:
@@ -144,11 +217,148 @@ class WalletService(WalletServiceABC):
             except PayInvoiceFailure:
                 raise CouldNotPayInvoice
 
+            await WalletTransactionRepo(session).mark_needs_sync([payer_wallet.id])
+            await session.commit()
+
     async def get_wallet_history(
         self,
         user_id: UUID,
-        pagination: PaginationSchema
+        pagination: PaginationSchema,
+        filters: WalletHistoryFiltersSchema | None = None,
+        cursor: WalletHistoryCursorSchema | None = None
     ) -> list[LightningTransactionSchema]:
         async with SessionScope.get_session() as session:
             wallet = await self._get_wallet(session, user_id)
-            return await LNBitsClient().get_wallet_history(wallet.inkey, pagination)
+            transaction_repo = WalletTransactionRepo(session)
+
+            if await transaction_repo.get_sync_state(wallet.id) is None:
+                # Never synchronized yet, mirror the newest entries right away.
+                # If the wallet API is down, the empty mirror is served.
+                await self._sync_wallet_history(wallet)
+
+            filters_dto = None
+            if filters is not None:
+                filters_dto = WalletTransactionFiltersDto(
+                    incoming=None if filters.type is None else filters.type == TransactionType.INCOMING,
+                    since=None if filters.since is None else _to_unix_time(filters.since),
+                    until=None if filters.until is None else _to_unix_time(filters.until)
+                )
+
+            transactions = await transaction_repo.list_transactions(
+                wallet.id,
+                pagination=Pagination(skip=pagination.skip, limit=pagination.limit),
+                filters=filters_dto,
+                cursor=None if cursor is None else WalletTransactionCursorDto(time=cursor.time, checking_id=cursor.checking_id)
+            )
+            return [
+                LightningTransactionSchema(
+                    checking_id=transaction.checking_id,
+                    pending=transaction.pending,
+                    amount=transaction.amount_msat / 1000,  # In sats, not msats
+                    memo=transaction.memo,
+                    time=transaction.time
+                )
+                for transaction in transactions
+            ]
+
+    async def sync_wallet_histories(self, limit: int) -> int:
+        async with SessionScope.get_session() as session:
+            wallets = await WalletTransactionRepo(session).list_wallets_to_sync(limit, self.HISTORY_SYNC_STALE_AFTER)
+
+        semaphore = asyncio.Semaphore(self.HISTORY_SYNC_CONCURRENCY)
+
+        async def sync(wallet: LightningWalletDbModel) -> bool:
+            async with semaphore:
+                return await self._sync_wallet_history(wallet)
+
+        return sum(await asyncio.gather(*[sync(wallet) for wallet in wallets]))
+
+    async def get_deposit(self, user_id: UUID, checking_id: str) -> DepositSchema:
+        async with SessionScope.get_session() as session:
+            invoice = await LightningInvoiceRepo(session).get_invoice_by_checking_id(checking_id, user_id=user_id)
+            if invoice is None:
+                raise DepositNotFound
+            return DepositSchema.model_validate(invoice)
+
+    async def wait_for_deposit(self, user_id: UUID, checking_id: str, timeout: float) -> DepositSchema:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            deposit = await self.get_deposit(user_id, checking_id)
+            remaining = deadline - loop.time()
+            if deposit.status != DepositStatus.PENDING or remaining <= 0:
+                return deposit
+            # Re-reading periodically covers settlements recorded by other processes
+            await DepositSettlementNotifier.wait(checking_id, min(remaining, self.DEPOSIT_WAIT_RECHECK_SECONDS))
+
+    async def settle_deposit(self, checking_id: str) -> DepositSchema | None:
+        async with SessionScope.get_session() as session:
+            invoice = await LightningInvoiceRepo(session).get_invoice_by_checking_id(checking_id)
+            if invoice is None:
+                return None
+            if invoice.status == DepositStatus.PAID:
+                return DepositSchema.model_validate(invoice)
+            wallet = await self._get_wallet(session, invoice.user_id)
+
+        # Checked with no session open, not to hold a connection during the LNBits round-trip
+        payment = await LNBitsClient().get_payment(wallet.inkey, checking_id)
+        if not payment.paid:
+            return DepositSchema.model_validate(invoice)
+
+        async with SessionScope.get_session() as session:
+            invoice = await LightningInvoiceRepo(session).mark_paid(checking_id) or invoice
+            await WalletTransactionRepo(session).mark_needs_sync([wallet.id])
+            await session.commit()
+
+        DepositSettlementNotifier.notify(checking_id)
+        return DepositSchema.model_validate(invoice)
+
+    async def check_pending_deposits(self, limit: int) -> int:
+        async with SessionScope.get_session() as session:
+            invoice_repo = LightningInvoiceRepo(session)
+            await invoice_repo.expire_invoices(self.DEPOSIT_EXPIRY_GRACE)
+
+            invoices = await invoice_repo.list_pending_invoices(limit, self.DEPOSIT_EXPIRY_GRACE)
+            wallets = {
+                wallet.user_id: wallet
+                for wallet in await LightningWalletRepo(session).get_wallets_by_user_ids(
+                    list({invoice.user_id for invoice in invoices})
+                )
+            }
+            await session.commit()
+
+        semaphore = asyncio.Semaphore(self.DEPOSIT_CHECK_CONCURRENCY)
+        lnbits_client = LNBitsClient()
+
+        async def is_paid(checking_id: str, inkey: str) -> bool:
+            async with semaphore:
+                try:
+                    return (await lnbits_client.get_payment(inkey, checking_id)).paid
+                except WalletAPIException as e:
+                    logging.warning("Could not check deposit %s: %r", checking_id, e)
+                    return False
+
+        # Checked with no session open, so the batch doesn't hold a connection and the expired rows
+        # for the LNBits round-trips. The results are recorded in a short transaction of their own.
+        checked = [invoice for invoice in invoices if invoice.user_id in wallets]
+        results = await asyncio.gather(*[
+            is_paid(invoice.checking_id, wallets[invoice.user_id].inkey)
+            for invoice in checked
+        ])
+        settled_ids = [invoice.checking_id for invoice, paid in zip(checked, results) if paid]
+
+        async with SessionScope.get_session() as session:
+            invoice_repo = LightningInvoiceRepo(session)
+            for checking_id in settled_ids:
+                await invoice_repo.mark_paid(checking_id)
+            await invoice_repo.touch_invoices(
+                [invoice.checking_id for invoice in invoices if invoice.checking_id not in settled_ids]
+            )
+            await WalletTransactionRepo(session).mark_needs_sync(list({
+                wallets[invoice.user_id].id for invoice in checked if invoice.checking_id in settled_ids
+            }))
+            await session.commit()
+
+        for checking_id in settled_ids:
+            DepositSettlementNotifier.notify(checking_id)
+        return len(settled_ids)
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+
+from domain.wallet import WalletServiceABC
+
+
+class DepositSettlementNotifier:
+    """
+    Wakes up requests waiting for a deposit settled by this process.
+    Settlements recorded by other processes are picked up by the waiters re-reading the database.
+    """
+
+    _waiters: dict[str, set[asyncio.Event]] = {}
+
+    @classmethod
+    def notify(cls, checking_id: str) -> None:
+        for event in cls._waiters.get(checking_id, set()):
+            event.set()
+
+    @classmethod
+    async def wait(cls, checking_id: str, timeout: float) -> bool:
+        """
+        Waits for the deposit to be settled.
+        :return: True if notified before the timeout
+        """
+        event = asyncio.Event()
+        cls._waiters.setdefault(checking_id, set()).add(event)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = cls._waiters.get(checking_id, set())
+            waiters.discard(event)
+            if not waiters:
+                cls._waiters.pop(checking_id, None)
+
+
+class DepositSettlementListener:
+    """
+    Polls pending deposits as a fallback for LNBits webhooks that were not delivered.
+    Every round checks a bounded batch, so the load on LNBits doesn't grow with the number of open invoices.
+    """
+
+    _wallet_service: WalletServiceABC
+    _poll_interval: float = 30
+    _batch_size: int = 50
+
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def setup(
+        cls,
+        wallet_service: WalletServiceABC,
+        poll_interval: float = 30,
+        batch_size: int = 50
+    ) -> None:
+        cls._wallet_service = wallet_service
+        cls._poll_interval = poll_interval
+        cls._batch_size = batch_size
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._task = asyncio.create_task(cls._poll_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    async def _poll_periodically(cls) -> None:
+        while True:
+            try:
+                settled = await cls._wallet_service.check_pending_deposits(cls._batch_size)
+                if settled:
+                    logging.info("%s deposits settled by polling", settled)
+            except Exception as e:
+                logging.exception("Deposit polling failed: %r", e)
+            await asyncio.sleep(cls._poll_interval)
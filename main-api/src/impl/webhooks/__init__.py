@@ -0,0 +1,4 @@
+from .service import WebhookService
+
+
+__all__ = ["WebhookService"]
@@ -0,0 +1,50 @@
+import datetime
+
+from domain.webhooks import WebhookServiceABC
+from domain.webhooks.schemas import CreateWebhookDeliverySchema, WebhookDeliverySchema
+from infrastructure.database import SessionScope
+from infrastructure.database.webhook_deliveries import GithubWebhookDeliveryRepo
+from infrastructure.database.webhook_deliveries.dtos import CreateGithubWebhookDeliveryDto
+
+
+class WebhookService(WebhookServiceABC):
+    MAX_ATTEMPTS = 5
+    PROCESSING_TIMEOUT = datetime.timedelta(minutes=10)
+
+    async def register_delivery(self, schema: CreateWebhookDeliverySchema) -> bool:
+        async with SessionScope.get_session() as session:
+            delivery = await GithubWebhookDeliveryRepo(session).create_delivery_if_new(
+                CreateGithubWebhookDeliveryDto(**schema.model_dump())
+            )
+            await session.commit()
+            return delivery is not None
+
+    async def claim_delivery(self, delivery_id: str) -> WebhookDeliverySchema | None:
+        async with SessionScope.get_session() as session:
+            delivery = await GithubWebhookDeliveryRepo(session).claim_delivery(delivery_id)
+            await session.commit()
+            return WebhookDeliverySchema.model_validate(delivery) if delivery is not None else None
+
+    async def claim_pending_deliveries(self, limit: int) -> list[WebhookDeliverySchema]:
+        async with SessionScope.get_session() as session:
+            deliveries = await GithubWebhookDeliveryRepo(session).claim_pending_deliveries(
+                limit=limit,
+                max_attempts=self.MAX_ATTEMPTS,
+                stale_after=self.PROCESSING_TIMEOUT
+            )
+            await session.commit()
+            return [WebhookDeliverySchema.model_validate(delivery) for delivery in deliveries]
+
+    async def complete_delivery(self, delivery_id: str) -> None:
+        async with SessionScope.get_session() as session:
+            await GithubWebhookDeliveryRepo(session).mark_processed(delivery_id)
+            await session.commit()
+
+    async def fail_delivery(self, delivery: WebhookDeliverySchema, error: str) -> None:
+        async with SessionScope.get_session() as session:
+            await GithubWebhookDeliveryRepo(session).mark_failed(
+                delivery_id=delivery.delivery_id,
+                error=error,
+                retry=delivery.attempts < self.MAX_ATTEMPTS
+            )
+            await session.commit()
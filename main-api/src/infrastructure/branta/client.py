@@ -1,38 +1,48 @@
-import httpx
+from infrastructure.resilience import ResilientHTTPClient
+from infrastructure.tracing import traced
+
 
 class BrantaClient:
     _url_base: str = ""
     _api_key:  str = ""
 
+    _http = ResilientHTTPClient("branta", timeout=5)
+
     @classmethod
-    def setup(cls, url_base: str, api_key: str) -> None:
+    def setup(cls, url_base: str, api_key: str, timeout: float = 5) -> None:
         cls._url_base = url_base
         cls._api_key = api_key
+        cls._http.configure(timeout=timeout)
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._url_base != "" and cls._api_key != ""
 
     @classmethod
+    @traced("branta.verify_invoice")
     async def verify_invoice(cls, invoice: str) -> bool:
-        if cls._url_base == "" or cls._api_key == "":
+        if not cls.is_enabled():
             raise Exception("Branta client not set up")
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"https://{cls._url_base}/v1/payments",
-                    headers={
-                        "API_KEY": cls._api_key,
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "payment": {
-                            "description": "Account Deposit",
-                            "merchant": "Lightning Bounties",
-                            "payment": invoice,
-                            "ttl": "86400",
-                        }
+            response = await cls._http.request(
+                "POST",
+                f"https://{cls._url_base}/v1/payments",
+                idempotent=False,
+                headers={
+                    "API_KEY": cls._api_key,
+                    "Content-Type": "application/json",
+                },
+                json={
+                    "payment": {
+                        "description": "Account Deposit",
+                        "merchant": "Lightning Bounties",
+                        "payment": invoice,
+                        "ttl": "86400",
                     }
-                )
+                }
+            )
             if response.status_code != 201:
                 raise Exception("Branta did not return 201")
             return True
         except Exception as e:
             raise Exception(f"Branta API call failed: {e}")
-        
\ No newline at end of file
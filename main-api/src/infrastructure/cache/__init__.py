@@ -0,0 +1,18 @@
+from .backends import CacheBackendABC, InMemoryCacheBackend
+from .cache import Cache
+from .exceptions import CacheException, CacheUnavailable
+from .invalidation import notify_invalidation, invalidate_committed, CacheInvalidationListener
+from .redis import RedisCacheBackend
+
+
+__all__ = [
+    "Cache",
+    "CacheBackendABC",
+    "InMemoryCacheBackend",
+    "RedisCacheBackend",
+    "CacheException",
+    "CacheUnavailable",
+    "notify_invalidation",
+    "invalidate_committed",
+    "CacheInvalidationListener"
+]
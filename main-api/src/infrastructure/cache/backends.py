@@ -0,0 +1,179 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable, NamedTuple
+
+
+class CacheBackendABC(ABC):
+    """
+    Values are bytes, serialization is up to the callers.
+    **ttl** is in seconds, None keeps the entry until it's evicted or invalidated.
+    **shared** backends are seen by all the API instances, the others live in the process.
+    """
+    shared: bool = False
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        :param key: Cache key
+        :return: The value or None if it's missing or expired
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float | None = None, tags: Iterable[str] = ()) -> None:
+        """
+        :param key: Cache key
+        :param value: Value to store
+        :param ttl: Time to live in seconds
+        :param tags: Tags the entry is invalidated with
+        :return: None
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_ttl(self, key: str) -> float | None:
+        """
+        :param key: Cache key
+        :return: Remaining time to live in seconds, None if the entry is missing or doesn't expire
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        """
+        :param key: Cache key
+        :return: True if the entry existed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: bytes | None,
+        value: bytes,
+        ttl: float | None = None,
+        tags: Iterable[str] = ()
+    ) -> bool:
+        """
+        Stores the value only if the current one is **expected**.
+        :param key: Cache key
+        :param expected: The value the entry must have, None if it must be missing
+        :param value: Value to store
+        :param ttl: Time to live in seconds
+        :param tags: Tags the entry is invalidated with
+        :return: True if the value was stored
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Deletes every entry stored with any of the tags.
+        :param tags: Tags to invalidate
+        :return: Number of deleted entries
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        Deletes every entry.
+        :return: None
+        """
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class _Entry(NamedTuple):
+    value: bytes
+    expires_at: float | None
+    tags: frozenset[str]
+
+
+class InMemoryCacheBackend(CacheBackendABC):
+    """
+    Least recently used entries of the process memory. Each API instance has its own cache.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._tagged_keys: dict[str, set[str]] = {}
+
+    def _get_entry(self, key: str) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry.tags:
+            keys = self._tagged_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged_keys[tag]
+        return True
+
+    def _store(self, key: str, value: bytes, ttl: float | None, tags: Iterable[str]) -> None:
+        self._remove(key)
+        entry = _Entry(
+            value=value,
+            expires_at=time.monotonic() + ttl if ttl is not None else None,
+            tags=frozenset(tags)
+        )
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tagged_keys.setdefault(tag, set()).add(key)
+        while len(self._entries) > self._max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._get_entry(key)
+        return entry.value if entry is not None else None
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None, tags: Iterable[str] = ()) -> None:
+        self._store(key, value, ttl, tags)
+
+    async def get_ttl(self, key: str) -> float | None:
+        entry = self._get_entry(key)
+        if entry is None or entry.expires_at is None:
+            return None
+        return max(entry.expires_at - time.monotonic(), 0)
+
+    async def delete(self, key: str) -> bool:
+        return self._remove(key)
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: bytes | None,
+        value: bytes,
+        ttl: float | None = None,
+        tags: Iterable[str] = ()
+    ) -> bool:
+        # Nothing is awaited in between, so the check and the write are atomic within the event loop
+        entry = self._get_entry(key)
+        if (entry.value if entry is not None else None) != expected:
+            return False
+        self._store(key, value, ttl, tags)
+        return True
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        keys = set().union(*(self._tagged_keys.get(tag, set()) for tag in tags))
+        return sum(self._remove(key) for key in keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tagged_keys.clear()
@@ -0,0 +1,69 @@
+from typing import Iterable
+
+from infrastructure.metrics import MetricsRegistry
+from .backends import CacheBackendABC, InMemoryCacheBackend
+
+
+_REQUESTS = MetricsRegistry.counter(
+    "cache_requests_total",
+    "Number of cache reads by outcome.",
+    ("outcome",)
+)
+
+
+class Cache:
+    """
+    Process-wide cache on top of the configured backend.
+    Memory by default, so the app works without a cache server.
+    """
+
+    _backend: CacheBackendABC = InMemoryCacheBackend()
+
+    @classmethod
+    def setup(cls, backend: CacheBackendABC) -> None:
+        cls._backend = backend
+
+    @classmethod
+    def is_shared(cls) -> bool:
+        return cls._backend.shared
+
+    @classmethod
+    async def get(cls, key: str) -> bytes | None:
+        value = await cls._backend.get(key)
+        _REQUESTS.inc(outcome="hit" if value is not None else "miss")
+        return value
+
+    @classmethod
+    async def set(cls, key: str, value: bytes, ttl: float | None = None, tags: Iterable[str] = ()) -> None:
+        await cls._backend.set(key, value, ttl=ttl, tags=tags)
+
+    @classmethod
+    async def get_ttl(cls, key: str) -> float | None:
+        return await cls._backend.get_ttl(key)
+
+    @classmethod
+    async def delete(cls, key: str) -> bool:
+        return await cls._backend.delete(key)
+
+    @classmethod
+    async def compare_and_set(
+        cls,
+        key: str,
+        expected: bytes | None,
+        value: bytes,
+        ttl: float | None = None,
+        tags: Iterable[str] = ()
+    ) -> bool:
+        return await cls._backend.compare_and_set(key, expected, value, ttl=ttl, tags=tags)
+
+    @classmethod
+    async def invalidate_tags(cls, *tags: str) -> int:
+        return await cls._backend.invalidate_tags(*tags)
+
+    @classmethod
+    async def clear(cls) -> None:
+        await cls._backend.clear()
+
+    @classmethod
+    async def close(cls) -> None:
+        await cls._backend.close()
@@ -0,0 +1,16 @@
+from infrastructure.common.exceptions import InfrastructureException
+
+
+class CacheException(InfrastructureException):
+    """Base class for cache exceptions"""
+    pass
+
+
+class CacheUnavailable(CacheException):
+    """The cache server couldn't be reached or didn't respond in time"""
+    pass
+
+
+class RedisError(CacheException):
+    """The cache server replied with an error"""
+    pass
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+from typing import Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database import listen
+from infrastructure.metrics import MetricsRegistry
+from infrastructure.resilience import RetryPolicy
+from infrastructure.tasks import TaskSupervisor
+from .cache import Cache
+from .exceptions import CacheException
+
+
+INVALIDATION_CHANNEL = "cache_invalidation"
+# NOTIFY payloads are limited to 8000 bytes
+MAX_TAGS_PER_NOTIFICATION = 100
+
+INVALIDATE_TAGS_TASK = TaskSupervisor.register(
+    "cache_invalidate_tags",
+    RetryPolicy(max_attempts=5, base_delay=0.5, max_delay=10)
+)
+
+_INVALIDATIONS = MetricsRegistry.counter(
+    "cache_invalidations_total",
+    "Number of cache invalidation notifications by origin.",
+    ("origin",)
+)
+
+
+async def notify_invalidation(session: AsyncSession, tags: Iterable[str]) -> None:
+    """
+    Queues the invalidation of the tags for all the API instances.
+    Postgres delivers notifications when the transaction commits and drops them on rollback,
+    so the other instances never evict before the change is visible to them.
+    :param session: Session of the transaction changing the tagged entities
+    :param tags: Tags of the changed entities
+    :return: None
+    """
+    tags = sorted(set(tags))
+    for start in range(0, len(tags), MAX_TAGS_PER_NOTIFICATION):
+        payload = json.dumps(tags[start:start + MAX_TAGS_PER_NOTIFICATION])
+        await session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+
+async def invalidate_committed(tags: Iterable[str]) -> None:
+    """
+    Evicts the tags from the cache of this instance, or the shared one, right after the commit.
+    The write already succeeded, so a failed eviction doesn't fail the caller,
+    it's retried in the background instead.
+    :param tags: Tags of the changed entities
+    :return: None
+    """
+    tags = list(tags)
+    if not tags:
+        return
+    try:
+        await Cache.invalidate_tags(*tags)
+        _INVALIDATIONS.inc(origin="local")
+    except CacheException as e:
+        logging.warning("Cache invalidation failed, retrying in the background: %r", e)
+        TaskSupervisor.submit(INVALIDATE_TAGS_TASK, lambda: Cache.invalidate_tags(*tags))
+
+
+class CacheInvalidationListener:
+    """
+    Evicts the entries invalidated by the other API instances from the cache of this one.
+
+    Notifications sent while the connection is down are lost, so the whole cache is cleared on reconnect.
+    A shared cache is invalidated by the writers themselves, so there is nothing to listen for.
+    """
+
+    _connect_kwargs: dict = {}
+    _reconnect_delay: float = 5
+    _keepalive_interval: float = 30
+
+    _queue: asyncio.Queue[str] | None = None
+    _tasks: list[asyncio.Task] = []
+
+    @classmethod
+    def setup(
+        cls,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        reconnect_delay: float = 5,
+        keepalive_interval: float = 30
+    ) -> None:
+        cls._connect_kwargs = dict(host=host, port=port, user=user, password=password, database=database)
+        cls._reconnect_delay = reconnect_delay
+        cls._keepalive_interval = keepalive_interval
+
+    @classmethod
+    async def start(cls) -> None:
+        if Cache.is_shared():
+            return
+        cls._queue = asyncio.Queue()
+        cls._tasks = [
+            asyncio.create_task(cls._listen()),
+            asyncio.create_task(cls._evict())
+        ]
+
+    @classmethod
+    async def stop(cls) -> None:
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+        cls._queue = None
+
+    @classmethod
+    def _on_notification(cls, payload: str) -> None:
+        cls._queue.put_nowait(payload)
+
+    @classmethod
+    async def _on_reconnect(cls) -> None:
+        await Cache.clear()
+
+    @classmethod
+    async def _listen(cls) -> None:
+        await listen(
+            cls._connect_kwargs,
+            INVALIDATION_CHANNEL,
+            cls._on_notification,
+            cls._on_reconnect,
+            reconnect_delay=cls._reconnect_delay,
+            keepalive_interval=cls._keepalive_interval
+        )
+
+    @classmethod
+    async def _evict(cls) -> None:
+        while True:
+            payload = await cls._queue.get()
+            try:
+                await Cache.invalidate_tags(*json.loads(payload))
+                _INVALIDATIONS.inc(origin="notification")
+            except Exception as e:
+                logging.exception("Cache invalidation failed: %r", e)
@@ -0,0 +1,108 @@
+import math
+from typing import Iterable
+
+from .backends import CacheBackendABC
+from .exceptions import RedisError
+from .resp import RedisConnection, RedisConnectionPool
+
+
+class RedisCacheBackend(CacheBackendABC):
+    """
+    Keeps the entries on a Redis-protocol server shared by all the API instances.
+
+    Every tag is a set of the keys stored with it. Invalidating a tag deletes its keys and the set itself,
+    entries that expired in the meantime are just skipped.
+    """
+    shared = True
+
+    def __init__(self, url: str, namespace: str = "bh", max_connections: int = 10, timeout: float = 1):
+        self._pool = RedisConnectionPool(url, max_connections=max_connections, timeout=timeout)
+        self._namespace = namespace
+
+    def _key(self, key: str) -> str:
+        return f"{self._namespace}:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self._namespace}:tag:{tag}"
+
+    def _set_commands(self, key: str, value: bytes, ttl: float | None, tags: Iterable[str]) -> list[tuple]:
+        full_key = self._key(key)
+        set_command = ("SET", full_key, value)
+        if ttl is not None:
+            set_command += ("PX", max(math.ceil(ttl * 1000), 1))
+        return [set_command, *(("SADD", self._tag_key(tag), full_key) for tag in tags)]
+
+    @staticmethod
+    async def _execute_pipeline(connection: RedisConnection, commands: list[tuple]) -> list:
+        replies = await connection.pipeline(*commands)
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def get(self, key: str) -> bytes | None:
+        async with self._pool.connection() as connection:
+            return await connection.execute("GET", self._key(key))
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None, tags: Iterable[str] = ()) -> None:
+        async with self._pool.connection() as connection:
+            await self._execute_pipeline(connection, self._set_commands(key, value, ttl, tags))
+
+    async def get_ttl(self, key: str) -> float | None:
+        async with self._pool.connection() as connection:
+            ttl_ms = await connection.execute("PTTL", self._key(key))
+        # -2 if the key is missing, -1 if it doesn't expire
+        return ttl_ms / 1000 if ttl_ms >= 0 else None
+
+    async def delete(self, key: str) -> bool:
+        async with self._pool.connection() as connection:
+            return await connection.execute("DEL", self._key(key)) > 0
+
+    async def compare_and_set(
+        self,
+        key: str,
+        expected: bytes | None,
+        value: bytes,
+        ttl: float | None = None,
+        tags: Iterable[str] = ()
+    ) -> bool:
+        full_key = self._key(key)
+        async with self._pool.connection() as connection:
+            # Optimistic transaction: EXEC is aborted if the key changes after WATCH
+            await connection.execute("WATCH", full_key)
+            if await connection.execute("GET", full_key) != expected:
+                await connection.execute("UNWATCH")
+                return False
+            replies = await connection.pipeline(
+                ("MULTI",),
+                *self._set_commands(key, value, ttl, tags),
+                ("EXEC",)
+            )
+        results = replies[-1]
+        if isinstance(results, RedisError):
+            raise results
+        return results is not None
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        if not tags:
+            return 0
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        async with self._pool.connection() as connection:
+            members = await connection.execute("SUNION", *tag_keys)
+            # The tag sets go first, so keys tagged in between keep their tags for the next invalidation
+            replies = await self._execute_pipeline(connection, [("DEL", *tag_keys), *(("DEL", key) for key in members)])
+        return sum(replies[1:])
+
+    async def clear(self) -> None:
+        cursor = b"0"
+        while True:
+            # Short connection holds, so the other callers aren't blocked by a large keyspace
+            async with self._pool.connection() as connection:
+                cursor, keys = await connection.execute("SCAN", cursor, "MATCH", f"{self._namespace}:*", "COUNT", 500)
+                if keys:
+                    await connection.execute("DEL", *keys)
+            if cursor == b"0":
+                return
+
+    async def close(self) -> None:
+        await self._pool.close()
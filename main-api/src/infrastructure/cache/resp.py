@@ -0,0 +1,144 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
+
+from .exceptions import CacheUnavailable, RedisError
+
+
+def encode_command(*args: str | bytes | int | float) -> bytes:
+    """
+    Encodes a command as a RESP array of bulk strings.
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        elif not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+class RedisConnection:
+    """
+    Single connection speaking RESP2, the protocol of Redis and its compatible servers.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, host: str, port: int, password: str | None = None, db: int = 0) -> "RedisConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        connection = cls(reader, writer)
+        if password:
+            await connection.execute("AUTH", password)
+        if db:
+            await connection.execute("SELECT", db)
+        return connection
+
+    @property
+    def is_closed(self) -> bool:
+        return self._writer.is_closing()
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readuntil(b"\r\n")
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            # Returned instead of raised, so the rest of a pipeline is still read
+            return RedisError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            return (await self._reader.readexactly(length + 2))[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    async def pipeline(self, *commands: tuple) -> list[Any]:
+        """
+        Sends the commands in one write and reads their replies.
+        Error replies are returned as **RedisError** instances.
+        """
+        self._writer.write(b"".join(encode_command(*command) for command in commands))
+        await self._writer.drain()
+        return [await self._read_reply() for _ in commands]
+
+    async def execute(self, *args: str | bytes | int | float) -> Any:
+        """
+        Throws **RedisError** if the server replied with an error.
+        """
+        reply = (await self.pipeline(args))[0]
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class RedisConnectionPool:
+    """
+    Hands out connections one caller at a time, which keeps WATCH/MULTI transactions on their own connection.
+    Connections that failed mid-command are dropped, since their replies may be out of sync.
+    """
+
+    def __init__(self, url: str, max_connections: int = 10, timeout: float = 1):
+        parsed_url = urlparse(url)
+        self._host = parsed_url.hostname or "127.0.0.1"
+        self._port = parsed_url.port or 6379
+        self._password = parsed_url.password
+        self._db = int(parsed_url.path.lstrip("/") or 0)
+        self._timeout = timeout
+
+        self._idle: list[RedisConnection] = []
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    async def _open(self) -> RedisConnection:
+        return await RedisConnection.open(self._host, self._port, self._password, self._db)
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[RedisConnection]:
+        """
+        Throws **CacheUnavailable** if the server couldn't be reached or didn't respond within the timeout.
+        """
+        async with self._semaphore:
+            connection = None
+            try:
+                async with asyncio.timeout(self._timeout):
+                    connection = self._idle.pop() if self._idle else await self._open()
+                    yield connection
+            except RedisError:
+                # An error reply leaves the connection usable
+                raise
+            except (OSError, asyncio.IncompleteReadError, TimeoutError) as e:
+                if connection is not None:
+                    await connection.close()
+                    connection = None
+                raise CacheUnavailable(repr(e)) from e
+            except BaseException:
+                if connection is not None:
+                    await connection.close()
+                    connection = None
+                raise
+            finally:
+                if connection is not None and not connection.is_closed:
+                    self._idle.append(connection)
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._idle.pop().close()
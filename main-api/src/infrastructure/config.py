@@ -7,20 +7,49 @@ class DatabaseConfig(BaseModel):
     user: str = "postgres"
     password: str = "postgres"
     database: str = "postgres"
+    pool_size: int = 5
 
 
 class LNBitsConfig(BaseModel):
     node_url: str
+    deposit_webhook_url: str | None = None
+    max_concurrency: int = 10
+    admission_timeout: float = 1
+    timeout: float = 10
+    payment_timeout: float = 60
 
 
 class GithubConfig(BaseModel):
     client_id: str
     client_secret: str
+    timeout: float = 10
+    app_tokens: list[str] = []
+    rate_limit_reserve: int = 100
+    max_defer: float = 5
 
 
 class BrantaConfig(BaseModel):
     url_base: str
     api_key: str
-
-
-
+    timeout: float = 5
+
+
+class TracingConfig(BaseModel):
+    """
+    **exporter**: none, file or otlp
+    """
+    exporter: str = "none"
+    file_path: str = "traces.jsonl"
+    otlp_endpoint: str = "http://127.0.0.1:4318/v1/traces"
+    sample_rate: float = 1
+    service_name: str = "bh-api"
+
+
+class CacheConfig(BaseModel):
+    """
+    **backend**: memory (per instance) or redis (shared by all the instances)
+    """
+    backend: str = "memory"
+    redis_url: str = "redis://127.0.0.1:6379/0"
+    max_entries: int = 10_000
+    namespace: str = "bh"
@@ -1,7 +1,13 @@
-from ._setup import init_db
+from ._setup import init_db, warmup_db, probe_db, dispose_db, hold_connection
 from ._session import SessionScope
+from ._listen import listen
 
 __all__ = [
     "init_db",
+    "warmup_db",
+    "probe_db",
+    "dispose_db",
+    "hold_connection",
     "SessionScope",
+    "listen",
 ]
@@ -1,9 +1,17 @@
 import abc
+from typing import Any, TypeVar
+from uuid import uuid4
 
-from sqlalchemy import Select
+from sqlalchemy import Select, Boolean, select, literal_column, union_all, exists, or_, false, true, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from .dtos import Pagination
+from .tables import IdentifiableDbModel
+
+
+IdentifiableModel = TypeVar("IdentifiableModel", bound=IdentifiableDbModel)
 
 
 class SQLAAbstractRepo(abc.ABC):
@@ -26,3 +34,70 @@ class SQLAAbstractRepo(abc.ABC):
     @staticmethod
     def lock_rows(statement: Select) -> Select:
         return statement.with_for_update()
+
+    async def _upsert(
+        self,
+        model: type[IdentifiableModel],
+        values: dict[str, Any],
+        unique_field: str,
+        update_fields: list[str]
+    ) -> tuple[IdentifiableModel, bool, bool]:
+        """
+        Creates a row or updates the one with the same **unique_field** value in a single statement.
+        The existing row is written only if any of **update_fields** differ, so unchanged rows cost no write.
+
+        Concurrent calls for the same row don't fail on the unique constraint, one of them creates the row
+        and the others get it.
+        :param model: Table model, has to have a unique constraint on **unique_field**
+        :param values: Column values of the new row
+        :param unique_field: Column identifying the row
+        :param update_fields: Columns to update on the existing row, none to never update it
+        :return: A tuple containing:
+            - The row (created, updated or unchanged).
+            - bool #1: True if the row was created, False otherwise.
+            - bool #2: True if the row was updated, False otherwise.
+        """
+        table = model.__table__
+        unique_column = table.c[unique_field]
+
+        # Python-side defaults aren't applied to an INSERT inside a CTE
+        stmt = insert(model).values(**{"id": uuid4(), **values})
+        if update_fields:
+            set_ = {field: stmt.excluded[field] for field in update_fields}
+            if "modified_at" in table.c:
+                set_["modified_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[unique_column],
+                set_=set_,
+                where=or_(*[table.c[field].is_distinct_from(stmt.excluded[field]) for field in update_fields])
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[unique_column])
+
+        # xmax is 0 only for the rows inserted by the statement
+        upserted = stmt.returning(
+            *table.c,
+            literal_column("xmax = 0", Boolean).label("created"),
+            true().label("written")
+        ).cte("upserted")
+        unchanged = select(
+            *table.c,
+            false().label("created"),
+            false().label("written")
+        ).where(
+            unique_column == values[unique_field],
+            ~exists(select(upserted.c.id))
+        )
+        rows = union_all(select(upserted), unchanged).subquery()
+
+        row = (await self._session.execute(
+            select(aliased(model, rows), rows.c.created, rows.c.written),
+            execution_options={"populate_existing": True}
+        )).first()
+        if row is not None:
+            obj, created, written = row
+            return obj, created, written and not created
+
+        # The row was created by a concurrent transaction which committed after this statement had started
+        obj = await self._session.scalar(select(model).where(unique_column == values[unique_field]))
+        return obj, False, False
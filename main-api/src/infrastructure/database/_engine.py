@@ -2,5 +2,5 @@ from sqlalchemy import URL
 from sqlalchemy.ext.asyncio import create_async_engine as create_async_engine_, AsyncEngine
 
 
-def create_async_engine(url: URL | str) -> AsyncEngine:
-    return create_async_engine_(url, future=True)
+def create_async_engine(url: URL | str, pool_size: int = 5) -> AsyncEngine:
+    return create_async_engine_(url, future=True, pool_size=pool_size)
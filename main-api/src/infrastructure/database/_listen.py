@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+import asyncpg
+
+
+async def listen(
+    connect_kwargs: dict,
+    channel: str,
+    callback: Callable[[str], None],
+    on_reconnect: Callable[[], Awaitable[None]],
+    reconnect_delay: float = 5,
+    keepalive_interval: float = 30
+) -> None:
+    """
+    Listens to the notifications of a Postgres channel until cancelled, reconnecting when the connection is lost.
+
+    Listens on a dedicated connection outside the pool, since a pooled connection
+    would stop receiving notifications once it's handed to a request.
+    :param connect_kwargs: Connection arguments of asyncpg
+    :param channel: Channel to listen to
+    :param callback: Called with the payload of every notification, it must not block
+    :param on_reconnect: Awaited once listening again after the connection was lost,
+    the notifications sent meanwhile are lost
+    :param reconnect_delay: Seconds to wait before reconnecting
+    :param keepalive_interval: Seconds of silence after which the connection is checked
+    :return: None
+    """
+    def on_notification(_connection: asyncpg.Connection, _pid: int, _channel: str, payload: str) -> None:
+        callback(payload)
+
+    connected_before = False
+    while True:
+        connection: asyncpg.Connection | None = None
+        try:
+            connection = await asyncpg.connect(**connect_kwargs)
+            terminated = asyncio.Event()
+            connection.add_termination_listener(lambda _connection: terminated.set())
+            await connection.add_listener(channel, on_notification)
+            if connected_before:
+                logging.warning("Listener of %s reconnected, notifications may have been lost", channel)
+                await on_reconnect()
+            connected_before = True
+
+            while not terminated.is_set():
+                try:
+                    await asyncio.wait_for(terminated.wait(), keepalive_interval)
+                except TimeoutError:
+                    # A silently dropped connection is only noticed when something is sent over it
+                    await connection.execute("SELECT 1", timeout=keepalive_interval)
+            logging.warning("Listener of %s connection closed", channel)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.exception("Listener of %s failed: %r", channel, e)
+        finally:
+            if connection is not None:
+                connection.terminate()
+        await asyncio.sleep(reconnect_delay)
@@ -2,6 +2,8 @@ from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
+from infrastructure.tracing import Tracer
+
 
 class SessionScope:
     _sessionmaker: async_sessionmaker[AsyncSession] | None = None
@@ -13,11 +15,12 @@ class SessionScope:
     @classmethod
     @asynccontextmanager
     async def get_session(cls) -> AsyncSession:
-        async with cls._sessionmaker() as session:
-            try:
-                yield session
-            except:
-                await session.rollback()
-                raise
-            finally:
-                await session.close()
+        with Tracer.start_span("db session"):
+            async with cls._sessionmaker() as session:
+                try:
+                    yield session
+                except:
+                    await session.rollback()
+                    raise
+                finally:
+                    await session.close()
@@ -1,16 +1,45 @@
-from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncEngine
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncConnection, AsyncEngine
+
+from infrastructure.tracing import instrument_engine
 from ._abstract.tables.base import SQLABase
 from ._engine import create_async_engine
 from ._session import SessionScope
 
-from .  import users
+from .  import users, webhook_deliveries, lightning_invoices, wallet_transactions, idempotency_keys, rate_limit_buckets, escrow_discrepancies, reserved_balances, reward_rollups
+
+
+_engine: AsyncEngine | None = None
 
 
 async def init_tables(engine: AsyncEngine, metadata: MetaData) -> None:
     async with engine.begin() as conn:
-        await conn.run_sync(metadata.create_all)
+        # create_all checks every table separately, one query is enough when nothing is missing
+        existing_tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+        missing_tables = set(metadata.tables) - set(existing_tables)
+        if missing_tables:
+            logging.info("Creating missing tables: %s", ", ".join(sorted(missing_tables)))
+            await conn.run_sync(metadata.create_all)
+
+        # create_all only creates the indexes of the tables it creates
+        existing_indexes = set(await conn.scalars(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()")
+        ))
+        missing_indexes = [
+            index
+            for table in metadata.sorted_tables
+            for index in table.indexes
+            if index.name not in existing_indexes
+        ]
+        for index in missing_indexes:
+            logging.info("Creating missing index: %s", index.name)
+            await conn.run_sync(index.create)
 
 
 async def init_db(
@@ -18,10 +47,51 @@ async def init_db(
     port: int = 5432,
     user: str = "postgres",
     password: str = "postgres",
-    database: str = "postgres"
+    database: str = "postgres",
+    pool_size: int = 5
 ) -> None:
+    global _engine
     url = f"postgresql+asyncpg://{user}:{password}@{host}:{port}/{database}"
-    async_engine = create_async_engine(url)
+    async_engine = _engine = create_async_engine(url, pool_size=pool_size)
+    instrument_engine(async_engine)
     SessionScope.init_sessionmaker(async_sessionmaker(async_engine, expire_on_commit=False))
 
     await init_tables(async_engine, SQLABase.metadata)
+
+
+async def probe_db() -> float:
+    """
+    :return: Round trip time of a trivial query in seconds
+    """
+    started_at = time.perf_counter()
+    async with SessionScope.get_session() as session:
+        await session.execute(text("SELECT 1"))
+    return time.perf_counter() - started_at
+
+
+async def warmup_db(connections: int | None = None) -> None:
+    """
+    Opens the pool connections up front, so the first requests don't pay for connecting.
+    :param connections: Number of connections to open, the whole pool by default
+    """
+    if connections is None:
+        connections = _engine.pool.size() if _engine is not None else 1
+    await asyncio.gather(*(probe_db() for _ in range(connections)))
+
+
+@asynccontextmanager
+async def hold_connection() -> AsyncIterator[AsyncConnection]:
+    """
+    Holds a pool connection in autocommit mode, so no transaction stays open while it's held,
+    e.g. for session-level locks.
+    """
+    async with _engine.connect() as connection:
+        yield await connection.execution_options(isolation_level="AUTOCOMMIT")
+
+
+async def dispose_db() -> None:
+    """
+    Closes the pool connections.
+    """
+    if _engine is not None:
+        await _engine.dispose()
@@ -0,0 +1,8 @@
+from .table import EscrowDiscrepancyDbModel
+from .repo import EscrowDiscrepancyRepo
+
+
+__all__ = [
+    "EscrowDiscrepancyDbModel",
+    "EscrowDiscrepancyRepo"
+]
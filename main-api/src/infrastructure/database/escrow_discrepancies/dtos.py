@@ -0,0 +1,14 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from domain.escrow.schemas import EscrowDiscrepancyKind
+
+
+class CreateEscrowDiscrepancyDto(BaseModel):
+    run_id: UUID
+    issue_id: UUID
+    wallet_id: str = Field(..., max_length=32)
+    kind: EscrowDiscrepancyKind
+    expected_sats: int
+    actual_sats: int | None = None
@@ -0,0 +1,27 @@
+from uuid import UUID
+
+from sqlalchemy import select
+
+from .dtos import CreateEscrowDiscrepancyDto
+from .table import EscrowDiscrepancyDbModel
+from .._abstract.repo import SQLAAbstractRepo
+
+
+class EscrowDiscrepancyRepo(SQLAAbstractRepo):
+
+    async def create_discrepancies(
+        self,
+        discrepancy_dtos: list[CreateEscrowDiscrepancyDto]
+    ) -> list[EscrowDiscrepancyDbModel]:
+        new_discrepancies = [EscrowDiscrepancyDbModel(**dto.model_dump()) for dto in discrepancy_dtos]
+        self._session.add_all(new_discrepancies)
+        return new_discrepancies
+
+    async def list_discrepancies(self, run_id: UUID) -> list[EscrowDiscrepancyDbModel]:
+        return list(await self._session.scalars(
+            select(EscrowDiscrepancyDbModel).where(
+                EscrowDiscrepancyDbModel.run_id == run_id
+            ).order_by(
+                EscrowDiscrepancyDbModel.issue_id
+            )
+        ))
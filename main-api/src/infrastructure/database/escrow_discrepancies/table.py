@@ -0,0 +1,22 @@
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, String, BIGINT
+from sqlalchemy.dialects.postgresql import UUID as PSQL_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._abstract.tables import IdentifiableDbModel, CreatedAtTimestamp
+
+
+class EscrowDiscrepancyDbModel(IdentifiableDbModel, CreatedAtTimestamp):
+    """
+    Issue wallet whose LNBits balance didn't match the open rewards of the issue during a reconciliation run.
+    """
+    __tablename__ = "escrow_discrepancies"
+
+    run_id: Mapped[UUID] = mapped_column(PSQL_UUID(as_uuid=True), nullable=False, index=True)
+    issue_id: Mapped[UUID] = mapped_column(ForeignKey("issues.id"), nullable=False, index=True)
+    wallet_id: Mapped[str] = mapped_column(String(32), nullable=False)
+
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    expected_sats: Mapped[int] = mapped_column(BIGINT, nullable=False)
+    actual_sats: Mapped[int | None] = mapped_column(BIGINT, nullable=True)
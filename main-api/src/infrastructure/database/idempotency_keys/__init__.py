@@ -0,0 +1,8 @@
+from .table import IdempotencyKeyDbModel
+from .repo import IdempotencyKeyRepo
+
+
+__all__ = [
+    "IdempotencyKeyDbModel",
+    "IdempotencyKeyRepo"
+]
@@ -0,0 +1,16 @@
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class CreateIdempotencyKeyDto(BaseModel):
+    user_id: UUID
+    key: str = Field(..., max_length=255)
+    endpoint: str = Field(..., max_length=255)
+    fingerprint: str = Field(..., max_length=64)
+
+
+class IdempotentResponseDto(BaseModel):
+    response_status: int
+    response_body: Any
@@ -0,0 +1,105 @@
+import datetime
+import logging
+from uuid import UUID
+
+from sqlalchemy import select, update, delete, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+
+from domain.idempotency.schemas import IdempotencyKeyStatus
+from .dtos import CreateIdempotencyKeyDto, IdempotentResponseDto
+from .table import IdempotencyKeyDbModel
+from .._abstract.repo import SQLAAbstractRepo
+
+
+class IdempotencyKeyRepo(SQLAAbstractRepo):
+
+    async def acquire_key(
+        self,
+        key_dto: CreateIdempotencyKeyDto,
+        ttl: datetime.timedelta,
+        lock_timeout: datetime.timedelta
+    ) -> IdempotencyKeyDbModel | None:
+        """
+        Stores the key as in progress, unless it's already stored.
+        Expired keys and keys abandoned in progress for longer than **lock_timeout** are taken over.
+        :param key_dto: Key data
+        :param ttl: Time to keep the key for
+        :param lock_timeout: Time after which an unfinished request is considered abandoned
+        :return: The acquired key or None if the key is held by another request
+        """
+        stmt = insert(IdempotencyKeyDbModel).values(
+            **key_dto.model_dump(),
+            status=IdempotencyKeyStatus.IN_PROGRESS,
+            expires_at=func.now() + ttl
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKeyDbModel.user_id, IdempotencyKeyDbModel.key],
+            set_={
+                "endpoint": stmt.excluded.endpoint,
+                "fingerprint": stmt.excluded.fingerprint,
+                "status": stmt.excluded.status,
+                "response_status": None,
+                "response_body": None,
+                "expires_at": stmt.excluded.expires_at,
+                "modified_at": func.now()
+            },
+            where=or_(
+                IdempotencyKeyDbModel.expires_at < func.now(),
+                and_(
+                    IdempotencyKeyDbModel.status == IdempotencyKeyStatus.IN_PROGRESS,
+                    IdempotencyKeyDbModel.modified_at < func.now() - lock_timeout
+                )
+            )
+        ).returning(IdempotencyKeyDbModel)
+
+        acquired_key = await self._session.scalar(stmt)
+        logging.debug("Idempotency key %s acquired: %s", key_dto.key, acquired_key is not None)
+        return acquired_key
+
+    async def get_key(self, user_id: UUID, key: str) -> IdempotencyKeyDbModel | None:
+        return await self._session.scalar(
+            select(IdempotencyKeyDbModel).where(
+                IdempotencyKeyDbModel.user_id == user_id,
+                IdempotencyKeyDbModel.key == key
+            )
+        )
+
+    async def complete_key(self, user_id: UUID, key: str, response_dto: IdempotentResponseDto) -> None:
+        await self._session.execute(
+            update(IdempotencyKeyDbModel).where(
+                IdempotencyKeyDbModel.user_id == user_id,
+                IdempotencyKeyDbModel.key == key
+            ).values(
+                **response_dto.model_dump(),
+                status=IdempotencyKeyStatus.COMPLETED
+            )
+        )
+
+    async def hold_key(self, user_id: UUID, key: str) -> None:
+        """
+        Held keys are not taken over after the lock timeout, only once they expire.
+        """
+        await self._session.execute(
+            update(IdempotencyKeyDbModel).where(
+                IdempotencyKeyDbModel.user_id == user_id,
+                IdempotencyKeyDbModel.key == key,
+                IdempotencyKeyDbModel.status == IdempotencyKeyStatus.IN_PROGRESS
+            ).values(
+                status=IdempotencyKeyStatus.HELD
+            )
+        )
+
+    async def delete_key(self, user_id: UUID, key: str) -> None:
+        await self._session.execute(
+            delete(IdempotencyKeyDbModel).where(
+                IdempotencyKeyDbModel.user_id == user_id,
+                IdempotencyKeyDbModel.key == key,
+                IdempotencyKeyDbModel.status == IdempotencyKeyStatus.IN_PROGRESS
+            )
+        )
+
+    async def delete_expired_keys(self) -> int:
+        result = await self._session.execute(
+            delete(IdempotencyKeyDbModel).where(IdempotencyKeyDbModel.expires_at < func.now())
+        )
+        return result.rowcount
@@ -4,6 +4,7 @@ from sqlalchemy import select
 
 from .dtos import IssueLightningWalletDTO
 from .table import IssueLightningWalletDbModel
+from ..issues import IssueDbModel
 from .._abstract.repo import SQLAAbstractRepo
 
 
@@ -26,3 +27,38 @@ class IssueLightningWalletRepo(SQLAAbstractRepo):
         return await self._session.scalar(
             select(IssueLightningWalletDbModel).where(IssueLightningWalletDbModel.issue_id == issue_id)
         )
+
+    async def get_wallets_by_issue_ids(self, issue_ids: list[UUID]) -> list[IssueLightningWalletDbModel]:
+        if not issue_ids:
+            return []
+
+        return list(await self._session.scalars(
+            select(IssueLightningWalletDbModel).where(IssueLightningWalletDbModel.issue_id.in_(issue_ids))
+        ))
+
+    async def list_wallets_with_issue_state(
+        self,
+        after_issue_id: UUID | None,
+        limit: int,
+        issue_ids: list[UUID] | None = None
+    ) -> list[tuple[IssueLightningWalletDbModel, bool]]:
+        """
+        Lists the wallets ordered by issue ID, starting after **after_issue_id**.
+        :param after_issue_id: Issue ID of the last wallet in the previous chunk, None to start from the beginning
+        :param limit: Max number of wallets
+        :param issue_ids: Only the wallets of these issues, all of them if None
+        :return: Wallets and whether their issues are closed
+        """
+        stmt = select(IssueLightningWalletDbModel, IssueDbModel.is_closed).join(
+            IssueDbModel,
+            IssueDbModel.id == IssueLightningWalletDbModel.issue_id
+        ).order_by(
+            IssueLightningWalletDbModel.issue_id
+        ).limit(limit)
+
+        if after_issue_id is not None:
+            stmt = stmt.where(IssueLightningWalletDbModel.issue_id > after_issue_id)
+        if issue_ids is not None:
+            stmt = stmt.where(IssueLightningWalletDbModel.issue_id.in_(issue_ids))
+
+        return [(wallet, is_closed) for wallet, is_closed in await self._session.execute(stmt)]
@@ -48,10 +48,25 @@ class ExtendedIssueDto(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     issue: IssueDbModel
-    repository: RepositoryDbModel
+    repository: RepositoryDbModel | None = None
     winner: UserDbModel | None = None
     last_rewarder: UserDbModel | None = None
     second_last_rewarder: UserDbModel | None = None
     third_last_rewarder: UserDbModel | None = None
-    rewards_count: int
-    rewards_sat_sum: int
+    rewards_count: int = 0
+    rewards_sat_sum: int = 0
+
+
+class ExpandedIssueProjectionDto(BaseModel):
+    """
+    Parts of the expanded issues to load.
+    **issue_columns** are the issue columns besides the ID, all of them if None.
+    """
+    issue_columns: set[str] | None = None
+    repository: bool = True
+    winner: bool = True
+    last_rewarder: bool = True
+    second_last_rewarder: bool = True
+    third_last_rewarder: bool = True
+    rewards_count: bool = True
+    rewards_sat_sum: bool = True
@@ -1,9 +1,11 @@
 import logging
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select, update, Select, func
-from sqlalchemy.orm import aliased
+from sqlalchemy import select, update, Select, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased, load_only
 
 from .table import IssueDbModel
 from .._abstract.dtos import Pagination
@@ -11,7 +13,9 @@ from .._abstract.repo import SQLAAbstractRepo
 from .dtos import (
     CreateIssueDto,
     UpdateIssueDto,
-    IssueFiltersDto, ExtendedIssueDto
+    IssueFiltersDto,
+    ExtendedIssueDto,
+    ExpandedIssueProjectionDto
 )
 from ..repositories import RepositoryDbModel
 from ..rewards import RewardDbModel
@@ -34,22 +38,19 @@ class IssueRepo(SQLAAbstractRepo):
 
         return stmt
 
-    def _parse_row(self, row: Any) -> ExtendedIssueDto:
+    def _parse_row(self, row: Any) -> ExtendedIssueDto | None:
+        if row is None:
+            return None
+        values = row._asdict()
         return ExtendedIssueDto(
-            issue=row[0],
-            repository=row[1],
-            winner=row[2],
-            last_rewarder=row[3],
-            second_last_rewarder=row[4],
-            third_last_rewarder=row[5],
-            rewards_count=row[6] if row[6] is not None else 0,
-            rewards_sat_sum=row[7] if row[7] is not None else 0
+            issue=values.pop("IssueDbModel"),
+            **{name: value for name, value in values.items() if value is not None}
         )
 
     async def create_issue(self, issue_dto: CreateIssueDto) -> IssueDbModel:
         new_issue = IssueDbModel(**issue_dto.model_dump())
         self._session.add(new_issue)
-        logging.debug(f"New issue created: {new_issue}")
+        logging.debug("New issue created: %s", new_issue)
         return new_issue
 
     async def get_issue_by_id(self, issue_id: UUID, lock: bool = False) -> IssueDbModel | None:
@@ -61,64 +62,126 @@ class IssueRepo(SQLAAbstractRepo):
             stmt
         )
 
+    async def get_issues_by_ids(
+        self,
+        issue_ids: list[UUID],
+        lock: bool = False,
+        refresh: bool = False
+    ) -> list[IssueDbModel]:
+        """
+        :param refresh: Overwrite the issues already loaded in the session with the current rows
+        """
+        if not issue_ids:
+            return []
+
+        stmt = select(IssueDbModel).where(IssueDbModel.id.in_(issue_ids))
+        if lock:
+            stmt = self.lock_rows(stmt)
+        if refresh:
+            stmt = stmt.execution_options(populate_existing=True)
+
+        return list(await self._session.scalars(stmt))
+
+    def _select_expanded(self, projection: ExpandedIssueProjectionDto | None = None) -> Select:
+        """
+        Selects the issues along with
+        - Repository
+        - Winner user data
+        - Last rewarder user data
+        - Second last rewarder user data
+        - Third last rewarder user data
+        - Total rewards for each issue
+        - Sum of reward amounts for each issue
+        :param projection: Columns and joins to load, all of them if not passed
+        """
+        if projection is None:
+            projection = ExpandedIssueProjectionDto()
+
+        entities: list[Any] = [IssueDbModel]
+        options = []
+        joins = []
+        if projection.issue_columns is not None:
+            issue_columns = [getattr(IssueDbModel, column) for column in projection.issue_columns]
+            options.append(load_only(IssueDbModel.id, *issue_columns))
+
+        if projection.repository:
+            repository = aliased(RepositoryDbModel, name="repository")
+            entities.append(repository)
+            options.append(load_only(repository.full_name))
+            joins.append((repository, IssueDbModel.repository_id == repository.id))
+
+        # Only the columns of UserData are loaded for the joined users
+        for name, user_id_column in (
+            ("winner", IssueDbModel.winner_id),
+            ("last_rewarder", IssueDbModel.last_rewarder_id),
+            ("second_last_rewarder", IssueDbModel.second_last_rewarder_id),
+            ("third_last_rewarder", IssueDbModel.third_last_rewarder_id)
+        ):
+            if getattr(projection, name):
+                user = aliased(UserDbModel, name=name)
+                entities.append(user)
+                options.append(load_only(user.github_username, user.avatar_url))
+                joins.append((user, user_id_column == user.id))
+
+        if projection.rewards_count or projection.rewards_sat_sum:
+            # Both totals come from a single pass over the rewards
+            reward_totals_subquery = select(
+                RewardDbModel.issue_id,
+                func.count(RewardDbModel.id).label("rewards_count"),
+                func.sum(RewardDbModel.reward_sats).label("rewards_sat_sum")
+            ).group_by(RewardDbModel.issue_id).subquery()
+            if projection.rewards_count:
+                entities.append(reward_totals_subquery.c.rewards_count)
+            if projection.rewards_sat_sum:
+                entities.append(reward_totals_subquery.c.rewards_sat_sum)
+            joins.append((reward_totals_subquery, IssueDbModel.id == reward_totals_subquery.c.issue_id))
+
+        stmt = select(*entities).options(*options)
+        for target, on_clause in joins:
+            stmt = stmt.outerjoin(target, on_clause)
+        return stmt
+
     async def get_issue_by_id_expanded(
         self,
         issue_id: UUID
     ) -> tuple[IssueDbModel, RepositoryDbModel, UserDbModel, int, int | None]:
-        WinnerDbModel = aliased(UserDbModel)
-        LastRewarderDbModel = aliased(UserDbModel)
-        SecondLastRewarderDbModel = aliased(UserDbModel)
-        ThirdLastRewarderDbModel = aliased(UserDbModel)
-
-        # Subquery to count rewards per issue
-        reward_count_subquery = select(
-            RewardDbModel.issue_id,
-            func.count(RewardDbModel.id).label("reward_count")
-        ).group_by(RewardDbModel.issue_id).subquery()
-
-        # Subquery to sum reward amounts per issue
-        reward_sum_subquery = select(
-            RewardDbModel.issue_id,
-            func.sum(RewardDbModel.reward_sats).label("total_reward_sats")
-        ).group_by(RewardDbModel.issue_id).subquery()
-
-        stmt = select(
-            IssueDbModel,
-            RepositoryDbModel,
-            WinnerDbModel,
-            LastRewarderDbModel,
-            SecondLastRewarderDbModel,
-            ThirdLastRewarderDbModel,
-            reward_count_subquery.c.reward_count,
-            reward_sum_subquery.c.total_reward_sats
-        ).outerjoin(
-            RepositoryDbModel,
-            IssueDbModel.repository_id == RepositoryDbModel.id
-        ).outerjoin(
-            WinnerDbModel,
-            IssueDbModel.winner_id == WinnerDbModel.id
-        ).outerjoin(
-            LastRewarderDbModel,
-            IssueDbModel.last_rewarder_id == LastRewarderDbModel.id
-        ).outerjoin(
-            SecondLastRewarderDbModel,
-            IssueDbModel.second_last_rewarder_id == SecondLastRewarderDbModel.id
-        ).outerjoin(
-            ThirdLastRewarderDbModel,
-            IssueDbModel.third_last_rewarder_id == ThirdLastRewarderDbModel.id
-        ).outerjoin(
-            reward_count_subquery,
-            IssueDbModel.id == reward_count_subquery.c.issue_id
-        ).outerjoin(
-            reward_sum_subquery,
-            IssueDbModel.id == reward_sum_subquery.c.issue_id
-        ).where(
+        stmt = self._select_expanded().where(
             IssueDbModel.id == issue_id
         )
 
         res = (await self._session.execute(stmt)).first()
         return self._parse_row(res)
 
+    async def get_issues_by_ids_expanded(self, issue_ids: list[UUID]) -> list[ExtendedIssueDto]:
+        """
+        Fetches the issues with a single query, in the order of the passed IDs. Unknown IDs are skipped.
+        """
+        if not issue_ids:
+            return []
+
+        stmt = self._select_expanded().where(IssueDbModel.id.in_(issue_ids))
+        rows = {row[0].id: row for row in (await self._session.execute(stmt)).all()}
+        return [
+            self._parse_row(rows[issue_id])
+            for issue_id in dict.fromkeys(issue_ids)
+            if issue_id in rows
+        ]
+
+    async def get_issues_by_github_ids_expanded(self, github_ids: list[int]) -> list[ExtendedIssueDto]:
+        """
+        Fetches the issues with a single query, in the order of the passed GitHub IDs. Unknown IDs are skipped.
+        """
+        if not github_ids:
+            return []
+
+        stmt = self._select_expanded().where(IssueDbModel.github_id.in_(github_ids))
+        rows = {row[0].github_id: row for row in (await self._session.execute(stmt)).all()}
+        return [
+            self._parse_row(rows[github_id])
+            for github_id in dict.fromkeys(github_ids)
+            if github_id in rows
+        ]
+
     async def get_issue_by_github_id(self, issue_github_id: int, lock: bool = False) -> IssueDbModel | None:
         stmt = select(IssueDbModel).where(IssueDbModel.github_id == issue_github_id)
         if lock:
@@ -161,7 +224,8 @@ class IssueRepo(SQLAAbstractRepo):
     async def list_issues_extended(
         self,
         pagination: Pagination | None = None,
-        filters: IssueFiltersDto | None = None
+        filters: IssueFiltersDto | None = None,
+        projection: ExpandedIssueProjectionDto | None = None
     ) -> list[ExtendedIssueDto]:
         """
         Lists the issues based on the pagination and filters passed.
@@ -179,56 +243,10 @@ class IssueRepo(SQLAAbstractRepo):
         - Sum of reward amounts for each issue
         :param pagination:
         :param filters:
+        :param projection: Columns and joins to load, all of them if not passed
         :return:
         """
-        WinnerDbModel = aliased(UserDbModel)
-        LastRewarderDbModel = aliased(UserDbModel)
-        SecondLastRewarderDbModel = aliased(UserDbModel)
-        ThirdLastRewarderDbModel = aliased(UserDbModel)
-
-        # Subquery to count rewards per issue
-        reward_count_subquery = select(
-            RewardDbModel.issue_id,
-            func.count(RewardDbModel.id).label("reward_count")
-        ).group_by(RewardDbModel.issue_id).subquery()
-
-        # Subquery to sum reward amounts per issue
-        reward_sum_subquery = select(
-            RewardDbModel.issue_id,
-            func.sum(RewardDbModel.reward_sats).label("total_reward_sats")
-        ).group_by(RewardDbModel.issue_id).subquery()
-
-        stmt = select(
-            IssueDbModel,
-            RepositoryDbModel,
-            WinnerDbModel,
-            LastRewarderDbModel,
-            SecondLastRewarderDbModel,
-            ThirdLastRewarderDbModel,
-            reward_count_subquery.c.reward_count,
-            reward_sum_subquery.c.total_reward_sats
-        ).outerjoin(
-            RepositoryDbModel,
-            IssueDbModel.repository_id == RepositoryDbModel.id
-        ).outerjoin(
-            WinnerDbModel,
-            IssueDbModel.winner_id == WinnerDbModel.id
-        ).outerjoin(
-            LastRewarderDbModel,
-            IssueDbModel.last_rewarder_id == LastRewarderDbModel.id
-        ).outerjoin(
-            SecondLastRewarderDbModel,
-            IssueDbModel.second_last_rewarder_id == SecondLastRewarderDbModel.id
-        ).outerjoin(
-            ThirdLastRewarderDbModel,
-            IssueDbModel.third_last_rewarder_id == ThirdLastRewarderDbModel.id
-        ).outerjoin(
-            reward_count_subquery,
-            IssueDbModel.id == reward_count_subquery.c.issue_id
-        ).outerjoin(
-            reward_sum_subquery,
-            IssueDbModel.id == reward_sum_subquery.c.issue_id
-        ).order_by(
+        stmt = self._select_expanded(projection).order_by(
             IssueDbModel.created_at.desc()
         )
 
@@ -246,6 +264,27 @@ class IssueRepo(SQLAAbstractRepo):
             for row in rows
         ]
 
+    async def stream_issues_expanded(
+        self,
+        since: datetime | None = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[ExtendedIssueDto]:
+        """
+        Streams the issues modified since the passed time, the oldest first, with the same joins
+        as **list_issues_extended**.
+        Rows are fetched by **batch_size** through a server-side cursor, so the memory use stays constant.
+        """
+        stmt = self._select_expanded().order_by(
+            IssueDbModel.modified_at,
+            IssueDbModel.id
+        ).execution_options(yield_per=batch_size)
+
+        if since is not None:
+            stmt = stmt.where(IssueDbModel.modified_at >= since)
+
+        async for row in await self._session.stream(stmt):
+            yield self._parse_row(row)
+
     async def count_issues(
         self,
         filters: IssueFiltersDto | None = None
@@ -263,13 +302,28 @@ class IssueRepo(SQLAAbstractRepo):
         return await self._session.scalar(stmt)
 
     async def update_issue(self, issue_id: UUID, update_fields: UpdateIssueDto) -> IssueDbModel | None:
+        values = update_fields.model_dump(exclude_unset=True)
         stmt = (
             update(IssueDbModel).where(IssueDbModel.id == issue_id)
-            .values(**update_fields.model_dump(exclude_unset=True))
+            .values(**values)
             .returning(IssueDbModel)
 
         )
-        logging.debug(f"Issue updated with fields: {update_fields.model_dump(exclude_unset=True)}")
+        logging.debug("Issue %s updated with fields: %s", issue_id, values)
+        return await self._session.scalar(stmt)
+
+    async def update_issue_by_github_id(
+        self,
+        issue_github_id: int,
+        update_fields: UpdateIssueDto
+    ) -> IssueDbModel | None:
+        values = update_fields.model_dump(exclude_unset=True)
+        stmt = (
+            update(IssueDbModel).where(IssueDbModel.github_id == issue_github_id)
+            .values(**values)
+            .returning(IssueDbModel)
+        )
+        logging.debug("Issue with GitHub ID %s updated with fields: %s", issue_github_id, values)
         return await self._session.scalar(stmt)
 
     def update_top_rewarders(
@@ -284,58 +338,73 @@ class IssueRepo(SQLAAbstractRepo):
 
     async def get_or_create_issue(self, issue_dto: CreateIssueDto) -> tuple[IssueDbModel, bool]:
         """
-        Fetches an issue by its GitHub ID, creates a new issue if it"s not found.
+        Fetches an issue by its GitHub ID, creates a new issue if it"s not found. All in a single statement.
         :param issue_dto: DTO to create the issue if not found.
         :return: Issue, [True if the issue was created, False otherwise]
         """
-        issue_was_created = False
-        issue = await self.get_issue_by_github_id(issue_github_id=issue_dto.github_id)
-        if issue is None:
-            issue = await self.create_issue(issue_dto)
-            issue_was_created = True
-        return issue, issue_was_created
+        issue, created, _ = await self._upsert(
+            IssueDbModel,
+            values=issue_dto.model_dump(),
+            unique_field="github_id",
+            update_fields=[]
+        )
+        return issue, created
 
     async def get_update_or_create_issue(self, issue_dto: CreateIssueDto) -> tuple[IssueDbModel, bool, bool]:
         """
         Fetches an issue by its GitHub ID,
         updates it if it"s different from issue_dto
-        and creates a new issue if not found.
+        and creates a new issue if not found. All in a single statement.
         :param issue_dto: DTO to create the issue if not found.
         :return: A tuple containing:
             - IssueDbModel: The issue Model (updated or newly created).
             - bool #1: True if the issue was created, False otherwise.
             - bool #2: True if the issue was updated, False otherwise.
         """
-        issue, created = await self.get_or_create_issue(issue_dto)
-        if created:
-            return issue, created, False
-
-        updated = False
-        if self._issue_has_differences(issue, issue_dto):
-            issue = await self.update_issue(
-                issue_id=issue.id,
-                update_fields=UpdateIssueDto(
-                    title=issue_dto.title,
-                    body=issue_dto.body,
-                    is_closed=issue_dto.is_closed,
-                    repository_id=issue_dto.repository_id
-                )
-            )
-
-        return issue, created, updated
-
-    def _issue_has_differences(self, issue: IssueDbModel, expected_dto: CreateIssueDto) -> bool:
+        return await self._upsert(
+            IssueDbModel,
+            values=issue_dto.model_dump(),
+            unique_field="github_id",
+            update_fields=["issue_number", "title", "body", "is_closed", "repository_id"]
+        )
+
+    async def upsert_issues(self, issue_dtos: list[CreateIssueDto]) -> list[IssueDbModel]:
         """
-        Checks if there are differences between the existing issue and the DTO of the expected values.
-        :param issue: The existing issue.
-        :param expected_dto: Expected values
-        :return: True if there are differences, False otherwise
+        Creates the issues or updates the existing ones by GitHub ID in a single statement.
+        Like get_update_or_create_issue, existing rows are written only if they differ.
+        All the passed rows stay locked until the end of the transaction, the unchanged ones included.
+        :param issue_dtos: Expected issue details, GitHub IDs have to be unique
+        :return: All the passed issues
         """
-
-        return (
-            issue.issue_number != expected_dto.issue_number
-            or issue.title != expected_dto.title
-            or issue.body != expected_dto.body
-            or issue.is_closed != expected_dto.is_closed
-            or issue.repository_id != expected_dto.repository_id
-        )
+        if not issue_dtos:
+            return []
+
+        update_fields = ["issue_number", "title", "body", "is_closed", "repository_id"]
+        table = IssueDbModel.__table__
+        stmt = insert(IssueDbModel).values([
+            issue_dto.model_dump()
+            for issue_dto in issue_dtos
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IssueDbModel.github_id],
+            set_={
+                **{field: stmt.excluded[field] for field in update_fields},
+                "modified_at": func.now()
+            },
+            where=or_(*[table.c[field].is_distinct_from(stmt.excluded[field]) for field in update_fields])
+        ).returning(IssueDbModel)
+        issues = list(await self._session.scalars(stmt, execution_options={"populate_existing": True}))
+
+        # The rows skipped by the WHERE clause are locked by ON CONFLICT but not returned
+        written_github_ids = {issue.github_id for issue in issues}
+        unchanged_github_ids = [
+            issue_dto.github_id
+            for issue_dto in issue_dtos
+            if issue_dto.github_id not in written_github_ids
+        ]
+        if unchanged_github_ids:
+            issues.extend(await self._session.scalars(
+                select(IssueDbModel).where(IssueDbModel.github_id.in_(unchanged_github_ids)),
+                execution_options={"populate_existing": True}
+            ))
+        return issues
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import Column, BIGINT, ForeignKey, String, Boolean, DateTime
+from sqlalchemy import Column, BIGINT, ForeignKey, String, Boolean, DateTime, Index
 from sqlalchemy.orm import Mapped
 
 from .._abstract.tables import IdentifiableDbModel, TimestampedDbModel
@@ -9,6 +9,10 @@ from .._abstract.tables import IdentifiableDbModel, TimestampedDbModel
 
 class IssueDbModel(IdentifiableDbModel, TimestampedDbModel):
     __tablename__ = "issues"
+    __table_args__ = (
+        # Incremental exports
+        Index("ix_issues_modified_at_id", "modified_at", "id"),
+    )
 
     github_id: Mapped[int] = Column(BIGINT, unique=True, nullable=False)
 
@@ -0,0 +1,8 @@
+from .table import LightningInvoiceDbModel
+from .repo import LightningInvoiceRepo
+
+
+__all__ = [
+    "LightningInvoiceDbModel",
+    "LightningInvoiceRepo"
+]
@@ -0,0 +1,12 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class CreateLightningInvoiceDto(BaseModel):
+    user_id: UUID
+    checking_id: str
+    payment_request: str
+    amount_sats: int = Field(..., gt=0)
+    expires_at: datetime
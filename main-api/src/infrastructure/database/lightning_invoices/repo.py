@@ -0,0 +1,90 @@
+import datetime
+import logging
+from uuid import UUID
+
+from sqlalchemy import select, update, func
+
+from domain.wallet.schemas import DepositStatus
+from .dtos import CreateLightningInvoiceDto
+from .table import LightningInvoiceDbModel
+from .._abstract.repo import SQLAAbstractRepo
+
+
+class LightningInvoiceRepo(SQLAAbstractRepo):
+
+    async def create_invoice(self, invoice_dto: CreateLightningInvoiceDto) -> LightningInvoiceDbModel:
+        new_invoice = LightningInvoiceDbModel(**invoice_dto.model_dump(), status=DepositStatus.PENDING)
+        self._session.add(new_invoice)
+        logging.debug("New invoice tracked: %s", invoice_dto.checking_id)
+        return new_invoice
+
+    async def get_invoice_by_checking_id(
+        self,
+        checking_id: str,
+        user_id: UUID | None = None
+    ) -> LightningInvoiceDbModel | None:
+        stmt = select(LightningInvoiceDbModel).where(LightningInvoiceDbModel.checking_id == checking_id)
+        if user_id is not None:
+            stmt = stmt.where(LightningInvoiceDbModel.user_id == user_id)
+        return await self._session.scalar(stmt)
+
+    async def list_pending_invoices(
+        self,
+        limit: int,
+        expiry_grace: datetime.timedelta
+    ) -> list[LightningInvoiceDbModel]:
+        """
+        Lists pending invoices which haven't expired yet, the ones checked the longest time ago first.
+        :param limit: Max number of invoices
+        :param expiry_grace: Invoices are still listed for this long after their expiry
+        """
+        stmt = select(
+            LightningInvoiceDbModel
+        ).where(
+            LightningInvoiceDbModel.status == DepositStatus.PENDING,
+            LightningInvoiceDbModel.expires_at > func.now() - expiry_grace
+        ).order_by(
+            LightningInvoiceDbModel.modified_at
+        ).limit(limit)
+        return list(await self._session.scalars(stmt))
+
+    async def touch_invoices(self, checking_ids: list[str]) -> None:
+        """
+        Bumps **modified_at** of the invoices checked, so the next polling round starts from other invoices.
+        """
+        if not checking_ids:
+            return
+        await self._session.execute(
+            update(LightningInvoiceDbModel).where(
+                LightningInvoiceDbModel.checking_id.in_(checking_ids)
+            ).values(modified_at=func.now())
+        )
+
+    async def mark_paid(self, checking_id: str) -> LightningInvoiceDbModel | None:
+        """
+        Marks an invoice as paid.
+        :return: The invoice or None if it's already marked as paid
+        """
+        stmt = update(
+            LightningInvoiceDbModel
+        ).where(
+            LightningInvoiceDbModel.checking_id == checking_id,
+            LightningInvoiceDbModel.status != DepositStatus.PAID
+        ).values(
+            status=DepositStatus.PAID,
+            paid_at=func.now()
+        ).returning(LightningInvoiceDbModel)
+        return await self._session.scalar(stmt)
+
+    async def expire_invoices(self, expiry_grace: datetime.timedelta) -> int:
+        """
+        Marks pending invoices past their expiry and the grace period as expired.
+        :return: Number of invoices expired
+        """
+        result = await self._session.execute(
+            update(LightningInvoiceDbModel).where(
+                LightningInvoiceDbModel.status == DepositStatus.PENDING,
+                LightningInvoiceDbModel.expires_at <= func.now() - expiry_grace
+            ).values(status=DepositStatus.EXPIRED)
+        )
+        return result.rowcount
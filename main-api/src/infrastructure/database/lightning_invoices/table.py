@@ -0,0 +1,24 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, String, BIGINT, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._abstract.tables import IdentifiableDbModel, TimestampedDbModel
+
+
+class LightningInvoiceDbModel(IdentifiableDbModel, TimestampedDbModel):
+    """
+    Incoming invoices created for deposits, tracked until they are settled or expired.
+    """
+    __tablename__ = "lightning_invoices"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+
+    checking_id: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    payment_request: Mapped[str] = mapped_column(String, nullable=False)
+    amount_sats: Mapped[int] = mapped_column(BIGINT, nullable=False)
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False)
+    paid_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
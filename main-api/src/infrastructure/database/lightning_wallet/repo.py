@@ -12,7 +12,7 @@ class LightningWalletRepo(SQLAAbstractRepo):
     async def create_wallet(self, wallet_dto: LightningWalletDTO) -> LightningWalletDbModel:
         new_wallet = LightningWalletDbModel(**wallet_dto.model_dump())
         self._session.add(new_wallet)
-        logging.debug(f"New wallet created: {new_wallet}")
+        logging.debug("New wallet created: %s", new_wallet)
         return new_wallet
 
     async def get_wallet_by_id(self, wallet_id: UUID) -> LightningWalletDbModel | None:
@@ -34,3 +34,8 @@ class LightningWalletRepo(SQLAAbstractRepo):
         if fetched_wallet is None:
             fetched_wallet = await self.create_wallet(wallet_dto)
         return fetched_wallet
+
+    async def get_wallets_by_user_ids(self, user_ids: list[UUID]) -> list[LightningWalletDbModel]:
+        return list(await self._session.scalars(
+            select(LightningWalletDbModel).where(LightningWalletDbModel.user_id.in_(user_ids))
+        ))
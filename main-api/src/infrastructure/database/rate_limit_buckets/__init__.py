@@ -0,0 +1,8 @@
+from .table import RateLimitBucketDbModel
+from .repo import RateLimitBucketRepo
+
+
+__all__ = [
+    "RateLimitBucketDbModel",
+    "RateLimitBucketRepo"
+]
@@ -0,0 +1,60 @@
+from sqlalchemy import func, case, literal, update
+from sqlalchemy.dialects.postgresql import insert
+
+from .table import RateLimitBucketDbModel
+from .._abstract.repo import SQLAAbstractRepo
+
+
+class RateLimitBucketRepo(SQLAAbstractRepo):
+
+    async def consume_tokens(
+        self,
+        key: str,
+        capacity: int,
+        refill_rate: float,
+        cost: float = 1
+    ) -> tuple[bool, float]:
+        """
+        Refills the bucket and takes **cost** tokens from it if there are enough, in a single statement.
+        :param key: Bucket key
+        :param capacity: Max number of tokens in the bucket
+        :param refill_rate: Tokens added per second
+        :param cost: Number of tokens to take
+        :return: Whether the tokens were taken and the number of tokens left
+        """
+        elapsed = func.extract("epoch", func.now() - RateLimitBucketDbModel.updated_at)
+        refilled = func.least(capacity, RateLimitBucketDbModel.tokens + elapsed * refill_rate)
+
+        stmt = insert(RateLimitBucketDbModel).values(
+            key=key,
+            tokens=capacity - cost,
+            last_allowed=capacity >= cost,
+            updated_at=func.now()
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RateLimitBucketDbModel.key],
+            set_={
+                "tokens": case((refilled >= cost, refilled - cost), else_=refilled),
+                "last_allowed": refilled >= literal(cost),
+                "updated_at": func.now()
+            }
+        ).returning(RateLimitBucketDbModel.last_allowed, RateLimitBucketDbModel.tokens)
+
+        allowed, tokens = (await self._session.execute(stmt)).one()
+        return allowed, tokens
+
+    async def refund_tokens(self, key: str, capacity: int, cost: float = 1) -> None:
+        """
+        Puts back **cost** tokens taken from the bucket, up to its capacity.
+        :param key: Bucket key
+        :param capacity: Max number of tokens in the bucket
+        :param cost: Number of tokens to put back
+        :return: None
+        """
+        await self._session.execute(
+            update(RateLimitBucketDbModel).where(
+                RateLimitBucketDbModel.key == key
+            ).values(
+                tokens=func.least(capacity, RateLimitBucketDbModel.tokens + cost)
+            )
+        )
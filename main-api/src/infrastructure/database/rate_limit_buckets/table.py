@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import String, Float, Boolean, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._abstract.tables.base import SQLABase
+
+
+class RateLimitBucketDbModel(SQLABase):
+    """
+    Token bucket shared by all API instances.
+    **tokens** is the amount left at **updated_at**, the refill is computed on every consumption.
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    last_allowed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), nullable=False, default=func.now(), index=True
+    )
@@ -2,6 +2,8 @@ import logging
 
 from uuid import UUID
 from sqlalchemy import func, select, update
+from sqlalchemy.orm import load_only
+from sqlalchemy.dialects.postgresql import insert
 
 from .._abstract.repo import SQLAAbstractRepo
 from .._abstract.dtos import Pagination
@@ -13,7 +15,7 @@ class RepositoryRepo(SQLAAbstractRepo):
     async def create_repository(self, repository_dto: CreateRepositoryDto) -> RepositoryDbModel:
         new_repository = RepositoryDbModel(**repository_dto.model_dump())
         self._session.add(new_repository)
-        logging.debug(f"New repository created: {new_repository}")
+        logging.debug("New repository created: %s", new_repository)
         return new_repository
 
     async def get_repository_by_id(self, repository_id: UUID) -> RepositoryDbModel:
@@ -31,19 +33,57 @@ class RepositoryRepo(SQLAAbstractRepo):
             select(RepositoryDbModel).where(RepositoryDbModel.full_name == repository_fullname)
         )
 
+    async def get_repositories_by_ids(self, repository_ids: list[UUID]) -> list[RepositoryDbModel]:
+        """
+        Fetches the repositories with a single query, in the order of the passed IDs. Unknown IDs are skipped.
+        """
+        if not repository_ids:
+            return []
+
+        repositories = {
+            repository.id: repository
+            for repository in await self._session.scalars(
+                select(RepositoryDbModel).where(RepositoryDbModel.id.in_(repository_ids))
+            )
+        }
+        return [
+            repositories[repository_id]
+            for repository_id in dict.fromkeys(repository_ids)
+            if repository_id in repositories
+        ]
+
+    async def get_repositories_by_github_ids(self, github_ids: list[int]) -> list[RepositoryDbModel]:
+        """
+        Fetches the repositories with a single query, in the order of the passed GitHub IDs. Unknown IDs are skipped.
+        """
+        if not github_ids:
+            return []
+
+        repositories = {
+            repository.github_id: repository
+            for repository in await self._session.scalars(
+                select(RepositoryDbModel).where(RepositoryDbModel.github_id.in_(github_ids))
+            )
+        }
+        return [
+            repositories[github_id]
+            for github_id in dict.fromkeys(github_ids)
+            if github_id in repositories
+        ]
+
     async def get_or_create(self, repository_dto: CreateRepositoryDto) -> tuple[RepositoryDbModel, bool]:
         """
-        Fetches a repository by its GitHub ID or creates a new one if not found.
+        Fetches a repository by its GitHub ID or creates a new one if not found, in a single statement.
         :param repository_dto: DTO to create the repository if not found.
         :return: Repository, [True if the repo was created, False otherwise].
         """
-
-        repo_was_created = False
-        repository = await self.get_repository_by_github_id(repository_dto.github_id)
-        if repository is None:
-            repository = await self.create_repository(repository_dto)
-            repo_was_created = True
-        return repository, repo_was_created
+        repository, created, _ = await self._upsert(
+            RepositoryDbModel,
+            values=repository_dto.model_dump(),
+            unique_field="github_id",
+            update_fields=[]
+        )
+        return repository, created
 
     async def get_update_or_create_repository(
         self,
@@ -51,7 +91,7 @@ class RepositoryRepo(SQLAAbstractRepo):
     ) -> tuple[RepositoryDbModel, bool, bool]:
         """
         Fetches a repository by its GitHub ID, updates it if there are differences from the expected values,
-        or creates a new one if it is not found.
+        or creates a new one if it is not found. All in a single statement.
 
         :param repository_dto: Data Transfer Object containing repository details.
         :return: A tuple containing:
@@ -59,48 +99,58 @@ class RepositoryRepo(SQLAAbstractRepo):
             - bool #1: True if the repository was created, False otherwise.
             - bool #2: True if the repository was updated, False otherwise.
         """
+        return await self._upsert(
+            RepositoryDbModel,
+            values=repository_dto.model_dump(),
+            unique_field="github_id",
+            update_fields=["full_name", "owner_github_id", "html_url"]
+        )
 
-        repository, created = await self.get_or_create(repository_dto)
-        if created:
-            return repository, created, False
-
-        updated = False
-        if self._repository_has_differences(repository, repository_dto):
-            repository = await self.update_repository(
-                repository_id=repository.id,
-                update_fields=UpdateRepositoryDto(
-                    fullname=repository_dto.full_name,
-                    owner_github_id=repository_dto.owner_github_id,
-                    html_url=repository_dto.html_url
-                )
-            )
-            updated = True
-
-        return repository, created, updated
-
-    def _repository_has_differences(self, repository: RepositoryDbModel, repository_dto: CreateRepositoryDto) -> bool:
+    async def upsert_repositories(self, repository_dtos: list[CreateRepositoryDto]) -> list[RepositoryDbModel]:
         """
-        Checks if there are differences between the existing repository and the provided DTO.
-
-        :param repository: The existing repository.
-        :param repository_dto: The Data Transfer Object containing the expected repository details.
-        :return: True if there are differences, False otherwise.
+        Creates the repositories or updates the existing ones by GitHub ID in a single statement.
+        :param repository_dtos: Expected repository details, GitHub IDs have to be unique
+        :return: All the passed repositories
         """
-        return (
-            repository.full_name != repository_dto.full_name
-            or repository.owner_github_id != repository_dto.owner_github_id
-            or repository.html_url != repository_dto.html_url
-        )
+        if not repository_dtos:
+            return []
+
+        stmt = insert(RepositoryDbModel).values([
+            repository_dto.model_dump()
+            for repository_dto in repository_dtos
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RepositoryDbModel.github_id],
+            set_={
+                "full_name": stmt.excluded.full_name,
+                "owner_github_id": stmt.excluded.owner_github_id,
+                "html_url": stmt.excluded.html_url,
+                "modified_at": func.now()
+            }
+        ).returning(RepositoryDbModel)
+        return list(await self._session.scalars(stmt, execution_options={"populate_existing": True}))
 
     async def list_repositories(
         self,
         pagination: Pagination | None = None,
-        owner_github_id: int | None = None
+        owner_github_id: int | None = None,
+        columns: set[str] | None = None
     ) -> list[RepositoryDbModel]:
+        """
+        :param pagination:
+        :param owner_github_id:
+        :param columns: Columns to load besides the ID, all of them if not passed
+        :return:
+        """
         stmt = self._apply_pagination(
             select(RepositoryDbModel),
             pagination
         )
+        if columns is not None:
+            stmt = stmt.options(load_only(
+                RepositoryDbModel.id,
+                *[getattr(RepositoryDbModel, column) for column in columns]
+            ))
 
         if owner_github_id is not None:
             stmt = stmt.where(RepositoryDbModel.owner_github_id == owner_github_id)
@@ -115,12 +165,13 @@ class RepositoryRepo(SQLAAbstractRepo):
         )
 
     async def update_repository(self, repository_id: UUID, update_fields: UpdateRepositoryDto) -> RepositoryDbModel:
+        values = update_fields.model_dump(exclude_unset=True)
         stmt = update(
             RepositoryDbModel
         ).where(
             RepositoryDbModel.id == repository_id
         ).values(
-            **update_fields.model_dump(exclude_unset=True)
+            **values
         ).returning(RepositoryDbModel)
-        logging.debug(f"Repository updated with fields: {update_fields.model_dump(exclude_unset=True)}")
+        logging.debug("Repository %s updated with fields: %s", repository_id, values)
         return await self._session.scalar(stmt)
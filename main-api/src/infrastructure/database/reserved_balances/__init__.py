@@ -0,0 +1,8 @@
+from .table import ReservedBalanceDbModel
+from .repo import ReservedBalanceRepo
+
+
+__all__ = [
+    "ReservedBalanceDbModel",
+    "ReservedBalanceRepo"
+]
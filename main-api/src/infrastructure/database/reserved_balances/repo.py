@@ -0,0 +1,171 @@
+from uuid import UUID
+
+from sqlalchemy import select, update, func, literal, ScalarSelect
+from sqlalchemy.dialects.postgresql import insert
+
+from .table import ReservedBalanceDbModel
+from .._abstract.repo import SQLAAbstractRepo
+from ..issues import IssueDbModel
+from ..rewards import RewardDbModel
+
+
+def _open_rewards_sum(user_id: UUID) -> ScalarSelect:
+    """
+    :return: Sats of the user's rewards on the open issues, computed from the rewards
+    """
+    return select(
+        func.coalesce(func.sum(RewardDbModel.reward_sats), 0)
+    ).join(
+        IssueDbModel, RewardDbModel.issue_id == IssueDbModel.id
+    ).where(
+        RewardDbModel.rewarder_id == user_id,
+        IssueDbModel.is_closed.is_(False)
+    ).scalar_subquery()
+
+
+class ReservedBalanceRepo(SQLAAbstractRepo):
+    """
+    Balances missing for the users who rewarded before the balances were introduced
+    are initialized from the rewards the first time they are read or changed.
+    """
+
+    async def get_reserved_sats(self, user_id: UUID) -> int | None:
+        """
+        :return: Reserved sats of the user, None if the balance isn't initialized
+        """
+        return await self._session.scalar(
+            select(ReservedBalanceDbModel.reserved_sats).where(
+                ReservedBalanceDbModel.user_id == user_id
+            )
+        )
+
+    async def initialize(self, user_id: UUID) -> int:
+        """
+        Creates the balance of the user from the rewards if it doesn't exist.
+        :return: Reserved sats of the user
+        """
+        stmt = insert(ReservedBalanceDbModel).from_select(
+            [ReservedBalanceDbModel.user_id, ReservedBalanceDbModel.reserved_sats],
+            select(literal(user_id), _open_rewards_sum(user_id))
+        ).on_conflict_do_nothing(
+            index_elements=[ReservedBalanceDbModel.user_id]
+        ).returning(ReservedBalanceDbModel.reserved_sats)
+        reserved_sats = await self._session.scalar(stmt)
+        if reserved_sats is None:
+            # Created concurrently
+            reserved_sats = await self.get_reserved_sats(user_id)
+        return reserved_sats
+
+    async def reserve(self, user_id: UUID, amount: int) -> None:
+        """
+        Adds the sats of new rewards to the balance of the user. Call it after the rewards are created.
+        :param user_id:
+        :param amount: Sats of the new rewards
+        """
+        updated = await self._session.scalar(
+            update(ReservedBalanceDbModel).where(
+                ReservedBalanceDbModel.user_id == user_id
+            ).values(
+                reserved_sats=ReservedBalanceDbModel.reserved_sats + amount
+            ).returning(ReservedBalanceDbModel.user_id)
+        )
+        if updated is not None:
+            return
+
+        # The new rewards are visible to this transaction, so the initial balance already includes them
+        stmt = insert(ReservedBalanceDbModel).from_select(
+            [ReservedBalanceDbModel.user_id, ReservedBalanceDbModel.reserved_sats],
+            select(literal(user_id), _open_rewards_sum(user_id))
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ReservedBalanceDbModel.user_id],
+            set_={"reserved_sats": ReservedBalanceDbModel.reserved_sats + amount}
+        )
+        await self._session.execute(stmt)
+
+    async def release_issue(self, issue_id: UUID) -> list[UUID]:
+        """
+        Takes the sats of the issue rewards off the balances of their rewarders. Call it when the issue gets closed.
+        :param issue_id:
+        :return: IDs of the users whose balance changed
+        """
+        released = select(
+            RewardDbModel.rewarder_id,
+            func.sum(RewardDbModel.reward_sats).label("reward_sats")
+        ).where(
+            RewardDbModel.issue_id == issue_id
+        ).group_by(
+            RewardDbModel.rewarder_id
+        ).subquery()
+
+        # Locked in a stable order, so concurrent releases sharing rewarders can't deadlock
+        await self._session.execute(
+            select(ReservedBalanceDbModel.user_id).where(
+                ReservedBalanceDbModel.user_id.in_(select(released.c.rewarder_id))
+            ).order_by(
+                ReservedBalanceDbModel.user_id
+            ).with_for_update()
+        )
+        return list(await self._session.scalars(
+            update(ReservedBalanceDbModel).where(
+                ReservedBalanceDbModel.user_id == released.c.rewarder_id
+            ).values(
+                reserved_sats=ReservedBalanceDbModel.reserved_sats - released.c.reward_sats
+            ).returning(ReservedBalanceDbModel.user_id)
+        ))
+
+    async def list_mismatched_user_ids(self) -> list[UUID]:
+        """
+        Compares all the balances with the rewards. The result may include balances changed by
+        transactions in progress, check them again with **correct** before fixing them.
+        :return: IDs of the users whose balance doesn't match their rewards
+        """
+        expected = select(
+            RewardDbModel.rewarder_id.label("user_id"),
+            func.sum(RewardDbModel.reward_sats).filter(
+                IssueDbModel.is_closed.is_(False)
+            ).label("reserved_sats")
+        ).join(
+            IssueDbModel, RewardDbModel.issue_id == IssueDbModel.id
+        ).group_by(
+            RewardDbModel.rewarder_id
+        ).subquery()
+
+        # Full join, so the rewarders without a balance are returned too
+        return list(await self._session.scalars(
+            select(
+                func.coalesce(ReservedBalanceDbModel.user_id, expected.c.user_id)
+            ).select_from(
+                ReservedBalanceDbModel
+            ).join(
+                expected, ReservedBalanceDbModel.user_id == expected.c.user_id, full=True
+            ).where(
+                ReservedBalanceDbModel.reserved_sats.is_distinct_from(func.coalesce(expected.c.reserved_sats, 0))
+            )
+        ))
+
+    async def correct(self, user_id: UUID) -> tuple[int | None, int]:
+        """
+        Recomputes the balance of the user from the rewards.
+        The balance row stays locked until the end of the transaction, so commit right after.
+        :return: Previous balance, None if it wasn't initialized, and the correct one
+        """
+        previous = await self._session.scalar(
+            select(ReservedBalanceDbModel.reserved_sats).where(
+                ReservedBalanceDbModel.user_id == user_id
+            ).with_for_update()
+        )
+        if previous is None:
+            return None, await self.initialize(user_id)
+
+        # Read after the lock is taken, the transactions changing the balance have committed their rewards by then
+        expected = await self._session.scalar(select(_open_rewards_sum(user_id)))
+        if expected != previous:
+            await self._session.execute(
+                update(ReservedBalanceDbModel).where(
+                    ReservedBalanceDbModel.user_id == user_id
+                ).values(
+                    reserved_sats=expected
+                )
+            )
+        return previous, expected
@@ -0,0 +1,17 @@
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, BIGINT
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._abstract.tables.base import SQLABase
+
+
+class ReservedBalanceDbModel(SQLABase):
+    """
+    Sats reserved by the rewards of a user on the open issues.
+    Kept in step with the rewards in the transactions changing them, so it's read without aggregating the rewards.
+    """
+    __tablename__ = "reserved_balances"
+
+    user_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    reserved_sats: Mapped[int] = mapped_column(BIGINT, nullable=False)
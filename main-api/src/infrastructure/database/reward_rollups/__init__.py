@@ -0,0 +1,10 @@
+from .table import RewardRollupDbModel, RewardRollupFunderDbModel, GLOBAL_SCOPE
+from .repo import RewardRollupRepo
+
+
+__all__ = [
+    "RewardRollupDbModel",
+    "RewardRollupFunderDbModel",
+    "GLOBAL_SCOPE",
+    "RewardRollupRepo"
+]
@@ -0,0 +1,11 @@
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class PledgeDto(BaseModel):
+    reward_id: UUID
+    issue_id: UUID
+    repository_id: UUID
+    rewarder_id: UUID
+    reward_sats: int
@@ -0,0 +1,259 @@
+from collections import defaultdict
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlalchemy import select, delete, func, literal, literal_column, text, union_all, Date, ColumnElement, Select, Subquery
+from sqlalchemy.dialects.postgresql import insert, UUID as PSQL_UUID
+
+from domain.stats.schemas import RollupPeriod
+from .dtos import PledgeDto
+from .table import RewardRollupDbModel, RewardRollupFunderDbModel, GLOBAL_SCOPE
+from .._abstract.repo import SQLAAbstractRepo
+from ..issues import IssueDbModel
+from ..rewards import RewardDbModel
+
+
+ROLLUP_KEY = ("period", "repository_id", "bucket_start")
+COUNTERS = ("sats_pledged", "sats_paid_out", "issues_funded", "active_funders")
+
+RollupKey = tuple[str, UUID, date]
+
+
+def _get_keys(repository_id: UUID, at: datetime) -> list[RollupKey]:
+    """
+    :return: Keys of the rollups an event of the repository at **at** is counted in
+    """
+    return [
+        (period.value, scope, period.get_bucket_start(at.date()))
+        for period in RollupPeriod
+        for scope in (GLOBAL_SCOPE, repository_id)
+    ]
+
+
+def _bucket(period: RollupPeriod, timestamp: ColumnElement) -> ColumnElement:
+    # Rendered inline, so the GROUP BY matches the selected expression
+    return func.date_trunc(literal_column(f"'{period.value}'"), timestamp).cast(Date)
+
+
+def _select_buckets(period: RollupPeriod, source: Subquery, value: ColumnElement) -> Select:
+    """
+    :param source: Subquery with the **repository_id** and the time **at** of the events
+    :param value: Aggregate of the events of a bucket
+    :return: Rollup keys and values of the global and the repository rollups
+    """
+    bucket = _bucket(period, source.c.at)
+    return union_all(
+        select(
+            literal(period.value).label("period"),
+            literal(GLOBAL_SCOPE, PSQL_UUID(as_uuid=True)).label("repository_id"),
+            bucket.label("bucket_start"),
+            value
+        ).group_by(bucket),
+        select(
+            literal(period.value).label("period"),
+            source.c.repository_id,
+            bucket.label("bucket_start"),
+            value
+        ).group_by(source.c.repository_id, bucket)
+    )
+
+
+class RewardRollupRepo(SQLAAbstractRepo):
+    """
+    Rollups are updated in the transactions creating the rewards and claiming the issues.
+    The rows are written in key order, so concurrent updates can't deadlock.
+    """
+
+    async def _add(self, counters: dict[RollupKey, dict[str, int]]) -> None:
+        if not counters:
+            return
+        stmt = insert(RewardRollupDbModel).values([
+            {**dict(zip(ROLLUP_KEY, key)), **{counter: values.get(counter, 0) for counter in COUNTERS}}
+            for key, values in sorted(counters.items())
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=ROLLUP_KEY,
+            set_={
+                counter: getattr(RewardRollupDbModel, counter) + stmt.excluded[counter]
+                for counter in COUNTERS
+            }
+        )
+        await self._session.execute(stmt)
+
+    async def record_pledges(self, pledges: list[PledgeDto], at: datetime) -> None:
+        """
+        Counts new rewards. Call it after the rewards are created.
+        :param pledges: The new rewards
+        :param at: Creation time of the rewards
+        """
+        if not pledges:
+            return
+
+        previously_funded_issue_ids = set(await self._session.scalars(
+            select(RewardDbModel.issue_id).where(
+                RewardDbModel.issue_id.in_({pledge.issue_id for pledge in pledges}),
+                RewardDbModel.id.not_in([pledge.reward_id for pledge in pledges])
+            ).distinct()
+        ))
+
+        counters: dict[RollupKey, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        funded_issue_ids: dict[RollupKey, set[UUID]] = defaultdict(set)
+        funder_rows = set()
+        for pledge in pledges:
+            for key in _get_keys(pledge.repository_id, at):
+                counters[key]["sats_pledged"] += pledge.reward_sats
+                if pledge.issue_id not in previously_funded_issue_ids:
+                    funded_issue_ids[key].add(pledge.issue_id)
+                funder_rows.add((*key, pledge.rewarder_id))
+        for key, issue_ids in funded_issue_ids.items():
+            counters[key]["issues_funded"] = len(issue_ids)
+        await self._add(counters)
+
+        # Funders are counted once per rollup, the ones already counted are skipped by the insert
+        new_funder_keys = await self._session.execute(
+            insert(RewardRollupFunderDbModel).values([
+                dict(zip((*ROLLUP_KEY, "user_id"), row))
+                for row in sorted(funder_rows)
+            ]).on_conflict_do_nothing().returning(
+                RewardRollupFunderDbModel.period,
+                RewardRollupFunderDbModel.repository_id,
+                RewardRollupFunderDbModel.bucket_start
+            )
+        )
+        funders: dict[RollupKey, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for key in new_funder_keys:
+            funders[tuple(key)]["active_funders"] += 1
+        await self._add(funders)
+
+    async def record_payout(self, issue_id: UUID, repository_id: UUID, at: datetime) -> None:
+        """
+        Counts the rewards of a claimed issue as paid out.
+        :param issue_id:
+        :param repository_id: Repository of the issue
+        :param at: Claim time
+        """
+        paid_out = await self._session.scalar(
+            select(func.coalesce(func.sum(RewardDbModel.reward_sats), 0)).where(
+                RewardDbModel.issue_id == issue_id
+            )
+        )
+        await self._add({
+            key: {"sats_paid_out": paid_out}
+            for key in _get_keys(repository_id, at)
+        })
+
+    async def list_rollups(
+        self,
+        period: RollupPeriod,
+        repository_id: UUID,
+        first_bucket_start: date,
+        last_bucket_start: date
+    ) -> list[RewardRollupDbModel]:
+        """
+        :return: Rollups of the range, buckets without activity are missing
+        """
+        return list(await self._session.scalars(
+            select(RewardRollupDbModel).where(
+                RewardRollupDbModel.period == period.value,
+                RewardRollupDbModel.repository_id == repository_id,
+                RewardRollupDbModel.bucket_start.between(first_bucket_start, last_bucket_start)
+            ).order_by(
+                RewardRollupDbModel.bucket_start
+            )
+        ))
+
+    async def _merge_from_select(self, counter: str, stmt: Select) -> None:
+        """
+        Sets a counter of the rollups selected by **stmt**, creating the missing ones.
+        """
+        insert_stmt = insert(RewardRollupDbModel).from_select([*ROLLUP_KEY, counter], stmt)
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=ROLLUP_KEY,
+            set_={counter: insert_stmt.excluded[counter]}
+        )
+        await self._session.execute(insert_stmt)
+
+    async def rebuild(self) -> None:
+        """
+        Replaces all the rollups with the ones computed from the rewards and the claimed issues.
+        The rollup writes of other transactions wait for this one to complete, reads don't.
+        """
+        await self._session.execute(text(
+            f"LOCK TABLE {RewardRollupDbModel.__tablename__}, {RewardRollupFunderDbModel.__tablename__} "
+            f"IN EXCLUSIVE MODE"
+        ))
+        await self._session.execute(delete(RewardRollupFunderDbModel))
+        await self._session.execute(delete(RewardRollupDbModel))
+
+        pledges = select(
+            IssueDbModel.repository_id,
+            RewardDbModel.created_at.label("at"),
+            RewardDbModel.reward_sats,
+            RewardDbModel.rewarder_id
+        ).join(
+            IssueDbModel, RewardDbModel.issue_id == IssueDbModel.id
+        ).subquery()
+        payouts = select(
+            IssueDbModel.repository_id,
+            IssueDbModel.claimed_at.label("at"),
+            RewardDbModel.reward_sats
+        ).join(
+            IssueDbModel, RewardDbModel.issue_id == IssueDbModel.id
+        ).where(
+            IssueDbModel.is_closed.is_(True),
+            IssueDbModel.claimed_at.is_not(None)
+        ).subquery()
+        fundings = select(
+            IssueDbModel.repository_id,
+            func.min(RewardDbModel.created_at).label("at")
+        ).join(
+            IssueDbModel, RewardDbModel.issue_id == IssueDbModel.id
+        ).group_by(
+            IssueDbModel.id
+        ).subquery()
+
+        for period in RollupPeriod:
+            await self._merge_from_select(
+                "sats_pledged",
+                _select_buckets(period, pledges, func.sum(pledges.c.reward_sats))
+            )
+            await self._merge_from_select(
+                "sats_paid_out",
+                _select_buckets(period, payouts, func.sum(payouts.c.reward_sats))
+            )
+            await self._merge_from_select(
+                "issues_funded",
+                _select_buckets(period, fundings, func.count())
+            )
+            bucket = _bucket(period, pledges.c.at)
+            await self._session.execute(insert(RewardRollupFunderDbModel).from_select(
+                [*ROLLUP_KEY, "user_id"],
+                union_all(
+                    select(
+                        literal(period.value),
+                        literal(GLOBAL_SCOPE, PSQL_UUID(as_uuid=True)),
+                        bucket,
+                        pledges.c.rewarder_id
+                    ).distinct(),
+                    select(
+                        literal(period.value),
+                        pledges.c.repository_id,
+                        bucket,
+                        pledges.c.rewarder_id
+                    ).distinct()
+                )
+            ))
+
+        await self._merge_from_select(
+            "active_funders",
+            select(
+                RewardRollupFunderDbModel.period,
+                RewardRollupFunderDbModel.repository_id,
+                RewardRollupFunderDbModel.bucket_start,
+                func.count()
+            ).group_by(
+                RewardRollupFunderDbModel.period,
+                RewardRollupFunderDbModel.repository_id,
+                RewardRollupFunderDbModel.bucket_start
+            )
+        )
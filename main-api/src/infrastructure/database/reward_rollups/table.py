@@ -0,0 +1,41 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import BIGINT, Date, Integer, String
+from sqlalchemy.dialects.postgresql import UUID as PSQL_UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._abstract.tables.base import SQLABase
+
+
+# Repository ID of the rollups of all the repositories together
+GLOBAL_SCOPE = UUID(int=0)
+
+
+class RewardRollupDbModel(SQLABase):
+    """
+    Reward activity of a repository, or of all of them, in a day, week or month.
+    The primary key serves the time range reads of a repository.
+    """
+    __tablename__ = "reward_rollups"
+
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)
+    repository_id: Mapped[UUID] = mapped_column(PSQL_UUID(as_uuid=True), primary_key=True)
+    bucket_start: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    sats_pledged: Mapped[int] = mapped_column(BIGINT, nullable=False, server_default="0")
+    sats_paid_out: Mapped[int] = mapped_column(BIGINT, nullable=False, server_default="0")
+    issues_funded: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    active_funders: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+
+class RewardRollupFunderDbModel(SQLABase):
+    """
+    Users counted in the **active_funders** of a rollup, so each of them is counted once.
+    """
+    __tablename__ = "reward_rollup_funders"
+
+    period: Mapped[str] = mapped_column(String(8), primary_key=True)
+    repository_id: Mapped[UUID] = mapped_column(PSQL_UUID(as_uuid=True), primary_key=True)
+    bucket_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[UUID] = mapped_column(PSQL_UUID(as_uuid=True), primary_key=True)
@@ -24,5 +24,15 @@ class ExpandedRewardDto(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     reward: RewardDbModel
-    rewarder: UserDbModel
-    issue: IssueDbModel
+    rewarder: UserDbModel | None = None
+    issue: IssueDbModel | None = None
+
+
+class ExpandedRewardProjectionDto(BaseModel):
+    """
+    Parts of the expanded rewards to load.
+    **reward_columns** are the reward columns besides the ID, all of them if None.
+    """
+    reward_columns: set[str] | None = None
+    rewarder: bool = True
+    issue: bool = True
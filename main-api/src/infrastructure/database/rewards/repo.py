@@ -1,8 +1,10 @@
 import logging
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select, Select, func, text
+from sqlalchemy import select, Select, func
+from sqlalchemy.orm import aliased, load_only
 
 from .._abstract.dtos import Pagination
 from .._abstract.repo import SQLAAbstractRepo
@@ -10,7 +12,8 @@ from .table import RewardDbModel
 from .dtos import (
     CreateRewardDto,
     RewardFiltersDto,
-    ExpandedRewardDto
+    ExpandedRewardDto,
+    ExpandedRewardProjectionDto
 )
 from ..issues import IssueDbModel
 from ..users import UserDbModel
@@ -20,20 +23,44 @@ class RewardRepo(SQLAAbstractRepo):
 
     def _parse_row(self, row: Any) -> ExpandedRewardDto | None:
         if row is not None:
-            return ExpandedRewardDto(
-                reward=row[0],
-                rewarder=row[1],
-                issue=row[2]
-            )
+            values = row._asdict()
+            return ExpandedRewardDto(reward=values.pop("RewardDbModel"), **values)
+
+    def _select_expanded(self, projection: ExpandedRewardProjectionDto | None = None) -> Select:
+        """
+        Selects the rewards along with the rewarder user data and the issue data.
+        :param projection: Columns and joins to load, all of them if not passed
+        """
+        if projection is None:
+            projection = ExpandedRewardProjectionDto()
+
+        stmt = select(RewardDbModel)
+        if projection.reward_columns is not None:
+            reward_columns = [getattr(RewardDbModel, column) for column in projection.reward_columns]
+            stmt = stmt.options(load_only(RewardDbModel.id, *reward_columns))
+        # Only the columns of UserData and IssueData are loaded for the joined rows
+        if projection.rewarder:
+            rewarder = aliased(UserDbModel, name="rewarder")
+            stmt = stmt.add_columns(rewarder).join(
+                rewarder,
+                RewardDbModel.rewarder_id == rewarder.id
+            ).options(load_only(rewarder.github_username, rewarder.avatar_url))
+        if projection.issue:
+            issue = aliased(IssueDbModel, name="issue")
+            stmt = stmt.add_columns(issue).join(
+                issue,
+                RewardDbModel.issue_id == issue.id
+            ).options(load_only(issue.issue_number, issue.title, issue.is_closed))
+        return stmt
 
     def _apply_filters(self, stmt: Select, filters: RewardFiltersDto) -> Select:
         if filters.issue_id is not None:
             stmt = stmt.where(RewardDbModel.issue_id == filters.issue_id)
         if filters.is_closed is not None:
-            stmt = stmt.join(
-                IssueDbModel,
-                RewardDbModel.issue_id == IssueDbModel.id
-            ).where(IssueDbModel.is_closed == filters.is_closed)
+            # Not joined, so it works the same whether the issues are selected or not
+            stmt = stmt.where(RewardDbModel.issue_id.in_(
+                select(IssueDbModel.id).where(IssueDbModel.is_closed == filters.is_closed)
+            ))
         if filters.rewarder_id is not None:
             stmt = stmt.where(RewardDbModel.rewarder_id == filters.rewarder_id)
 
@@ -42,26 +69,22 @@ class RewardRepo(SQLAAbstractRepo):
     async def create_reward(self, reward_dto: CreateRewardDto) -> RewardDbModel:
         new_reward = RewardDbModel(**reward_dto.model_dump())
         self._session.add(new_reward)
-        logging.debug(f"New reward created: {new_reward}")
+        logging.debug("New reward created: %s", new_reward)
         return new_reward
 
+    async def create_rewards(self, reward_dtos: list[CreateRewardDto]) -> list[RewardDbModel]:
+        new_rewards = [RewardDbModel(**reward_dto.model_dump()) for reward_dto in reward_dtos]
+        self._session.add_all(new_rewards)
+        logging.debug("%s new rewards created", len(new_rewards))
+        return new_rewards
+
     async def get_reward(self, reward_id: UUID) -> RewardDbModel | None:
         return await self._session.scalar(
             select(RewardDbModel).where(RewardDbModel.id == reward_id)
         )
 
     async def get_reward_expanded(self, reward_id: UUID) -> ExpandedRewardDto | None:
-        stmt = select(
-            RewardDbModel,
-            UserDbModel,
-            IssueDbModel
-        ).join(
-            UserDbModel,
-            RewardDbModel.rewarder_id == UserDbModel.id
-        ).join(
-            IssueDbModel,
-            RewardDbModel.issue_id == IssueDbModel.id
-        ).where(RewardDbModel.id == reward_id)
+        stmt = self._select_expanded().where(RewardDbModel.id == reward_id)
 
         return self._parse_row(
             (await self._session.execute(stmt)).first()
@@ -85,19 +108,10 @@ class RewardRepo(SQLAAbstractRepo):
     async def list_rewards_expanded(
         self,
         pagination: Pagination | None = None,
-        filters: RewardFiltersDto | None = None
+        filters: RewardFiltersDto | None = None,
+        projection: ExpandedRewardProjectionDto | None = None
     ) -> list[ExpandedRewardDto]:
-        stmt = select(
-            RewardDbModel,
-            UserDbModel,
-            IssueDbModel
-        ).join(
-            UserDbModel,
-            RewardDbModel.rewarder_id == UserDbModel.id
-        ).join(
-            IssueDbModel,
-            RewardDbModel.issue_id == IssueDbModel.id
-        )
+        stmt = self._select_expanded(projection)
 
         stmt = self._apply_pagination(stmt, pagination)
 
@@ -109,6 +123,26 @@ class RewardRepo(SQLAAbstractRepo):
             for row in (await self._session.execute(stmt)).all()
         ]
 
+    async def stream_rewards_expanded(
+        self,
+        since: datetime | None = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[ExpandedRewardDto]:
+        """
+        Streams the rewards modified since the passed time, the oldest first.
+        Rows are fetched by **batch_size** through a server-side cursor, so the memory use stays constant.
+        """
+        stmt = self._select_expanded().order_by(
+            RewardDbModel.modified_at,
+            RewardDbModel.id
+        ).execution_options(yield_per=batch_size)
+
+        if since is not None:
+            stmt = stmt.where(RewardDbModel.modified_at >= since)
+
+        async for row in await self._session.stream(stmt):
+            yield self._parse_row(row)
+
     async def count_rewards(
         self,
         filters: RewardFiltersDto | None = None
@@ -135,8 +169,22 @@ class RewardRepo(SQLAAbstractRepo):
         result = await self._session.scalar(stmt)
         return int(result) if result is not None else 0
 
-    async def lock_exclusively(self) -> None:
-        await self._session.execute(text(f"LOCK TABLE {RewardDbModel.__tablename__} IN EXCLUSIVE MODE"))
-
-    async def lock_in_share_mode(self) -> None:
-        await self._session.execute(text(f"LOCK TABLE {RewardDbModel.__tablename__} IN SHARE MODE"))
+    async def sum_rewards_by_issue_ids(self, issue_ids: list[UUID]) -> dict[UUID, int]:
+        """
+        :param issue_ids: IDs of the issues
+        :return: Total reward per issue, issues without rewards are omitted
+        """
+        if not issue_ids:
+            return {}
+
+        rows = await self._session.execute(
+            select(
+                RewardDbModel.issue_id,
+                func.sum(RewardDbModel.reward_sats)
+            ).where(
+                RewardDbModel.issue_id.in_(issue_ids)
+            ).group_by(
+                RewardDbModel.issue_id
+            )
+        )
+        return {issue_id: int(total) for issue_id, total in rows}
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, BIGINT
+from sqlalchemy import ForeignKey, BIGINT, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .._abstract.tables import IdentifiableDbModel, TimestampedDbModel
@@ -8,6 +8,10 @@ from .._abstract.tables import IdentifiableDbModel, TimestampedDbModel
 
 class RewardDbModel(IdentifiableDbModel, TimestampedDbModel):
     __tablename__ = "rewards"
+    __table_args__ = (
+        # Incremental exports
+        Index("ix_rewards_modified_at_id", "modified_at", "id"),
+    )
 
     issue_id: Mapped[UUID] = mapped_column(ForeignKey("issues.id"), nullable=False)
     rewarder_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
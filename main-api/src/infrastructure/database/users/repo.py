@@ -12,9 +12,8 @@ from .._abstract.repo import SQLAAbstractRepo
 class UserRepo(SQLAAbstractRepo):
 
     async def create_user(self, user_dto: CreateUserDTO) -> UserDbModel:
-        logging.debug(f"Start creating new issue with data: {user_dto.model_dump()}")
         new_user_obj = UserDbModel(**user_dto.model_dump())
-        logging.debug(f"New user created: {new_user_obj}")
+        logging.debug("New user created: %s", new_user_obj)
         self._session.add(new_user_obj)
         return new_user_obj
 
@@ -33,16 +32,63 @@ class UserRepo(SQLAAbstractRepo):
         github_id: int,
         user_dto: CreateUserDTO
     ) -> UserDbModel:
-        fetched_user = await self.get_user_by_github_id(github_id)
-        if fetched_user is None:
-            fetched_user = await self.create_user(user_dto)
-        return fetched_user
+        """
+        Fetches a user by its GitHub ID or creates a new one if not found, in a single statement.
+        """
+        user, _, _ = await self._upsert(
+            UserDbModel,
+            values={**user_dto.model_dump(), "github_id": github_id},
+            unique_field="github_id",
+            update_fields=[]
+        )
+        return user
 
     async def get_user_by_username(self, username: str) -> UserDbModel | None:
         return await self._session.scalar(
             select(UserDbModel).where(UserDbModel.github_username == username)
         )
 
+    async def get_users_by_ids(self, user_ids: list[UUID]) -> list[UserDbModel]:
+        """
+        Fetches the users with a single query, in the order of the passed IDs. Unknown IDs are skipped.
+        """
+        if not user_ids:
+            return []
+
+        users = {
+            user.id: user
+            for user in await self._session.scalars(select(UserDbModel).where(UserDbModel.id.in_(user_ids)))
+        }
+        return [users[user_id] for user_id in dict.fromkeys(user_ids) if user_id in users]
+
+    async def get_users_by_github_ids(self, github_ids: list[int]) -> list[UserDbModel]:
+        """
+        Fetches the users with a single query, in the order of the passed GitHub IDs. Unknown IDs are skipped.
+        """
+        if not github_ids:
+            return []
+
+        users = {
+            user.github_id: user
+            for user in await self._session.scalars(select(UserDbModel).where(UserDbModel.github_id.in_(github_ids)))
+        }
+        return [users[github_id] for github_id in dict.fromkeys(github_ids) if github_id in users]
+
+    async def get_users_by_usernames(self, usernames: list[str]) -> list[UserDbModel]:
+        """
+        Fetches the users with a single query, in the order of the passed usernames. Unknown usernames are skipped.
+        """
+        if not usernames:
+            return []
+
+        users = {
+            user.github_username: user
+            for user in await self._session.scalars(
+                select(UserDbModel).where(UserDbModel.github_username.in_(usernames))
+            )
+        }
+        return [users[username] for username in dict.fromkeys(usernames) if username in users]
+
     async def list_users(self, pagination: Pagination | None = None) -> list[UserDbModel]:
         stmt = self._apply_pagination(
             select(UserDbModel),
@@ -51,15 +97,13 @@ class UserRepo(SQLAAbstractRepo):
         return await self._session.scalars(stmt)
 
     async def update_user(self, user_id: UUID, update_fields: UpdateUserDTO) -> UserDbModel | None:
-        logging.debug(
-            f"Start updating user {user_id}, new fields: {update_fields.model_dump(exclude_unset=True)}"
-        )
+        values = update_fields.model_dump(exclude_unset=True)
         stmt = update(
             UserDbModel
         ).where(
             UserDbModel.id == user_id
         ).values(
-            **update_fields.model_dump(exclude_unset=True)
+            **values
         ).returning(UserDbModel)
-        logging.debug(f"Updated user created")
+        logging.debug("User %s updated with fields: %s", user_id, values)
         return await self._session.scalar(stmt)
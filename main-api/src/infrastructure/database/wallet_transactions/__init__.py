@@ -0,0 +1,9 @@
+from .table import WalletTransactionDbModel, WalletHistorySyncStateDbModel
+from .repo import WalletTransactionRepo
+
+
+__all__ = [
+    "WalletTransactionDbModel",
+    "WalletHistorySyncStateDbModel",
+    "WalletTransactionRepo"
+]
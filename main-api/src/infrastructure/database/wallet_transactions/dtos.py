@@ -0,0 +1,31 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class WalletTransactionDto(BaseModel):
+    checking_id: str
+    pending: bool
+    amount_msat: int
+    memo: str | None = None
+    time: int
+
+
+class WalletTransactionFiltersDto(BaseModel):
+    incoming: bool | None = None
+    since: int | None = None
+    until: int | None = None
+
+
+class WalletTransactionCursorDto(BaseModel):
+    """
+    Position of the last entry of the previous page.
+    """
+    time: int
+    checking_id: str
+
+
+class WalletHistorySyncStateDto(BaseModel):
+    wallet_id: UUID
+    backfilled: bool
+    backfill_offset: int = Field(0, ge=0)
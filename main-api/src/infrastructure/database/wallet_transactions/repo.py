@@ -0,0 +1,160 @@
+import datetime
+from uuid import UUID
+
+from sqlalchemy import select, update, func, tuple_, or_, nulls_first
+from sqlalchemy.dialects.postgresql import insert
+
+from .dtos import (
+    WalletTransactionDto,
+    WalletTransactionFiltersDto,
+    WalletTransactionCursorDto,
+    WalletHistorySyncStateDto
+)
+from .table import WalletTransactionDbModel, WalletHistorySyncStateDbModel
+from .._abstract.dtos import Pagination
+from .._abstract.repo import SQLAAbstractRepo
+from ..lightning_wallet import LightningWalletDbModel
+
+
+class WalletTransactionRepo(SQLAAbstractRepo):
+
+    async def upsert_transactions(self, wallet_id: UUID, transactions: list[WalletTransactionDto]) -> None:
+        """
+        Inserts new entries and updates the ones that changed (e.g. pending payments that got settled).
+        """
+        if not transactions:
+            return
+
+        stmt = insert(WalletTransactionDbModel).values([
+            {"wallet_id": wallet_id, **transaction.model_dump()}
+            for transaction in transactions
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WalletTransactionDbModel.wallet_id, WalletTransactionDbModel.checking_id],
+            set_={
+                "pending": stmt.excluded.pending,
+                "amount_msat": stmt.excluded.amount_msat,
+                "memo": stmt.excluded.memo,
+                "time": stmt.excluded.time,
+                "modified_at": func.now()
+            },
+            where=or_(
+                WalletTransactionDbModel.pending.is_distinct_from(stmt.excluded.pending),
+                WalletTransactionDbModel.amount_msat.is_distinct_from(stmt.excluded.amount_msat),
+                WalletTransactionDbModel.memo.is_distinct_from(stmt.excluded.memo),
+                WalletTransactionDbModel.time.is_distinct_from(stmt.excluded.time)
+            )
+        )
+        await self._session.execute(stmt)
+
+    async def get_high_water_mark(self, wallet_id: UUID) -> int | None:
+        """
+        Returns the time down to which the newest entries have to be re-fetched:
+        the latest settled entry or the earliest pending one, whichever is older.
+        """
+        stmt = select(
+            func.max(WalletTransactionDbModel.time).filter(WalletTransactionDbModel.pending.is_(False)),
+            func.min(WalletTransactionDbModel.time).filter(WalletTransactionDbModel.pending.is_(True))
+        ).where(WalletTransactionDbModel.wallet_id == wallet_id)
+
+        latest_settled, earliest_pending = (await self._session.execute(stmt)).one()
+        marks = [mark for mark in (latest_settled, earliest_pending) if mark is not None]
+        return min(marks) if marks else None
+
+    async def list_transactions(
+        self,
+        wallet_id: UUID,
+        pagination: Pagination,
+        filters: WalletTransactionFiltersDto | None = None,
+        cursor: WalletTransactionCursorDto | None = None
+    ) -> list[WalletTransactionDbModel]:
+        """
+        Lists the mirrored entries, newest first.
+        If the cursor is passed, the entries after it are listed and **pagination.skip** is ignored.
+        """
+        stmt = select(
+            WalletTransactionDbModel
+        ).where(
+            WalletTransactionDbModel.wallet_id == wallet_id
+        ).order_by(
+            WalletTransactionDbModel.time.desc(),
+            WalletTransactionDbModel.checking_id.desc()
+        )
+
+        if filters is not None:
+            if filters.incoming is not None:
+                stmt = stmt.where(
+                    WalletTransactionDbModel.amount_msat > 0 if filters.incoming
+                    else WalletTransactionDbModel.amount_msat < 0
+                )
+            if filters.since is not None:
+                stmt = stmt.where(WalletTransactionDbModel.time >= filters.since)
+            if filters.until is not None:
+                stmt = stmt.where(WalletTransactionDbModel.time < filters.until)
+
+        if cursor is not None:
+            stmt = stmt.where(
+                tuple_(WalletTransactionDbModel.time, WalletTransactionDbModel.checking_id)
+                < tuple_(cursor.time, cursor.checking_id)
+            )
+            pagination = Pagination(limit=pagination.limit)
+
+        return list(await self._session.scalars(self._apply_pagination(stmt, pagination)))
+
+    async def get_sync_state(self, wallet_id: UUID) -> WalletHistorySyncStateDbModel | None:
+        return await self._session.scalar(
+            select(WalletHistorySyncStateDbModel).where(WalletHistorySyncStateDbModel.wallet_id == wallet_id)
+        )
+
+    async def save_sync_state(self, state_dto: WalletHistorySyncStateDto) -> None:
+        values = {
+            **state_dto.model_dump(),
+            "needs_sync": False,
+            "last_synced_at": func.now()
+        }
+        stmt = insert(WalletHistorySyncStateDbModel).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[WalletHistorySyncStateDbModel.wallet_id],
+            set_={key: value for key, value in values.items() if key != "wallet_id"}
+        )
+        await self._session.execute(stmt)
+
+    async def mark_needs_sync(self, wallet_ids: list[UUID]) -> None:
+        """
+        Flags the wallets whose history changed, so they are synchronized in the next round.
+        """
+        if not wallet_ids:
+            return
+        await self._session.execute(
+            update(WalletHistorySyncStateDbModel).where(
+                WalletHistorySyncStateDbModel.wallet_id.in_(wallet_ids)
+            ).values(needs_sync=True)
+        )
+
+    async def list_wallets_to_sync(
+        self,
+        limit: int,
+        stale_after: datetime.timedelta
+    ) -> list[LightningWalletDbModel]:
+        """
+        Lists wallets that were never synchronized, were flagged as changed
+        or weren't synchronized for longer than **stale_after**, in that order.
+        """
+        stmt = select(
+            LightningWalletDbModel
+        ).outerjoin(
+            WalletHistorySyncStateDbModel,
+            LightningWalletDbModel.id == WalletHistorySyncStateDbModel.wallet_id
+        ).where(
+            or_(
+                WalletHistorySyncStateDbModel.wallet_id.is_(None),
+                WalletHistorySyncStateDbModel.needs_sync.is_(True),
+                WalletHistorySyncStateDbModel.backfilled.is_(False),
+                WalletHistorySyncStateDbModel.last_synced_at < func.now() - stale_after
+            )
+        ).order_by(
+            WalletHistorySyncStateDbModel.needs_sync.desc().nulls_first(),
+            nulls_first(WalletHistorySyncStateDbModel.last_synced_at)
+        ).limit(limit)
+
+        return list(await self._session.scalars(stmt))
@@ -0,0 +1,44 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import ForeignKey, String, BIGINT, Boolean, Integer, DateTime, Index, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._abstract.tables import IdentifiableDbModel, TimestampedDbModel
+from .._abstract.tables.base import SQLABase
+
+
+class WalletTransactionDbModel(IdentifiableDbModel, TimestampedDbModel):
+    """
+    Local mirror of the LNBits payment history of user wallets.
+    """
+    __tablename__ = "wallet_transactions"
+    __table_args__ = (
+        UniqueConstraint("wallet_id", "checking_id"),
+        Index("ix_wallet_transactions_wallet_id_time", "wallet_id", "time", "checking_id"),
+    )
+
+    wallet_id: Mapped[UUID] = mapped_column(ForeignKey("lightning_wallets.id"), nullable=False)
+
+    checking_id: Mapped[str] = mapped_column(String, nullable=False)
+    pending: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    amount_msat: Mapped[int] = mapped_column(BIGINT, nullable=False)
+    memo: Mapped[str | None] = mapped_column(String, nullable=True)
+    time: Mapped[int] = mapped_column(BIGINT, nullable=False)  # Unix timestamp, as returned by LNBits
+
+
+class WalletHistorySyncStateDbModel(SQLABase):
+    """
+    Synchronization progress of a wallet history mirror.
+
+    The first synchronization walks the whole history page by page, **backfill_offset** keeps the progress.
+    After that, only the newest entries are fetched, down to the high-water mark of the mirrored entries.
+    """
+    __tablename__ = "wallet_history_sync_states"
+
+    wallet_id: Mapped[UUID] = mapped_column(ForeignKey("lightning_wallets.id"), primary_key=True)
+
+    backfilled: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    backfill_offset: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    needs_sync: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
@@ -0,0 +1,8 @@
+from .table import GithubWebhookDeliveryDbModel
+from .repo import GithubWebhookDeliveryRepo
+
+
+__all__ = [
+    "GithubWebhookDeliveryDbModel",
+    "GithubWebhookDeliveryRepo"
+]
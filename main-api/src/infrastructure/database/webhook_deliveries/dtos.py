@@ -0,0 +1,10 @@
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class CreateGithubWebhookDeliveryDto(BaseModel):
+    delivery_id: str = Field(..., max_length=64)
+    event: str = Field(..., max_length=64)
+    action: str | None = Field(None, max_length=64)
+    payload: dict[str, Any]
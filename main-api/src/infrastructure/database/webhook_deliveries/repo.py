@@ -0,0 +1,126 @@
+import datetime
+import logging
+
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert
+
+from domain.webhooks.schemas import WebhookDeliveryStatus
+from .dtos import CreateGithubWebhookDeliveryDto
+from .table import GithubWebhookDeliveryDbModel
+from .._abstract.repo import SQLAAbstractRepo
+
+
+class GithubWebhookDeliveryRepo(SQLAAbstractRepo):
+
+    async def create_delivery_if_new(
+        self,
+        delivery_dto: CreateGithubWebhookDeliveryDto
+    ) -> GithubWebhookDeliveryDbModel | None:
+        """
+        Stores a webhook delivery unless a delivery with the same GitHub delivery ID already exists.
+        :param delivery_dto: Delivery data
+        :return: The stored delivery or None if it is a duplicate
+        """
+        stmt = insert(GithubWebhookDeliveryDbModel).values(
+            **delivery_dto.model_dump(),
+            status=WebhookDeliveryStatus.PENDING,
+            attempts=0
+        ).on_conflict_do_nothing(
+            index_elements=[GithubWebhookDeliveryDbModel.delivery_id]
+        ).returning(GithubWebhookDeliveryDbModel)
+
+        new_delivery = await self._session.scalar(stmt)
+        logging.debug("Webhook delivery %s stored: %s", delivery_dto.delivery_id, new_delivery is not None)
+        return new_delivery
+
+    async def get_delivery(self, delivery_id: str) -> GithubWebhookDeliveryDbModel | None:
+        return await self._session.scalar(
+            select(GithubWebhookDeliveryDbModel).where(GithubWebhookDeliveryDbModel.delivery_id == delivery_id)
+        )
+
+    async def claim_delivery(self, delivery_id: str) -> GithubWebhookDeliveryDbModel | None:
+        """
+        Marks a pending delivery as being processed.
+        :param delivery_id: GitHub delivery ID
+        :return: The claimed delivery or None if it's not pending anymore
+        """
+        stmt = update(
+            GithubWebhookDeliveryDbModel
+        ).where(
+            GithubWebhookDeliveryDbModel.delivery_id == delivery_id,
+            GithubWebhookDeliveryDbModel.status == WebhookDeliveryStatus.PENDING
+        ).values(
+            status=WebhookDeliveryStatus.PROCESSING,
+            processing_started_at=func.now(),
+            attempts=GithubWebhookDeliveryDbModel.attempts + 1
+        ).returning(GithubWebhookDeliveryDbModel)
+
+        return await self._session.scalar(stmt)
+
+    async def claim_pending_deliveries(
+        self,
+        limit: int,
+        max_attempts: int,
+        stale_after: datetime.timedelta
+    ) -> list[GithubWebhookDeliveryDbModel]:
+        """
+        Claims pending deliveries and deliveries stuck in processing for longer than **stale_after**.
+        Rows locked by other workers are skipped, so several nodes can sweep concurrently.
+        :param limit: Max number of deliveries to claim
+        :param max_attempts: Deliveries with this many attempts are not claimed anymore
+        :param stale_after: Time after which a delivery being processed is considered abandoned
+        :return: Claimed deliveries
+        """
+        candidates = select(
+            GithubWebhookDeliveryDbModel.id
+        ).where(
+            GithubWebhookDeliveryDbModel.attempts < max_attempts,
+            or_(
+                GithubWebhookDeliveryDbModel.status == WebhookDeliveryStatus.PENDING,
+                and_(
+                    GithubWebhookDeliveryDbModel.status == WebhookDeliveryStatus.PROCESSING,
+                    GithubWebhookDeliveryDbModel.processing_started_at < func.now() - stale_after
+                )
+            )
+        ).order_by(
+            GithubWebhookDeliveryDbModel.created_at
+        ).limit(limit).with_for_update(skip_locked=True)
+
+        stmt = update(
+            GithubWebhookDeliveryDbModel
+        ).where(
+            GithubWebhookDeliveryDbModel.id.in_(candidates.scalar_subquery())
+        ).values(
+            status=WebhookDeliveryStatus.PROCESSING,
+            processing_started_at=func.now(),
+            attempts=GithubWebhookDeliveryDbModel.attempts + 1
+        ).returning(GithubWebhookDeliveryDbModel)
+
+        return list(await self._session.scalars(stmt))
+
+    async def mark_processed(self, delivery_id: str) -> None:
+        await self._session.execute(
+            update(GithubWebhookDeliveryDbModel).where(
+                GithubWebhookDeliveryDbModel.delivery_id == delivery_id
+            ).values(
+                status=WebhookDeliveryStatus.PROCESSED,
+                processed_at=func.now(),
+                last_error=None
+            )
+        )
+
+    async def mark_failed(self, delivery_id: str, error: str, retry: bool) -> None:
+        """
+        Records a processing failure.
+        :param delivery_id: GitHub delivery ID
+        :param error: Error description
+        :param retry: If True, the delivery goes back to pending, otherwise it's marked as failed
+        """
+        await self._session.execute(
+            update(GithubWebhookDeliveryDbModel).where(
+                GithubWebhookDeliveryDbModel.delivery_id == delivery_id
+            ).values(
+                status=WebhookDeliveryStatus.PENDING if retry else WebhookDeliveryStatus.FAILED,
+                last_error=error
+            )
+        )
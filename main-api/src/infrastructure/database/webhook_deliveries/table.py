@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .._abstract.tables import IdentifiableDbModel, TimestampedDbModel
+
+
+class GithubWebhookDeliveryDbModel(IdentifiableDbModel, TimestampedDbModel):
+    __tablename__ = "github_webhook_deliveries"
+
+    delivery_id: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    event: Mapped[str] = mapped_column(String(64), nullable=False)
+    action: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    status: Mapped[str] = mapped_column(String(16), nullable=False, index=True)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
+    processing_started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
@@ -0,0 +1,10 @@
+from .hub import EventHub, Subscription
+from .notifications import notify_events, LiveEventListener
+
+
+__all__ = [
+    "EventHub",
+    "Subscription",
+    "notify_events",
+    "LiveEventListener"
+]
@@ -0,0 +1,166 @@
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+from uuid import UUID
+
+from domain.rewards.schemas import RewardEventSchema
+from infrastructure.metrics import MetricsRegistry
+
+
+_SUBSCRIBERS = MetricsRegistry.gauge(
+    "live_event_subscribers",
+    "Number of open live event subscriptions."
+)
+_PUBLISHED = MetricsRegistry.counter(
+    "live_events_published_total",
+    "Number of live events published to the subscribers of this instance by type.",
+    ("type",)
+)
+_DROPPED = MetricsRegistry.counter(
+    "live_events_dropped_total",
+    "Number of live events dropped for subscribers that didn't keep up."
+)
+
+
+class Subscription:
+    """
+    Pending events of a subscriber. A subscriber that doesn't keep up loses the oldest events
+    and is told it lagged behind, so it can reload the state it shows instead.
+    """
+
+    def __init__(self, repository_ids: frozenset[UUID], issue_ids: frozenset[UUID], max_pending: int):
+        self.repository_ids = repository_ids
+        self.issue_ids = issue_ids
+
+        self._pending: deque[RewardEventSchema] = deque(maxlen=max_pending)
+        self._lagged = False
+        self._closed = False
+        self._ready = asyncio.Event()
+
+    @property
+    def is_filtered(self) -> bool:
+        return bool(self.repository_ids or self.issue_ids)
+
+    def put(self, event: RewardEventSchema) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            self._lagged = True
+            _DROPPED.inc()
+        self._pending.append(event)
+        self._ready.set()
+
+    def mark_lagged(self) -> None:
+        self._lagged = True
+        self._ready.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def get(self) -> tuple[list[RewardEventSchema], bool] | None:
+        """
+        Waits for events. The events published meanwhile are returned at once, so they can be sent together.
+        :return: The events, oldest first, and whether events were lost before them.
+        None once the subscription is closed
+        """
+        await self._ready.wait()
+        if self._closed:
+            return None
+        self._ready.clear()
+        events, lagged = list(self._pending), self._lagged
+        self._pending.clear()
+        self._lagged = False
+        return events, lagged
+
+
+class EventHub:
+    """
+    Fans the reward events out to the subscribers of this instance.
+
+    Subscribers are indexed by the repositories and the issues they follow,
+    so publishing an event only visits the subscribers interested in it.
+    Publishing never waits for a subscriber, each one has a bounded queue of pending events.
+    """
+
+    _max_pending: int = 100
+
+    _unfiltered: set[Subscription] = set()
+    _by_repository_id: dict[UUID, set[Subscription]] = {}
+    _by_issue_id: dict[UUID, set[Subscription]] = {}
+    _closed: bool = False
+
+    @classmethod
+    def setup(cls, max_pending: int = 100) -> None:
+        """
+        :param max_pending: Events kept for a subscriber before the oldest ones are dropped
+        """
+        cls._max_pending = max_pending
+        cls._closed = False
+
+    @classmethod
+    @contextmanager
+    def subscribe(
+        cls,
+        repository_ids: Iterable[UUID] = (),
+        issue_ids: Iterable[UUID] = ()
+    ) -> Iterator[Subscription]:
+        """
+        Subscribes to the events of the repositories and the issues, to all the events if none is passed.
+        """
+        subscription = Subscription(frozenset(repository_ids), frozenset(issue_ids), cls._max_pending)
+        if cls._closed:
+            subscription.close()
+        if not subscription.is_filtered:
+            cls._unfiltered.add(subscription)
+        for repository_id in subscription.repository_ids:
+            cls._by_repository_id.setdefault(repository_id, set()).add(subscription)
+        for issue_id in subscription.issue_ids:
+            cls._by_issue_id.setdefault(issue_id, set()).add(subscription)
+        _SUBSCRIBERS.inc()
+        try:
+            yield subscription
+        finally:
+            _SUBSCRIBERS.dec()
+            cls._unfiltered.discard(subscription)
+            cls._discard(cls._by_repository_id, subscription.repository_ids, subscription)
+            cls._discard(cls._by_issue_id, subscription.issue_ids, subscription)
+
+    @staticmethod
+    def _discard(index: dict[UUID, set[Subscription]], keys: Iterable[UUID], subscription: Subscription) -> None:
+        for key in keys:
+            subscriptions = index.get(key, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                index.pop(key, None)
+
+    @classmethod
+    def publish(cls, event: RewardEventSchema) -> None:
+        # A subscriber following both the repository and the issue gets the event once
+        subscriptions = cls._unfiltered.union(
+            cls._by_repository_id.get(event.repository_id, ()),
+            cls._by_issue_id.get(event.issue_id, ())
+        )
+        for subscription in subscriptions:
+            subscription.put(event)
+        _PUBLISHED.inc(type=event.type.value)
+
+    @classmethod
+    def mark_all_lagged(cls) -> None:
+        """
+        Tells all the subscribers that events may have been lost.
+        """
+        for subscription in cls._iter_subscriptions():
+            subscription.mark_lagged()
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Ends all the subscriptions, and the ones opened afterwards right away.
+        """
+        cls._closed = True
+        for subscription in cls._iter_subscriptions():
+            subscription.close()
+
+    @classmethod
+    def _iter_subscriptions(cls) -> set[Subscription]:
+        return cls._unfiltered.union(*cls._by_repository_id.values(), *cls._by_issue_id.values())
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Iterable
+
+from pydantic import TypeAdapter
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.rewards.schemas import RewardEventSchema
+from infrastructure.database import listen
+from .hub import EventHub
+
+
+EVENTS_CHANNEL = "reward_events"
+# NOTIFY payloads are limited to 8000 bytes, an event takes less than 350
+MAX_EVENTS_PER_NOTIFICATION = 20
+
+_events_adapter = TypeAdapter(list[RewardEventSchema])
+
+
+async def notify_events(session: AsyncSession, events: Iterable[RewardEventSchema]) -> None:
+    """
+    Queues the events for the subscribers of all the API instances, including this one.
+    Postgres delivers notifications when the transaction commits and drops them on rollback,
+    so the subscribers only hear about committed changes.
+    :param session: Session of the transaction making the changes
+    :param events:
+    :return: None
+    """
+    events = list(events)
+    for start in range(0, len(events), MAX_EVENTS_PER_NOTIFICATION):
+        payload = _events_adapter.dump_json(events[start:start + MAX_EVENTS_PER_NOTIFICATION]).decode()
+        await session.execute(select(func.pg_notify(EVENTS_CHANNEL, payload)))
+
+
+class LiveEventListener:
+    """
+    Publishes the events notified by all the API instances to the subscribers of this one.
+
+    Notifications sent while the connection is down are lost, so the subscribers are told they lagged on reconnect.
+    """
+
+    _connect_kwargs: dict = {}
+    _reconnect_delay: float = 5
+    _keepalive_interval: float = 30
+
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def setup(
+        cls,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        database: str,
+        reconnect_delay: float = 5,
+        keepalive_interval: float = 30
+    ) -> None:
+        cls._connect_kwargs = dict(host=host, port=port, user=user, password=password, database=database)
+        cls._reconnect_delay = reconnect_delay
+        cls._keepalive_interval = keepalive_interval
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._task = asyncio.create_task(cls._listen())
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is None:
+            return
+        cls._task.cancel()
+        await asyncio.gather(cls._task, return_exceptions=True)
+        cls._task = None
+
+    @classmethod
+    def _on_notification(cls, payload: str) -> None:
+        # Publishing doesn't wait for the subscribers, so it's done right in the callback
+        try:
+            events = _events_adapter.validate_json(payload)
+        except ValueError as e:
+            logging.error("Invalid live event notification: %r", e)
+            return
+        for event in events:
+            EventHub.publish(event)
+
+    @classmethod
+    async def _on_reconnect(cls) -> None:
+        EventHub.mark_all_lagged()
+
+    @classmethod
+    async def _listen(cls) -> None:
+        await listen(
+            cls._connect_kwargs,
+            EVENTS_CHANNEL,
+            cls._on_notification,
+            cls._on_reconnect,
+            reconnect_delay=cls._reconnect_delay,
+            keepalive_interval=cls._keepalive_interval
+        )
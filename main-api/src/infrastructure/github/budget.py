@@ -0,0 +1,187 @@
+import hashlib
+import time
+
+import httpx
+
+from infrastructure.metrics import MetricsRegistry
+from .exceptions import GithubRateLimited
+
+
+_TRACKED_TOKENS = MetricsRegistry.gauge(
+    "github_rate_limit_tracked_tokens",
+    "Number of GitHub tokens with a known rate limit budget."
+)
+_POOL_REMAINING = MetricsRegistry.gauge(
+    "github_rate_limit_pool_remaining",
+    "Remaining GitHub requests of the app token pool by token index.",
+    ("token",)
+)
+_SCHEDULED = MetricsRegistry.counter(
+    "github_requests_scheduled_total",
+    "Number of GitHub requests by scheduling decision.",
+    ("decision",)
+)
+
+# Budget of a token GitHub hasn't reported on yet
+DEFAULT_LIMIT = 5000
+
+
+class TokenBudget:
+    """
+    Requests left for a token until **reset_at** (epoch seconds), as last reported by GitHub
+    minus the requests sent since then.
+    """
+    __slots__ = ("limit", "remaining", "reset_at", "blocked_until", "next_slot_at")
+
+    def __init__(self):
+        self.limit = DEFAULT_LIMIT
+        self.remaining = DEFAULT_LIMIT
+        self.reset_at = 0.0
+        # Set by the secondary rate limits, which don't show in the remaining budget
+        self.blocked_until = 0.0
+        # Pacing of the non-urgent requests near exhaustion
+        self.next_slot_at = 0.0
+
+    def refresh(self, now: float) -> None:
+        if self.reset_at and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = 0.0
+
+    def get_retry_after(self, now: float) -> float:
+        """
+        :return: Seconds until the token can be used again, 0 if it can be used now
+        """
+        self.refresh(now)
+        if self.blocked_until > now:
+            return self.blocked_until - now
+        if self.remaining <= 0 and self.reset_at:
+            return self.reset_at - now
+        return 0
+
+
+class GithubBudgetScheduler:
+    """
+    Tracks the rate limit budget of every GitHub token from the **X-RateLimit-*** response headers.
+
+    Urgent requests are sent as long as the token has any budget left. Once a token drops below
+    the reserve, non-urgent requests are paced to spread the rest of its budget until the reset,
+    so a heavy background job can't exhaust the quota the user's interactive requests need.
+    Public reads the user's token can't afford go through the app token with the most budget left.
+    """
+
+    _app_tokens: list[str] = []
+    _reserve: int = 100
+    _max_defer: float = 5
+    _max_tracked_tokens: int = 10_000
+
+    _budgets: dict[str, TokenBudget] = {}
+
+    @classmethod
+    def setup(cls, app_tokens: list[str], reserve: int = 100, max_defer: float = 5) -> None:
+        """
+        :param app_tokens: App or installation tokens used for public reads when a user's budget runs out
+        :param reserve: Budget left for the urgent requests, the non-urgent ones are paced below it
+        :param max_defer: Max number of seconds a non-urgent request is delayed
+        """
+        cls._app_tokens = app_tokens
+        cls._reserve = reserve
+        cls._max_defer = max_defer
+
+    @staticmethod
+    def _get_token_key(token: str) -> str:
+        # Tokens are not kept in memory longer than needed
+        return hashlib.sha256(token.encode()).hexdigest()[:32]
+
+    @classmethod
+    def _get_budget(cls, token: str) -> TokenBudget:
+        key = cls._get_token_key(token)
+        budget = cls._budgets.get(key)
+        if budget is None:
+            if len(cls._budgets) >= cls._max_tracked_tokens:
+                cls._prune(time.time())
+            budget = cls._budgets[key] = TokenBudget()
+            _TRACKED_TOKENS.set(len(cls._budgets))
+        return budget
+
+    @classmethod
+    def _prune(cls, now: float) -> None:
+        # Budgets past their reset are full again, so forgetting them loses nothing
+        for key, budget in list(cls._budgets.items()):
+            if budget.reset_at <= now and budget.blocked_until <= now:
+                del cls._budgets[key]
+        _TRACKED_TOKENS.set(len(cls._budgets))
+
+    @classmethod
+    def _get_delay(cls, budget: TokenBudget, urgent: bool, now: float) -> float | None:
+        """
+        :return: Seconds to wait before sending, None if the token can't be used within the max delay
+        """
+        retry_after = budget.get_retry_after(now)
+        if retry_after > 0:
+            return None
+        if urgent or budget.remaining > cls._reserve or not budget.reset_at:
+            return 0
+
+        interval = (budget.reset_at - now) / max(budget.remaining, 1)
+        delay = max(budget.next_slot_at - now, 0)
+        if delay > cls._max_defer:
+            return None
+        budget.next_slot_at = now + delay + interval
+        return delay
+
+    @classmethod
+    def schedule(cls, token: str, urgent: bool, public: bool) -> tuple[str, float]:
+        """
+        Picks the token to send a request with and reserves a request of its budget.
+        Throws **GithubRateLimited** if no token can be used within the max delay.
+        :param token: Token of the user
+        :param urgent: Whether the request can use the reserve
+        :param public: Whether the request reads public data any token can read
+        :return: (token, seconds to wait before sending)
+        """
+        now = time.time()
+        budget = cls._get_budget(token)
+        delay = cls._get_delay(budget, urgent, now)
+        if delay is not None:
+            budget.remaining -= 1
+            _SCHEDULED.inc(decision="deferred" if delay else "sent")
+            return token, delay
+
+        if public and cls._app_tokens:
+            app_token = max(cls._app_tokens, key=lambda app_token: cls._get_budget(app_token).remaining)
+            app_budget = cls._get_budget(app_token)
+            if cls._get_delay(app_budget, True, now) == 0:
+                app_budget.remaining -= 1
+                _SCHEDULED.inc(decision="app_token")
+                return app_token, 0
+
+        _SCHEDULED.inc(decision="rejected")
+        retry_after = budget.get_retry_after(now) or budget.next_slot_at - now
+        raise GithubRateLimited(retry_after=max(retry_after, 1))
+
+    @classmethod
+    def record_response(cls, token: str, response: httpx.Response) -> float | None:
+        """
+        Updates the budget of the token from the response headers.
+        :return: Seconds to wait if the response is a rate limit error, None otherwise
+        """
+        now = time.time()
+        budget = cls._get_budget(token)
+        headers = response.headers
+        if headers.get("X-RateLimit-Resource", "core") == "core" and "X-RateLimit-Remaining" in headers:
+            budget.limit = int(headers.get("X-RateLimit-Limit", budget.limit))
+            budget.remaining = int(headers["X-RateLimit-Remaining"])
+            budget.reset_at = float(headers.get("X-RateLimit-Reset", budget.reset_at))
+        if token in cls._app_tokens:
+            _POOL_REMAINING.set(budget.remaining, token=str(cls._app_tokens.index(token)))
+
+        if response.status_code not in (403, 429):
+            return None
+        if "Retry-After" in headers:
+            # Secondary rate limit
+            budget.blocked_until = now + float(headers["Retry-After"])
+            return float(headers["Retry-After"])
+        if headers.get("X-RateLimit-Remaining") == "0":
+            return max(budget.reset_at - now, 1)
+        # Forbidden for another reason
+        return None
@@ -1,7 +1,18 @@
+import asyncio
+
 import httpx
 
+from infrastructure.resilience import ResilientHTTPClient, DependencyUnavailable
+from infrastructure.tracing import traced
+from ..budget import GithubBudgetScheduler
 from ..exceptions import (
+    GithubUnavailable,
+    GithubRateLimited,
     CouldNotFetchGithubUser,
+    GithubRepositoryNotFound,
+    CouldNotFetchRepository,
+    GithubIssueNotFound,
+    CouldNotFetchIssue,
     GithubPullRequestNotFound,
     CouldNotFetchPullRequest
 )
@@ -18,55 +29,120 @@ from ..schemas import (
 class GithubAPIClient:
     """
     GithubAPIService is responsible for working with GitHub API.
+
+    Requests are scheduled against the rate limit budget of the token (see **GithubBudgetScheduler**).
+    Clients of background work should be made **deferrable**, so they leave the reserve to the user's requests.
     """
 
     _api_token: str
-    _request_headers: dict[str, str]
+    _urgent: bool
+
+    _http = ResilientHTTPClient("github_api", timeout=10)
 
-    def __init__(self, api_token: str):
+    def __init__(self, api_token: str, urgent: bool = True):
         self._api_token = api_token
-        self._request_headers = {"Authorization": f"Bearer {self._api_token}"}
+        self._urgent = urgent
+
+    @classmethod
+    def setup(
+        cls,
+        timeout: float = 10,
+        app_tokens: list[str] | None = None,
+        rate_limit_reserve: int = 100,
+        max_defer: float = 5
+    ) -> None:
+        cls._http.configure(timeout=timeout)
+        GithubBudgetScheduler.setup(
+            app_tokens=app_tokens or [],
+            reserve=rate_limit_reserve,
+            max_defer=max_defer
+        )
 
-    async def get_authenticated_user(self) -> GithubUserSchema:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.github.com/user",
-                headers=self._request_headers
+    def deferrable(self) -> "GithubAPIClient":
+        """
+        :return: Client with the same token whose requests are paced near the rate limit
+        """
+        return GithubAPIClient(self._api_token, urgent=False)
+
+    @classmethod
+    async def probe(cls) -> float:
+        """
+        Requests the rate limit status, which doesn't count against the rate limit.
+        Throws **DependencyUnavailable** if GitHub couldn't be reached.
+        :return: Response time in seconds
+        """
+        return await cls._http.probe("https://api.github.com/rate_limit")
+
+    async def _send(self, token: str, url: str, **kwargs) -> httpx.Response:
+        try:
+            response = await self._http.request(
+                "GET",
+                url,
+                idempotent=True,
+                headers={"Authorization": f"Bearer {token}"},
+                follow_redirects=True,  # Renamed and transferred repositories are redirected
+                **kwargs
             )
+        except DependencyUnavailable as dependency_unavailable:
+            raise GithubUnavailable from dependency_unavailable
+
+        retry_after = GithubBudgetScheduler.record_response(token, response)
+        if retry_after is not None:
+            raise GithubRateLimited(retry_after=retry_after)
+        return response
+
+    async def _get(self, url: str, public: bool = True, **kwargs) -> httpx.Response:
+        """
+        Throws **GithubUnavailable** if GitHub couldn't be reached
+        and **GithubRateLimited** if the rate limit is exhausted.
+        :param public: Whether the URL is readable with any token, so it can be sent with an app token
+        """
+        token, delay = GithubBudgetScheduler.schedule(self._api_token, urgent=self._urgent, public=public)
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            return await self._send(token, url, **kwargs)
+        except GithubRateLimited:
+            if token != self._api_token or not public:
+                raise
+            # The budget was used up by another process, the user's token is now known to be exhausted
+            token, _ = GithubBudgetScheduler.schedule(self._api_token, urgent=self._urgent, public=public)
+            return await self._send(token, url, **kwargs)
+
+    @traced("github.get_authenticated_user")
+    async def get_authenticated_user(self) -> GithubUserSchema:
+        response = await self._get("https://api.github.com/user", public=False)
 
-            if response.status_code != 200:
-                raise CouldNotFetchGithubUser
+        if response.status_code != 200:
+            raise CouldNotFetchGithubUser
 
-            return GithubUserSchema.from_api(response.json())
+        return GithubUserSchema.from_api(response.json())
 
+    @traced("github.fetch_repository")
     async def fetch_repository(self, repo_full_name: str) -> GithubRepositorySchema:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.github.com/repos/" + repo_full_name,
-                headers=self._request_headers
-            )
+        response = await self._get("https://api.github.com/repos/" + repo_full_name)
 
-            # TODO: Handle exceptions
-            # Refer to the GitHub API documentation
-            # 301 - Moved permanently
-            # 403 - Forbidden
-            # 404 - Not Found
+        if response.status_code != 200:
+            if response.status_code in (403, 404):
+                # Private repositories the token can't see are reported as missing
+                raise GithubRepositoryNotFound
+            raise CouldNotFetchRepository
 
-            return GithubRepositorySchema.from_api(response.json())
+        return GithubRepositorySchema.from_api(response.json())
 
+    @traced("github.fetch_issue")
     async def fetch_issue(self, identifier: GithubIssueIdentifierSchema) -> GithubIssueSchema:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.github.com/repos/" + identifier.repo_full_name + "/issues/" + str(identifier.issue_number),
-                headers=self._request_headers
-            )
+        response = await self._get(
+            "https://api.github.com/repos/" + identifier.repo_full_name + "/issues/" + str(identifier.issue_number)
+        )
 
-            # TODO: Handle exceptions
-            # Refer to the GitHub API documentation
-            # 301 - Moved permanently
-            # 404 - Not found
+        if response.status_code != 200:
+            if response.status_code in (404, 410):
+                # 410 - The issue was deleted or the issues are disabled
+                raise GithubIssueNotFound
+            raise CouldNotFetchIssue
 
-            return GithubIssueSchema.from_api(response.json())
+        return GithubIssueSchema.from_api(response.json())
 
     def parse_issue_html_url(self, url: str) -> GithubIssueIdentifierSchema:
         url_components = url.split("/")
@@ -81,41 +157,47 @@ class GithubAPIClient:
             issue_number=issue_number
         )
 
+    @traced("github.fetch_issue_html_url")
     async def fetch_issue_html_url(self, html_url: str) -> GithubIssueSchema:
         identifier = self.parse_issue_html_url(html_url)
         return await self.fetch_issue(identifier)
 
+    @traced("github.fetch_pull_request")
     async def fetch_pull_request(
         self,
         identifier: GithubIssueIdentifierSchema
     ) -> GithubPullRequestSchema:
-        async with httpx.AsyncClient() as client:
-            url = (f"https://api.github.com/repos/"
-                   f"{identifier.repo_full_name}/pulls/{identifier.issue_number}")
-            params = {"state": "closed"}
+        url = (f"https://api.github.com/repos/"
+               f"{identifier.repo_full_name}/pulls/{identifier.issue_number}")
+        params = {"state": "closed"}
 
-            resp = await client.get(url, headers=self._request_headers, params=params)
+        try:
+            resp = await self._get(url, params=params)
+        except GithubUnavailable:
+            raise CouldNotFetchPullRequest
 
-            if resp.status_code != 200:
-                if resp.status_code == 404:
-                    raise GithubPullRequestNotFound
-                else:
-                    raise CouldNotFetchPullRequest
+        if resp.status_code != 200:
+            if resp.status_code == 404:
+                raise GithubPullRequestNotFound
+            else:
+                raise CouldNotFetchPullRequest
 
-            return GithubPullRequestSchema.from_api(resp.json())
+        return GithubPullRequestSchema.from_api(resp.json())
 
+    @traced("github.fetch_pull_request_commits")
     async def fetch_pull_request_commits(
         self,
         identifier: GithubIssueIdentifierSchema
     ) -> list[GithubCommitSchema]:
         url = f"https://api.github.com/repos/{identifier.repo_full_name}/pulls/{identifier.issue_number}/commits"
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(url, headers=self._request_headers)
-            return [
-                GithubCommitSchema(
-                    sha=commit["sha"],
-                    message=commit["commit"]["message"],
-                    author=GithubUserSchema.from_api(commit["author"]),
-                )
-                for commit in resp.json()
-            ]
+        resp = await self._get(url)
+        if resp.status_code != 200:
+            raise CouldNotFetchPullRequest
+        return [
+            GithubCommitSchema(
+                sha=commit["sha"],
+                message=commit["commit"]["message"],
+                author=GithubUserSchema.from_api(commit["author"]),
+            )
+            for commit in resp.json()
+        ]
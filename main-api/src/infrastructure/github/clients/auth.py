@@ -1,8 +1,8 @@
 from urllib.parse import urlencode
 
-import httpx
-
-from infrastructure.github.exceptions import LoginFailed
+from infrastructure.github.exceptions import LoginFailed, GithubUnavailable
+from infrastructure.resilience import ResilientHTTPClient, DependencyUnavailable
+from infrastructure.tracing import traced
 
 
 class GithubAuthClient:
@@ -17,10 +17,13 @@ class GithubAuthClient:
 
     _auth_link: str | None = None
 
+    _http = ResilientHTTPClient("github_oauth", timeout=10)
+
     @classmethod
-    def setup(cls, client_id: str, client_secret: str) -> None:
+    def setup(cls, client_id: str, client_secret: str, timeout: float = 10) -> None:
         cls._client_id = client_id
         cls._client_secret = client_secret
+        cls._http.configure(timeout=timeout)
 
         auth_params = {"client_id": cls._client_id}
         cls._auth_link = f"https://github.com/login/oauth/authorize/?{urlencode(auth_params)}"
@@ -32,10 +35,13 @@ class GithubAuthClient:
         return cls._auth_link
 
     @classmethod
+    @traced("github.get_auth_token")
     async def get_auth_token(cls, code: str) -> str:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        try:
+            response = await cls._http.request(
+                "POST",
                 "https://github.com/login/oauth/access_token",
+                idempotent=False,  # The code can be exchanged only once
                 headers={"Accept": "application/json"},
                 data={
                     "client_id": cls._client_id,
@@ -43,9 +49,11 @@ class GithubAuthClient:
                     "code": code
                 }
             )
+        except DependencyUnavailable as dependency_unavailable:
+            raise GithubUnavailable from dependency_unavailable
 
-            if response.status_code != 200:
-                raise LoginFailed
+        if response.status_code != 200:
+            raise LoginFailed
 
-            # TODO: Handle key error (happens seldom)
-            return response.json()["access_token"]
+        # TODO: Handle key error (happens seldom)
+        return response.json()["access_token"]
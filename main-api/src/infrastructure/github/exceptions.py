@@ -6,6 +6,22 @@ class GithubException(InfrastructureException):
     pass
 
 
+class GithubUnavailable(GithubException):
+    """Raised when GitHub couldn't be reached or is considered down"""
+    pass
+
+
+class GithubRateLimited(GithubException):
+    """
+    Raised when the rate limit of the token is exhausted.
+    **retry_after** is the number of seconds until it can be used again.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"GitHub rate limit exceeded, retry after {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
 class LoginFailed(GithubException):
     pass
 
@@ -24,3 +40,19 @@ class GithubPullRequestNotFound(GithubException):
 
 class CouldNotFetchPullRequest(GithubException):
     pass
+
+
+class GithubRepositoryNotFound(GithubException):
+    pass
+
+
+class CouldNotFetchRepository(GithubException):
+    pass
+
+
+class GithubIssueNotFound(GithubException):
+    pass
+
+
+class CouldNotFetchIssue(GithubException):
+    pass
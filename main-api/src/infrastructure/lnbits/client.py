@@ -1,7 +1,10 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import httpx
 
-from domain.common.schemas import PaginationSchema
-from domain.wallet.schemas import LightningTransactionSchema, InvoiceCreationSchema
+from domain.wallet.schemas import InvoiceCreationSchema
 from infrastructure.lnbits.exceptions import (
     AccountCreationFailure,
     WalletCreationFailure,
@@ -11,22 +14,99 @@ from infrastructure.lnbits.exceptions import (
     PayInvoiceFailure,
     NotEnoughSats,
     InvoiceIsAlreadyPaid,
-    CouldNotDecodeInvoiceException
+    CouldNotDecodeInvoiceException,
+    PaymentFetchFailure,
+    PaymentHistoryFetchFailure,
+    LNBitsOverloaded,
+    LNBitsUnavailable
 )
 from infrastructure.lnbits.schemas import (
     LightningAccountSchema,
     LightningWalletCredentialsSchema,
     LightningWalletSchema,
-    DecodedInvoice
+    DecodedInvoice,
+    PaymentStatusSchema,
+    LightningPaymentSchema
+)
+from infrastructure.metrics import MetricsRegistry
+from infrastructure.resilience import ResilientHTTPClient, DependencyUnavailable
+from infrastructure.tracing import traced
+
+
+_CONCURRENCY_LIMIT = MetricsRegistry.gauge(
+    "lnbits_concurrency_limit",
+    "Max number of concurrent LNBits requests."
+)
+_IN_FLIGHT = MetricsRegistry.gauge(
+    "lnbits_requests_in_flight",
+    "Number of LNBits requests being executed."
+)
+_REJECTED = MetricsRegistry.counter(
+    "lnbits_requests_rejected_total",
+    "Number of LNBits requests rejected because the concurrency limit was reached."
 )
 
 
 class LNBitsClient:
     _url_base: str
-    
+    _deposit_webhook_url: str | None = None
+    _admission_timeout: float = 1
+    _semaphore: asyncio.Semaphore = asyncio.Semaphore(10)
+    _payment_timeout: float = 60
+    _http = ResilientHTTPClient("lnbits", timeout=10)
+
     @classmethod
-    def setup(cls, url_base: str) -> None:
+    def setup(
+        cls,
+        url_base: str,
+        deposit_webhook_url: str | None = None,
+        max_concurrency: int = 10,
+        admission_timeout: float = 1,
+        timeout: float = 10,
+        payment_timeout: float = 60
+    ) -> None:
+        """
+        :param url_base: LNBits host
+        :param deposit_webhook_url: URL LNBits calls when a deposit invoice is paid
+        :param max_concurrency: Max number of concurrent requests to LNBits from this process
+        :param admission_timeout: Max number of seconds to wait for a free slot before failing with **LNBitsOverloaded**
+        :param timeout: Request timeout in seconds
+        :param payment_timeout: Timeout of outgoing payments in seconds
+        """
         cls._url_base = url_base
+        cls._deposit_webhook_url = deposit_webhook_url
+        cls._admission_timeout = admission_timeout
+        cls._semaphore = asyncio.Semaphore(max_concurrency)
+        cls._payment_timeout = payment_timeout
+        cls._http.configure(timeout=timeout)
+        _CONCURRENCY_LIMIT.set(max_concurrency)
+
+    @asynccontextmanager
+    async def _admission(self) -> AsyncIterator[None]:
+        """
+        Holds one of the concurrency slots for the duration of the request.
+        Fails fast with **LNBitsOverloaded** instead of queueing up behind a slow LNBits.
+        """
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self._admission_timeout)
+        except asyncio.TimeoutError:
+            _REJECTED.inc()
+            raise LNBitsOverloaded
+
+        _IN_FLIGHT.inc()
+        try:
+            yield
+        finally:
+            _IN_FLIGHT.dec()
+            self._semaphore.release()
+
+    @classmethod
+    async def probe(cls) -> float:
+        """
+        Throws **DependencyUnavailable** if LNBits couldn't be reached.
+        :return: Response time in seconds
+        """
+        return await cls._http.probe(f"https://{cls._url_base}/api/v1/health")
 
     def _get_header(self, auth_key: str) -> dict:
         """
@@ -38,31 +118,56 @@ class LNBitsClient:
             "X-Api-Key": auth_key
         }
 
+    async def _request(self, method: str, path: str, idempotent: bool, **kwargs) -> httpx.Response:
+        """
+        Sends a request to LNBits within a concurrency slot.
+        Throws **LNBitsUnavailable** if LNBits couldn't be reached.
+        :param method: HTTP method
+        :param path: URL path
+        :param idempotent: Whether the request is safe to retry
+        :return: httpx.Response
+        """
+        async with self._admission():
+            try:
+                return await self._http.request(
+                    method,
+                    f"https://{self._url_base}{path}",
+                    idempotent=idempotent,
+                    **kwargs
+                )
+            except DependencyUnavailable as dependency_unavailable:
+                raise LNBitsUnavailable from dependency_unavailable
+
+    @traced("lnbits.create_account")
     async def create_account(self, name: str) -> LightningAccountSchema:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://{self._url_base}/api/v1/account",
-                json={
-                    "name": name
-                }
-            )
-            if response.status_code != 200:
-                raise AccountCreationFailure
-            return LightningAccountSchema.model_validate(response.json())
+        response = await self._request(
+            "POST",
+            "/api/v1/account",
+            idempotent=False,
+            json={
+                "name": name
+            }
+        )
+        if response.status_code != 200:
+            raise AccountCreationFailure
+        return LightningAccountSchema.model_validate(response.json())
 
+    @traced("lnbits.create_wallet")
     async def create_wallet(self, account_api_key: str, name: str) -> LightningWalletCredentialsSchema:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://{self._url_base}/api/v1/wallet",
-                headers=self._get_header(account_api_key),
-                json={
-                    "name": name
-                }
-            )
-            if response.status_code != 200:
-                raise WalletCreationFailure
-            return LightningWalletCredentialsSchema.model_validate(response.json())
+        response = await self._request(
+            "POST",
+            "/api/v1/wallet",
+            idempotent=False,
+            headers=self._get_header(account_api_key),
+            json={
+                "name": name
+            }
+        )
+        if response.status_code != 200:
+            raise WalletCreationFailure
+        return LightningWalletCredentialsSchema.model_validate(response.json())
 
+    @traced("lnbits.create_headless_wallet")
     async def create_headless_wallet(self, name: str) -> LightningWalletCredentialsSchema:
         """
         Works the same as **create_wallet** method but instead of creating a wallet for a specified account,
@@ -78,99 +183,157 @@ class LNBitsClient:
 
         return await self.create_wallet(api_key, name)
 
+    @traced("lnbits.get_wallet")
     async def get_wallet(self, inkey: str) -> LightningWalletSchema:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://{self._url_base}/api/v1/wallet",
-                headers=self._get_header(inkey)
-            )
-            if response.status_code != 200:
-                raise WalletFetchFailure
-
-            return LightningWalletSchema.model_validate(response.json())
-
-    async def create_invoice(self, inkey: str, amount_sats: int, memo: str = "") -> InvoiceCreationSchema:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://{self._url_base}/api/v1/payments",
-                headers=self._get_header(inkey),
-                json={
-                    "out": False,
-                    "amount": amount_sats,
-                    "memo": memo
-                }
+        response = await self._request(
+            "GET",
+            "/api/v1/wallet",
+            idempotent=True,
+            headers=self._get_header(inkey)
+        )
+        if response.status_code != 200:
+            raise WalletFetchFailure
+
+        return LightningWalletSchema.model_validate(response.json())
+
+    @traced("lnbits.create_invoice")
+    async def create_invoice(
+        self,
+        inkey: str,
+        amount_sats: int,
+        memo: str = "",
+        expiry: int | None = None,
+        webhook: str | None = None
+    ) -> InvoiceCreationSchema:
+        body = {
+            "out": False,
+            "amount": amount_sats,
+            "memo": memo
+        }
+        if expiry is not None:
+            body["expiry"] = expiry
+        if webhook is not None:
+            body["webhook"] = webhook
+
+        response = await self._request(
+            "POST",
+            "/api/v1/payments",
+            idempotent=False,
+            headers=self._get_header(inkey),
+            json=body
+        )
+
+        if response.status_code != 201:
+            raise CreateInvoiceFailure
+
+        try:
+            data = response.json()
+            return InvoiceCreationSchema(
+                invoice=data["payment_request"],
+                checking_id=data["checking_id"]
             )
+        except KeyError:
+            raise BadResponseBody
 
-            if response.status_code != 201:
-                raise CreateInvoiceFailure
+    @traced("lnbits.create_deposit_invoice")
+    async def create_deposit_invoice(self, inkey: str, amount_sats: int, expiry: int) -> InvoiceCreationSchema:
+        """
+        Creates an incoming invoice which notifies the deposit webhook on settlement, if the webhook is configured.
+        :param inkey: Inkey of the wallet to deposit to
+        :param amount_sats: Amount of sats to deposit
+        :param expiry: Invoice expiry in seconds
+        :return: InvoiceCreationSchema
+        """
+        return await self.create_invoice(
+            inkey=inkey,
+            amount_sats=amount_sats,
+            expiry=expiry,
+            webhook=self._deposit_webhook_url
+        )
 
-            try:
-                data = response.json()
-                return InvoiceCreationSchema(
-                    invoice=data["payment_request"],
-                    checking_id=data["checking_id"]
-                )
-            except KeyError:
-                raise BadResponseBody
+    @traced("lnbits.get_payment")
+    async def get_payment(self, inkey: str, checking_id: str) -> PaymentStatusSchema:
+        response = await self._request(
+            "GET",
+            f"/api/v1/payments/{checking_id}",
+            idempotent=True,
+            headers=self._get_header(inkey)
+        )
+        if response.status_code != 200:
+            raise PaymentFetchFailure
+
+        return PaymentStatusSchema.model_validate(response.json())
 
+    @traced("lnbits.pay_invoice")
     async def pay_invoice(self, adminkey: str, invoice: str) -> None:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"https://{self._url_base}/api/v1/payments",
-                headers=self._get_header(adminkey),
-                json={
-                    "out": True,
-                    "bolt11": invoice
-                }
-            )
+        response = await self._request(
+            "POST",
+            "/api/v1/payments",
+            idempotent=False,
+            timeout=self._payment_timeout,  # Lightning payments may take a while to be routed
+            headers=self._get_header(adminkey),
+            json={
+                "out": True,
+                "bolt11": invoice
+            }
+        )
 
-            if response.status_code == 403:
-                raise NotEnoughSats
+        if response.status_code == 403:
+            raise NotEnoughSats
 
-            if response.status_code == 520:
-                raise InvoiceIsAlreadyPaid
+        if response.status_code == 520:
+            raise InvoiceIsAlreadyPaid
 
-            if response.status_code != 201:
-                raise PayInvoiceFailure
+        if response.status_code != 201:
+            raise PayInvoiceFailure
 
+    @traced("lnbits.decode_invoice")
     async def decode_invoice(self, invoice: str) -> DecodedInvoice:
-        async with httpx.AsyncClient() as client:
-            body = {
+        response = await self._request(
+            "POST",
+            "/api/v1/payments/decode",
+            idempotent=True,  # Decoding has no side effects
+            json={
                 "data": invoice
             }
-            response = await client.post(
-                f"https://{self._url_base}/api/v1/payments/decode",
-                json=body
-            )
-            if response.status_code != 200:
-                raise CouldNotDecodeInvoiceException
-            return DecodedInvoice(**response.json())
+        )
+        if response.status_code != 200:
+            raise CouldNotDecodeInvoiceException
+        return DecodedInvoice(**response.json())
 
-    async def get_wallet_history(
+    @traced("lnbits.get_payments")
+    async def get_payments(
         self,
         inkey: str,
-        pagination: PaginationSchema
-    ) -> list[LightningTransactionSchema]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://{self._url_base}/api/v1/payments",
-                headers=self._get_header(inkey),
-                params={
-                    "offset": pagination.skip,
-                    "limit": pagination.limit
-                }
-            )
-            return [
-                LightningTransactionSchema(
-                    checking_id=entry["checking_id"],
-                    pending=entry["pending"],
-                    amount=entry["amount"] / 1000,  # In sats, not msats
-                    memo=entry["memo"],
-                    time=entry["time"]
-                )
-                for entry in response.json()
-            ]
+        offset: int,
+        limit: int
+    ) -> list[LightningPaymentSchema]:
+        """
+        Fetches a page of the wallet payment history, newest first.
+        :param inkey: Inkey of the wallet
+        :param offset: Number of the newest payments to skip
+        :param limit: Max number of payments to fetch
+        :return: list[LightningPaymentSchema]
+        """
+        response = await self._request(
+            "GET",
+            "/api/v1/payments",
+            idempotent=True,
+            headers=self._get_header(inkey),
+            params={
+                "offset": offset,
+                "limit": limit
+            }
+        )
+        if response.status_code != 200:
+            raise PaymentHistoryFetchFailure
+
+        try:
+            return [LightningPaymentSchema.model_validate(entry) for entry in response.json()]
+        except ValueError:
+            raise BadResponseBody
 
+    @traced("lnbits.move_sats")
     async def move_sats(
         self,
         from_wallet_adminkey: str,
@@ -42,6 +42,24 @@ class CouldNotDecodeInvoiceException(WalletAPIException):
     pass
 
 
+class PaymentFetchFailure(WalletAPIException):
+    pass
+
+
+class PaymentHistoryFetchFailure(WalletAPIException):
+    pass
+
+
+class LNBitsUnavailable(WalletAPIException):
+    """Raised when LNBits couldn't be reached or is considered down"""
+    pass
+
+
+class LNBitsOverloaded(LNBitsUnavailable):
+    """Raised when there are too many concurrent requests to LNBits"""
+    pass
+
+
 class LNBitsTransactionFailure(WalletAPIException):
     """
     Composite exception raised when there is
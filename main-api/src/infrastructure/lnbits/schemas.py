@@ -32,3 +32,20 @@ class LightningWalletSchema(APISchema):
 
 class DecodedInvoice(APISchema):
     amount_msat: int = Field(..., gt=0)
+
+
+class PaymentStatusSchema(APISchema):
+    paid: bool
+
+
+class LightningPaymentSchema(APISchema):
+    """
+    **amount**: Amount in msat, negative for outgoing payments
+
+    **time**: Unix timestamp
+    """
+    checking_id: str
+    pending: bool
+    amount: int
+    memo: str | None = None
+    time: int
@@ -0,0 +1,9 @@
+from .advisory import AdvisoryLockService
+from .exceptions import LockException, LockNotAcquired
+
+
+__all__ = [
+    "AdvisoryLockService",
+    "LockException",
+    "LockNotAcquired"
+]
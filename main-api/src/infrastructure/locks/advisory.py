@@ -0,0 +1,141 @@
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
+
+from sqlalchemy import BigInteger, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database import hold_connection
+from infrastructure.metrics import MetricsRegistry
+from .exceptions import LockNotAcquired
+
+
+_ACQUISITIONS = MetricsRegistry.counter(
+    "advisory_lock_acquisitions_total",
+    "Number of advisory lock attempts by namespace and outcome.",
+    ("namespace", "outcome")
+)
+_WAIT_SECONDS = MetricsRegistry.counter(
+    "advisory_lock_wait_seconds_total",
+    "Time spent waiting for contended advisory locks by namespace.",
+    ("namespace",)
+)
+_WAITING = MetricsRegistry.gauge(
+    "advisory_locks_waiting",
+    "Number of transactions waiting for an advisory lock by namespace.",
+    ("namespace",)
+)
+
+
+class AdvisoryLockService:
+    """
+    Serializes transactions working on the same entity with Postgres advisory locks.
+
+    Unlike **SELECT ... FOR UPDATE**, the locks don't touch the rows, so readers are never blocked,
+    and transactions only wait for the ones locking the same key.
+    The locks are transaction-level: they are released on commit or rollback, even if the connection dies.
+    Work that outlives a transaction, like a periodic job, holds a session-level lock with **try_hold** instead.
+
+    Waiting is done by polling the non-blocking variant, so a timeout doesn't abort the transaction
+    and cancelling the request doesn't leave a pending lock request on the connection.
+    """
+    POLL_INTERVAL = 0.01
+    MAX_POLL_INTERVAL = 0.2
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    @staticmethod
+    def get_lock_key(namespace: str, key: Any) -> int:
+        """
+        :return: Signed 64-bit key, the same in all the processes
+        """
+        digest = hashlib.blake2b(f"{namespace}:{key}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big", signed=True)
+
+    async def _try_lock_key(self, lock_key: int) -> bool:
+        return await self._session.scalar(select(func.pg_try_advisory_xact_lock(literal(lock_key, BigInteger))))
+
+    async def try_lock(self, namespace: str, key: Any) -> bool:
+        """
+        Takes the lock if it's free, without waiting.
+        :param namespace: Kind of the locked entity, e.g. "issue"
+        :param key: ID of the locked entity
+        :return: True if the lock was taken
+        """
+        acquired = await self._try_lock_key(self.get_lock_key(namespace, key))
+        _ACQUISITIONS.inc(namespace=namespace, outcome="acquired" if acquired else "busy")
+        return acquired
+
+    async def lock(self, namespace: str, key: Any, timeout: float = 5) -> None:
+        """
+        Waits for the lock for at most **timeout** seconds.
+        Throws **LockNotAcquired** if it's still held by another transaction.
+        :param namespace: Kind of the locked entity, e.g. "issue"
+        :param key: ID of the locked entity
+        :param timeout: Time to wait in seconds
+        :return: None
+        """
+        lock_key = self.get_lock_key(namespace, key)
+        if await self._try_lock_key(lock_key):
+            _ACQUISITIONS.inc(namespace=namespace, outcome="acquired")
+            return
+
+        started_at = time.monotonic()
+        deadline = started_at + timeout
+        poll_interval = self.POLL_INTERVAL
+        _WAITING.inc(namespace=namespace)
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    _ACQUISITIONS.inc(namespace=namespace, outcome="timed_out")
+                    raise LockNotAcquired(f"{namespace} {key} is locked")
+                await asyncio.sleep(min(poll_interval, remaining))
+                poll_interval = min(poll_interval * 2, self.MAX_POLL_INTERVAL)
+                if await self._try_lock_key(lock_key):
+                    _ACQUISITIONS.inc(namespace=namespace, outcome="waited")
+                    return
+        finally:
+            _WAITING.dec(namespace=namespace)
+            _WAIT_SECONDS.inc(time.monotonic() - started_at, namespace=namespace)
+
+    @classmethod
+    @asynccontextmanager
+    async def try_hold(cls, namespace: str, key: Any) -> AsyncIterator[bool]:
+        """
+        Takes a session-level lock if it's free, without waiting, and holds it until the block exits.
+        A pool connection is held meanwhile, the lock is released with it if it dies.
+        :param namespace: Kind of the locked entity, e.g. "job"
+        :param key: ID of the locked entity
+        :return: True if the lock was taken
+        """
+        lock_key = literal(cls.get_lock_key(namespace, key), BigInteger)
+        async with hold_connection() as connection:
+            acquired = await connection.scalar(select(func.pg_try_advisory_lock(lock_key)))
+            _ACQUISITIONS.inc(namespace=namespace, outcome="acquired" if acquired else "busy")
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    try:
+                        await connection.scalar(select(func.pg_advisory_unlock(lock_key)))
+                    except Exception:
+                        # Closing the connection is the only other way to release the lock
+                        await connection.invalidate()
+                        raise
+
+    async def lock_many(self, namespace: str, keys: Iterable[Any], timeout: float = 5) -> None:
+        """
+        Takes the locks in a global order, so transactions locking overlapping sets can't deadlock.
+        Throws **LockNotAcquired** if any of them is held by another transaction for longer than the timeout.
+        :param namespace: Kind of the locked entities, e.g. "issue"
+        :param keys: IDs of the locked entities
+        :param timeout: Time to wait for all the locks in seconds
+        :return: None
+        """
+        deadline = time.monotonic() + timeout
+        for key in sorted(set(keys), key=lambda key: self.get_lock_key(namespace, key)):
+            await self.lock(namespace, key, timeout=max(deadline - time.monotonic(), 0))
@@ -0,0 +1,11 @@
+from infrastructure.common.exceptions import InfrastructureException
+
+
+class LockException(InfrastructureException):
+    """Base class for lock exceptions"""
+    pass
+
+
+class LockNotAcquired(LockException):
+    """The lock is held by another transaction for longer than the timeout"""
+    pass
@@ -0,0 +1,6 @@
+from .setup import setup_logging
+
+
+__all__ = [
+    "setup_logging"
+]
@@ -0,0 +1,15 @@
+import logging
+import random
+
+
+class DebugSamplingFilter(logging.Filter):
+    """
+    Lets through only a share of the debug records, the ones of higher levels always pass.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self._rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or random.random() < self._rate
@@ -0,0 +1,80 @@
+import atexit
+import copy
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+from .filters import DebugSamplingFilter
+from .formatters import JSONFormatter
+
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s: %(message)s"
+TEXT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_listener: QueueListener | None = None
+
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """
+    Only merges the message arguments, which may change after the call, before queueing the record.
+    Tracebacks and the output format are rendered by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_format: str = "json",
+    levels: dict[str, str] | None = None,
+    debug_sample_rate: float = 1
+) -> None:
+    """
+    Routes the records through a queue to a listener thread that formats and writes them to stdout,
+    so the event loop never blocks on log I/O.
+    :param level: Root log level
+    :param log_format: **json** or **text**
+    :param levels: Log levels by logger name, e.g. {"uvicorn.access": "WARNING"}
+    :param debug_sample_rate: Share of the debug records to keep, from 0 to 1
+    :return: None
+    """
+    global _listener
+    _stop_listener()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if log_format == "json":
+        stream_handler.setFormatter(JSONFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATE_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredFormattingQueueHandler(log_queue)
+    if debug_sample_rate < 1:
+        # Dropped before being queued, the sampled out records cost nothing but the level check
+        queue_handler.addFilter(DebugSamplingFilter(debug_sample_rate))
+
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level.upper())
+    for logger_name, logger_level in (levels or {}).items():
+        logging.getLogger(logger_name).setLevel(logger_level.upper())
+
+    _listener = QueueListener(log_queue, stream_handler)
+    _listener.start()
+
+
+atexit.register(_stop_listener)
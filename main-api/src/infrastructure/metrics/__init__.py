@@ -0,0 +1,8 @@
+from .registry import MetricsRegistry, Counter, Gauge
+
+
+__all__ = [
+    "MetricsRegistry",
+    "Counter",
+    "Gauge"
+]
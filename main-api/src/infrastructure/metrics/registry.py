@@ -0,0 +1,94 @@
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metric:
+    """
+    Base class for process-local metrics exposed in the Prometheus text format.
+    """
+    type_name: str
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def _get_label_values(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric {self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._get_label_values(labels), 0)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}"
+        ]
+        for label_values, value in self._values.items():
+            if label_values:
+                formatted_labels = ",".join(
+                    f'{name}="{_escape_label_value(label_value)}"'
+                    for name, label_value in zip(self.label_names, label_values)
+                )
+                lines.append(f"{self.name}{{{formatted_labels}}} {value}")
+            else:
+                lines.append(f"{self.name} {value}")
+        return lines
+
+
+class Counter(Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        label_values = self._get_label_values(labels)
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._get_label_values(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        label_values = self._get_label_values(labels)
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class MetricsRegistry:
+    """
+    Process-wide registry of the metrics.
+    Registering a metric that already exists returns the existing one.
+    """
+
+    _metrics: dict[str, Metric] = {}
+
+    @classmethod
+    def _register(cls, metric_type: type[Metric], name: str, documentation: str, labels: tuple[str, ...]) -> Metric:
+        metric = cls._metrics.get(name)
+        if metric is None:
+            metric = cls._metrics[name] = metric_type(name, documentation, labels)
+        elif not isinstance(metric, metric_type) or metric.label_names != labels:
+            raise ValueError(f"Metric {name} is already registered with a different type or labels")
+        return metric
+
+    @classmethod
+    def counter(cls, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return cls._register(Counter, name, documentation, labels)
+
+    @classmethod
+    def gauge(cls, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return cls._register(Gauge, name, documentation, labels)
+
+    @classmethod
+    def render(cls) -> str:
+        lines = []
+        for metric in cls._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
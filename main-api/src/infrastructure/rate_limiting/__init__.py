@@ -0,0 +1,11 @@
+from .backends import RateLimitBackendABC, InMemoryRateLimitBackend, DatabaseRateLimitBackend
+from .schemas import RateLimitRule, RateLimitDecision
+
+
+__all__ = [
+    "RateLimitBackendABC",
+    "InMemoryRateLimitBackend",
+    "DatabaseRateLimitBackend",
+    "RateLimitRule",
+    "RateLimitDecision"
+]
@@ -0,0 +1,110 @@
+import time
+from abc import ABC, abstractmethod
+
+from infrastructure.database import SessionScope
+from infrastructure.database.rate_limit_buckets import RateLimitBucketRepo
+
+from .schemas import RateLimitRule, RateLimitDecision
+
+
+def _get_retry_after(tokens: float, rule: RateLimitRule, cost: float) -> float:
+    return max(cost - tokens, 0) / rule.refill_rate
+
+
+class RateLimitBackendABC(ABC):
+
+    @abstractmethod
+    async def consume(self, key: str, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+        """
+        Takes **cost** tokens from the bucket if there are enough.
+        :param key: Bucket key
+        :param rule: Bucket capacity and refill period
+        :param cost: Number of tokens to take
+        :return: RateLimitDecision
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def refund(self, key: str, rule: RateLimitRule, cost: float = 1) -> None:
+        """
+        Puts back tokens taken for a request that was rejected afterwards.
+        :param key: Bucket key
+        :param rule: Bucket capacity and refill period
+        :param cost: Number of tokens to put back
+        :return: None
+        """
+        raise NotImplementedError
+
+
+class InMemoryRateLimitBackend(RateLimitBackendABC):
+    """
+    Keeps the buckets in the process memory. Limits are enforced per API instance.
+    """
+    MAX_BUCKETS = 100_000
+
+    def __init__(self):
+        # key -> (tokens, monotonic time of the last update, refill period)
+        self._buckets: dict[str, tuple[float, float, float]] = {}
+
+    def _prune(self, now: float) -> None:
+        # Buckets idle for longer than the refill period are full, dropping them changes nothing
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if now - bucket[1] < bucket[2]
+        }
+
+    async def consume(self, key: str, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self._prune(now)
+            tokens = rule.capacity
+        else:
+            tokens, updated_at, _ = bucket
+            tokens = min(rule.capacity, tokens + (now - updated_at) * rule.refill_rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets[key] = (tokens, now, rule.period_seconds)
+
+        return RateLimitDecision(
+            allowed=allowed,
+            retry_after=0 if allowed else _get_retry_after(tokens, rule, cost)
+        )
+
+    async def refund(self, key: str, rule: RateLimitRule, cost: float = 1) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            # Pruned, so it was full already
+            return
+        tokens, updated_at, period = bucket
+        self._buckets[key] = (min(rule.capacity, tokens + cost), updated_at, period)
+
+
+class DatabaseRateLimitBackend(RateLimitBackendABC):
+    """
+    Keeps the buckets in the database, so the limits are shared by all API instances.
+    """
+
+    async def consume(self, key: str, rule: RateLimitRule, cost: float = 1) -> RateLimitDecision:
+        async with SessionScope.get_session() as session:
+            allowed, tokens = await RateLimitBucketRepo(session).consume_tokens(
+                key,
+                capacity=rule.capacity,
+                refill_rate=rule.refill_rate,
+                cost=cost
+            )
+            await session.commit()
+
+        return RateLimitDecision(
+            allowed=allowed,
+            retry_after=0 if allowed else _get_retry_after(tokens, rule, cost)
+        )
+
+    async def refund(self, key: str, rule: RateLimitRule, cost: float = 1) -> None:
+        async with SessionScope.get_session() as session:
+            await RateLimitBucketRepo(session).refund_tokens(key, capacity=rule.capacity, cost=cost)
+            await session.commit()
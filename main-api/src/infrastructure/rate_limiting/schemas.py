@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class RateLimitRule(BaseModel):
+    """
+    Token bucket holding up to **capacity** tokens, refilled completely every **period_seconds**.
+    """
+    capacity: int = Field(..., gt=0)
+    period_seconds: float = Field(..., gt=0)
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period_seconds
+
+
+class RateLimitDecision(BaseModel):
+    """
+    **retry_after**: Seconds until the request would be allowed, 0 if it's allowed
+    """
+    allowed: bool
+    retry_after: float = 0
@@ -0,0 +1,15 @@
+from .breaker import CircuitBreaker, CircuitState
+from .client import ResilientHTTPClient
+from .exceptions import ResilienceException, DependencyUnavailable, CircuitOpen
+from .retry import RetryPolicy
+
+
+__all__ = [
+    "CircuitBreaker",
+    "CircuitState",
+    "ResilientHTTPClient",
+    "ResilienceException",
+    "DependencyUnavailable",
+    "CircuitOpen",
+    "RetryPolicy"
+]
@@ -0,0 +1,104 @@
+import time
+from enum import StrEnum
+
+from infrastructure.metrics import MetricsRegistry
+
+from .exceptions import CircuitOpen
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+_STATE_VALUES = {
+    CircuitState.CLOSED: 0,
+    CircuitState.HALF_OPEN: 1,
+    CircuitState.OPEN: 2
+}
+
+_STATE = MetricsRegistry.gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state by dependency: 0 - closed, 1 - half-open, 2 - open.",
+    ("dependency",)
+)
+_REJECTED = MetricsRegistry.counter(
+    "circuit_breaker_rejected_total",
+    "Number of calls rejected by an open circuit breaker.",
+    ("dependency",)
+)
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency after **failure_threshold** consecutive failures.
+
+    While open, calls fail fast with **CircuitOpen**. After **recovery_timeout** seconds the breaker
+    lets up to **half_open_max_calls** probe calls through: a successful probe closes it, a failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started_at = 0.0
+        _STATE.set(_STATE_VALUES[self._state], dependency=name)
+
+    def _set_state(self, state: CircuitState) -> None:
+        self._state = state
+        _STATE.set(_STATE_VALUES[state], dependency=self.name)
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._get_retry_after() == 0:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def _get_retry_after(self) -> float:
+        return max(0.0, self._opened_at + self._recovery_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        """
+        Reserves a call or raises **CircuitOpen** if the dependency is considered down.
+        """
+        if self._state == CircuitState.OPEN:
+            retry_after = self._get_retry_after()
+            if retry_after > 0:
+                _REJECTED.inc(dependency=self.name)
+                raise CircuitOpen(self.name, retry_after=retry_after)
+            self._set_state(CircuitState.HALF_OPEN)
+            self._probes = 0
+
+        if self._state == CircuitState.HALF_OPEN:
+            # Probes that never reported back (e.g. cancelled) stop counting after the recovery timeout
+            if time.monotonic() - self._probe_started_at > self._recovery_timeout:
+                self._probes = 0
+            if self._probes >= self._half_open_max_calls:
+                _REJECTED.inc(dependency=self.name)
+                raise CircuitOpen(self.name, retry_after=1)
+            self._probes += 1
+            self._probe_started_at = time.monotonic()
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self._state != CircuitState.CLOSED:
+            self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+            self._set_state(CircuitState.OPEN)
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+import httpx
+
+from infrastructure.metrics import MetricsRegistry
+from infrastructure.tracing import Tracer, SpanKind
+
+from .breaker import CircuitBreaker, CircuitState
+from .exceptions import DependencyUnavailable
+from .retry import RetryPolicy
+
+
+_REQUESTS = MetricsRegistry.counter(
+    "outbound_requests_total",
+    "Number of outbound HTTP attempts by dependency and outcome.",
+    ("dependency", "outcome")
+)
+_RETRIES = MetricsRegistry.counter(
+    "outbound_retries_total",
+    "Number of outbound HTTP retries by dependency.",
+    ("dependency",)
+)
+
+# Worth retrying, the dependency may respond properly to the next attempt
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class ResilientHTTPClient:
+    """
+    HTTP client of a single dependency with a timeout, retries and a circuit breaker.
+
+    The underlying connection pool is created on the first request and shared by all the callers.
+    Only idempotent requests are retried after a response or a timeout;
+    connection failures are retried for all requests since nothing has been sent.
+    """
+
+    _instances: dict[str, "ResilientHTTPClient"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 10,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        breaker: CircuitBreaker | None = None
+    ):
+        self.name = name
+        self._timeout = timeout
+        self._retry_policy = retry_policy
+        self._breaker = breaker or CircuitBreaker(name)
+        self._client: httpx.AsyncClient | None = None
+        ResilientHTTPClient._instances[name] = self
+
+    def configure(self, timeout: float | None = None, retry_policy: RetryPolicy | None = None) -> None:
+        if timeout is not None:
+            self._timeout = timeout
+        if retry_policy is not None:
+            self._retry_policy = retry_policy
+
+    @property
+    def breaker_state(self) -> CircuitState:
+        return self._breaker.state
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self._timeout)
+        return self._client
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        idempotent: bool,
+        timeout: float | None = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Sends the request, retrying transient failures according to the retry policy.
+
+        Throws **DependencyUnavailable** (or **CircuitOpen**) if no response was received.
+        A transient error response of the last attempt is returned as is.
+        :param method: HTTP method
+        :param url: Request URL
+        :param idempotent: Whether the request is safe to repeat
+        :param timeout: Overrides the dependency timeout for the request
+        :param kwargs: Passed to **httpx.AsyncClient.request**
+        :return: httpx.Response
+        """
+        with Tracer.start_span(
+            f"{self.name} {method}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.method": method, "http.url": url.split("?", 1)[0]}
+        ) as span:
+            if span.is_recording:
+                kwargs["headers"] = {**kwargs.get("headers", {}), "traceparent": span.context.to_traceparent()}
+            response = await self._request_with_retries(method, url, idempotent, timeout, **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
+    async def _request_with_retries(
+        self,
+        method: str,
+        url: str,
+        idempotent: bool,
+        timeout: float | None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            self._breaker.before_call()
+            try:
+                response = await self._get_client().request(
+                    method,
+                    url,
+                    timeout=timeout if timeout is not None else self._timeout,
+                    **kwargs
+                )
+            except httpx.TransportError as e:
+                self._breaker.record_failure()
+                _REQUESTS.inc(dependency=self.name, outcome="error")
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= self._retry_policy.max_attempts:
+                    logging.warning("%s request %s failed after %s attempts: %r", self.name, method, attempt, e)
+                    raise DependencyUnavailable(self.name) from e
+            else:
+                transient = response.status_code in TRANSIENT_STATUS_CODES
+                if transient and response.status_code != 429:
+                    self._breaker.record_failure()
+                else:
+                    self._breaker.record_success()
+                _REQUESTS.inc(dependency=self.name, outcome="transient" if transient else "ok")
+                if not transient or not idempotent or attempt >= self._retry_policy.max_attempts:
+                    return response
+
+            _RETRIES.inc(dependency=self.name)
+            Tracer.get_current_span().set_attribute("http.retries", attempt)
+            await asyncio.sleep(self._retry_policy.get_delay(attempt - 1))
+
+    async def probe(self, url: str, timeout: float = 2) -> float:
+        """
+        Sends a single GET, bypassing the retries and the circuit breaker.
+        The connection stays in the pool, so probing also primes it for the following requests.
+
+        Throws **DependencyUnavailable** if there was no response or it was a server error.
+        :param url: URL that is cheap for the dependency to serve
+        :param timeout: Probe timeout
+        :return: Response time in seconds
+        """
+        started_at = time.perf_counter()
+        try:
+            response = await self._get_client().get(url, timeout=timeout)
+        except httpx.TransportError as e:
+            raise DependencyUnavailable(self.name) from e
+        if response.status_code >= 500:
+            raise DependencyUnavailable(self.name)
+        return time.perf_counter() - started_at
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @classmethod
+    def get_breaker_states(cls) -> dict[str, CircuitState]:
+        return {name: client.breaker_state for name, client in cls._instances.items()}
+
+    @classmethod
+    async def close_all(cls) -> None:
+        for client in cls._instances.values():
+            await client.aclose()
@@ -0,0 +1,23 @@
+from infrastructure.common.exceptions import InfrastructureException
+
+
+class ResilienceException(InfrastructureException):
+    """Base class for exceptions raised by the outbound call protection"""
+    pass
+
+
+class DependencyUnavailable(ResilienceException):
+    """
+    Raised when a dependency couldn't be reached after all the attempts.
+    **retry_after** is the number of seconds after which the dependency may be available again, if known.
+    """
+
+    def __init__(self, dependency: str, retry_after: float | None = None):
+        super().__init__(f"{dependency} is unavailable")
+        self.dependency = dependency
+        self.retry_after = retry_after
+
+
+class CircuitOpen(DependencyUnavailable):
+    """Raised without calling the dependency while its circuit breaker is open"""
+    pass
@@ -0,0 +1,16 @@
+import random
+
+from pydantic import BaseModel, Field
+
+
+class RetryPolicy(BaseModel):
+    """
+    Exponential backoff with full jitter: the n-th retry waits a random time
+    between 0 and min(**max_delay**, **base_delay** * 2^n) seconds.
+    """
+    max_attempts: int = Field(3, ge=1)
+    base_delay: float = Field(0.2, gt=0)
+    max_delay: float = Field(2, gt=0)
+
+    def get_delay(self, retry_number: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry_number))
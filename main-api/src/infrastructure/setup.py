@@ -1,32 +1,95 @@
-from .config import DatabaseConfig, LNBitsConfig, GithubConfig, BrantaConfig
+import logging
+import time
+
+from .cache import Cache, CacheBackendABC, InMemoryCacheBackend, RedisCacheBackend, CacheInvalidationListener
+from .config import DatabaseConfig, LNBitsConfig, GithubConfig, BrantaConfig, TracingConfig, CacheConfig
 from .database import init_db
-from .github import GithubAuthClient
+from .events import EventHub, LiveEventListener
+from .github import GithubAuthClient, GithubAPIClient
 from .lnbits.client import LNBitsClient
 from .branta import BrantaClient
+from .tracing import Tracer, SpanExporter, FileSpanExporter, OTLPHTTPSpanExporter
+
+
+def get_span_exporter(tracing_config: TracingConfig) -> SpanExporter | None:
+    if tracing_config.exporter == "file":
+        return FileSpanExporter(tracing_config.file_path)
+    if tracing_config.exporter == "otlp":
+        return OTLPHTTPSpanExporter(tracing_config.otlp_endpoint, service_name=tracing_config.service_name)
+    return None
+
+
+def get_cache_backend(cache_config: CacheConfig) -> CacheBackendABC:
+    if cache_config.backend == "redis":
+        return RedisCacheBackend(cache_config.redis_url, namespace=cache_config.namespace)
+    return InMemoryCacheBackend(max_entries=cache_config.max_entries)
 
 
 async def setup_infrastructure(
     database_config: DatabaseConfig,
     lnbits_config: LNBitsConfig,
     github_config: GithubConfig,
-    branta_config: BrantaConfig
+    branta_config: BrantaConfig,
+    tracing_config: TracingConfig = TracingConfig(),
+    cache_config: CacheConfig = CacheConfig()
 ):
+    Tracer.setup(
+        exporter=get_span_exporter(tracing_config),
+        sample_rate=tracing_config.sample_rate
+    )
+
+    started_at = time.perf_counter()
     await init_db(
         host=database_config.host,
         port=database_config.port,
         database=database_config.database,
         user=database_config.user,
-        password=database_config.password
+        password=database_config.password,
+        pool_size=database_config.pool_size
     )
+    logging.info("Database initialized in %.3fs", time.perf_counter() - started_at)
 
-    LNBitsClient.setup(lnbits_config.node_url)
+    LNBitsClient.setup(
+        url_base=lnbits_config.node_url,
+        deposit_webhook_url=lnbits_config.deposit_webhook_url,
+        max_concurrency=lnbits_config.max_concurrency,
+        admission_timeout=lnbits_config.admission_timeout,
+        timeout=lnbits_config.timeout,
+        payment_timeout=lnbits_config.payment_timeout
+    )
 
     GithubAuthClient.setup(
         client_id=github_config.client_id,
-        client_secret=github_config.client_secret
+        client_secret=github_config.client_secret,
+        timeout=github_config.timeout
+    )
+    GithubAPIClient.setup(
+        timeout=github_config.timeout,
+        app_tokens=github_config.app_tokens,
+        rate_limit_reserve=github_config.rate_limit_reserve,
+        max_defer=github_config.max_defer
     )
 
     BrantaClient.setup(
         url_base=branta_config.url_base,
-        api_key=branta_config.api_key
+        api_key=branta_config.api_key,
+        timeout=branta_config.timeout
+    )
+
+    Cache.setup(get_cache_backend(cache_config))
+    CacheInvalidationListener.setup(
+        host=database_config.host,
+        port=database_config.port,
+        user=database_config.user,
+        password=database_config.password,
+        database=database_config.database
+    )
+
+    EventHub.setup()
+    LiveEventListener.setup(
+        host=database_config.host,
+        port=database_config.port,
+        user=database_config.user,
+        password=database_config.password,
+        database=database_config.database
     )
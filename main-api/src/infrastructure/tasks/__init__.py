@@ -0,0 +1,6 @@
+from .supervisor import TaskSupervisor
+
+
+__all__ = [
+    "TaskSupervisor"
+]
@@ -0,0 +1,136 @@
+import asyncio
+import contextvars
+import logging
+from typing import Awaitable, Callable, NamedTuple
+
+from infrastructure.metrics import MetricsRegistry
+from infrastructure.resilience import RetryPolicy
+
+
+_QUEUED = MetricsRegistry.gauge(
+    "background_tasks_queued",
+    "Number of background tasks waiting for a worker."
+)
+_RUNNING = MetricsRegistry.gauge(
+    "background_tasks_running",
+    "Number of background tasks being executed."
+)
+_TASKS = MetricsRegistry.counter(
+    "background_tasks_total",
+    "Number of background task attempts by task type and outcome.",
+    ("task_type", "outcome")
+)
+
+# Side effects are not retried unless their task type says otherwise
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+class _Task(NamedTuple):
+    task_type: str
+    factory: Callable[[], Awaitable[None]]
+    context: contextvars.Context
+
+
+class TaskSupervisor:
+    """
+    Runs side effects in the background on a fixed pool of workers fed by a bounded queue.
+
+    Unlike bare **asyncio.create_task**, the tasks are referenced until they finish,
+    their failures are logged and retried according to the policy of their type,
+    and the queue is drained before the app shuts down.
+    Tasks run in the context they were submitted from, so they stay in the trace of the request.
+    """
+
+    _queue: asyncio.Queue[_Task] | None = None
+    _workers: list[asyncio.Task] = []
+    _worker_count: int = 4
+    _accepting: bool = False
+
+    _retry_policies: dict[str, RetryPolicy] = {}
+
+    @classmethod
+    def register(cls, task_type: str, retry_policy: RetryPolicy = NO_RETRY) -> str:
+        """
+        :param task_type: Name of the task type, used in logs and metrics
+        :param retry_policy: Retries of the failed tasks of the type
+        :return: The task type
+        """
+        cls._retry_policies[task_type] = retry_policy
+        return task_type
+
+    @classmethod
+    def setup(cls, queue_size: int = 1000, workers: int = 4) -> None:
+        cls._queue = asyncio.Queue(maxsize=queue_size)
+        cls._worker_count = workers
+
+    @classmethod
+    async def start(cls) -> None:
+        cls._workers = [asyncio.create_task(cls._work()) for _ in range(cls._worker_count)]
+        cls._accepting = True
+
+    @classmethod
+    async def stop(cls, drain_timeout: float = 10) -> None:
+        """
+        Stops accepting tasks and waits up to **drain_timeout** seconds for the queued ones to finish.
+        """
+        cls._accepting = False
+        if cls._queue is not None and cls._workers:
+            try:
+                await asyncio.wait_for(cls._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                logging.warning("%s background tasks abandoned on shutdown", cls._queue.qsize())
+
+        for worker in cls._workers:
+            worker.cancel()
+        await asyncio.gather(*cls._workers, return_exceptions=True)
+        cls._workers = []
+
+    @classmethod
+    def submit(cls, task_type: str, factory: Callable[[], Awaitable[None]]) -> bool:
+        """
+        Schedules a task for execution.
+        :param task_type: Registered task type
+        :param factory: Creates the awaitable to execute, called again for every retry
+        :return: False if the task was rejected because the supervisor is stopped or its queue is full
+        """
+        if not cls._accepting or cls._queue is None:
+            _TASKS.inc(task_type=task_type, outcome="rejected")
+            logging.warning("Background task %s rejected, the supervisor is not running", task_type)
+            return False
+        try:
+            cls._queue.put_nowait(_Task(task_type, factory, contextvars.copy_context()))
+        except asyncio.QueueFull:
+            _TASKS.inc(task_type=task_type, outcome="rejected")
+            logging.warning("Background task %s rejected, the queue is full", task_type)
+            return False
+
+        _QUEUED.set(cls._queue.qsize())
+        return True
+
+    @classmethod
+    async def _run(cls, task: _Task) -> None:
+        retry_policy = cls._retry_policies.get(task.task_type, NO_RETRY)
+        for attempt in range(1, retry_policy.max_attempts + 1):
+            try:
+                await asyncio.create_task(task.factory(), context=task.context)
+                _TASKS.inc(task_type=task.task_type, outcome="succeeded")
+                return
+            except Exception as e:
+                if attempt >= retry_policy.max_attempts:
+                    _TASKS.inc(task_type=task.task_type, outcome="failed")
+                    logging.exception("Background task %s failed after %s attempts: %r", task.task_type, attempt, e)
+                    return
+                _TASKS.inc(task_type=task.task_type, outcome="retried")
+                await asyncio.sleep(retry_policy.get_delay(attempt - 1))
+
+    @classmethod
+    async def _work(cls) -> None:
+        while True:
+            task = await cls._queue.get()
+            _QUEUED.set(cls._queue.qsize())
+            _RUNNING.inc()
+            try:
+                await cls._run(task)
+            finally:
+                _RUNNING.dec()
+                cls._queue.task_done()
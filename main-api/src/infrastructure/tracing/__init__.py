@@ -0,0 +1,17 @@
+from .exporters import SpanExporter, FileSpanExporter, OTLPHTTPSpanExporter
+from .instrumentation import instrument_engine
+from .span import Span, SpanContext, SpanKind
+from .tracer import Tracer, traced
+
+
+__all__ = [
+    "SpanExporter",
+    "FileSpanExporter",
+    "OTLPHTTPSpanExporter",
+    "instrument_engine",
+    "Span",
+    "SpanContext",
+    "SpanKind",
+    "Tracer",
+    "traced"
+]
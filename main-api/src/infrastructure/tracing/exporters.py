@@ -0,0 +1,101 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Any
+
+import httpx
+import orjson
+
+from .span import Span
+
+
+class SpanExporter(ABC):
+    """
+    Called from the span processor thread, never from the event loop.
+    """
+
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Appends the spans to a file, one JSON object per line.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "ab")
+
+    def export(self, spans: list[Span]) -> None:
+        self._file.write(b"".join(orjson.dumps(span.to_dict(), default=str) + b"\n" for span in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+def _to_otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _to_otlp_span(span: Span) -> dict[str, Any]:
+    otlp_span = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": int(span.kind),
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns),
+        "attributes": [{"key": key, "value": _to_otlp_value(value)} for key, value in span.attributes.items()],
+        # 1 - OK, 2 - ERROR
+        "status": {"code": 2, "message": span.error} if span.error is not None else {"code": 1}
+    }
+    if span.parent_span_id is not None:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    return otlp_span
+
+
+class OTLPHTTPSpanExporter(SpanExporter):
+    """
+    Sends the spans to an OpenTelemetry collector over OTLP/HTTP with the JSON encoding.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 5):
+        self._endpoint = endpoint
+        self._service_name = service_name
+        self._client = httpx.Client(timeout=timeout)
+
+    def export(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {
+                    "attributes": [{"key": "service.name", "value": {"stringValue": self._service_name}}]
+                },
+                "scopeSpans": [{
+                    "scope": {"name": "bh_api"},
+                    "spans": [_to_otlp_span(span) for span in spans]
+                }]
+            }]
+        }
+        try:
+            response = self._client.post(
+                self._endpoint,
+                content=orjson.dumps(payload, default=str),
+                headers={"Content-Type": "application/json"}
+            )
+            if response.status_code >= 400:
+                logging.warning("Trace collector rejected %s spans: %s", len(spans), response.status_code)
+        except httpx.HTTPError as e:
+            logging.warning("Could not export %s spans: %r", len(spans), e)
+
+    def shutdown(self) -> None:
+        self._client.close()
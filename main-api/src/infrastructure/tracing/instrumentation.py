@@ -0,0 +1,64 @@
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .span import SpanKind
+from .tracer import Tracer
+
+
+MAX_STATEMENT_LENGTH = 1000
+_SPANS_KEY = "tracing_spans"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Records a span for every statement executed by the engine.
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_statement_span(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool
+    ) -> None:
+        if not Tracer.is_enabled():
+            return
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "QUERY"
+        span = Tracer.create_span(
+            f"db {operation}",
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": "postgresql",
+                "db.operation": operation,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH]
+            }
+        )
+        conn.info.setdefault(_SPANS_KEY, []).append(span)
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def end_statement_span(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool
+    ) -> None:
+        spans = conn.info.get(_SPANS_KEY)
+        if spans:
+            Tracer.end_span(spans.pop())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def end_failed_statement_span(exception_context: ExceptionContext) -> None:
+        if exception_context.connection is None:
+            return
+        spans = exception_context.connection.info.get(_SPANS_KEY)
+        if spans:
+            span = spans.pop()
+            span.record_exception(exception_context.original_exception)
+            Tracer.end_span(span)
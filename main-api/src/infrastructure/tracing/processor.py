@@ -0,0 +1,79 @@
+import logging
+import queue
+import threading
+import time
+
+from infrastructure.metrics import MetricsRegistry
+
+from .exporters import SpanExporter
+from .span import Span
+
+
+_DROPPED = MetricsRegistry.counter(
+    "tracing_spans_dropped_total",
+    "Number of finished spans dropped because the export queue was full."
+)
+
+
+class BatchSpanProcessor:
+    """
+    Hands the finished spans over to a thread that exports them in batches,
+    so neither encoding nor export I/O happens on the event loop.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 256,
+        flush_interval: float = 5
+    ):
+        self._exporter = exporter
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=max_queue_size)
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._thread = threading.Thread(target=self._run, name="span-processor", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            _DROPPED.inc()
+
+    def shutdown(self) -> None:
+        # Blocks until the queued spans are exported
+        self._queue.put(None)
+        self._thread.join()
+        self._exporter.shutdown()
+
+    def _export(self, batch: list[Span]) -> None:
+        try:
+            self._exporter.export(batch)
+        except Exception as e:
+            logging.warning("Span export failed: %r", e)
+
+    def _run(self) -> None:
+        # A batch is exported once it's full or has been waiting for the flush interval
+        batch: list[Span] = []
+        flush_at = None
+        while True:
+            timeout = max(flush_at - time.monotonic(), 0) if flush_at is not None else None
+            try:
+                span = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._export(batch)
+                batch, flush_at = [], None
+                continue
+            if span is None:
+                break
+
+            if not batch:
+                flush_at = time.monotonic() + self._flush_interval
+            batch.append(span)
+            if len(batch) >= self._max_batch_size:
+                self._export(batch)
+                batch, flush_at = [], None
+
+        if batch:
+            self._export(batch)
@@ -0,0 +1,100 @@
+import re
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any
+
+
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+class SpanKind(IntEnum):
+    """
+    Values of the OTLP span kinds
+    """
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """
+    Identifies a span across processes in the W3C Trace Context format.
+    """
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @classmethod
+    def from_traceparent(cls, traceparent: str) -> "SpanContext | None":
+        """
+        :param traceparent: Value of the **traceparent** header
+        :return: The remote span context or None if the header is invalid
+        """
+        match = _TRACEPARENT_PATTERN.match(traceparent.strip().lower())
+        if match is None:
+            return None
+        trace_id, span_id, flags = match.groups()
+        if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+            return None
+        return cls(trace_id=trace_id, span_id=span_id, sampled=bool(int(flags, 16) & 1))
+
+
+@dataclass
+class Span:
+    name: str
+    context: SpanContext
+    parent_span_id: str | None = None
+    kind: SpanKind = SpanKind.INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: int | None = None
+    error: str | None = None
+
+    @property
+    def is_recording(self) -> bool:
+        return self.context.sampled
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.error = repr(exc)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_span_id": self.parent_span_id,
+            "kind": self.kind.name.lower(),
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": (self.end_time_ns - self.start_time_ns) / 1e6 if self.end_time_ns is not None else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class NonRecordingSpan(Span):
+    """
+    Stands in for a span while tracing is disabled, everything set on it is discarded.
+    """
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+INVALID_SPAN = NonRecordingSpan(
+    name="",
+    context=SpanContext(trace_id=_INVALID_TRACE_ID, span_id=_INVALID_SPAN_ID, sampled=False)
+)
@@ -0,0 +1,155 @@
+import atexit
+import functools
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, ParamSpec, TypeVar
+
+from .processor import BatchSpanProcessor
+from .exporters import SpanExporter
+from .span import Span, SpanContext, SpanKind, INVALID_SPAN
+
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Process-wide tracer. The current span is kept in a context variable,
+    so it follows the request into awaited calls and the tasks created from it.
+
+    Tracing is disabled until an exporter is set up; the spans are then stand-ins that cost next to nothing.
+    """
+
+    _processor: BatchSpanProcessor | None = None
+    _sample_rate: float = 1
+
+    @classmethod
+    def setup(cls, exporter: SpanExporter | None, sample_rate: float = 1) -> None:
+        """
+        :param exporter: Receives the finished spans, None disables tracing
+        :param sample_rate: Share of the new traces to record, from 0 to 1.
+        Traces continued from a remote parent follow its sampling decision.
+        """
+        cls.shutdown()
+        cls._sample_rate = sample_rate
+        if exporter is not None:
+            cls._processor = BatchSpanProcessor(exporter)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._processor is not None:
+            cls._processor.shutdown()
+            cls._processor = None
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._processor is not None
+
+    @classmethod
+    def get_current_span(cls) -> Span:
+        return _current_span.get() or INVALID_SPAN
+
+    @classmethod
+    def get_current_context(cls) -> SpanContext | None:
+        """
+        :return: Context of the current span to continue the trace elsewhere, None if there's no span
+        """
+        current_span = _current_span.get()
+        return current_span.context if current_span is not None else None
+
+    @classmethod
+    def create_span(
+        cls,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, Any] | None = None,
+        parent: SpanContext | None = None
+    ) -> Span:
+        """
+        Starts a span without making it the current one, it has to be finished with **end_span**.
+        :param name: Span name
+        :param kind: Span kind
+        :param attributes: Initial attributes
+        :param parent: Remote parent, defaults to the current span
+        :return: The started span
+        """
+        if cls._processor is None:
+            return INVALID_SPAN
+
+        if parent is None:
+            current_span = _current_span.get()
+            parent = current_span.context if current_span is not None else None
+
+        if parent is not None:
+            trace_id = parent.trace_id
+            sampled = parent.sampled
+        else:
+            trace_id = f"{random.getrandbits(128):032x}"
+            sampled = random.random() < cls._sample_rate
+
+        return Span(
+            name=name,
+            context=SpanContext(trace_id=trace_id, span_id=f"{random.getrandbits(64):016x}", sampled=sampled),
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            attributes=attributes or {}
+        )
+
+    @classmethod
+    def end_span(cls, span: Span) -> None:
+        if not span.is_recording or cls._processor is None:
+            return
+        span.end_time_ns = time.time_ns()
+        cls._processor.submit(span)
+
+    @classmethod
+    @contextmanager
+    def start_span(
+        cls,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, Any] | None = None,
+        parent: SpanContext | None = None
+    ) -> Iterator[Span]:
+        """
+        Starts a span and makes it the current one for the duration of the block.
+        Exceptions leaving the block are recorded on the span.
+        """
+        span = cls.create_span(name, kind, attributes, parent)
+        if span is INVALID_SPAN:
+            yield span
+            return
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            cls.end_span(span)
+
+
+def traced(name: str) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Wraps every call of the decorated coroutine function into a span.
+    :param name: Span name
+    """
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with Tracer.start_span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+atexit.register(Tracer.shutdown)
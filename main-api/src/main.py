@@ -1,17 +1,34 @@
 import asyncio
+from urllib.parse import urlencode
 
 import config
 from api import run_api, APIConfig, JWTSettings
-from api.config import IssueTrackerSettings
+from api.config import (
+    IssueTrackerSettings,
+    GithubWebhookSettings,
+    LNBitsWebhookSettings,
+    RateLimitSettings,
+    AdminSettings,
+    CompressionSettings
+)
 from infrastructure import setup_infrastructure
 from infrastructure.config import (
     DatabaseConfig, 
     LNBitsConfig, 
     GithubConfig, 
-    BrantaConfig
+    BrantaConfig,
+    TracingConfig,
+    CacheConfig
 )
 
 
+def get_lnbits_deposit_webhook_url() -> str | None:
+    if not config.API_PUBLIC_URL or not config.LNBITS_WEBHOOK_SECRET:
+        return None
+    return (f"{config.API_PUBLIC_URL.rstrip('/')}/api/wallet/deposits/lnbits-webhook"
+            f"?{urlencode({'secret': config.LNBITS_WEBHOOK_SECRET})}")
+
+
 async def main():
 
     await setup_infrastructure(
@@ -20,21 +37,45 @@ async def main():
             port=config.DB_PORT,
             database=config.DB_DATABASE,
             user=config.DB_USER,
-            password=config.DB_PASSWORD
+            password=config.DB_PASSWORD,
+            pool_size=config.DB_POOL_SIZE
         ),
 
         lnbits_config=LNBitsConfig(
-            node_url=config.LIGHTNING_BASE_URL
+            node_url=config.LIGHTNING_BASE_URL,
+            deposit_webhook_url=get_lnbits_deposit_webhook_url(),
+            max_concurrency=config.LNBITS_MAX_CONCURRENCY,
+            admission_timeout=config.LNBITS_ADMISSION_TIMEOUT,
+            timeout=config.LNBITS_TIMEOUT,
+            payment_timeout=config.LNBITS_PAYMENT_TIMEOUT
         ),
 
         github_config=GithubConfig(
             client_id=config.GITHUB_CLIENT_ID,
-            client_secret=config.GITHUB_CLIENT_SECRET
+            client_secret=config.GITHUB_CLIENT_SECRET,
+            timeout=config.GITHUB_TIMEOUT,
+            app_tokens=config.GITHUB_APP_TOKENS,
+            rate_limit_reserve=config.GITHUB_RATE_LIMIT_RESERVE,
+            max_defer=config.GITHUB_MAX_DEFER
         ),
 
         branta_config=BrantaConfig(
             url_base=config.BRANTA_BASE_URL,
-            api_key=config.BRANTA_API_KEY
+            api_key=config.BRANTA_API_KEY,
+            timeout=config.BRANTA_TIMEOUT
+        ),
+
+        tracing_config=TracingConfig(
+            exporter=config.TRACING_EXPORTER,
+            file_path=config.TRACING_FILE_PATH,
+            otlp_endpoint=config.TRACING_OTLP_ENDPOINT,
+            sample_rate=config.TRACING_SAMPLE_RATE
+        ),
+
+        cache_config=CacheConfig(
+            backend=config.CACHE_BACKEND,
+            redis_url=config.CACHE_REDIS_URL,
+            max_entries=config.CACHE_MAX_ENTRIES
         )
     )
 
@@ -48,6 +89,27 @@ async def main():
             ),
             issue_tracker_settings=IssueTrackerSettings(
                 secret=config.ISSUE_TRACKER_SECRET
+            ),
+            github_webhook_settings=GithubWebhookSettings(
+                secret=config.GITHUB_WEBHOOK_SECRET
+            ),
+            lnbits_webhook_settings=LNBitsWebhookSettings(
+                secret=config.LNBITS_WEBHOOK_SECRET
+            ),
+            rate_limit_settings=RateLimitSettings(
+                enabled=config.RATE_LIMIT_ENABLED,
+                backend=config.RATE_LIMIT_BACKEND,
+                routes=config.RATE_LIMITS
+            ),
+            admin_settings=AdminSettings(
+                github_ids=config.ADMIN_GITHUB_IDS
+            ),
+            compression_settings=CompressionSettings(
+                enabled=config.COMPRESSION_ENABLED,
+                minimum_size=config.COMPRESSION_MINIMUM_SIZE,
+                gzip_level=config.COMPRESSION_GZIP_LEVEL,
+                brotli_quality=config.COMPRESSION_BROTLI_QUALITY,
+                cache_ttl=config.COMPRESSION_CACHE_TTL
             )
         )
     )
@@ -0,0 +1,116 @@
+import sys
+import asyncio
+import importlib
+import os
+import subprocess
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+"""
+Measures the cold start of the API: import time per package, app construction and infrastructure init.
+Run this script with optional args: [--with-infrastructure] (requires the database and LNBits to be reachable)
+    > python src/profile_startup.py --with-infrastructure
+"""
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+FIRST_PARTY_PACKAGES = ("api", "domain", "impl", "infrastructure")
+TOP_PACKAGES = 20
+
+
+def get_package(module: str) -> str:
+    parts = module.split(".")
+    # First party packages are broken down one level deeper to point at the slow subsystem
+    depth = 2 if parts[0] in FIRST_PARTY_PACKAGES else 1
+    return ".".join(parts[:depth])
+
+
+def profile_imports() -> tuple[Counter, int]:
+    """
+    Imports main in a fresh interpreter with -X importtime.
+    :return: Self import time in microseconds per package, total import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    per_package = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        per_package[get_package(module.strip())] += int(self_us)
+    return per_package, sum(per_package.values())
+
+
+@contextmanager
+def timed(label: str, timings: list[tuple[str, float]]):
+    started_at = time.perf_counter()
+    yield
+    timings.append((label, time.perf_counter() - started_at))
+
+
+async def main(with_infrastructure):
+    per_package, total_us = profile_imports()
+    print(f"Imports: {total_us / 1000:.1f}ms")
+    for package, self_us in per_package.most_common(TOP_PACKAGES):
+        print(f"  {package:<40} {self_us / 1000:>8.1f}ms")
+
+    timings: list[tuple[str, float]] = []
+    with timed("import main", timings):
+        importlib.import_module("main")
+        import config
+        from api.config import APIConfig, JWTSettings, IssueTrackerSettings
+        from api.setup import get_fastapi_app
+
+    if with_infrastructure:
+        from infrastructure import setup_infrastructure
+        from infrastructure.config import DatabaseConfig, LNBitsConfig, GithubConfig, BrantaConfig
+        from infrastructure.database import warmup_db
+
+        with timed("setup_infrastructure", timings):
+            await setup_infrastructure(
+                database_config=DatabaseConfig(
+                    host=config.DB_HOST,
+                    port=config.DB_PORT,
+                    database=config.DB_DATABASE,
+                    user=config.DB_USER,
+                    password=config.DB_PASSWORD
+                ),
+                lnbits_config=LNBitsConfig(
+                    node_url=config.LIGHTNING_BASE_URL
+                ),
+                github_config=GithubConfig(
+                    client_id=config.GITHUB_CLIENT_ID,
+                    client_secret=config.GITHUB_CLIENT_SECRET
+                ),
+                branta_config=BrantaConfig(
+                    url_base=config.BRANTA_BASE_URL,
+                    api_key=config.BRANTA_API_KEY
+                )
+            )
+        with timed("warmup_db", timings):
+            await warmup_db()
+
+    with timed("get_fastapi_app", timings):
+        app = get_fastapi_app(APIConfig(
+            enable_docs=True,
+            jwt_settings=JWTSettings(access_token_secret=config.JWT_ACCESS_TOKEN_SECRET),
+            issue_tracker_settings=IssueTrackerSettings(secret=config.ISSUE_TRACKER_SECRET or "")
+        ))
+    # Built on the first docs request, not before serving
+    with timed("openapi schema (deferred)", timings):
+        app.openapi()
+
+    print("Startup:")
+    for label, seconds in timings:
+        print(f"  {label:<40} {seconds * 1000:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 or (len(sys.argv) == 2 and sys.argv[1] != "--with-infrastructure"):
+        raise Exception("supply the script at most one arg: [--with-infrastructure]")
+    asyncio.run(main(len(sys.argv) == 2))
@@ -0,0 +1,50 @@
+import sys
+import asyncio
+
+import config
+from infrastructure import setup_infrastructure
+from infrastructure.config import DatabaseConfig, LNBitsConfig, GithubConfig, BrantaConfig
+
+from impl.stats.service import StatsService
+
+"""
+Recomputes the reward rollups behind /api/stats from the rewards and the claimed issues.
+Run it once after deploying the rollups, and whenever they need to be repaired. Run this script without args:
+    > python src/rebuild_rollups.py
+"""
+
+
+async def main():
+
+    await setup_infrastructure(
+        database_config=DatabaseConfig(
+            host=config.DB_HOST,
+            port=config.DB_PORT,
+            database=config.DB_DATABASE,
+            user=config.DB_USER,
+            password=config.DB_PASSWORD
+        ),
+
+        lnbits_config=LNBitsConfig(
+            node_url=config.LIGHTNING_BASE_URL
+        ),
+
+        github_config=GithubConfig(
+            client_id=config.GITHUB_CLIENT_ID,
+            client_secret=config.GITHUB_CLIENT_SECRET
+        ),
+
+        branta_config=BrantaConfig(
+            url_base=config.BRANTA_BASE_URL,
+            api_key=config.BRANTA_API_KEY
+        )
+    )
+
+    await StatsService().rebuild_rollups()
+    print("Reward rollups rebuilt")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        raise Exception("the script takes no args")
+    asyncio.run(main())
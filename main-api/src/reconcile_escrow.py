@@ -0,0 +1,58 @@
+import sys
+import asyncio
+
+import config
+from infrastructure import setup_infrastructure
+from infrastructure.config import DatabaseConfig, LNBitsConfig, GithubConfig, BrantaConfig
+
+from impl.escrow.service import EscrowService
+
+"""
+Run this script with optional args: [chunk_size] (int) [concurrency] (int)
+    > python src/reconcile_escrow.py 200 4
+"""
+
+
+async def main(chunk_size, concurrency):
+
+    await setup_infrastructure(
+        database_config=DatabaseConfig(
+            host=config.DB_HOST,
+            port=config.DB_PORT,
+            database=config.DB_DATABASE,
+            user=config.DB_USER,
+            password=config.DB_PASSWORD
+        ),
+
+        lnbits_config=LNBitsConfig(
+            node_url=config.LIGHTNING_BASE_URL,
+            max_concurrency=config.LNBITS_MAX_CONCURRENCY,
+            admission_timeout=config.LNBITS_ADMISSION_TIMEOUT,
+            timeout=config.LNBITS_TIMEOUT
+        ),
+
+        github_config=GithubConfig(
+            client_id=config.GITHUB_CLIENT_ID,
+            client_secret=config.GITHUB_CLIENT_SECRET
+        ),
+
+        branta_config=BrantaConfig(
+            url_base=config.BRANTA_BASE_URL,
+            api_key=config.BRANTA_API_KEY
+        )
+    )
+
+    report = await EscrowService().reconcile_escrow(chunk_size=chunk_size, concurrency=concurrency)
+
+    print(f"Reconciliation {report.run_id}: {report.checked_wallets} issue wallets checked, "
+          f"{len(report.discrepancies)} discrepancies found")
+    for discrepancy in report.discrepancies:
+        print(discrepancy.model_dump())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        raise Exception("supply the script at most two args: [chunk_size] [concurrency]")
+    chunk_size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    asyncio.run(main(chunk_size, concurrency))
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable
+
+import pytest
+
+from infrastructure.cache import RedisCacheBackend
+
+
+class WrongType(Exception):
+    pass
+
+
+class RESPServer:
+    """
+    In-memory stand-in of a Redis server, speaking RESP2 over TCP for the commands used by the cache backend.
+    """
+
+    def __init__(self):
+        self.data: dict[bytes, bytes | set[bytes]] = {}
+        self.expires_at: dict[bytes, float] = {}
+        self.connections = 0
+        # Seconds to wait before every reply, to make the clients time out
+        self.reply_delay: float = 0
+        # Called once before the next EXEC, to write in between WATCH and EXEC like another client
+        self.before_exec: Callable[[], None] | None = None
+
+        self._versions: dict[bytes, int] = {}
+        self._server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"redis://{host}:{port}/0"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def write(self, key: bytes, value: bytes | set[bytes] | None) -> None:
+        if value is None:
+            self.data.pop(key, None)
+        else:
+            self.data[key] = value
+        self.expires_at.pop(key, None)
+        self._versions[key] = self._versions.get(key, 0) + 1
+
+    def _get(self, key: bytes) -> bytes | set[bytes] | None:
+        if key in self.expires_at and self.expires_at[key] <= time.monotonic():
+            self.write(key, None)
+        return self.data.get(key)
+
+    def _get_set(self, key: bytes) -> set[bytes]:
+        value = self._get(key)
+        if value is not None and not isinstance(value, set):
+            raise WrongType()
+        return value or set()
+
+    def _run(self, command: bytes, args: list[bytes]) -> Any:
+        if command == b"GET":
+            value = self._get(args[0])
+            if isinstance(value, set):
+                raise WrongType()
+            return value
+        if command == b"SET":
+            self.write(args[0], args[1])
+            if len(args) == 4 and args[2].upper() == b"PX":
+                self.expires_at[args[0]] = time.monotonic() + int(args[3]) / 1000
+            return "OK"
+        if command == b"PTTL":
+            if self._get(args[0]) is None:
+                return -2
+            if args[0] not in self.expires_at:
+                return -1
+            return int((self.expires_at[args[0]] - time.monotonic()) * 1000)
+        if command == b"DEL":
+            deleted = [key for key in args if self._get(key) is not None]
+            for key in deleted:
+                self.write(key, None)
+            return len(deleted)
+        if command == b"SADD":
+            members = self._get_set(args[0])
+            added = set(args[1:]) - members
+            self.write(args[0], members | added)
+            return len(added)
+        if command == b"SUNION":
+            return sorted(set().union(*(self._get_set(key) for key in args)))
+        raise ValueError(f"ERR unknown command '{command.decode()}'")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        watched: dict[bytes, int] = {}
+        queued: list[tuple[bytes, list[bytes]]] | None = None
+        try:
+            while True:
+                command, *args = await self._read_command(reader)
+                command = command.upper()
+                if command == b"WATCH":
+                    watched.update((key, self._versions.get(key, 0)) for key in args)
+                    reply = "OK"
+                elif command == b"UNWATCH":
+                    watched.clear()
+                    reply = "OK"
+                elif command == b"MULTI":
+                    queued = []
+                    reply = "OK"
+                elif command == b"EXEC":
+                    if self.before_exec is not None:
+                        self.before_exec, before_exec = None, self.before_exec
+                        before_exec()
+                    if any(self._versions.get(key, 0) != version for key, version in watched.items()):
+                        reply = NotImplemented
+                    else:
+                        reply = [self._reply_to(queued_command, queued_args) for queued_command, queued_args in queued]
+                    queued = None
+                    watched.clear()
+                elif queued is not None:
+                    queued.append((command, args))
+                    reply = "QUEUED"
+                else:
+                    reply = self._reply_to(command, args)
+                if self.reply_delay:
+                    await asyncio.sleep(self.reply_delay)
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _reply_to(self, command: bytes, args: list[bytes]) -> Any:
+        try:
+            return self._run(command, args)
+        except WrongType:
+            return ValueError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        except ValueError as e:
+            return e
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> list[bytes]:
+        length = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args = []
+        for _ in range(length):
+            arg_length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(arg_length + 2))[:-2])
+        return args
+
+    @classmethod
+    def _encode(cls, reply: Any) -> bytes:
+        if reply is NotImplemented:
+            # Aborted transaction
+            return b"*-1\r\n"
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, ValueError):
+            return b"-%s\r\n" % str(reply).encode()
+        if isinstance(reply, str):
+            return b"+%s\r\n" % reply.encode()
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(cls._encode(item) for item in reply)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def redis_server() -> AsyncIterator[RESPServer]:
+    server = RESPServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+async def redis_backend(redis_server: RESPServer) -> AsyncIterator[RedisCacheBackend]:
+    backend = RedisCacheBackend(redis_server.url, namespace="test", timeout=0.2)
+    yield backend
+    await backend.close()
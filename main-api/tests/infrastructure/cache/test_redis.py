@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from infrastructure.cache import CacheUnavailable, RedisCacheBackend
+from infrastructure.cache.exceptions import RedisError
+from infrastructure.cache.resp import RedisConnectionPool, encode_command
+
+
+pytestmark = pytest.mark.anyio
+
+
+def test_encode_command():
+    assert encode_command("SET", b"key", 12, 0.5) == b"*4\r\n$3\r\nSET\r\n$3\r\nkey\r\n$2\r\n12\r\n$3\r\n0.5\r\n"
+
+
+async def test_get_set(redis_backend: RedisCacheBackend):
+    assert await redis_backend.get("key") is None
+
+    await redis_backend.set("key", b"value")
+
+    assert await redis_backend.get("key") == b"value"
+    assert await redis_backend.get_ttl("key") is None
+
+
+async def test_set_with_ttl(redis_backend: RedisCacheBackend, redis_server):
+    await redis_backend.set("key", b"value", ttl=0.1)
+
+    assert redis_server.data[b"test:key"] == b"value"
+    assert 0 < await redis_backend.get_ttl("key") <= 0.1
+    await asyncio.sleep(0.15)
+    assert await redis_backend.get("key") is None
+    assert await redis_backend.get_ttl("key") is None
+
+
+async def test_delete(redis_backend: RedisCacheBackend):
+    await redis_backend.set("key", b"value")
+
+    assert await redis_backend.delete("key") is True
+    assert await redis_backend.delete("key") is False
+    assert await redis_backend.get("key") is None
+
+
+async def test_compare_and_set(redis_backend: RedisCacheBackend):
+    assert await redis_backend.compare_and_set("key", None, b"first") is True
+    assert await redis_backend.compare_and_set("key", b"first", b"second", tags=["tag"]) is True
+
+    assert await redis_backend.get("key") == b"second"
+    assert await redis_backend.invalidate_tags("tag") == 1
+
+
+async def test_compare_and_set_with_unexpected_value(redis_backend: RedisCacheBackend):
+    await redis_backend.set("key", b"other")
+
+    assert await redis_backend.compare_and_set("key", b"first", b"second") is False
+    assert await redis_backend.get("key") == b"other"
+
+
+async def test_compare_and_set_conflict(redis_backend: RedisCacheBackend, redis_server):
+    await redis_backend.set("key", b"first")
+    # Another client writes the key in between WATCH and EXEC
+    redis_server.before_exec = lambda: redis_server.write(b"test:key", b"concurrent")
+
+    assert await redis_backend.compare_and_set("key", b"first", b"second", tags=["tag"]) is False
+
+    assert await redis_backend.get("key") == b"concurrent"
+    assert b"test:tag:tag" not in redis_server.data
+
+
+async def test_invalidate_tags(redis_backend: RedisCacheBackend, redis_server):
+    await redis_backend.set("a", b"a", tags=["x"])
+    await redis_backend.set("b", b"b", tags=["x", "y"])
+    await redis_backend.set("c", b"c", tags=["y"])
+    await redis_backend.set("d", b"d")
+
+    assert await redis_backend.invalidate_tags("x") == 2
+
+    assert await redis_backend.get("a") is None
+    assert await redis_backend.get("b") is None
+    assert await redis_backend.get("c") == b"c"
+    assert await redis_backend.get("d") == b"d"
+    assert b"test:tag:x" not in redis_server.data
+    # b is already gone, only c is deleted
+    assert await redis_backend.invalidate_tags("y") == 1
+    assert await redis_backend.invalidate_tags("x", "y") == 0
+    assert await redis_backend.invalidate_tags() == 0
+
+
+async def test_invalidate_tags_skips_expired_entries(redis_backend: RedisCacheBackend):
+    await redis_backend.set("a", b"a", ttl=0.05, tags=["x"])
+    await redis_backend.set("b", b"b", tags=["x"])
+    await asyncio.sleep(0.1)
+
+    assert await redis_backend.invalidate_tags("x") == 1
+
+
+async def test_error_reply_in_pipeline(redis_backend: RedisCacheBackend, redis_server):
+    # The tag key holds a string, so the SADD of the pipeline fails after the SET succeeded
+    redis_server.write(b"test:tag:broken", b"not a set")
+
+    with pytest.raises(RedisError, match="WRONGTYPE"):
+        await redis_backend.set("key", b"value", tags=["broken"])
+
+    # The replies after the error were read, so the connection is still in sync and reused
+    assert await redis_backend.get("key") == b"value"
+    assert redis_server.connections == 1
+
+
+async def test_pipeline_returns_error_replies(redis_server):
+    pool = RedisConnectionPool(redis_server.url)
+    async with pool.connection() as connection:
+        replies = await connection.pipeline(("SET", "key", "value"), ("NOPE",), ("GET", "key"))
+        with pytest.raises(RedisError, match="unknown command"):
+            await connection.execute("NOPE")
+    await pool.close()
+
+    assert replies[0] == "OK"
+    assert isinstance(replies[1], RedisError)
+    assert replies[2] == b"value"
+
+
+async def test_connection_dropped_after_timeout(redis_backend: RedisCacheBackend, redis_server):
+    await redis_backend.set("key", b"value")
+    redis_server.reply_delay = 0.3
+
+    with pytest.raises(CacheUnavailable):
+        await redis_backend.get("key")
+
+    redis_server.reply_delay = 0
+    await redis_backend.set("other", b"other")
+    # The late reply of the timed out GET would be read by the next command on the same connection
+    assert await redis_backend.get("key") == b"value"
+    assert await redis_backend.get("other") == b"other"
+    assert redis_server.connections == 2
+
+
+async def test_unreachable_server():
+    backend = RedisCacheBackend("redis://127.0.0.1:1/0", timeout=0.2)
+
+    with pytest.raises(CacheUnavailable):
+        await backend.get("key")
+    await backend.close()